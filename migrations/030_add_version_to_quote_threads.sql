@@ -0,0 +1,5 @@
+-- Per-thread change counter used for ETags on thread, offer and comparison reads.
+-- Bumped by every write that changes what those endpoints return.
+
+ALTER TABLE quote_threads
+  ADD COLUMN IF NOT EXISTS version bigint NOT NULL DEFAULT 0;
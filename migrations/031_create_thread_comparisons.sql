@@ -0,0 +1,9 @@
+-- Materialized mechanic comparison per thread (read model for GET /threads/{id}/comparison).
+-- Kept in sync by the offer write paths; rebuild with `make rebuild-comparisons`.
+
+CREATE TABLE IF NOT EXISTS thread_comparisons (
+  thread_id bigint PRIMARY KEY REFERENCES quote_threads(id) ON DELETE CASCADE,
+  mechanic_id bigint NOT NULL,
+  document jsonb NOT NULL,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
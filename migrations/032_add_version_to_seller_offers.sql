@@ -0,0 +1,6 @@
+-- Per-offer change counter for optimistic concurrency on seller item edits.
+-- Every item edit and status transition bumps it; clients may send the
+-- version they last saw and get 409 when another request changed the offer.
+
+ALTER TABLE seller_offers
+  ADD COLUMN IF NOT EXISTS version bigint NOT NULL DEFAULT 0;
@@ -0,0 +1,8 @@
+-- Content hash for catalog uploads: identical PDFs reuse the catalog that is
+-- already ingested (or being ingested) instead of spending embeddings again.
+ALTER TABLE catalog_documents
+  ADD COLUMN IF NOT EXISTS content_sha256 char(64) NULL;
+
+CREATE INDEX IF NOT EXISTS catalog_documents_content_sha256_idx
+  ON catalog_documents(content_sha256)
+  WHERE is_active = true;
@@ -0,0 +1,28 @@
+-- Application tables parsed from Bosch/NGK catalogs during ingestion:
+-- one row per vehicle/engine and part code, so exact-vehicle lookups are a
+-- plain indexed query instead of vector search + LLM.
+CREATE TABLE IF NOT EXISTS catalog_fitments (
+  id          bigserial PRIMARY KEY,
+  catalog_id  bigint NOT NULL REFERENCES catalog_documents(id) ON DELETE CASCADE,
+  brand       text NOT NULL,
+  model       text NOT NULL,
+  model_key   text NOT NULL,              -- lowercase, unaccented model
+  engine      text,
+  fuel        text,
+  year_start  int,
+  year_end    int,
+  part_type   text NOT NULL,              -- spark_plug | ignition_cable | ignition_coil
+  part_code   text NOT NULL,
+  variant     text,                       -- NGK: conventional | iridium
+  reference   text,                       -- Bosch: Nº referência / código simplificado
+  gap         text,
+  page        int,
+  created_at  timestamptz NOT NULL DEFAULT now()
+);
+
+-- Exact model and "model %" prefix lookups
+CREATE INDEX IF NOT EXISTS catalog_fitments_model_key_idx
+  ON catalog_fitments (model_key text_pattern_ops, part_type);
+
+CREATE INDEX IF NOT EXISTS catalog_fitments_catalog_id_idx
+  ON catalog_fitments (catalog_id);
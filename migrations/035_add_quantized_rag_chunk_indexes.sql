@@ -0,0 +1,18 @@
+-- Quantized first-pass indexes for rag_chunks (pgvector >= 0.7).
+-- RAG_VECTOR_SEARCH_MODE=halfvec|binary searches one of these and re-ranks
+-- the candidates with the full-precision embedding. The expressions must
+-- match RagChunkRepoSqlAlchemy exactly for the planner to use them.
+--
+-- halfvec: half the memory of the vector(1536) index, near-identical recall.
+CREATE INDEX IF NOT EXISTS rag_chunks_embedding_halfvec_idx
+  ON rag_chunks
+  USING hnsw ((CAST(embedding AS halfvec(1536))) halfvec_cosine_ops);
+
+-- binary: 1 bit per dimension (32x smaller), Hamming distance; needs the re-rank.
+CREATE INDEX IF NOT EXISTS rag_chunks_embedding_bit_idx
+  ON rag_chunks
+  USING hnsw ((CAST(binary_quantize(embedding) AS bit(1536))) bit_hamming_ops);
+
+-- Once a quantized mode is in use everywhere, the full-precision index
+-- (rag_chunks_embedding_idx) is no longer read and can be dropped to reclaim
+-- its memory; re-ranking reads the embedding column from the heap.
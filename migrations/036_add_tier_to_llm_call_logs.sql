@@ -0,0 +1,8 @@
+-- Which model tier answered a recommendation call: 'fast' (LLM_FAST_MODEL,
+-- tried first) or 'strong' (LLM_MODEL, escalation). NULL when tiered
+-- routing is disabled and every call goes to LLM_MODEL.
+ALTER TABLE llm_call_logs
+  ADD COLUMN IF NOT EXISTS tier text NULL;
+
+CREATE INDEX IF NOT EXISTS llm_call_logs_tier_idx
+  ON llm_call_logs(tier);
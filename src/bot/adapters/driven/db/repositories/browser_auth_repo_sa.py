@@ -4,27 +4,19 @@ from __future__ import annotations
 
 from typing import Any
 
-import bcrypt
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from src.bot.domain.errors import ConflictError, UnauthorizedError, ValidationError
-
-
-def _hash_password(plain: str) -> str:
-    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt()).decode()
-
-
-def _check_password(plain: str, hashed: str) -> bool:
-    return bcrypt.checkpw(plain.encode(), hashed.encode())
+from src.bot.domain.errors import ConflictError, ValidationError
 
 
 class BrowserAuthRepoSqlAlchemy:
     def __init__(self, session: Session) -> None:
         self._session = session
 
-    def create_credential(self, payload: dict[str, Any]) -> dict[str, Any]:
+    def create_credential(self, payload: dict[str, Any], *, password_hash: str) -> dict[str, Any]:
+        """Store a credential; ``password_hash`` is computed by the caller off the event loop."""
         role = str(payload["role"]).strip().lower()
         email = str(payload["email"]).strip().lower()
         actor_id = payload.get("actor_id")
@@ -38,7 +30,6 @@ class BrowserAuthRepoSqlAlchemy:
             raise ValidationError("actor_id is required for mechanic and seller credentials")
 
         principal = self._load_principal(role=role, actor_id=int(actor_id) if actor_id is not None else None)
-        password_hash = _hash_password(str(payload["password"]))
 
         try:
             row = self._session.execute(
@@ -67,7 +58,12 @@ class BrowserAuthRepoSqlAlchemy:
             "shop_id": principal["shop_id"],
         }
 
-    def authenticate(self, email: str, password: str) -> dict[str, Any]:
+    def find_login(self, email: str) -> dict[str, Any] | None:
+        """Credential matching ``email`` (with its password hash), or None.
+
+        Password checking is left to the caller so bcrypt can run off the
+        request thread; :meth:`complete_login` then resolves the principal.
+        """
         email_lower = email.strip().lower()
         credential = self._session.execute(
             text(
@@ -82,29 +78,14 @@ class BrowserAuthRepoSqlAlchemy:
             ),
             {"email": email_lower},
         ).mappings().one_or_none()
-
         if credential is not None:
-            if not _check_password(password, credential["password_hash"]):
-                raise UnauthorizedError("E-mail ou senha inválidos.")
-
-            principal = self._load_principal(
-                role=str(credential["role"]),
-                actor_id=int(credential["actor_id"]) if credential["actor_id"] is not None else None,
-            )
-            return {
-                "user_id": principal["user_id"],
-                "role": principal["role"],
-                "shop_id": principal["shop_id"],
-                "vendor_id": principal.get("vendor_id"),
-                "mechanic_id": principal.get("mechanic_id"),
-                "name": principal["name"],
-                "email": credential["email"],
-            }
+            return {"source": "browser_auth_credentials", **dict(credential)}
 
         legacy_seller = self._session.execute(
             text(
                 """
                 SELECT
+                    sc.id,
                     sc.seller_id AS vendor_id,
                     sc.autopart_id AS shop_id,
                     sc.email,
@@ -122,20 +103,54 @@ class BrowserAuthRepoSqlAlchemy:
             ),
             {"email": email_lower},
         ).mappings().one_or_none()
+        if legacy_seller is not None:
+            return {"source": "seller_credentials", **dict(legacy_seller)}
+        return None
 
-        if legacy_seller is None or not _check_password(password, legacy_seller["password_hash"]):
-            raise UnauthorizedError("E-mail ou senha inválidos.")
+    def complete_login(self, login: dict[str, Any]) -> dict[str, Any]:
+        """Principal for a login whose password was already verified."""
+        if login["source"] == "seller_credentials":
+            return {
+                "user_id": int(login["vendor_id"]),
+                "role": "seller",
+                "shop_id": int(login["shop_id"]),
+                "vendor_id": int(login["vendor_id"]),
+                "mechanic_id": None,
+                "name": str(login["name"]),
+                "email": str(login["email"]),
+            }
 
+        principal = self._load_principal(
+            role=str(login["role"]),
+            actor_id=int(login["actor_id"]) if login["actor_id"] is not None else None,
+        )
         return {
-            "user_id": int(legacy_seller["vendor_id"]),
-            "role": "seller",
-            "shop_id": int(legacy_seller["shop_id"]),
-            "vendor_id": int(legacy_seller["vendor_id"]),
-            "mechanic_id": None,
-            "name": str(legacy_seller["name"]),
-            "email": str(legacy_seller["email"]),
+            "user_id": principal["user_id"],
+            "role": principal["role"],
+            "shop_id": principal["shop_id"],
+            "vendor_id": principal.get("vendor_id"),
+            "mechanic_id": principal.get("mechanic_id"),
+            "name": principal["name"],
+            "email": login["email"],
         }
 
+    def update_password_hash(self, login: dict[str, Any], password_hash: str) -> None:
+        table = login["source"]
+        if table not in {"browser_auth_credentials", "seller_credentials"}:
+            raise ValidationError("unsupported credential source")
+        self._session.execute(
+            text(
+                f"""
+                UPDATE {table}
+                SET password_hash = :password_hash,
+                    updated_at = now()
+                WHERE id = :id
+                """
+            ),
+            {"id": int(login["id"]), "password_hash": password_hash},
+        )
+        self._session.commit()
+
     def _load_principal(self, *, role: str, actor_id: int | None) -> dict[str, Any]:
         if role == "admin":
             return {
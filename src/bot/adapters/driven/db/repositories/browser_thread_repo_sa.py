@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import json
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from src.bot.domain.errors import NotFoundError, UnauthorizedError, ValidationError
+from src.bot.domain.errors import ConflictError, NotFoundError, UnauthorizedError, ValidationError
+from src.bot.adapters.driven.db.seller_visibility import SELLER_VISIBILITY_CACHE, SellerVisibilityCache
+from src.bot.adapters.driven.db.thread_events import THREAD_EVENTS_CHANNEL
 from src.bot.application.services.recommendation_service import expand_requested_items
 
 
@@ -19,10 +23,47 @@ OFFER_STATUSES = {"DRAFT", "SUBMITTED_OPTIONS", "FINALIZED_QUOTE", "proposal_sen
 EDITABLE_OFFER_STATUSES = {"DRAFT", "SUBMITTED_OPTIONS"}
 MECHANIC_VISIBLE_OFFER_STATUSES = {"SUBMITTED_OPTIONS", "FINALIZED_QUOTE", "proposal_sent"}
 
+# A seller sees a thread when assigned to its workshop or already holding an offer on it.
+_SELLER_VISIBLE_SQL = """
+    (
+        EXISTS (
+            SELECT 1
+            FROM vendor_assignments va
+            WHERE va.workshop_id = t.workshop_id
+              AND va.autopart_id = :shop_id
+              AND va.vendor_id = :seller_id
+        )
+        OR EXISTS (
+            SELECT 1
+            FROM seller_offers so
+            WHERE so.thread_id = t.id
+              AND so.seller_id = :seller_id
+        )
+    )
+"""
+
+
+def _comparison_json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _comparison_offer_order(entry: dict[str, Any]) -> tuple[str, int]:
+    # Same order as the offer listings (created_at, then id). Entries read back
+    # from the stored document carry ISO strings, fresh ones carry datetimes.
+    created_at = entry.get("created_at")
+    if isinstance(created_at, (datetime, date)):
+        created_at = created_at.isoformat()
+    return created_at or "", int(entry["offer_id"])
+
 
 class BrowserThreadRepoSqlAlchemy:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, visibility_cache: SellerVisibilityCache | None = None) -> None:
         self._session = session
+        self._visibility_cache = SELLER_VISIBILITY_CACHE if visibility_cache is None else visibility_cache
 
     def create_thread(
         self,
@@ -228,10 +269,18 @@ class BrowserThreadRepoSqlAlchemy:
             },
         )
         self._fanout_thread_to_sellers(thread_id=int(thread_row["id"]))
+        request = self._compose_request(dict(request_row), dict(thread_row), requested_item_rows)
+        # Fanned-out offers are all DRAFT, so a new thread compares no offers yet.
+        self._save_comparison(
+            thread_id=int(thread_row["id"]),
+            mechanic_id=int(thread_row["mechanic_id"]),
+            document=self._comparison_document(dict(thread_row), request, offers=[]),
+        )
         self._session.commit()
+        # The fanout just gave every active seller an offer on this thread.
+        self._visibility_cache.invalidate_thread(int(thread_row["id"]))
 
         workshop = self._get_workshop_by_id(int(thread_row["workshop_id"]))
-        request = self._compose_request(dict(request_row), dict(thread_row), requested_item_rows)
         return {
             "thread": dict(thread_row),
             "workshop": workshop,
@@ -275,6 +324,20 @@ class BrowserThreadRepoSqlAlchemy:
             ),
             {"id": int(request_id), "status": status},
         )
+        thread_row = self._session.execute(
+            text(
+                """
+                UPDATE quote_threads
+                SET version = version + 1
+                WHERE id = (SELECT thread_id FROM part_requests WHERE id = :id)
+                RETURNING id
+                """
+            ),
+            {"id": int(request_id)},
+        ).one_or_none()
+        if thread_row is not None:
+            # The comparison embeds the request, status included.
+            self._rebuild_comparison(thread_id=int(thread_row[0]))
         self._session.commit()
 
     def save_suggestions(
@@ -327,6 +390,7 @@ class BrowserThreadRepoSqlAlchemy:
                 },
             ).mappings().one()
             rows.append(dict(row))
+        self._bump_thread_version(thread_id)
         self._session.commit()
         return rows
 
@@ -348,27 +412,10 @@ class BrowserThreadRepoSqlAlchemy:
             where.append("t.mechanic_id = :mechanic_id")
             params["mechanic_id"] = int(actor.mechanic_id)
         elif getattr(actor, "role", None) == "seller":
-            where.append(
-                """
-                (
-                    EXISTS (
-                        SELECT 1
-                        FROM vendor_assignments va
-                        WHERE va.workshop_id = t.workshop_id
-                          AND va.autopart_id = :shop_id
-                          AND va.vendor_id = :vendor_id
-                    )
-                    OR EXISTS (
-                        SELECT 1
-                        FROM seller_offers so
-                        WHERE so.thread_id = t.id
-                          AND so.seller_id = :vendor_id
-                    )
-                )
-                """
-            )
+            # Same predicate as the visibility cache, so listing and reads agree.
+            where.append(_SELLER_VISIBLE_SQL)
             params["shop_id"] = int(actor.shop_id)
-            params["vendor_id"] = int(actor.vendor_id)
+            params["seller_id"] = int(actor.vendor_id)
         elif getattr(actor, "role", None) != "admin":
             raise UnauthorizedError("not allowed")
 
@@ -420,7 +467,7 @@ class BrowserThreadRepoSqlAlchemy:
     def get_thread_detail(self, *, thread_id: int, actor: Any) -> dict[str, Any]:
         thread = self._get_visible_thread(thread_id=thread_id, actor=actor)
         request = self._get_request_by_thread(thread_id=thread_id)
-        messages = self.list_messages(thread_id=thread_id, actor=actor, limit=50)
+        messages = self.list_messages(thread_id=thread_id, actor=actor, limit=50, thread=thread)
         suggestions = self.list_suggestions(thread_id=thread_id, actor=actor)
         offers = self.list_offers(thread_id=thread_id, actor=actor)
         return {
@@ -434,21 +481,102 @@ class BrowserThreadRepoSqlAlchemy:
             "offers": offers,
         }
 
-    def list_messages(self, *, thread_id: int, actor: Any, limit: int = 100) -> list[dict[str, Any]]:
-        self._get_visible_thread(thread_id=thread_id, actor=actor)
+    def list_messages(
+        self,
+        *,
+        thread_id: int,
+        actor: Any,
+        limit: int = 100,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        thread: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Messages in chronological order.
+
+        ``after_id`` pages forward (oldest first after the cursor); ``before_id``
+        alone pages backward and returns the ``limit`` messages just before it.
+        ``thread`` is the row :meth:`get_visible_thread` already returned for
+        this actor; when given, the thread is not read again.
+        """
+        if thread is None or int(thread["id"]) != int(thread_id):
+            self._get_visible_thread(thread_id=thread_id, actor=actor)
+        where = ["thread_id = :thread_id"]
+        params: dict[str, Any] = {"thread_id": int(thread_id), "limit": int(limit)}
+        if after_id is not None:
+            where.append("id > :after_id")
+            params["after_id"] = int(after_id)
+        if before_id is not None:
+            where.append("id < :before_id")
+            params["before_id"] = int(before_id)
+        newest_first = before_id is not None and after_id is None
+
         rows = self._session.execute(
             text(
-                """
+                f"""
                 SELECT id, thread_id, sender_role, sender_user_ref, type, body, metadata_json, created_at
                 FROM thread_messages
-                WHERE thread_id = :thread_id
-                ORDER BY created_at ASC, id ASC
+                WHERE {' AND '.join(where)}
+                ORDER BY {'id DESC' if newest_first else 'created_at ASC, id ASC'}
                 LIMIT :limit
                 """
             ),
-            {"thread_id": int(thread_id), "limit": int(limit)},
+            params,
         ).mappings().all()
-        return [dict(row) for row in rows]
+        messages = [dict(row) for row in rows]
+        if newest_first:
+            messages.reverse()
+        return messages
+
+    def get_thread_version(self, *, thread_id: int, actor: Any) -> int:
+        """Change counter of a visible thread, for conditional reads.
+
+        Draft edits do not move the thread version (mechanics cannot see
+        drafts), so for sellers and admins the versions of the offers they see
+        are added in: the sum still only grows, and it grows on every edit.
+        """
+        thread = self._get_visible_thread(
+            thread_id=thread_id,
+            actor=actor,
+            with_offer_versions=getattr(actor, "role", None) != "mechanic",
+        )
+        return int(thread["version"]) + int(thread.get("offer_versions") or 0)
+
+    def get_visible_thread(self, *, thread_id: int, actor: Any) -> dict[str, Any]:
+        """The thread row, after checking ``actor`` may see it (no offers or messages)."""
+        return self._get_visible_thread(thread_id=thread_id, actor=actor)
+
+    def list_changes(
+        self,
+        *,
+        thread_id: int,
+        actor: Any,
+        after_message_id: int,
+        after_version: int | None = None,
+        limit: int = 100,
+    ) -> dict[str, Any]:
+        """One read of the long-poll change feed.
+
+        Returns the messages newer than ``after_message_id`` and the thread
+        ``version``. When ``after_version`` is given and the thread moved past
+        it, ``offers`` carries the current state of the offers ``actor`` may
+        see, so item edits on submitted offers reach the client without a
+        message.
+        """
+        thread = self._get_visible_thread(thread_id=thread_id, actor=actor)
+        version = int(thread["version"])
+        messages = self.list_messages(
+            thread_id=thread_id,
+            actor=actor,
+            limit=limit,
+            after_id=after_message_id,
+            thread=thread,
+        )
+        offers: list[dict[str, Any]] = []
+        if after_version is not None and version > int(after_version):
+            offers = [self._offer_with_items(row) for row in self._select_visible_offer_rows(thread_id, actor)]
+        # End the read transaction so the pooled connection is released while the caller waits.
+        self._session.commit()
+        return {"messages": messages, "version": version, "offers": offers}
 
     def add_message(
         self,
@@ -495,12 +623,14 @@ class BrowserThreadRepoSqlAlchemy:
                 """
                 UPDATE quote_threads
                 SET updated_at = now(),
-                    last_message_at = :last_message_at
+                    last_message_at = :last_message_at,
+                    version = version + 1
                 WHERE id = :thread_id
                 """
             ),
             {"thread_id": int(thread_id), "last_message_at": row["created_at"]},
         )
+        self._notify_thread_changed(thread_id)
         self._session.commit()
         return dict(row)
 
@@ -563,18 +693,36 @@ class BrowserThreadRepoSqlAlchemy:
                     "seller_shop_id": int(seller_shop_id),
                 },
             ).mappings().one()
+            self._bump_thread_version(thread_id)
             self._session.commit()
         return self.get_offer(offer_id=int(row["id"]), actor=self._actor_proxy("seller", seller_id, seller_shop_id))
 
     def list_offers(self, *, thread_id: int, actor: Any) -> list[dict[str, Any]]:
         self._get_visible_thread(thread_id=thread_id, actor=actor)
+        return [self._offer_with_items(row) for row in self._select_visible_offer_rows(thread_id, actor)]
+
+    def _select_visible_offer_rows(self, thread_id: int, actor: Any) -> list[dict[str, Any]]:
+        return self._select_offer_rows(
+            thread_id=thread_id,
+            statuses=MECHANIC_VISIBLE_OFFER_STATUSES if getattr(actor, "role", None) == "mechanic" else None,
+            seller_id=int(actor.vendor_id) if getattr(actor, "role", None) == "seller" else None,
+        )
+
+    def _select_offer_rows(
+        self,
+        *,
+        thread_id: int,
+        statuses: set[str] | None = None,
+        seller_id: int | None = None,
+    ) -> list[dict[str, Any]]:
         where = ["so.thread_id = :thread_id"]
         params: dict[str, Any] = {"thread_id": int(thread_id)}
-        if getattr(actor, "role", None) == "mechanic":
-            where.append("so.status IN ('SUBMITTED_OPTIONS', 'FINALIZED_QUOTE', 'proposal_sent')")
-        elif getattr(actor, "role", None) == "seller":
+        if statuses is not None:
+            where.append("so.status = ANY(CAST(:statuses AS text[]))")
+            params["statuses"] = sorted(statuses)
+        if seller_id is not None:
             where.append("so.seller_id = :seller_id")
-            params["seller_id"] = int(actor.vendor_id)
+            params["seller_id"] = int(seller_id)
 
         rows = self._session.execute(
             text(
@@ -591,6 +739,7 @@ class BrowserThreadRepoSqlAlchemy:
                     so.updated_at,
                     so.submitted_at,
                     so.finalized_at,
+                    so.version,
                     v.name AS seller_name,
                     ap.name AS seller_shop_name
                 FROM seller_offers so
@@ -602,32 +751,226 @@ class BrowserThreadRepoSqlAlchemy:
             ),
             params,
         ).mappings().all()
-        return [self._offer_with_items(dict(row)) for row in rows]
+        return [dict(row) for row in rows]
 
     def get_offer(self, *, offer_id: int, actor: Any) -> dict[str, Any]:
         row = self._get_offer_row(offer_id)
-        actor_role = getattr(actor, "role", None)
-        if actor_role == "mechanic":
-            self._get_visible_thread(thread_id=int(row["thread_id"]), actor=actor)
-            if row["status"] not in MECHANIC_VISIBLE_OFFER_STATUSES:
-                raise UnauthorizedError("offer not available")
-        elif actor_role == "seller":
-            if int(row["seller_id"]) != int(actor.vendor_id):
-                raise UnauthorizedError("offer not available")
-        elif actor_role != "admin":
-            raise UnauthorizedError("offer not available")
-
+        self._assert_offer_visible(row, actor)
         return self._offer_with_items(dict(row))
 
-    def add_offer_item(self, *, offer_id: int, seller_id: int, payload: dict[str, Any]) -> dict[str, Any]:
-        offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
-        self._assert_offer_editable(offer)
-        item_payload = self._normalize_offer_item_payload(
-            offer_id=offer_id,
-            thread_id=int(offer["thread_id"]),
+    def get_offer_version(self, *, offer_id: int, actor: Any) -> int:
+        """Version of the offer's thread, checked with the same rules as :meth:`get_offer`."""
+        row = self._session.execute(
+            text(
+                """
+                SELECT so.thread_id, so.seller_id, so.status, t.version
+                FROM seller_offers so
+                JOIN quote_threads t ON t.id = so.thread_id
+                WHERE so.id = :offer_id
+                """
+            ),
+            {"offer_id": int(offer_id)},
+        ).mappings().one_or_none()
+        if row is None:
+            raise NotFoundError("offer not found")
+        self._assert_offer_visible(row, actor)
+        return int(row["version"])
+
+    def add_offer_item(
+        self,
+        *,
+        offer_id: int,
+        seller_id: int,
+        payload: dict[str, Any],
+        expected_version: int | None = None,
+    ) -> dict[str, Any]:
+        claim = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        requested_item_ids, suggestions = self._offer_item_context(
+            thread_id=int(claim["thread_id"]),
+            suggested_part_ids=[payload["suggested_part_id"]] if payload.get("suggested_part_id") is not None else [],
+        )
+        normalized = self._normalize_offer_item_payload(
             payload=payload,
+            requested_item_ids=requested_item_ids,
+            suggestions=suggestions,
         )
-        row = self._session.execute(
+        [row] = self._insert_offer_items(offer_id=offer_id, rows=[normalized])
+        self._offer_items_changed(claim)
+        self._session.commit()
+        return {**self._serialize_offer_item(row), "offer_version": int(claim["version"])}
+
+    def update_offer_item(
+        self,
+        *,
+        offer_id: int,
+        item_id: int,
+        seller_id: int,
+        payload: dict[str, Any],
+        expected_version: int | None = None,
+    ) -> dict[str, Any]:
+        claim = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        current = self._fetch_offer_items_by_id(offer_id=offer_id, item_ids=[item_id])[int(item_id)]
+        merged = self._merge_offer_item_payload(current, payload)
+        requested_item_ids, suggestions = self._offer_item_context(
+            thread_id=int(claim["thread_id"]),
+            suggested_part_ids=[merged["suggested_part_id"]] if merged.get("suggested_part_id") is not None else [],
+        )
+        normalized = self._normalize_offer_item_payload(
+            payload=merged,
+            requested_item_ids=requested_item_ids,
+            suggestions=suggestions,
+        )
+        [row] = self._update_offer_items(offer_id=offer_id, rows=[{"id": int(item_id), **normalized}])
+        self._offer_items_changed(claim)
+        self._session.commit()
+        return {**self._serialize_offer_item(row), "offer_version": int(claim["version"])}
+
+    def delete_offer_item(
+        self,
+        *,
+        offer_id: int,
+        item_id: int,
+        seller_id: int,
+        expected_version: int | None = None,
+    ) -> int:
+        """Remove one item; returns the new offer version."""
+        claim = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        self._delete_offer_items(offer_id=offer_id, item_ids=[item_id])
+        self._offer_items_changed(claim)
+        self._session.commit()
+        return int(claim["version"])
+
+    def apply_offer_item_changes(
+        self,
+        *,
+        offer_id: int,
+        seller_id: int,
+        operations: list[dict[str, Any]],
+        expected_version: int,
+    ) -> dict[str, Any]:
+        """Apply create/update/delete operations in one transaction and one version bump.
+
+        ``expected_version`` is required here: a batch rewrites many lines at
+        once, so it only applies on top of the version the client last saw.
+
+        Operations are validated as a set: the thread's requested items, every
+        referenced suggestion and every updated row are each read with one
+        query, and each kind of write is one statement, so the number of round
+        trips does not grow with the number of lines.
+        """
+        creates: list[dict[str, Any]] = []
+        updates: dict[int, dict[str, Any]] = {}
+        deletes: list[int] = []
+        touched: set[int] = set()
+        for operation in operations:
+            op = operation.get("op")
+            payload = {key: value for key, value in operation.items() if key not in {"op", "item_id"}}
+            if op == "create":
+                creates.append(payload)
+                continue
+            if op not in {"update", "delete"}:
+                raise ValidationError("op must be create, update or delete")
+            item_id = int(operation["item_id"])
+            if item_id in touched:
+                raise ValidationError("each item_id may appear in only one operation")
+            touched.add(item_id)
+            if op == "update":
+                updates[item_id] = payload
+            else:
+                deletes.append(item_id)
+
+        claim = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        current = self._fetch_offer_items_by_id(offer_id=offer_id, item_ids=list(updates))
+        merged_updates = {
+            item_id: self._merge_offer_item_payload(current[item_id], payload) for item_id, payload in updates.items()
+        }
+        requested_item_ids, suggestions = self._offer_item_context(
+            thread_id=int(claim["thread_id"]),
+            suggested_part_ids=[
+                payload["suggested_part_id"]
+                for payload in [*creates, *merged_updates.values()]
+                if payload.get("suggested_part_id") is not None
+            ],
+        )
+
+        def normalize(payload: dict[str, Any]) -> dict[str, Any]:
+            return self._normalize_offer_item_payload(
+                payload=payload,
+                requested_item_ids=requested_item_ids,
+                suggestions=suggestions,
+            )
+
+        new_rows = [normalize(payload) for payload in creates]
+        updated_rows = [{"id": item_id, **normalize(payload)} for item_id, payload in merged_updates.items()]
+
+        self._delete_offer_items(offer_id=offer_id, item_ids=deletes)
+        self._update_offer_items(offer_id=offer_id, rows=updated_rows)
+        self._insert_offer_items(offer_id=offer_id, rows=new_rows)
+        self._offer_items_changed(claim)
+        self._session.commit()
+        return self.get_offer(offer_id=offer_id, actor=self._actor_proxy("seller", seller_id, None))
+
+    def _offer_item_context(
+        self,
+        *,
+        thread_id: int,
+        suggested_part_ids: list[int],
+    ) -> tuple[set[int], dict[int, dict[str, Any]]]:
+        """Requested item ids of the thread and the referenced suggestions, one query each."""
+        requested_item_ids = {
+            int(row[0])
+            for row in self._session.execute(
+                text(
+                    """
+                    SELECT ri.id
+                    FROM requested_items ri
+                    JOIN part_requests pr ON pr.id = ri.request_id
+                    WHERE pr.thread_id = :thread_id
+                    """
+                ),
+                {"thread_id": int(thread_id)},
+            ).all()
+        }
+        suggestions: dict[int, dict[str, Any]] = {}
+        ids = sorted({int(suggested_part_id) for suggested_part_id in suggested_part_ids})
+        if ids:
+            rows = self._session.execute(
+                text(
+                    """
+                    SELECT id, requested_item_id, title, brand, part_number
+                    FROM suggested_parts
+                    WHERE thread_id = :thread_id
+                      AND id = ANY(CAST(:ids AS bigint[]))
+                    """
+                ),
+                {"thread_id": int(thread_id), "ids": ids},
+            ).mappings().all()
+            suggestions = {int(row["id"]): dict(row) for row in rows}
+        return requested_item_ids, suggestions
+
+    def _fetch_offer_items_by_id(self, *, offer_id: int, item_ids: list[int]) -> dict[int, dict[str, Any]]:
+        if not item_ids:
+            return {}
+        rows = self._session.execute(
+            text(
+                """
+                SELECT *
+                FROM seller_offer_items
+                WHERE offer_id = :offer_id
+                  AND id = ANY(CAST(:item_ids AS bigint[]))
+                """
+            ),
+            {"offer_id": int(offer_id), "item_ids": [int(item_id) for item_id in item_ids]},
+        ).mappings().all()
+        found = {int(row["id"]): dict(row) for row in rows}
+        if len(found) != len(set(item_ids)):
+            raise NotFoundError("offer item not found")
+        return found
+
+    def _insert_offer_items(self, *, offer_id: int, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not rows:
+            return []
+        inserted = self._session.execute(
             text(
                 """
                 INSERT INTO seller_offer_items (
@@ -644,108 +987,125 @@ class BrowserThreadRepoSqlAlchemy:
                     metadata_json,
                     is_final_choice
                 )
-                VALUES (
+                SELECT
                     :offer_id,
-                    :requested_item_id,
-                    :source_type,
-                    :suggested_part_id,
-                    :title,
-                    :brand,
-                    :part_number,
-                    :quantity,
-                    :unit_price,
-                    :compatibility_note,
-                    CAST(:metadata_json AS jsonb),
-                    :is_final_choice
+                    r.requested_item_id,
+                    r.source_type,
+                    r.suggested_part_id,
+                    r.title,
+                    r.brand,
+                    r.part_number,
+                    r.quantity,
+                    r.unit_price,
+                    r.compatibility_note,
+                    COALESCE(r.metadata_json, '{}'::jsonb),
+                    r.is_final_choice
+                FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(
+                    requested_item_id bigint,
+                    source_type text,
+                    suggested_part_id bigint,
+                    title text,
+                    brand text,
+                    part_number text,
+                    quantity integer,
+                    unit_price numeric,
+                    compatibility_note text,
+                    metadata_json jsonb,
+                    is_final_choice boolean
                 )
                 RETURNING *
                 """
             ),
-            item_payload,
-        ).mappings().one()
-        self._touch_offer(offer_id)
-        self._session.commit()
-        return self._serialize_offer_item(dict(row))
-
-    def update_offer_item(
-        self,
-        *,
-        offer_id: int,
-        item_id: int,
-        seller_id: int,
-        payload: dict[str, Any],
-    ) -> dict[str, Any]:
-        offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
-        self._assert_offer_editable(offer)
-        current = self._get_offer_item_row(offer_id=offer_id, item_id=item_id)
-
-        merged_payload = {
-            "requested_item_id": payload.get("requested_item_id", current.get("requested_item_id")),
-            "source_type": current["source_type"],
-            "suggested_part_id": current.get("suggested_part_id"),
-            "description": payload.get("description", current["title"]),
-            "brand": payload.get("brand", current.get("brand")),
-            "part_number": payload.get("part_number", current.get("part_number")),
-            "quantity": payload.get("quantity", current["quantity"]),
-            "unit_price": payload.get("unit_price", current.get("unit_price")),
-            "notes": payload.get("notes", current.get("compatibility_note")),
-            "metadata_json": payload.get("metadata_json", current.get("metadata_json") or {}),
-            "is_final_choice": payload.get("is_final_choice", current.get("is_final_choice", False)),
-        }
-        normalized = self._normalize_offer_item_payload(
-            offer_id=offer_id,
-            thread_id=int(offer["thread_id"]),
-            payload=merged_payload,
-        )
+            {"offer_id": int(offer_id), "rows": json.dumps(rows, default=_comparison_json_default)},
+        ).mappings().all()
+        return sorted((dict(row) for row in inserted), key=lambda row: int(row["id"]))
 
-        row = self._session.execute(
+    def _update_offer_items(self, *, offer_id: int, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not rows:
+            return []
+        updated = self._session.execute(
             text(
                 """
-                UPDATE seller_offer_items
-                SET requested_item_id = :requested_item_id,
-                    title = :title,
-                    brand = :brand,
-                    part_number = :part_number,
-                    quantity = :quantity,
-                    unit_price = :unit_price,
-                    compatibility_note = :compatibility_note,
-                    metadata_json = CAST(:metadata_json AS jsonb),
-                    is_final_choice = :is_final_choice,
+                UPDATE seller_offer_items AS i
+                SET requested_item_id = r.requested_item_id,
+                    source_type = r.source_type,
+                    suggested_part_id = r.suggested_part_id,
+                    title = r.title,
+                    brand = r.brand,
+                    part_number = r.part_number,
+                    quantity = r.quantity,
+                    unit_price = r.unit_price,
+                    compatibility_note = r.compatibility_note,
+                    metadata_json = COALESCE(r.metadata_json, '{}'::jsonb),
+                    is_final_choice = r.is_final_choice,
                     updated_at = now()
-                WHERE id = :item_id
-                  AND offer_id = :offer_id
-                RETURNING *
+                FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(
+                    id bigint,
+                    requested_item_id bigint,
+                    source_type text,
+                    suggested_part_id bigint,
+                    title text,
+                    brand text,
+                    part_number text,
+                    quantity integer,
+                    unit_price numeric,
+                    compatibility_note text,
+                    metadata_json jsonb,
+                    is_final_choice boolean
+                )
+                WHERE i.id = r.id
+                  AND i.offer_id = :offer_id
+                RETURNING i.*
                 """
             ),
-            {
-                "item_id": int(item_id),
-                "offer_id": int(offer_id),
-                **normalized,
-            },
-        ).mappings().one_or_none()
-        if row is None:
+            {"offer_id": int(offer_id), "rows": json.dumps(rows, default=_comparison_json_default)},
+        ).mappings().all()
+        if len(updated) != len(rows):
             raise NotFoundError("offer item not found")
-        self._touch_offer(offer_id)
-        self._session.commit()
-        return self._serialize_offer_item(dict(row))
+        return [dict(row) for row in updated]
 
-    def delete_offer_item(self, *, offer_id: int, item_id: int, seller_id: int) -> None:
-        offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
-        self._assert_offer_editable(offer)
-        result = self._session.execute(
+    def _delete_offer_items(self, *, offer_id: int, item_ids: list[int]) -> None:
+        if not item_ids:
+            return
+        deleted = self._session.execute(
             text(
                 """
                 DELETE FROM seller_offer_items
-                WHERE id = :item_id
-                  AND offer_id = :offer_id
+                WHERE offer_id = :offer_id
+                  AND id = ANY(CAST(:item_ids AS bigint[]))
+                RETURNING id
                 """
             ),
-            {"item_id": int(item_id), "offer_id": int(offer_id)},
-        )
-        if result.rowcount == 0:
+            {"offer_id": int(offer_id), "item_ids": [int(item_id) for item_id in item_ids]},
+        ).all()
+        if len(deleted) != len(set(item_ids)):
             raise NotFoundError("offer item not found")
-        self._touch_offer(offer_id)
-        self._session.commit()
+
+    @staticmethod
+    def _merge_offer_item_payload(current: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any]:
+        source_type = payload.get("source_type") or current["source_type"]
+        if "suggested_part_id" in payload:
+            suggested_part_id = payload["suggested_part_id"]
+        elif source_type == "manual" and source_type != current["source_type"]:
+            suggested_part_id = None
+        else:
+            suggested_part_id = current.get("suggested_part_id")
+        # Pointing the item at another suggestion takes that suggestion's title,
+        # brand and part number unless the operation sets them as well.
+        refill = source_type == "suggested" and suggested_part_id != current.get("suggested_part_id")
+        return {
+            "requested_item_id": payload.get("requested_item_id", current.get("requested_item_id")),
+            "source_type": source_type,
+            "suggested_part_id": suggested_part_id,
+            "description": payload.get("description", None if refill else current["title"]),
+            "brand": payload.get("brand", None if refill else current.get("brand")),
+            "part_number": payload.get("part_number", None if refill else current.get("part_number")),
+            "quantity": payload.get("quantity", current["quantity"]),
+            "unit_price": payload.get("unit_price", current.get("unit_price")),
+            "notes": payload.get("notes", current.get("compatibility_note")),
+            "metadata_json": payload.get("metadata_json", current.get("metadata_json") or {}),
+            "is_final_choice": payload.get("is_final_choice", current.get("is_final_choice", False)),
+        }
 
     def submit_offer(
         self,
@@ -761,61 +1121,21 @@ class BrowserThreadRepoSqlAlchemy:
                 payload=payload,
             )
 
-        offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
-        self._assert_offer_editable(offer)
-
-        items = self._fetch_offer_item_rows(offer_id=offer_id)
+        version, items, requested_items = self._read_offer_for_submission(offer_id=offer_id, seller_id=seller_id)
         self._validate_offer_items_for_submission(items)
-        groups, _ = self._build_offer_groups(thread_id=int(offer["thread_id"]), item_rows=items)
-        summary_text = self._build_offer_summary("SUBMITTED_OPTIONS", groups)
-
-        row = self._session.execute(
-            text(
-                """
-                UPDATE seller_offers
-                SET status = 'SUBMITTED_OPTIONS',
-                    total_amount = NULL,
-                    finalized_at = NULL,
-                    submitted_at = now(),
-                    updated_at = now()
-                WHERE id = :offer_id
-                RETURNING *
-                """
-            ),
-            {"offer_id": int(offer_id)},
-        ).mappings().one()
-
-        notice_row = self._insert_offer_notice(
-            thread_id=int(offer["thread_id"]),
-            seller_id=seller_id,
+        result = self._transition_offer(
             offer_id=offer_id,
-            body=summary_text,
-            metadata_json={
-                "offer_id": int(offer_id),
-                "seller_id": int(seller_id),
-                "status": "SUBMITTED_OPTIONS",
-            },
-        )
-
-        self._session.execute(
-            text(
-                """
-                UPDATE quote_threads
-                SET status = 'offer_received',
-                    updated_at = now(),
-                    last_message_at = :last_message_at
-                WHERE id = :thread_id
-                """
-            ),
-            {"thread_id": int(offer["thread_id"]), "last_message_at": notice_row["created_at"]},
-        )
-        self._session.commit()
-        return self._build_submit_response(
-            offer_id=int(row["id"]),
             seller_id=seller_id,
-            seller_shop_id=int(offer["seller_shop_id"]),
+            version=version,
+            items=items,
+            requested_items=requested_items,
+            status="SUBMITTED_OPTIONS",
             thread_status="offer_received",
         )
+        result["offer_id"] = int(result["id"])
+        result["thread_status"] = "offer_received"
+        result["service_order_id"] = None
+        return result
 
     def _submit_final_proposal(
         self,
@@ -824,91 +1144,35 @@ class BrowserThreadRepoSqlAlchemy:
         seller_id: int,
         payload: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
-        offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
-        self._assert_offer_editable(offer)
-
-        items = self._fetch_offer_item_rows(offer_id=offer_id)
+        version, items, requested_items = self._read_offer_for_submission(offer_id=offer_id, seller_id=seller_id)
         self._validate_offer_items_for_submission(items)
         selected_ids = self._resolve_proposal_item_ids(
             items=items,
             explicit_ids=(payload or {}).get("selected_option_ids"),
         )
+        final_total = self._selected_total(items, selected_ids)
+        service_order_id = self._service_order_public_id(int(offer_id))
 
-        self._session.execute(
-            text(
-                """
-                UPDATE seller_offer_items
-                SET is_final_choice = (id = ANY(CAST(:selected_ids AS bigint[]))),
-                    updated_at = now()
-                WHERE offer_id = :offer_id
-                """
-            ),
-            {"offer_id": int(offer_id), "selected_ids": selected_ids},
-        )
-
-        selected_rows = [item for item in items if int(item["id"]) in selected_ids]
-        final_total = round(
-            sum(int(item["quantity"]) * float(item["unit_price"]) for item in selected_rows),
-            2,
-        )
-        groups, _ = self._build_offer_groups(
-            thread_id=int(offer["thread_id"]),
-            item_rows=self._fetch_offer_item_rows(offer_id=offer_id),
-        )
-        summary_text = self._build_offer_summary("proposal_sent", groups)
-
-        row = self._session.execute(
-            text(
-                """
-                UPDATE seller_offers
-                SET status = 'proposal_sent',
-                    total_amount = :final_total,
-                    submitted_at = now(),
-                    finalized_at = now(),
-                    updated_at = now()
-                WHERE id = :offer_id
-                RETURNING *
-                """
-            ),
-            {"offer_id": int(offer_id), "final_total": final_total},
-        ).mappings().one()
-        service_order_id = self._service_order_public_id(int(row["id"]))
-
-        notice_row = self._insert_offer_notice(
-            thread_id=int(offer["thread_id"]),
-            seller_id=seller_id,
+        result = self._transition_offer(
             offer_id=offer_id,
-            body=summary_text,
+            seller_id=seller_id,
+            version=version,
+            items=items,
+            requested_items=requested_items,
+            status="proposal_sent",
+            thread_status="closed",
+            selected_ids=selected_ids,
+            total_amount=final_total,
             metadata_json={
-                "offer_id": int(offer_id),
-                "seller_id": int(seller_id),
-                "status": "proposal_sent",
                 "total_amount": final_total,
                 "service_order_id": service_order_id,
                 "selected_option_ids": selected_ids,
             },
         )
-
-        self._session.execute(
-            text(
-                """
-                UPDATE quote_threads
-                SET status = 'closed',
-                    updated_at = now(),
-                    last_message_at = :last_message_at
-                WHERE id = :thread_id
-                """
-            ),
-            {"thread_id": int(offer["thread_id"]), "last_message_at": notice_row["created_at"]},
-        )
-        self._session.commit()
-        return self._build_submit_response(
-            offer_id=int(row["id"]),
-            seller_id=seller_id,
-            seller_shop_id=int(offer["seller_shop_id"]),
-            thread_status="closed",
-            service_order_id=service_order_id,
-        )
+        result["offer_id"] = int(result["id"])
+        result["thread_status"] = "closed"
+        result["service_order_id"] = service_order_id
+        return result
 
     def finalize_offer(
         self,
@@ -917,86 +1181,245 @@ class BrowserThreadRepoSqlAlchemy:
         seller_id: int,
         payload: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
-        offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
-        self._assert_offer_editable(offer)
-
-        items = self._fetch_offer_item_rows(offer_id=offer_id)
+        version, items, requested_items = self._read_offer_for_submission(offer_id=offer_id, seller_id=seller_id)
         self._validate_offer_items_for_submission(items)
         selected_ids = self._resolve_final_choice_ids(
-            offer_id=offer_id,
             items=items,
+            requested_items=requested_items,
             explicit_ids=(payload or {}).get("selected_option_ids"),
         )
+        final_total = self._selected_total(items, selected_ids)
 
-        self._session.execute(
+        return self._transition_offer(
+            offer_id=offer_id,
+            seller_id=seller_id,
+            version=version,
+            items=items,
+            requested_items=requested_items,
+            status="FINALIZED_QUOTE",
+            thread_status="offer_received",
+            selected_ids=selected_ids,
+            total_amount=final_total,
+            keep_submitted_at=True,
+            metadata_json={
+                "final_total": final_total,
+                "selected_option_ids": selected_ids,
+            },
+        )
+
+    def _read_offer_for_submission(
+        self,
+        *,
+        offer_id: int,
+        seller_id: int,
+    ) -> tuple[int, list[dict[str, Any]], list[dict[str, Any]]]:
+        """Read the offer version, its items and the requested items the summary needs.
+
+        Nothing is locked: :meth:`_transition_offer` re-checks ownership and
+        status and compares the version read here, so an edit that lands in
+        between turns into a conflict instead of a stale summary.
+        """
+        rows = self._session.execute(
             text(
                 """
-                UPDATE seller_offer_items
-                SET is_final_choice = (id = ANY(CAST(:selected_ids AS bigint[]))),
-                    updated_at = now()
-                WHERE offer_id = :offer_id
+                SELECT ri.*, so.version AS offer_version
+                FROM seller_offers so
+                JOIN part_requests pr ON pr.thread_id = so.thread_id
+                JOIN requested_items ri ON ri.request_id = pr.id
+                WHERE so.id = :offer_id
+                  AND so.seller_id = :seller_id
+                  AND so.status IN ('DRAFT', 'SUBMITTED_OPTIONS')
+                ORDER BY ri.id ASC
                 """
             ),
-            {"offer_id": int(offer_id), "selected_ids": selected_ids},
-        )
+            {"offer_id": int(offer_id), "seller_id": int(seller_id)},
+        ).mappings().all()
+        if not rows:
+            offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
+            self._assert_offer_editable(offer)
+            raise NotFoundError("request not found")
+        requested_items = [dict(row) for row in rows]
+        version = int(requested_items[0]["offer_version"])
+        for requested_item in requested_items:
+            requested_item.pop("offer_version")
+        items = self._fetch_offer_item_rows(offer_id=offer_id)
+        return version, items, requested_items
 
-        selected_rows = [item for item in items if int(item["id"]) in selected_ids]
-        final_total = round(
-            sum(int(item["quantity"]) * float(item["unit_price"]) for item in selected_rows),
-            2,
-        )
-        groups, _ = self._build_offer_groups(thread_id=int(offer["thread_id"]), item_rows=self._fetch_offer_item_rows(offer_id=offer_id))
-        summary_text = self._build_offer_summary("FINALIZED_QUOTE", groups)
+    def _transition_offer(
+        self,
+        *,
+        offer_id: int,
+        seller_id: int,
+        version: int,
+        items: list[dict[str, Any]],
+        requested_items: list[dict[str, Any]],
+        status: str,
+        thread_status: str,
+        selected_ids: list[int] | None = None,
+        total_amount: float | None = None,
+        keep_submitted_at: bool = False,
+        metadata_json: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Move the offer to ``status``, post its notice and bump the thread in one statement.
+
+        The UPDATE only matches the seller's own editable offer still at
+        ``version``; the response is assembled from the rows read by
+        :meth:`_read_offer_for_submission`, so nothing is re-read after the write.
+        """
+        if selected_ids is not None:
+            chosen = set(selected_ids)
+            items = [{**item, "is_final_choice": int(item["id"]) in chosen} for item in items]
+        groups, flat_items = self._group_offer_items(requested_items, items)
+        summary_text = self._build_offer_summary(status, groups)
 
         row = self._session.execute(
             text(
                 """
-                UPDATE seller_offers
-                SET status = 'FINALIZED_QUOTE',
-                    total_amount = :final_total,
-                    submitted_at = COALESCE(submitted_at, now()),
-                    finalized_at = now(),
-                    updated_at = now()
-                WHERE id = :offer_id
-                RETURNING *
+                WITH offer AS (
+                    UPDATE seller_offers
+                    SET status = :status,
+                        total_amount = CAST(:total_amount AS numeric),
+                        submitted_at = CASE WHEN :keep_submitted_at THEN COALESCE(submitted_at, now()) ELSE now() END,
+                        finalized_at = CASE WHEN CAST(:total_amount AS numeric) IS NULL THEN NULL ELSE now() END,
+                        updated_at = now(),
+                        version = version + 1
+                    WHERE id = :offer_id
+                      AND seller_id = :seller_id
+                      AND status IN ('DRAFT', 'SUBMITTED_OPTIONS')
+                      AND version = :version
+                    RETURNING
+                        id,
+                        thread_id,
+                        seller_id,
+                        seller_shop_id,
+                        status,
+                        notes,
+                        total_amount,
+                        created_at,
+                        updated_at,
+                        submitted_at,
+                        finalized_at,
+                        version
+                ),
+                choices AS (
+                    UPDATE seller_offer_items
+                    SET is_final_choice = (id = ANY(CAST(:selected_ids AS bigint[]))),
+                        updated_at = now()
+                    WHERE offer_id IN (SELECT id FROM offer)
+                      AND CAST(:selected_ids AS bigint[]) IS NOT NULL
+                    RETURNING id
+                ),
+                notice AS (
+                    INSERT INTO thread_messages (thread_id, sender_role, sender_user_ref, type, body, metadata_json)
+                    SELECT thread_id, 'system', :sender_user_ref, 'offer_notice', :body, CAST(:metadata_json AS jsonb)
+                    FROM offer
+                    RETURNING thread_id, created_at
+                ),
+                thread AS (
+                    UPDATE quote_threads t
+                    SET status = :thread_status,
+                        updated_at = now(),
+                        last_message_at = notice.created_at,
+                        version = t.version + 1
+                    FROM notice
+                    WHERE t.id = notice.thread_id
+                    RETURNING t.id
+                ),
+                notified AS (
+                    -- Every submit/finalize path posts a notice, so the change feed wakes up for offers too.
+                    SELECT pg_notify(:channel, CAST(id AS text))
+                    FROM thread
+                )
+                SELECT offer.*, v.name AS seller_name, ap.name AS seller_shop_name
+                FROM offer
+                JOIN vendors v ON v.id = offer.seller_id
+                JOIN autoparts ap ON ap.id = offer.seller_shop_id
+                CROSS JOIN (SELECT count(*) FROM notified) AS notifications
                 """
             ),
-            {"offer_id": int(offer_id), "final_total": final_total},
-        ).mappings().one()
-
-        notice_row = self._insert_offer_notice(
-            thread_id=int(offer["thread_id"]),
-            seller_id=seller_id,
-            offer_id=offer_id,
-            body=summary_text,
-            metadata_json={
+            {
                 "offer_id": int(offer_id),
                 "seller_id": int(seller_id),
-                "status": "FINALIZED_QUOTE",
-                "final_total": final_total,
-                "selected_option_ids": selected_ids,
+                "version": int(version),
+                "status": status,
+                "thread_status": thread_status,
+                "total_amount": total_amount,
+                "keep_submitted_at": keep_submitted_at,
+                "selected_ids": selected_ids,
+                "sender_user_ref": f"seller:{seller_id}",
+                "body": summary_text,
+                "metadata_json": json.dumps(
+                    {"offer_id": offer_id, "seller_id": seller_id, "status": status, **(metadata_json or {})}
+                ),
+                "channel": THREAD_EVENTS_CHANNEL,
             },
-        )
+        ).mappings().one_or_none()
+        if row is None:
+            offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
+            self._assert_offer_editable(offer)
+            raise ConflictError(
+                f"offer was changed by another request (expected version {version}, current {offer['version']})"
+            )
 
-        self._session.execute(
-            text(
-                """
-                UPDATE quote_threads
-                SET status = 'offer_received',
-                    updated_at = now(),
-                    last_message_at = :last_message_at
-                WHERE id = :thread_id
-                """
-            ),
-            {"thread_id": int(offer["thread_id"]), "last_message_at": notice_row["created_at"]},
+        if selected_ids is not None:
+            for item in flat_items:
+                item["updated_at"] = row["updated_at"]
+        payload = self._decorate_offer(
+            dict(row),
+            groups=groups,
+            flat_items=flat_items,
         )
+        self._sync_comparison_offer(thread_id=int(row["thread_id"]), offer_id=offer_id, offer=payload)
         self._session.commit()
-        return self.get_offer(offer_id=int(row["id"]), actor=self._actor_proxy("seller", seller_id, int(offer["seller_shop_id"])))
+        return payload
+
+    @staticmethod
+    def _selected_total(items: list[dict[str, Any]], selected_ids: list[int]) -> float:
+        chosen = set(selected_ids)
+        return round(
+            sum(int(item["quantity"]) * float(item["unit_price"]) for item in items if int(item["id"]) in chosen),
+            2,
+        )
+
+    def list_service_orders(
+        self,
+        *,
+        mechanic_id: int,
+        limit: int = 50,
+        before: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """One page of service orders, newest first, and the cursor of the next page.
+
+        ``before`` is the id of the last service order on the previous page
+        (keyset pagination); the returned cursor is None on the last page.
+        Item counts and totals are aggregated in the same query, so a page
+        costs one round trip whatever its size.
+        """
+        where = [
+            "t.mechanic_id = :mechanic_id",
+            """(
+                    so.status = 'proposal_sent'
+                    OR (so.status = 'SUBMITTED_OPTIONS' AND t.status = 'closed')
+                  )""",
+        ]
+        # One extra row tells whether another page follows.
+        params: dict[str, Any] = {"mechanic_id": int(mechanic_id), "limit": int(limit) + 1}
+        if before is not None:
+            # NULL submitted_at sorts last, like ORDER BY submitted_at DESC NULLS LAST.
+            where.append(
+                """(COALESCE(so.submitted_at, '-infinity'), so.id) < (
+                    SELECT COALESCE(prev.submitted_at, '-infinity'), prev.id
+                    FROM seller_offers prev
+                    JOIN quote_threads prev_thread ON prev_thread.id = prev.thread_id
+                    WHERE prev.id = :before_offer_id
+                      AND prev_thread.mechanic_id = :mechanic_id
+                  )"""
+            )
+            params["before_offer_id"] = self._parse_service_order_id(before)
 
-    def list_service_orders(self, *, mechanic_id: int) -> list[dict[str, Any]]:
         rows = self._session.execute(
             text(
-                """
+                f"""
                 SELECT
                     so.id AS offer_id,
                     so.thread_id,
@@ -1013,24 +1436,58 @@ class BrowserThreadRepoSqlAlchemy:
                     t.vehicle_engine,
                     t.vehicle_version,
                     ap.name AS auto_parts_name,
-                    v.name AS seller_name
+                    v.name AS seller_name,
+                    items.final_count,
+                    items.final_total,
+                    items.all_count,
+                    items.all_total
                 FROM seller_offers so
                 JOIN quote_threads t ON t.id = so.thread_id
                 JOIN part_requests pr ON pr.thread_id = t.id
                 JOIN workshops w ON w.id = t.workshop_id
                 JOIN autoparts ap ON ap.id = so.seller_shop_id
                 JOIN vendors v ON v.id = so.seller_id
-                WHERE t.mechanic_id = :mechanic_id
-                  AND (
-                    so.status = 'proposal_sent'
-                    OR (so.status = 'SUBMITTED_OPTIONS' AND t.status = 'closed')
-                  )
-                ORDER BY so.submitted_at DESC NULLS LAST, so.id DESC
+                CROSS JOIN LATERAL (
+                    SELECT
+                        count(*) FILTER (WHERE soi.is_final_choice) AS final_count,
+                        COALESCE(
+                            sum(soi.quantity * round(COALESCE(soi.unit_price, 0), 2)) FILTER (WHERE soi.is_final_choice),
+                            0
+                        ) AS final_total,
+                        count(*) AS all_count,
+                        COALESCE(sum(soi.quantity * round(COALESCE(soi.unit_price, 0), 2)), 0) AS all_total
+                    FROM seller_offer_items soi
+                    WHERE soi.offer_id = so.id
+                ) items
+                WHERE {' AND '.join(where)}
+                ORDER BY COALESCE(so.submitted_at, '-infinity') DESC, so.id DESC
+                LIMIT :limit
                 """
             ),
-            {"mechanic_id": int(mechanic_id)},
+            params,
         ).mappings().all()
-        return [self._build_service_order_list_item(dict(row)) for row in rows]
+        if not rows and before is not None:
+            # Only an empty page pays for telling an unknown cursor apart from the end of the list.
+            self._assert_service_order_cursor(offer_id=params["before_offer_id"], mechanic_id=mechanic_id)
+        page = [self._build_service_order_list_item(dict(row)) for row in rows[:limit]]
+        next_before = page[-1]["id"] if len(rows) > limit else None
+        return page, next_before
+
+    def _assert_service_order_cursor(self, *, offer_id: int, mechanic_id: int) -> None:
+        row = self._session.execute(
+            text(
+                """
+                SELECT 1
+                FROM seller_offers so
+                JOIN quote_threads t ON t.id = so.thread_id
+                WHERE so.id = :offer_id
+                  AND t.mechanic_id = :mechanic_id
+                """
+            ),
+            {"offer_id": int(offer_id), "mechanic_id": int(mechanic_id)},
+        ).one_or_none()
+        if row is None:
+            raise NotFoundError("service order not found")
 
     def get_service_order(self, *, service_order_id: str, mechanic_id: int) -> dict[str, Any]:
         offer_id = self._parse_service_order_id(service_order_id)
@@ -1106,53 +1563,163 @@ class BrowserThreadRepoSqlAlchemy:
             "total_amount": total_amount,
         }
 
-    def _build_submit_response(
-        self,
-        *,
-        offer_id: int,
-        seller_id: int,
-        seller_shop_id: int,
-        thread_status: str,
-        service_order_id: str | None = None,
-    ) -> dict[str, Any]:
-        payload = self.get_offer(
-            offer_id=offer_id,
-            actor=self._actor_proxy("seller", seller_id, seller_shop_id),
-        )
-        payload["offer_id"] = int(payload["id"])
-        payload["thread_status"] = thread_status
-        payload["service_order_id"] = service_order_id
-        return payload
-
     def get_comparison(self, *, thread_id: int, mechanic_id: int) -> dict[str, Any]:
-        actor = self._actor_proxy("mechanic", mechanic_id, None, mechanic_id=mechanic_id)
+        """Read the materialized comparison; threads without one are built on first read."""
+        row = self._session.execute(
+            text(
+                """
+                SELECT mechanic_id, document
+                FROM thread_comparisons
+                WHERE thread_id = :thread_id
+                """
+            ),
+            {"thread_id": int(thread_id)},
+        ).mappings().one_or_none()
+        if row is None:
+            actor = self._actor_proxy("mechanic", mechanic_id, None, mechanic_id=mechanic_id)
+            self._get_visible_thread(thread_id=thread_id, actor=actor)
+            document = self._rebuild_comparison(thread_id=thread_id)
+            self._session.commit()
+            return document
+        if int(row["mechanic_id"]) != int(mechanic_id):
+            raise UnauthorizedError("thread not available")
+        return dict(row["document"])
+
+    def rebuild_comparisons(self, *, thread_ids: list[int] | None = None, batch_size: int = 100) -> int:
+        """Recompute comparison documents from the offer tables (backfill/repair); returns the count."""
+        if thread_ids is None:
+            thread_ids = [
+                int(row[0])
+                for row in self._session.execute(text("SELECT id FROM quote_threads ORDER BY id")).all()
+            ]
+        for index, thread_id in enumerate(thread_ids, 1):
+            self._rebuild_comparison(thread_id=thread_id)
+            if index % batch_size == 0:
+                self._session.commit()
+        self._session.commit()
+        return len(thread_ids)
+
+    def _rebuild_comparison(self, *, thread_id: int) -> dict[str, Any]:
+        actor = self._actor_proxy("admin", None, None)
         thread = self._get_visible_thread(thread_id=thread_id, actor=actor)
         request = self._get_request_by_thread(thread_id=thread_id)
-        offers = self.list_offers(thread_id=thread_id, actor=actor)
+        # Only mechanic-visible offers are loaded, and their items are grouped
+        # against the request read above: DRAFT fan-out rows cost nothing here.
+        offers = []
+        for row in self._select_offer_rows(thread_id=thread_id, statuses=MECHANIC_VISIBLE_OFFER_STATUSES):
+            item_rows = self._fetch_offer_item_rows(offer_id=int(row["id"]))
+            groups, flat_items = self._group_offer_items(request["requested_items"], item_rows)
+            offer = self._decorate_offer(row, groups=groups, flat_items=flat_items)
+            offers.append(self._comparison_offer_entry(offer))
+        document = self._comparison_document(thread, request, offers=offers)
+        self._save_comparison(thread_id=thread_id, mechanic_id=int(thread["mechanic_id"]), document=document)
+        return document
+
+    def _comparison_document(
+        self,
+        thread: dict[str, Any],
+        request: dict[str, Any],
+        *,
+        offers: list[dict[str, Any]],
+    ) -> dict[str, Any]:
         return {
             "thread_id": int(thread["id"]),
             "vehicle": self._vehicle_from_thread(thread),
             "requested_items": request["requested_items"],
             "request": request,
-            "offers": [
-                {
-                    "offer_id": offer["id"],
-                    "seller_id": offer["seller_id"],
-                    "seller_name": offer["seller_name"],
-                    "seller_shop_id": offer["seller_shop_id"],
-                    "seller_shop_name": offer["seller_shop_name"],
-                    "status": offer["status"],
-                    "summary_text": offer["summary_text"],
-                    "final_total": offer["final_total"],
-                    "total_amount": offer["total_amount"],
-                    "submitted_at": offer["submitted_at"],
-                    "finalized_at": offer.get("finalized_at"),
-                    "groups": offer["groups"],
-                    "items": offer["items"],
-                    "notes": offer["notes"],
-                }
-                for offer in offers
-            ],
+            "offers": sorted(offers, key=_comparison_offer_order),
+        }
+
+    def _sync_comparison_offer(self, *, thread_id: int, offer_id: int, offer: dict[str, Any] | None = None) -> None:
+        """Re-project one offer into its thread's comparison instead of rebuilding every offer.
+
+        Callers that already hold the offer payload pass it as ``offer`` to skip re-reading it.
+        The swap is one UPDATE on the document: the row lock it takes orders
+        concurrent syncs, and each re-reads the offers array it replaces.
+        Threads without a document yet are left to :meth:`get_comparison`,
+        which builds it on first read.
+        """
+        if offer is None:
+            offer = self._get_offer_row(offer_id)
+            if offer["status"] in MECHANIC_VISIBLE_OFFER_STATUSES:
+                offer = self._offer_with_items(offer)
+        entry = None
+        if offer["status"] in MECHANIC_VISIBLE_OFFER_STATUSES:
+            entry = json.dumps(self._comparison_offer_entry(offer), ensure_ascii=False, default=_comparison_json_default)
+        self._session.execute(
+            text(
+                """
+                UPDATE thread_comparisons tc
+                SET document = jsonb_set(
+                        tc.document,
+                        '{offers}',
+                        (
+                            SELECT COALESCE(
+                                jsonb_agg(
+                                    entries.entry
+                                    ORDER BY COALESCE(entries.entry->>'created_at', ''), CAST(entries.entry->>'offer_id' AS bigint)
+                                ),
+                                CAST('[]' AS jsonb)
+                            )
+                            FROM (
+                                SELECT entry
+                                FROM jsonb_array_elements(tc.document->'offers') AS kept(entry)
+                                WHERE CAST(entry->>'offer_id' AS bigint) <> :offer_id
+                                UNION ALL
+                                SELECT CAST(:entry AS jsonb)
+                                WHERE CAST(:entry AS jsonb) IS NOT NULL
+                            ) AS entries
+                        )
+                    ),
+                    updated_at = now()
+                WHERE tc.thread_id = :thread_id
+                  -- Draft edits never reach the comparison: with no entry, only write when the offer is listed.
+                  AND (
+                      CAST(:entry AS jsonb) IS NOT NULL
+                      OR tc.document->'offers' @> jsonb_build_array(jsonb_build_object('offer_id', CAST(:offer_id AS bigint)))
+                  )
+                """
+            ),
+            {"thread_id": int(thread_id), "offer_id": int(offer_id), "entry": entry},
+        )
+
+    def _save_comparison(self, *, thread_id: int, mechanic_id: int, document: dict[str, Any]) -> None:
+        self._session.execute(
+            text(
+                """
+                INSERT INTO thread_comparisons (thread_id, mechanic_id, document, updated_at)
+                VALUES (:thread_id, :mechanic_id, CAST(:document AS jsonb), now())
+                ON CONFLICT (thread_id) DO UPDATE
+                SET mechanic_id = EXCLUDED.mechanic_id,
+                    document = EXCLUDED.document,
+                    updated_at = now()
+                """
+            ),
+            {
+                "thread_id": int(thread_id),
+                "mechanic_id": int(mechanic_id),
+                "document": json.dumps(document, ensure_ascii=False, default=_comparison_json_default),
+            },
+        )
+
+    @staticmethod
+    def _comparison_offer_entry(offer: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "offer_id": offer["id"],
+            "seller_id": offer["seller_id"],
+            "seller_name": offer["seller_name"],
+            "seller_shop_id": offer["seller_shop_id"],
+            "seller_shop_name": offer["seller_shop_name"],
+            "status": offer["status"],
+            "created_at": offer["created_at"],
+            "summary_text": offer["summary_text"],
+            "final_total": offer["final_total"],
+            "total_amount": offer["total_amount"],
+            "submitted_at": offer["submitted_at"],
+            "finalized_at": offer.get("finalized_at"),
+            "groups": offer["groups"],
+            "items": offer["items"],
+            "notes": offer["notes"],
         }
 
     def seller_inbox_list(
@@ -1205,7 +1772,8 @@ class BrowserThreadRepoSqlAlchemy:
                 """
                 UPDATE quote_threads
                 SET status = :status,
-                    updated_at = now()
+                    updated_at = now(),
+                    version = version + 1
                 WHERE id = :thread_id
                 """
             ),
@@ -1331,6 +1899,7 @@ class BrowserThreadRepoSqlAlchemy:
                     so.updated_at,
                     so.submitted_at,
                     so.finalized_at,
+                    so.version,
                     v.name AS seller_name,
                     ap.name AS seller_shop_name
                 FROM seller_offers so
@@ -1348,6 +1917,15 @@ class BrowserThreadRepoSqlAlchemy:
     def _offer_with_items(self, row: dict[str, Any]) -> dict[str, Any]:
         item_rows = self._fetch_offer_item_rows(offer_id=int(row["id"]))
         groups, flat_items = self._build_offer_groups(thread_id=int(row["thread_id"]), item_rows=item_rows)
+        return self._decorate_offer(row, groups=groups, flat_items=flat_items)
+
+    def _decorate_offer(
+        self,
+        row: dict[str, Any],
+        *,
+        groups: list[dict[str, Any]],
+        flat_items: list[dict[str, Any]],
+    ) -> dict[str, Any]:
         final_total = None
         if row["status"] in {"FINALIZED_QUOTE", "proposal_sent"} and row.get("total_amount") is not None:
             final_total = round(float(row["total_amount"]), 2)
@@ -1373,7 +1951,14 @@ class BrowserThreadRepoSqlAlchemy:
         item_rows: list[dict[str, Any]],
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
         request = self._get_request_by_thread(thread_id=thread_id)
-        requested_items = request["requested_items"]
+        return self._group_offer_items(request["requested_items"], item_rows)
+
+    @classmethod
+    def _group_offer_items(
+        cls,
+        requested_items: list[dict[str, Any]],
+        item_rows: list[dict[str, Any]],
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
         requested_item_map = {int(item["id"]): item for item in requested_items}
         options_by_requested_item: dict[int, list[dict[str, Any]]] = {int(item["id"]): [] for item in requested_items}
         flat_items: list[dict[str, Any]] = []
@@ -1385,7 +1970,7 @@ class BrowserThreadRepoSqlAlchemy:
                 requested_item_id = fallback_requested_item_id
             if requested_item_id is None or int(requested_item_id) not in requested_item_map:
                 continue
-            serialized = self._serialize_offer_item({**row, "requested_item_id": int(requested_item_id)})
+            serialized = cls._serialize_offer_item({**row, "requested_item_id": int(requested_item_id)})
             options_by_requested_item[int(requested_item_id)].append(serialized)
             flat_items.append(serialized)
 
@@ -1458,9 +2043,12 @@ class BrowserThreadRepoSqlAlchemy:
         return f"Resposta enviada com {suffix}."
 
     def _build_service_order_list_item(self, row: dict[str, Any]) -> dict[str, Any]:
-        items = self._serialize_service_order_items(offer_id=int(row["offer_id"]))
+        # Same rule as _fetch_service_order_item_rows: final choices only, when the offer has any.
+        has_final_choice = int(row["final_count"]) > 0
+        item_count = int(row["final_count"] if has_final_choice else row["all_count"])
+        line_total = row["final_total"] if has_final_choice else row["all_total"]
         total_amount = round(float(row["total_amount"]), 2) if row.get("total_amount") is not None else round(
-            sum(item["line_total"] for item in items),
+            float(line_total),
             2,
         )
         return {
@@ -1472,7 +2060,7 @@ class BrowserThreadRepoSqlAlchemy:
             "workshop_name": row.get("workshop_name"),
             "vehicle_summary": self._vehicle_summary(row),
             "total_amount": total_amount,
-            "item_count": len(items),
+            "item_count": item_count,
             "created_at": row["created_at"],
             "submitted_at": row["submitted_at"],
             "auto_parts_name": row.get("auto_parts_name"),
@@ -1634,35 +2222,18 @@ class BrowserThreadRepoSqlAlchemy:
         if offer["status"] not in EDITABLE_OFFER_STATUSES:
             raise ValidationError("only draft or submitted option offers can be edited")
 
-    def _get_offer_item_row(self, *, offer_id: int, item_id: int) -> dict[str, Any]:
-        row = self._session.execute(
-            text(
-                """
-                SELECT *
-                FROM seller_offer_items
-                WHERE id = :item_id
-                  AND offer_id = :offer_id
-                """
-            ),
-            {"item_id": int(item_id), "offer_id": int(offer_id)},
-        ).mappings().one_or_none()
-        if row is None:
-            raise NotFoundError("offer item not found")
-        return dict(row)
-
+    @staticmethod
     def _normalize_offer_item_payload(
-        self,
         *,
-        offer_id: int,
-        thread_id: int,
         payload: dict[str, Any],
+        requested_item_ids: set[int],
+        suggestions: dict[int, dict[str, Any]],
     ) -> dict[str, Any]:
+        """Validate one item against the thread context loaded by :meth:`_offer_item_context`."""
         source_type = str(payload["source_type"]).strip().lower()
         if source_type not in {"suggested", "manual"}:
             raise ValidationError("source_type must be manual or suggested")
 
-        requested_items = self._get_request_by_thread(thread_id=thread_id)["requested_items"]
-        requested_item_ids = {int(item["id"]) for item in requested_items}
         requested_item_id = payload.get("requested_item_id")
         if requested_item_id is None and len(requested_item_ids) == 1:
             requested_item_id = next(iter(requested_item_ids))
@@ -1684,17 +2255,7 @@ class BrowserThreadRepoSqlAlchemy:
         if source_type == "suggested":
             if suggested_part_id is None:
                 raise ValidationError("suggested_part_id is required for suggested items")
-            suggestion = self._session.execute(
-                text(
-                    """
-                    SELECT id, requested_item_id, title, brand, part_number
-                    FROM suggested_parts
-                    WHERE id = :id
-                      AND thread_id = :thread_id
-                    """
-                ),
-                {"id": int(suggested_part_id), "thread_id": int(thread_id)},
-            ).mappings().one_or_none()
+            suggestion = suggestions.get(int(suggested_part_id))
             if suggestion is None:
                 raise ValidationError("invalid suggested_part_id")
             suggestion_requested_item_id = suggestion.get("requested_item_id")
@@ -1707,7 +2268,6 @@ class BrowserThreadRepoSqlAlchemy:
             raise ValidationError("description is required")
 
         return {
-            "offer_id": int(offer_id),
             "requested_item_id": int(requested_item_id),
             "source_type": source_type,
             "suggested_part_id": int(suggested_part_id) if suggested_part_id is not None else None,
@@ -1717,7 +2277,7 @@ class BrowserThreadRepoSqlAlchemy:
             "quantity": quantity,
             "unit_price": unit_price,
             "compatibility_note": payload.get("notes") or payload.get("compatibility_note"),
-            "metadata_json": json.dumps(payload.get("metadata_json") or {}),
+            "metadata_json": payload.get("metadata_json") or {},
             "is_final_choice": bool(payload.get("is_final_choice", False)),
         }
 
@@ -1732,11 +2292,11 @@ class BrowserThreadRepoSqlAlchemy:
             if item["unit_price"] is None or float(item["unit_price"]) <= 0:
                 raise ValidationError(f"item {item['title']} must have a positive unit price")
 
+    @staticmethod
     def _resolve_final_choice_ids(
-        self,
         *,
-        offer_id: int,
         items: list[dict[str, Any]],
+        requested_items: list[dict[str, Any]],
         explicit_ids: list[int] | None,
     ) -> list[int]:
         item_map = {int(item["id"]): item for item in items}
@@ -1746,7 +2306,6 @@ class BrowserThreadRepoSqlAlchemy:
 
         seen_requested_items: set[int] = set()
         normalized_ids: list[int] = []
-        requested_items = self._get_request_by_thread(thread_id=int(self._get_offer_row(int(offer_id))["thread_id"]))["requested_items"]
         fallback_requested_item_id = int(requested_items[0]["id"]) if len(requested_items) == 1 else None
         for raw_id in selected_ids:
             item = item_map.get(int(raw_id))
@@ -1829,128 +2388,188 @@ class BrowserThreadRepoSqlAlchemy:
             return "proposal_sent"
         return str(row["status"])
 
-    def _insert_offer_notice(
-        self,
-        *,
-        thread_id: int,
-        seller_id: int,
-        offer_id: int,
-        body: str,
-        metadata_json: dict[str, Any],
-    ) -> dict[str, Any]:
-        return dict(
-            self._session.execute(
-                text(
-                    """
-                    INSERT INTO thread_messages (thread_id, sender_role, sender_user_ref, type, body, metadata_json)
-                    VALUES (
-                        :thread_id,
-                        'system',
-                        :sender_user_ref,
-                        'offer_notice',
-                        :body,
-                        CAST(:metadata_json AS jsonb)
-                    )
-                    RETURNING created_at
-                    """
-                ),
-                {
-                    "thread_id": int(thread_id),
-                    "sender_user_ref": f"seller:{seller_id}",
-                    "body": body,
-                    "metadata_json": json.dumps({"offer_id": int(offer_id), **metadata_json}),
-                },
-            ).mappings().one()
+    def _notify_thread_changed(self, thread_id: int) -> None:
+        # Delivered by Postgres only when the surrounding transaction commits.
+        self._session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": THREAD_EVENTS_CHANNEL, "payload": str(int(thread_id))},
         )
 
-    def _touch_offer(self, offer_id: int) -> None:
-        self._session.execute(
+    def _claim_offer(self, *, offer_id: int, seller_id: int, expected_version: int | None) -> dict[str, Any]:
+        """Compare-and-swap the offer version before an item edit.
+
+        Ownership, editability and the caller's ``expected_version`` are checked
+        by the same UPDATE that bumps the version, so an edit costs one
+        statement on ``seller_offers`` instead of a read followed by a write.
+        """
+        row = self._session.execute(
             text(
                 """
                 UPDATE seller_offers
-                SET updated_at = now(),
-                    total_amount = CASE
-                        WHEN status IN ('FINALIZED_QUOTE', 'proposal_sent') THEN total_amount
-                        ELSE NULL
-                    END
+                SET version = version + 1,
+                    updated_at = now(),
+                    total_amount = NULL
                 WHERE id = :offer_id
+                  AND seller_id = :seller_id
+                  AND status IN ('DRAFT', 'SUBMITTED_OPTIONS')
+                  AND (CAST(:expected_version AS bigint) IS NULL OR version = CAST(:expected_version AS bigint))
+                RETURNING id, thread_id, status, version
                 """
             ),
-            {"offer_id": int(offer_id)},
+            {"offer_id": int(offer_id), "seller_id": int(seller_id), "expected_version": expected_version},
+        ).mappings().one_or_none()
+        if row is not None:
+            return dict(row)
+
+        offer = self._assert_offer_owner(offer_id=offer_id, seller_id=seller_id)
+        self._assert_offer_editable(offer)
+        raise ConflictError(
+            f"offer was changed by another request (expected version {expected_version}, current {offer['version']})"
         )
 
-    def _get_visible_thread(self, *, thread_id: int, actor: Any) -> dict[str, Any]:
-        row = self._session.execute(
+    def _offer_items_changed(self, claim: dict[str, Any]) -> None:
+        # Drafts are seen only by their seller, who tracks them through the offer version
+        # (see get_thread_version); the thread version and the comparison move for visible offers.
+        if claim["status"] not in MECHANIC_VISIBLE_OFFER_STATUSES:
+            return
+        thread_id = int(claim["thread_id"])
+        self._bump_thread_version(thread_id)
+        self._sync_comparison_offer(thread_id=thread_id, offer_id=int(claim["id"]))
+
+    def _bump_thread_version(self, thread_id: int) -> None:
+        # Every version bump also wakes the long-poll feed, in the same round trip.
+        self._session.execute(
             text(
                 """
-                SELECT
-                    id,
-                    mechanic_id,
-                    workshop_id,
-                    status,
-                    created_at,
-                    updated_at,
-                    last_message_at,
-                    vehicle_plate,
-                    vehicle_brand,
-                    vehicle_model,
-                    vehicle_year,
-                    vehicle_engine,
-                    vehicle_version,
-                    vehicle_notes
-                FROM quote_threads
-                WHERE id = :thread_id
+                WITH bumped AS (
+                    UPDATE quote_threads SET version = version + 1 WHERE id = :thread_id RETURNING id
+                )
+                SELECT pg_notify(:channel, CAST(id AS text)) FROM bumped
                 """
             ),
-            {"thread_id": int(thread_id)},
-        ).mappings().one_or_none()
-        if row is None:
-            raise NotFoundError("thread not found")
+            {"thread_id": int(thread_id), "channel": THREAD_EVENTS_CHANNEL},
+        )
 
+    def _assert_offer_visible(self, row: Any, actor: Any) -> None:
         actor_role = getattr(actor, "role", None)
-        if actor_role == "mechanic" and int(row["mechanic_id"]) != int(actor.mechanic_id):
-            raise UnauthorizedError("thread not available")
+        if actor_role == "mechanic":
+            self._get_visible_thread(thread_id=int(row["thread_id"]), actor=actor)
+            if row["status"] not in MECHANIC_VISIBLE_OFFER_STATUSES:
+                raise UnauthorizedError("offer not available")
+        elif actor_role == "seller":
+            if int(row["seller_id"]) != int(actor.vendor_id):
+                raise UnauthorizedError("offer not available")
+        elif actor_role != "admin":
+            raise UnauthorizedError("offer not available")
+
+    def _get_visible_thread(
+        self,
+        *,
+        thread_id: int,
+        actor: Any,
+        with_offer_versions: bool = False,
+    ) -> dict[str, Any]:
+        actor_role = getattr(actor, "role", None)
+        params: dict[str, Any] = {"thread_id": int(thread_id)}
+        seller_visible: bool | None = None
         if actor_role == "seller":
-            self._assert_seller_visible(
+            params["seller_id"] = int(actor.vendor_id)
+            params["shop_id"] = int(actor.shop_id)
+            seller_visible = self._visibility_cache.get(
                 thread_id=thread_id,
-                seller_id=int(actor.vendor_id),
-                seller_shop_id=int(actor.shop_id),
+                seller_id=params["seller_id"],
+                shop_id=params["shop_id"],
+            )
+        # Uncached seller checks ride along with the thread read instead of costing a second query.
+        visibility_column = _SELLER_VISIBLE_SQL if actor_role == "seller" and seller_visible is None else "NULL"
+        offer_versions_column = "NULL"
+        if with_offer_versions:
+            seller_filter = "AND so.seller_id = :seller_id" if actor_role == "seller" else ""
+            offer_versions_column = (
+                f"(SELECT sum(so.version) FROM seller_offers so WHERE so.thread_id = t.id {seller_filter})"
             )
-        elif actor_role not in {"mechanic", "seller", "admin"}:
-            raise UnauthorizedError("thread not available")
-        return dict(row)
 
-    def _assert_seller_visible(self, *, thread_id: int, seller_id: int, seller_shop_id: int) -> None:
         row = self._session.execute(
             text(
-                """
-                SELECT 1
+                f"""
+                SELECT
+                    t.id,
+                    t.mechanic_id,
+                    t.workshop_id,
+                    t.status,
+                    t.created_at,
+                    t.updated_at,
+                    t.last_message_at,
+                    t.version,
+                    t.vehicle_plate,
+                    t.vehicle_brand,
+                    t.vehicle_model,
+                    t.vehicle_year,
+                    t.vehicle_engine,
+                    t.vehicle_version,
+                    t.vehicle_notes,
+                    {visibility_column} AS seller_visible,
+                    {offer_versions_column} AS offer_versions
                 FROM quote_threads t
                 WHERE t.id = :thread_id
-                  AND (
-                    EXISTS (
-                        SELECT 1
-                        FROM vendor_assignments va
-                        WHERE va.workshop_id = t.workshop_id
-                          AND va.autopart_id = :shop_id
-                          AND va.vendor_id = :seller_id
-                    )
-                    OR EXISTS (
-                        SELECT 1
-                        FROM seller_offers so
-                        WHERE so.thread_id = t.id
-                          AND so.seller_id = :seller_id
-                    )
-                  )
                 """
             ),
-            {
-                "thread_id": int(thread_id),
-                "shop_id": int(seller_shop_id),
-                "seller_id": int(seller_id),
-            },
-        ).one_or_none()
+            params,
+        ).mappings().one_or_none()
         if row is None:
+            raise NotFoundError("thread not found")
+
+        thread = dict(row)
+        fetched_visibility = thread.pop("seller_visible")
+        offer_versions = thread.pop("offer_versions", None)
+        if with_offer_versions:
+            thread["offer_versions"] = offer_versions
+        if actor_role == "mechanic" and int(thread["mechanic_id"]) != int(actor.mechanic_id):
+            raise UnauthorizedError("thread not available")
+        if actor_role == "seller":
+            if seller_visible is None:
+                seller_visible = bool(fetched_visibility)
+                self._visibility_cache.put(
+                    thread_id=thread_id,
+                    seller_id=params["seller_id"],
+                    shop_id=params["shop_id"],
+                    workshop_id=int(thread["workshop_id"]),
+                    visible=seller_visible,
+                )
+            if not seller_visible:
+                raise UnauthorizedError("thread not available")
+        elif actor_role not in {"mechanic", "admin"}:
+            raise UnauthorizedError("thread not available")
+        return thread
+
+    def _assert_seller_visible(self, *, thread_id: int, seller_id: int, seller_shop_id: int) -> None:
+        visible = self._visibility_cache.get(thread_id=thread_id, seller_id=seller_id, shop_id=seller_shop_id)
+        if visible is None:
+            row = self._session.execute(
+                text(
+                    f"""
+                    SELECT t.workshop_id, {_SELLER_VISIBLE_SQL} AS seller_visible
+                    FROM quote_threads t
+                    WHERE t.id = :thread_id
+                    """
+                ),
+                {
+                    "thread_id": int(thread_id),
+                    "shop_id": int(seller_shop_id),
+                    "seller_id": int(seller_id),
+                },
+            ).mappings().one_or_none()
+            if row is None:
+                raise UnauthorizedError("thread not available")
+            visible = bool(row["seller_visible"])
+            self._visibility_cache.put(
+                thread_id=thread_id,
+                seller_id=seller_id,
+                shop_id=seller_shop_id,
+                workshop_id=int(row["workshop_id"]),
+                visible=visible,
+            )
+        if not visible:
             raise UnauthorizedError("thread not available")
 
     def _assert_mechanic_membership(self, *, mechanic_id: int, workshop_id: int) -> None:
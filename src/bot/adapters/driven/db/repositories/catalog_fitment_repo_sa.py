@@ -0,0 +1,118 @@
+"""SQLAlchemy repository for catalog_fitments."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_COLS = """
+    f.id, f.catalog_id, cd.original_filename, f.brand, f.model, f.engine,
+    f.fuel, f.year_start, f.year_end, f.part_type, f.part_code, f.variant,
+    f.reference, f.gap, f.page
+"""
+
+
+class CatalogFitmentRepoSqlAlchemy:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def replace_for_catalog(self, catalog_id: int, fitments: list[dict[str, Any]]) -> int:
+        """Swap the catalog's fitments for ``fitments`` in one transaction."""
+        self._session.execute(
+            text("DELETE FROM catalog_fitments WHERE catalog_id = :catalog_id"),
+            {"catalog_id": catalog_id},
+        )
+        if fitments:
+            self._session.execute(
+                text("""
+                    INSERT INTO catalog_fitments
+                      (catalog_id, brand, model, model_key, engine, fuel,
+                       year_start, year_end, part_type, part_code, variant,
+                       reference, gap, page)
+                    SELECT :catalog_id, r.brand, r.model, r.model_key, r.engine, r.fuel,
+                           r.year_start, r.year_end, r.part_type, r.part_code, r.variant,
+                           r.reference, r.gap, r.page
+                    FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(
+                        brand text,
+                        model text,
+                        model_key text,
+                        engine text,
+                        fuel text,
+                        year_start integer,
+                        year_end integer,
+                        part_type text,
+                        part_code text,
+                        variant text,
+                        reference text,
+                        gap text,
+                        page integer
+                    )
+                """),
+                {"catalog_id": catalog_id, "rows": json.dumps(fitments)},
+            )
+        self._session.commit()
+        logger.info("Catalog %d: stored %d fitment rows", catalog_id, len(fitments))
+        return len(fitments)
+
+    def find_fitments(
+        self,
+        *,
+        model: str,
+        year: int | None = None,
+        part_types: list[str] | None = None,
+        brand: str | None = None,
+        catalog_id: int | None = None,
+        manufacturer_id: int | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        where = [
+            "cd.is_active = true",
+            "(f.model_key = :model OR f.model_key LIKE :model_prefix)",
+        ]
+        params: dict[str, Any] = {
+            "model": model,
+            "model_prefix": model.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + " %",
+            "limit": limit,
+        }
+
+        if year is not None:
+            where.append("(f.year_start IS NULL OR f.year_start <= :year)")
+            where.append("(f.year_end IS NULL OR f.year_end >= :year)")
+            params["year"] = year
+
+        if part_types:
+            where.append("f.part_type = ANY(CAST(:part_types AS text[]))")
+            params["part_types"] = list(part_types)
+
+        if brand is not None:
+            where.append("upper(f.brand) = upper(:brand)")
+            params["brand"] = brand
+
+        if catalog_id is not None:
+            where.append("f.catalog_id = :catalog_id")
+            params["catalog_id"] = catalog_id
+
+        if manufacturer_id is not None:
+            where.append("cd.manufacturer_id = :manufacturer_id")
+            params["manufacturer_id"] = manufacturer_id
+
+        rows = self._session.execute(
+            text(f"""
+                SELECT {_COLS}
+                FROM catalog_fitments f
+                JOIN catalog_documents cd ON cd.id = f.catalog_id
+                WHERE {" AND ".join(where)}
+                ORDER BY f.model_key, f.engine NULLS FIRST, f.year_start NULLS FIRST,
+                         f.part_type, f.brand, f.id
+                LIMIT :limit
+            """),
+            params,
+        ).mappings().all()
+        return [dict(r) for r in rows]
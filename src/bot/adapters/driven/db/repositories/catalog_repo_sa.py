@@ -15,7 +15,7 @@ logger = get_logger(__name__)
 _COLS = """
     id, manufacturer_id, original_filename, stored_filename,
     file_size_bytes, description, status, page_count, chunk_count,
-    error_message, brand, is_active, created_at, updated_at
+    error_message, brand, is_active, content_sha256, created_at, updated_at
 """
 
 
@@ -30,10 +30,10 @@ class CatalogRepoSqlAlchemy:
             text(f"""
                 INSERT INTO catalog_documents
                   (manufacturer_id, original_filename, stored_filename,
-                   file_size_bytes, description, brand, status)
+                   file_size_bytes, description, brand, content_sha256, status)
                 VALUES
                   (:manufacturer_id, :original_filename, :stored_filename,
-                   :file_size_bytes, :description, :brand, 'pending')
+                   :file_size_bytes, :description, :brand, :content_sha256, 'pending')
                 RETURNING {_COLS}
             """),
             {
@@ -43,6 +43,7 @@ class CatalogRepoSqlAlchemy:
                 "file_size_bytes": payload.get("file_size_bytes"),
                 "description": payload.get("description"),
                 "brand": payload.get("brand"),
+                "content_sha256": payload.get("content_sha256"),
             },
         ).mappings().one()
         self._session.commit()
@@ -59,6 +60,40 @@ class CatalogRepoSqlAlchemy:
             raise CatalogNotFound(f"catalog {catalog_id} not found")
         return dict(row)
 
+    def find_active_by_sha256(self, content_sha256: str) -> dict[str, Any] | None:
+        """Active catalog with identical content that is ingested or still ingesting.
+
+        Failed ingestions are ignored so re-uploading the same file retries it.
+        """
+        row = self._session.execute(
+            text(f"""
+                SELECT {_COLS}
+                FROM catalog_documents
+                WHERE content_sha256 = :content_sha256
+                  AND is_active = true
+                  AND status IN ('ready', 'processing', 'pending')
+                ORDER BY (status = 'ready') DESC, created_at DESC
+                LIMIT 1
+            """),
+            {"content_sha256": content_sha256},
+        ).mappings().one_or_none()
+        return dict(row) if row is not None else None
+
+    def catalog_set_version(self) -> str:
+        """Fingerprint of the catalog set that changes with any status/is_active/brand change.
+
+        Every UPDATE here bumps ``updated_at`` and hard deletes lower the row
+        count, so ``count:max(updated_at)`` is enough to invalidate caches.
+        """
+        row = self._session.execute(
+            text("""
+                SELECT COUNT(*) AS total, MAX(updated_at) AS last_update
+                FROM catalog_documents
+            """)
+        ).mappings().one()
+        last_update = row["last_update"]
+        return f"{row['total']}:{last_update.isoformat() if last_update else '-'}"
+
     def list_catalogs(
         self,
         *,
@@ -32,6 +32,7 @@ class LlmCallLogRepoSqlAlchemy:
                     provider,
                     endpoint,
                     model,
+                    tier,
                     status,
                     vehicle_json,
                     context_json,
@@ -45,6 +46,7 @@ class LlmCallLogRepoSqlAlchemy:
                     :provider,
                     :endpoint,
                     :model,
+                    :tier,
                     COALESCE(:status, 'started'),
                     CAST(:vehicle_json AS jsonb),
                     CAST(:context_json AS jsonb),
@@ -61,6 +63,7 @@ class LlmCallLogRepoSqlAlchemy:
                 "provider": payload["provider"],
                 "endpoint": payload["endpoint"],
                 "model": payload["model"],
+                "tier": payload.get("tier"),
                 "status": payload.get("status", "started"),
                 "vehicle_json": _json_dump(payload.get("vehicle_json")),
                 "context_json": _json_dump(payload.get("context_json")),
@@ -161,6 +164,7 @@ class LlmCallLogRepoSqlAlchemy:
         model: str | None = None,
         requester_id: str | None = None,
         thread_id: str | None = None,
+        tier: str | None = None,
     ) -> list[dict[str, Any]]:
         where = ["1=1"]
         params: dict[str, Any] = {"limit": int(limit), "offset": int(offset)}
@@ -177,6 +181,9 @@ class LlmCallLogRepoSqlAlchemy:
         if thread_id:
             where.append("thread_id = :thread_id")
             params["thread_id"] = thread_id
+        if tier:
+            where.append("tier = :tier")
+            params["tier"] = tier
 
         rows = self._session.execute(
             text(
@@ -189,6 +196,7 @@ class LlmCallLogRepoSqlAlchemy:
                     provider,
                     endpoint,
                     model,
+                    tier,
                     status,
                     http_status,
                     duration_ms,
@@ -219,6 +227,7 @@ class LlmCallLogRepoSqlAlchemy:
                     provider,
                     endpoint,
                     model,
+                    tier,
                     status,
                     http_status,
                     duration_ms,
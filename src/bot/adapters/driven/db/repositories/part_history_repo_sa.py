@@ -0,0 +1,140 @@
+"""SQLAlchemy repository for part candidates seen on past quotation threads."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    MECHANIC_VISIBLE_OFFER_STATUSES,
+)
+
+# Suggestions written by the retrieval stage itself are not evidence.
+_GENERATED_SOURCES = ("catalog_chunks", "part_history")
+
+
+def _normalized(column: str) -> str:
+    """Lowercase, accent-free ``column`` (same result as ``normalize_text`` for pt-BR text)."""
+    return (
+        f"translate(lower(COALESCE({column}, '')), "
+        "'áàâãäéèêëíìîïóòôõöúùûüç', 'aaaaaeeeeiiiiooooouuuuc')"
+    )
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class PartHistoryRepoSqlAlchemy:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def find_history_candidates(
+        self,
+        *,
+        queries: list[dict[str, Any]],
+        limit: int = 10,
+    ) -> list[list[dict[str, Any]]]:
+        results: list[list[dict[str, Any]]] = [[] for _ in queries]
+        rows_param = [
+            {
+                "idx": index,
+                "model": query["model"],
+                "model_prefix": _like_escape(query["model"]) + " %",
+                "patterns": [f"%{_like_escape(keyword)}%" for keyword in query["keywords"]],
+                "year": str(query["year"]) if query.get("year") is not None else None,
+            }
+            for index, query in enumerate(queries)
+            if query.get("model") and query.get("keywords")
+        ]
+        if not rows_param:
+            return results
+
+        vehicle_model = _normalized("pr.vehicle_model")
+        model_match = f"({vehicle_model} = q.model OR {vehicle_model} LIKE q.model_prefix)"
+        item_description = _normalized("ri.description")
+
+        rows = self._session.execute(
+            text(f"""
+                WITH q AS (
+                    SELECT *
+                    FROM jsonb_to_recordset(CAST(:queries AS jsonb)) AS r(
+                        idx integer,
+                        model text,
+                        model_prefix text,
+                        patterns text[],
+                        year text
+                    )
+                ),
+                history AS (
+                    SELECT q.idx, q.year AS wanted_year,
+                           soi.part_number, soi.brand, soi.title,
+                           soi.compatibility_note AS note, soi.unit_price,
+                           1 AS offered,
+                           CASE WHEN soi.is_final_choice THEN 1 ELSE 0 END AS chosen,
+                           0 AS suggested,
+                           pr.vehicle_year
+                    FROM q
+                    JOIN part_requests pr ON {model_match}
+                    JOIN seller_offers so ON so.thread_id = pr.thread_id
+                    JOIN seller_offer_items soi ON soi.offer_id = so.id
+                    LEFT JOIN requested_items ri ON ri.id = soi.requested_item_id
+                    WHERE so.status = ANY(CAST(:statuses AS text[]))
+                      AND ({item_description} LIKE ANY(q.patterns)
+                           OR {_normalized("soi.title")} LIKE ANY(q.patterns))
+                    UNION ALL
+                    SELECT q.idx, q.year,
+                           sp.part_number, sp.brand, sp.title,
+                           sp.note, NULL,
+                           0, 0, 1,
+                           pr.vehicle_year
+                    FROM q
+                    JOIN part_requests pr ON {model_match}
+                    JOIN suggested_parts sp ON sp.request_id = pr.id
+                    LEFT JOIN requested_items ri ON ri.id = sp.requested_item_id
+                    WHERE COALESCE(sp.metadata_json->>'source', '') <> ALL(CAST(:generated AS text[]))
+                      AND ({item_description} LIKE ANY(q.patterns)
+                           OR {_normalized("sp.title")} LIKE ANY(q.patterns))
+                ),
+                ranked AS (
+                    SELECT idx,
+                           MIN(part_number) AS part_number,
+                           mode() WITHIN GROUP (ORDER BY brand) AS brand,
+                           mode() WITHIN GROUP (ORDER BY title) AS title,
+                           mode() WITHIN GROUP (ORDER BY note) AS note,
+                           SUM(offered) AS offered_count,
+                           SUM(chosen) AS chosen_count,
+                           SUM(suggested) AS suggested_count,
+                           COUNT(*) FILTER (WHERE vehicle_year = wanted_year) AS year_matches,
+                           CAST(AVG(unit_price) AS float) AS average_price_brl,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY idx
+                               ORDER BY SUM(chosen) DESC, SUM(offered) DESC,
+                                        COUNT(*) FILTER (WHERE vehicle_year = wanted_year) DESC,
+                                        SUM(suggested) DESC, MIN(part_number)
+                           ) AS position
+                    FROM history
+                    WHERE part_number IS NOT NULL AND btrim(part_number) <> ''
+                    GROUP BY idx, upper(regexp_replace(part_number, '[^A-Za-z0-9]', '', 'g'))
+                )
+                SELECT idx, part_number, brand, title, note,
+                       offered_count, chosen_count, suggested_count,
+                       year_matches, average_price_brl
+                FROM ranked
+                WHERE position <= :limit
+                ORDER BY idx, position
+            """),
+            {
+                "queries": json.dumps(rows_param),
+                "statuses": sorted(MECHANIC_VISIBLE_OFFER_STATUSES),
+                "generated": list(_GENERATED_SOURCES),
+                "limit": limit,
+            },
+        ).mappings().all()
+        for row in rows:
+            candidate = dict(row)
+            results[candidate.pop("idx")].append(candidate)
+        return results
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from src.bot.domain.errors import ValidationError
 from src.bot.adapters.driven.db.repositories.vendor_repo_sa import VendorRepoSqlAlchemy
+from src.bot.adapters.driven.db.seller_visibility import SELLER_VISIBILITY_CACHE
 
 
 @dataclass
@@ -111,6 +112,8 @@ class QuoteWorkflowRepoSqlAlchemy:
             )
 
         self._session.commit()
+        # New vendor assignments for this workshop change which sellers see its threads.
+        SELLER_VISIBILITY_CACHE.invalidate_workshop(workshop_id)
         return conversations
 
     def get_conversation_context(self, conversation_id: str) -> ConversationContext | None:
@@ -1,9 +1,27 @@
-"""SQLAlchemy repository for rag_chunks — insert and cosine-similarity search."""
+"""SQLAlchemy repository for rag_chunks — insert and cosine-similarity search.
+
+Search modes:
+  full     one pass over the full-precision HNSW index (default)
+  halfvec  first pass over the halfvec index, then exact re-rank
+  binary   first pass over the binary-quantized index (Hamming), then exact re-rank
+
+The quantized modes read the expression indexes from migration 035.
+
+Each search sets ``hnsw.ef_search`` and pgvector's iterative scan for the
+transaction from the share of chunks the filters keep, so filtered queries
+still fill ``top_k``; see :class:`HnswSearchTuning`. ``set_config(..., true)``
+lasts until the transaction ends, so every managed GUC is set on every
+search, defaults included, and a search never inherits an earlier one's
+values. The iterative scan GUCs only exist from pgvector 0.8; on older
+servers they are skipped (the version is read once per process).
+"""
 
 from __future__ import annotations
 
 import json
-from typing import Any
+import math
+from dataclasses import dataclass
+from typing import Any, ClassVar
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
@@ -12,10 +30,82 @@ from src.bot.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+VECTOR_SEARCH_MODES = ("full", "halfvec", "binary")
+
+# Must stay identical to the index expressions in migration 035.
+_FIRST_PASS_DISTANCE = {
+    "halfvec": (
+        "CAST(rc.embedding AS halfvec(1536))"
+        " <=> CAST((SELECT vec FROM search_vector) AS halfvec(1536))"
+    ),
+    "binary": (
+        "CAST(binary_quantize(rc.embedding) AS bit(1536))"
+        " <~> binary_quantize((SELECT vec FROM search_vector))"
+    ),
+}
+
+# pgvector's default hnsw.ef_search and the largest value it accepts.
+_DEFAULT_EF_SEARCH = 40
+_MAX_EF_SEARCH = 1000
+
+ITERATIVE_SCAN_MODES = ("off", "relaxed_order", "strict_order")
+_ITERATIVE_SCAN_MIN_VERSION = (0, 8)
+_ITERATIVE_SCAN_SETTINGS = ("hnsw.iterative_scan", "hnsw.max_scan_tuples")
+
+
+@dataclass(frozen=True, slots=True)
+class HnswSearchTuning:
+    """How wide each HNSW scan is.
+
+    An HNSW scan yields at most ``ef_search`` rows *before* the WHERE filters
+    run, so a filter that keeps 10% of the chunks needs roughly ten times the
+    candidates to still return ``top_k`` rows. ``ef_search`` is scaled by the
+    filter selectivity between the floor and ``ef_search_max``; filtered
+    searches also enable pgvector's iterative scan (0.8+), which keeps
+    walking the graph, up to ``max_scan_tuples``, until enough rows pass.
+    """
+
+    ef_search: int = _DEFAULT_EF_SEARCH
+    ef_search_max: int = 400
+    iterative_scan: str = "relaxed_order"
+    max_scan_tuples: int = 20000
+
+    def __post_init__(self) -> None:
+        if self.iterative_scan not in ITERATIVE_SCAN_MODES:
+            raise ValueError(f"unknown iterative scan mode: {self.iterative_scan}")
+
+    def ef_search_for(self, scan_limit: int, selectivity: float) -> int:
+        wanted = math.ceil(scan_limit / max(selectivity, 0.001))
+        return max(self.ef_search, min(wanted, self.ef_search_max, _MAX_EF_SEARCH))
+
+    def settings_for(self, scan_limit: int, selectivity: float) -> dict[str, str]:
+        """Transaction-local values of every managed GUC for one search."""
+        return {
+            "hnsw.ef_search": str(self.ef_search_for(scan_limit, selectivity)),
+            # Unfiltered searches scan normally, even after a filtered one in the same transaction.
+            "hnsw.iterative_scan": self.iterative_scan if selectivity < 1.0 else "off",
+            "hnsw.max_scan_tuples": str(self.max_scan_tuples),
+        }
+
 
 class RagChunkRepoSqlAlchemy:
-    def __init__(self, session: Session) -> None:
+    # Whether the server's pgvector has the iterative scan GUCs; None until read.
+    _iterative_scan_supported: ClassVar[bool | None] = None
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        search_mode: str = "full",
+        rerank_factor: int = 4,
+        tuning: HnswSearchTuning | None = None,
+    ) -> None:
+        if search_mode not in VECTOR_SEARCH_MODES:
+            raise ValueError(f"unknown vector search mode: {search_mode}")
         self._session = session
+        self._search_mode = search_mode
+        self._rerank_factor = max(int(rerank_factor), 1)
+        self._tuning = tuning or HnswSearchTuning()
 
     # ── WRITE ─────────────────────────────────────────────────────────
 
@@ -64,6 +154,7 @@ class RagChunkRepoSqlAlchemy:
         manufacturer_id: int | None = None,
         catalog_id: int | None = None,
         brand: str | None = None,
+        mode: str | None = None,
     ) -> list[dict[str, Any]]:
         """Return up to top_k chunks nearest to `embedding` (cosine distance).
 
@@ -71,7 +162,13 @@ class RagChunkRepoSqlAlchemy:
         - catalog_id: restrict to a single catalog
         - manufacturer_id: restrict to catalogs belonging to that manufacturer
         - brand: restrict to a specific brand
+
+        ``mode`` overrides the repository's search mode for this call.
         """
+        mode = mode or self._search_mode
+        if mode not in VECTOR_SEARCH_MODES:
+            raise ValueError(f"unknown vector search mode: {mode}")
+
         # Convert embedding to SQL array format for pgvector
         # Embeddings should always be list[float] from the API
         if isinstance(embedding, list):
@@ -108,9 +205,44 @@ class RagChunkRepoSqlAlchemy:
 
         where_sql = " AND ".join(where)
 
+        if mode == "full":
+            scan_limit = top_k
+            sql = self._single_pass_sql(where_sql)
+        else:
+            scan_limit = params["candidates"] = top_k * self._rerank_factor
+            sql = self._rerank_sql(where_sql, _FIRST_PASS_DISTANCE[mode])
+
+        selectivity = self._filter_selectivity(
+            manufacturer_id=manufacturer_id, catalog_id=catalog_id, brand=brand
+        )
+        hnsw_settings = self._tuning.settings_for(scan_limit, selectivity)
+        if not self._supports_iterative_scan():
+            for name in _ITERATIVE_SCAN_SETTINGS:
+                hnsw_settings.pop(name, None)
+        self._apply_settings(hnsw_settings)
+
+        try:
+            rows = self._session.execute(text(sql), params).mappings().all()
+        except Exception as e:
+            logger.error("RAG search failed: %s", e)
+            raise
+
+        results = [dict(r) for r in rows]
+        if hnsw_settings.get("hnsw.iterative_scan") == "relaxed_order" and mode == "full":
+            # relaxed_order may return neighbours slightly out of order.
+            results.sort(key=lambda row: row["similarity"], reverse=True)
+
+        logger.info(
+            "RAG search returned %d rows (top_k=%d, mode=%s, selectivity=%.3f, hnsw=%s)",
+            len(results), top_k, mode, selectivity, hnsw_settings,
+        )
+        return results
+
+    @staticmethod
+    def _single_pass_sql(where_sql: str) -> str:
         # Use a CTE to materialise the search vector once, so the HNSW
         # index on rag_chunks.embedding is used for the ORDER BY + LIMIT.
-        sql = f"""
+        return f"""
                 WITH search_vector AS (
                     SELECT CAST(:embedding_array AS vector) AS vec
                 )
@@ -131,11 +263,104 @@ class RagChunkRepoSqlAlchemy:
                 LIMIT :top_k
             """
 
-        try:
-            rows = self._session.execute(text(sql), params).mappings().all()
-        except Exception as e:
-            logger.error("RAG search failed: %s", e)
-            raise
+    @staticmethod
+    def _rerank_sql(where_sql: str, first_pass_distance: str) -> str:
+        # The candidates CTE is ordered by the quantized expression, so it is
+        # served by its HNSW index; only those rows are re-scored exactly.
+        return f"""
+                WITH search_vector AS (
+                    SELECT CAST(:embedding_array AS vector) AS vec
+                ),
+                candidates AS (
+                    SELECT rc.id
+                    FROM rag_chunks rc
+                    INNER JOIN catalog_documents cd
+                      ON (rc.metadata->>'catalog_id')::bigint = cd.id
+                    WHERE {where_sql}
+                      AND cd.is_active = true
+                      AND cd.status = 'ready'
+                    ORDER BY {first_pass_distance}
+                    LIMIT :candidates
+                )
+                SELECT
+                    rc.id,
+                    rc.source_id,
+                    rc.chunk_text,
+                    rc.metadata,
+                    rc.brand,
+                    1 - (rc.embedding <=> (SELECT vec FROM search_vector)) AS similarity
+                FROM candidates c
+                INNER JOIN rag_chunks rc ON rc.id = c.id
+                ORDER BY rc.embedding <=> (SELECT vec FROM search_vector)
+                LIMIT :top_k
+            """
+
+    def _filter_selectivity(
+        self,
+        *,
+        manufacturer_id: int | None,
+        catalog_id: int | None,
+        brand: str | None,
+    ) -> float:
+        """Share of searchable chunks the filters keep, from catalog chunk counts."""
+        where: list[str] = []
+        params: dict[str, Any] = {}
+        if catalog_id is not None:
+            where.append("id = :catalog_id")
+            params["catalog_id"] = catalog_id
+        if manufacturer_id is not None:
+            where.append("manufacturer_id = :manufacturer_id")
+            params["manufacturer_id"] = manufacturer_id
+        if brand is not None:
+            where.append("brand = :brand")
+            params["brand"] = brand
+        if not where:
+            return 1.0
+
+        row = self._session.execute(
+            text(f"""
+                SELECT
+                    COALESCE(SUM(chunk_count) FILTER (WHERE {" AND ".join(where)}), 0) AS matching,
+                    COALESCE(SUM(chunk_count), 0) AS total
+                FROM catalog_documents
+                WHERE is_active = true
+                  AND status = 'ready'
+            """),
+            params,
+        ).mappings().one()
+        if not row["total"]:
+            return 1.0
+        return min(float(row["matching"]) / float(row["total"]), 1.0)
+
+    def _supports_iterative_scan(self) -> bool:
+        cls = type(self)
+        if cls._iterative_scan_supported is None:
+            version = self._session.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            ).scalar()
+            cls._iterative_scan_supported = _parse_version(version) >= _ITERATIVE_SCAN_MIN_VERSION
+            if not cls._iterative_scan_supported:
+                logger.warning(
+                    "pgvector %s has no iterative scan (needs 0.8+); filtered searches only widen ef_search",
+                    version,
+                )
+        return cls._iterative_scan_supported
+
+    def _apply_settings(self, values: dict[str, str]) -> None:
+        """``SET LOCAL`` the given GUCs in one round trip (bind-safe via set_config)."""
+        calls = ", ".join(f"set_config(:name_{i}, :value_{i}, true)" for i in range(len(values)))
+        params: dict[str, Any] = {}
+        for i, (name, value) in enumerate(values.items()):
+            params[f"name_{i}"] = name
+            params[f"value_{i}"] = value
+        self._session.execute(text(f"SELECT {calls}"), params)
+
 
-        logger.info("RAG search returned %d rows (top_k=%d)", len(rows), top_k)
-        return [dict(r) for r in rows]
+def _parse_version(version: str | None) -> tuple[int, ...]:
+    """``"0.8.0"`` -> ``(0, 8, 0)``; unknown or missing versions sort lowest."""
+    parts = []
+    for part in str(version or "").split("."):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts)
@@ -4,12 +4,11 @@ from __future__ import annotations
 
 from typing import Any
 
-import bcrypt
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from src.bot.domain.errors import ConflictError, UnauthorizedError, ValidationError
+from src.bot.domain.errors import ConflictError, ValidationError
 
 
 CREDENTIAL_RETURNING = """\
@@ -23,21 +22,14 @@ updated_at
 """
 
 
-def _hash_password(plain: str) -> str:
-    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt()).decode()
-
-
-def _check_password(plain: str, hashed: str) -> bool:
-    return bcrypt.checkpw(plain.encode(), hashed.encode())
-
-
 class SellerCredentialRepoSqlAlchemy:
     def __init__(self, session: Session) -> None:
         self._session = session
 
     # ── register ─────────────────────────────────────────────────
 
-    def create_credential(self, payload: dict[str, Any]) -> dict[str, Any]:
+    def create_credential(self, payload: dict[str, Any], *, password_hash: str) -> dict[str, Any]:
+        """Store a credential; ``password_hash`` is computed by the caller off the event loop."""
         seller_id = int(payload["seller_id"])
         autopart_id = int(payload["autopart_id"])
 
@@ -51,8 +43,6 @@ class SellerCredentialRepoSqlAlchemy:
         if int(vendor["autopart_id"]) != autopart_id:
             raise ValidationError("autopart_id does not match vendor's store")
 
-        password_hash = _hash_password(payload["password"])
-
         stmt = text(
             f"""
             INSERT INTO seller_credentials (seller_id, autopart_id, email, password_hash)
@@ -78,10 +68,10 @@ class SellerCredentialRepoSqlAlchemy:
 
     # ── authenticate ─────────────────────────────────────────────
 
-    def authenticate(self, email: str, password: str) -> dict[str, Any]:
-        """Validate email+password and return credential + vendor info.
+    def find_login(self, email: str) -> dict[str, Any] | None:
+        """Active credential + vendor info for ``email`` (with password hash), or None.
 
-        Raises UnauthorizedError when credentials are invalid.
+        The caller verifies the password (off the event loop) before using it.
         """
         row = self._session.execute(
             text(
@@ -104,16 +94,18 @@ class SellerCredentialRepoSqlAlchemy:
             ),
             {"email": email.strip().lower()},
         ).mappings().one_or_none()
+        return dict(row) if row is not None else None
 
-        if row is None:
-            raise UnauthorizedError("E-mail ou senha inválidos.")
-
-        if not _check_password(password, row["password_hash"]):
-            raise UnauthorizedError("E-mail ou senha inválidos.")
-
-        return {
-            "seller_id": row["seller_id"],
-            "autopart_id": row["autopart_id"],
-            "email": row["email"],
-            "seller_name": row["seller_name"],
-        }
+    def update_password_hash(self, credential_id: int, password_hash: str) -> None:
+        self._session.execute(
+            text(
+                """
+                UPDATE seller_credentials
+                SET password_hash = :password_hash,
+                    updated_at = now()
+                WHERE id = :id
+                """
+            ),
+            {"id": int(credential_id), "password_hash": password_hash},
+        )
+        self._session.commit()
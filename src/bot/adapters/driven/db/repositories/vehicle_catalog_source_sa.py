@@ -0,0 +1,39 @@
+"""Incremental reads of manufacturers/vehicles for the in-memory catalog index."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+class VehicleCatalogSourceSqlAlchemy:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def list_manufacturers_changed_since(self, since: datetime | None) -> list[dict[str, Any]]:
+        rows = self._session.execute(
+            text("""
+                SELECT id, name, soft_delete, updated_at
+                FROM manufacturers
+                WHERE CAST(:since AS timestamptz) IS NULL OR updated_at >= :since
+                ORDER BY updated_at, id
+            """),
+            {"since": since},
+        ).mappings().all()
+        return [dict(r) for r in rows]
+
+    def list_vehicles_changed_since(self, since: datetime | None) -> list[dict[str, Any]]:
+        rows = self._session.execute(
+            text("""
+                SELECT id, manufacturer_id, model, model_year_start, model_year_end,
+                       soft_delete, updated_at
+                FROM vehicles
+                WHERE CAST(:since AS timestamptz) IS NULL OR updated_at >= :since
+                ORDER BY updated_at, id
+            """),
+            {"since": since},
+        ).mappings().all()
+        return [dict(r) for r in rows]
@@ -8,6 +8,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.bot.adapters.driven.db.seller_visibility import SELLER_VISIBILITY_CACHE
 from src.bot.domain.errors import (
     ConflictError,
     ValidationError,
@@ -131,12 +132,53 @@ class VendorRepoSqlAlchemy:
             if row is None:
                 self._session.rollback()
                 raise VendorNotFound("vendor not found")
+            if "name" in updates:
+                self._rename_in_comparisons(vendor_id=int(vendor_id), name=row["name"])
             self._session.commit()
             return dict(row)
         except IntegrityError as exc:
             self._session.rollback()
             raise ConflictError("vendor update conflicts with existing data") from exc
 
+    def _rename_in_comparisons(self, *, vendor_id: int, name: str) -> None:
+        """Patch ``seller_name`` in the materialized comparisons that list this vendor.
+
+        The thread version is bumped with it so conditional comparison reads
+        stop answering 304 with the old name.
+        """
+        self._session.execute(
+            text(
+                """
+                WITH renamed AS (
+                    UPDATE thread_comparisons tc
+                    SET document = jsonb_set(
+                            tc.document,
+                            '{offers}',
+                            (
+                                SELECT jsonb_agg(
+                                    CASE
+                                        WHEN CAST(entry->>'seller_id' AS bigint) = :vendor_id
+                                        THEN jsonb_set(entry, '{seller_name}', to_jsonb(CAST(:name AS text)))
+                                        ELSE entry
+                                    END
+                                    ORDER BY position
+                                )
+                                FROM jsonb_array_elements(tc.document->'offers') WITH ORDINALITY AS offers(entry, position)
+                            )
+                        ),
+                        updated_at = now()
+                    WHERE tc.document->'offers' @> jsonb_build_array(jsonb_build_object('seller_id', CAST(:vendor_id AS bigint)))
+                    RETURNING tc.thread_id
+                )
+                UPDATE quote_threads t
+                SET version = t.version + 1
+                FROM renamed
+                WHERE t.id = renamed.thread_id
+                """
+            ),
+            {"vendor_id": int(vendor_id), "name": name},
+        )
+
     def delete_vendor(self, vendor_id: int) -> None:
         result = self._session.execute(
             text(
@@ -207,6 +249,7 @@ class VendorRepoSqlAlchemy:
         )
 
         self._session.commit()
+        SELLER_VISIBILITY_CACHE.invalidate_workshop(int(workshop_id))
         return dict(row)
 
     def list_assignments(
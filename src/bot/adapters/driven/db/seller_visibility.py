@@ -0,0 +1,81 @@
+"""Short-lived, per-process cache of seller → thread visibility decisions.
+
+Sellers poll the same threads every few seconds; the visibility rule
+(assignment to the thread's workshop, or an offer on the thread) rarely
+changes. Entries expire after a TTL so changes made by other processes are
+picked up, and writers in this process that change assignments invalidate
+the affected workshop right after committing.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+
+from src.bot.infrastructure.config.settings import settings
+
+_Key = tuple[int, int, int]
+
+
+class SellerVisibilityCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = float(ttl_seconds)
+        self._max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._lock = Lock()
+        # key -> (visible, workshop_id, expires_at), least recently used first
+        self._entries: OrderedDict[_Key, tuple[bool, int, float]] = OrderedDict()
+
+    def get(self, *, thread_id: int, seller_id: int, shop_id: int) -> bool | None:
+        """Cached decision, or None when unknown or expired."""
+        key = (int(thread_id), int(seller_id), int(shop_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, *, thread_id: int, seller_id: int, shop_id: int, workshop_id: int, visible: bool) -> None:
+        if self._ttl <= 0:
+            return
+        key = (int(thread_id), int(seller_id), int(shop_id))
+        with self._lock:
+            self._entries[key] = (bool(visible), int(workshop_id), self._clock() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_thread(self, thread_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == int(thread_id)]:
+                del self._entries[key]
+
+    def invalidate_workshop(self, workshop_id: int) -> None:
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1] == int(workshop_id)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+SELLER_VISIBILITY_CACHE = SellerVisibilityCache(
+    ttl_seconds=settings.SELLER_VISIBILITY_CACHE_TTL_SECONDS,
+    max_entries=settings.SELLER_VISIBILITY_CACHE_MAX_ENTRIES,
+)
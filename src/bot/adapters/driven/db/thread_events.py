@@ -0,0 +1,104 @@
+"""In-process fan-out of thread change notifications (Postgres LISTEN/NOTIFY).
+
+Writers call ``pg_notify(THREAD_EVENTS_CHANNEL, '<thread_id>')`` inside their
+transaction; Postgres delivers it on commit. One listener connection per
+process receives every notification and wakes only the long-poll requests
+waiting on that thread. Waiting requests hold no DB connection and run no
+queries until they are woken.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+
+import psycopg
+
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+THREAD_EVENTS_CHANNEL = "thread_events"
+
+# Upper bound on a single wait when no listener is connected, so long-polls
+# degrade to slow polling instead of sleeping through changes.
+_FALLBACK_POLL_SECONDS = 3.0
+_RECONNECT_MAX_SECONDS = 30.0
+
+
+class ThreadEventHub:
+    def __init__(self) -> None:
+        self._waiters: dict[int, set[asyncio.Event]] = defaultdict(set)
+        self.listening = False
+
+    def subscribe(self, thread_id: int) -> asyncio.Event:
+        """Register interest *before* reading, so a change between read and wait is not lost."""
+        event = asyncio.Event()
+        self._waiters[int(thread_id)].add(event)
+        return event
+
+    def unsubscribe(self, thread_id: int, event: asyncio.Event) -> None:
+        waiters = self._waiters.get(int(thread_id))
+        if waiters is None:
+            return
+        waiters.discard(event)
+        if not waiters:
+            self._waiters.pop(int(thread_id), None)
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        """Wait until notified or ``timeout``; True when a notification arrived."""
+        if not self.listening:
+            timeout = min(timeout, _FALLBACK_POLL_SECONDS)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            return False
+        event.clear()
+        return True
+
+    def publish(self, thread_id: int) -> None:
+        for event in self._waiters.get(int(thread_id), ()):
+            event.set()
+
+    @property
+    def waiter_count(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+
+def _libpq_url(url: str) -> str:
+    # psycopg takes plain libpq URLs, not SQLAlchemy's "+driver" form.
+    for prefix in ("postgresql+psycopg://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql://" + url[len(prefix):]
+    return url
+
+
+class PostgresThreadEventListener:
+    """Feeds :class:`ThreadEventHub` from a dedicated ``LISTEN`` connection, reconnecting on failure."""
+
+    def __init__(self, hub: ThreadEventHub, database_url: str) -> None:
+        self._hub = hub
+        self._dsn = _libpq_url(database_url)
+
+    async def run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self._dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {THREAD_EVENTS_CHANNEL}")
+                    self._hub.listening = True
+                    backoff = 1.0
+                    logger.info("Listening for %s notifications", THREAD_EVENTS_CHANNEL)
+                    async for notify in conn.notifies():
+                        try:
+                            self._hub.publish(int(notify.payload))
+                        except ValueError:
+                            logger.warning("Ignoring malformed %s payload: %r", THREAD_EVENTS_CHANNEL, notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Thread event listener disconnected: %s", exc)
+            finally:
+                self._hub.listening = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, _RECONNECT_MAX_SECONDS)
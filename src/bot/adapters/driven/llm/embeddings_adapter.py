@@ -11,6 +11,12 @@ import httpx
 from src.bot.infrastructure.config.settings import Settings
 from src.bot.infrastructure.logging import get_logger
 
+from .provider_resilience import (
+    ProviderEndpoint,
+    ProviderUnavailableError,
+    ResilientProvider,
+)
+
 logger = get_logger(__name__)
 
 _BATCH_SIZE = 100
@@ -20,9 +26,14 @@ class EmbeddingsError(RuntimeError):
     """Raised when the embeddings API call fails."""
 
 
+class EmbeddingsUnavailableError(EmbeddingsError):
+    """Raised without calling the API while its circuit breaker is open."""
+
+
 class EmbeddingsAdapter:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, resilience: ResilientProvider | None = None) -> None:
         self._settings = settings
+        self._resilience = resilience
 
     async def embed_texts(self, texts: list[str]) -> list[list[float]]:
         """Embed a list of texts, batching when len > _BATCH_SIZE."""
@@ -45,17 +56,26 @@ class EmbeddingsAdapter:
         if not s.EMBEDDINGS_API_KEY:
             raise EmbeddingsError("EMBEDDINGS_API_KEY não configurada.")
 
-        url = f"{s.EMBEDDINGS_BASE_URL.rstrip('/')}/embeddings"
-        headers = {
-            "Authorization": f"Bearer {s.EMBEDDINGS_API_KEY}",
-            "Content-Type": "application/json",
-        }
         payload = {"model": s.EMBEDDINGS_MODEL, "input": texts}
 
+        async def send(endpoint: ProviderEndpoint) -> httpx.Response:
+            url = f"{endpoint.base_url.rstrip('/')}/embeddings"
+            headers = {
+                "Authorization": f"Bearer {endpoint.api_key}",
+                "Content-Type": "application/json",
+            }
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                return await client.post(url, headers=headers, json=payload)
+
         logger.debug("Embedding %d texts with model=%s", len(texts), s.EMBEDDINGS_MODEL)
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(url, headers=headers, json=payload)
+        if self._resilience is None:
+            resp = await send(ProviderEndpoint(s.EMBEDDINGS_BASE_URL, s.EMBEDDINGS_API_KEY))
+        else:
+            try:
+                resp = await self._resilience.call(send)
+            except ProviderUnavailableError as exc:
+                raise EmbeddingsUnavailableError(str(exc)) from exc
 
         if resp.status_code >= 400:
             raise EmbeddingsError(
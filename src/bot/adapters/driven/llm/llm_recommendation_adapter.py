@@ -9,6 +9,7 @@ from __future__ import annotations
 import json
 import re
 import time
+from collections.abc import Callable
 from typing import Any
 
 import httpx
@@ -24,7 +25,12 @@ from src.bot.application.dtos.recommendation.recommendation_response import (
 )
 from src.bot.infrastructure.config.settings import Settings
 from src.bot.infrastructure.logging import get_logger
-from .prompt_templates import build_messages
+from .prompt_templates import build_batch_messages, build_messages
+from .provider_resilience import (
+    ProviderEndpoint,
+    ProviderUnavailableError,
+    ResilientProvider,
+)
 
 logger = get_logger(__name__)
 
@@ -35,6 +41,14 @@ class LlmError(RuntimeError):
     """Raised when the LLM call fails or returns unparseable output."""
 
 
+class LlmParseError(LlmError):
+    """Raised when the provider answered but the content does not match the schema."""
+
+
+class LlmUnavailableError(LlmError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
 def _strip_code_fences(text: str) -> str:
     text = text.strip()
     if text.startswith("```"):
@@ -47,25 +61,89 @@ def _extract_json(text: str) -> str:
     text = _strip_code_fences(text)
     m = _JSON_RE.search(text)
     if not m:
-        raise LlmError("Não foi possível extrair JSON da resposta do modelo.")
+        raise LlmParseError("Não foi possível extrair JSON da resposta do modelo.")
     return m.group(0)
 
 
 class OpenAiRecommendationAdapter:
     """Driven adapter — OpenAI-compatible LLM provider."""
 
-    def __init__(self, settings: Settings, log_store: Any | None = None) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        log_store: Any | None = None,
+        *,
+        model: str | None = None,
+        timeout_seconds: float | None = None,
+        tier: str | None = None,
+        resilience: ResilientProvider | None = None,
+    ) -> None:
         self._settings = settings
         self._log_store = log_store or LlmCallLogStore()
+        # A tier (see TieredRecommendationRouter) overrides the model and
+        # timeout; by default every call uses LLM_MODEL / LLM_TIMEOUT_SECONDS.
+        self._model = model or settings.LLM_MODEL
+        self._timeout_seconds = timeout_seconds or settings.LLM_TIMEOUT_SECONDS
+        self._tier = tier
+        # Hedging + circuit breaker (see provider_resilience); None = one plain call.
+        self._resilience = resilience
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def tier(self) -> str | None:
+        return self._tier
 
     # ── public interface (matches LlmRecommendationPort) ─────────────
 
     async def generate(
-        self, request: RecommendationRequest
+        self,
+        request: RecommendationRequest,
+        *,
+        log_metadata: dict[str, Any] | None = None,
+    ) -> RecommendationResponse:
+        return await self._generate(
+            request,
+            build_messages(request),
+            self._parse_response,
+            log_metadata=log_metadata,
+        )
+
+    async def generate_batch(
+        self,
+        request: RecommendationRequest,
+        *,
+        log_metadata: dict[str, Any] | None = None,
+    ) -> RecommendationResponse:
+        """Rank every part of ``request`` in a single structured-output call.
+
+        The response carries one entry in ``items`` per requested ``item_id``.
+        Raises :class:`LlmParseError` when the model output cannot be mapped
+        back to the requested items, so callers can fall back to per-item calls.
+        """
+        return await self._generate(
+            request,
+            build_batch_messages(request),
+            self._parse_batch_response,
+            mode="batch",
+            log_metadata=log_metadata,
+        )
+
+    # ── private helpers ──────────────────────────────────────────────
+
+    async def _generate(
+        self,
+        request: RecommendationRequest,
+        messages: list[dict[str, str]],
+        parser: Callable[[str, RecommendationRequest], RecommendationResponse],
+        *,
+        mode: str = "single",
+        log_metadata: dict[str, Any] | None = None,
     ) -> RecommendationResponse:
-        messages = build_messages(request)
         start = time.perf_counter()
-        log_id = self._create_log(request, messages)
+        log_id = self._create_log(request, messages, mode=mode, log_metadata=log_metadata)
         http_status: int | None = None
         raw_text: str | None = None
         response = None
@@ -73,7 +151,7 @@ class OpenAiRecommendationAdapter:
             response = await self._call_chat_completions(messages)
             http_status = response.status_code
             raw_text = self._extract_content(response)
-            parsed = self._parse_response(raw_text, request)
+            parsed = parser(raw_text, request)
             self._mark_log_success(
                 log_id,
                 http_status=http_status,
@@ -98,8 +176,6 @@ class OpenAiRecommendationAdapter:
             )
             raise
 
-    # ── private helpers ──────────────────────────────────────────────
-
     async def _call_chat_completions(
         self,
         messages: list[dict[str, str]],
@@ -108,28 +184,33 @@ class OpenAiRecommendationAdapter:
         if not s.LLM_API_KEY:
             raise LlmError("LLM_API_KEY não configurada.")
 
-        url = f"{s.LLM_BASE_URL.rstrip('/')}/chat/completions"
-
         payload: dict[str, Any] = {
-            "model": s.LLM_MODEL,
+            "model": self._model,
             "messages": messages,
             "temperature": s.LLM_TEMPERATURE,
             "response_format": {"type": "json_object"},
         }
 
-        headers = {
-            "Authorization": f"Bearer {s.LLM_API_KEY}",
-            "Content-Type": "application/json",
-        }
+        async def send(endpoint: ProviderEndpoint) -> httpx.Response:
+            url = f"{endpoint.base_url.rstrip('/')}/chat/completions"
+            headers = {
+                "Authorization": f"Bearer {endpoint.api_key}",
+                "Content-Type": "application/json",
+            }
 
-        logger.info(
-            "[RECOMMENDER_DEBUG] Calling LLM model=%s url=%s", s.LLM_MODEL, url,
-        )
+            logger.info(
+                "[RECOMMENDER_DEBUG] Calling LLM model=%s tier=%s url=%s", self._model, self._tier, url,
+            )
 
-        async with httpx.AsyncClient(timeout=s.LLM_TIMEOUT_SECONDS) as client:
-            resp = await client.post(url, headers=headers, json=payload)
+            async with httpx.AsyncClient(timeout=self._timeout_seconds) as client:
+                return await client.post(url, headers=headers, json=payload)
 
-        return resp
+        if self._resilience is None:
+            return await send(ProviderEndpoint(s.LLM_BASE_URL, s.LLM_API_KEY))
+        try:
+            return await self._resilience.call(send)
+        except ProviderUnavailableError as exc:
+            raise LlmUnavailableError(str(exc)) from exc
 
     def _extract_content(self, resp: httpx.Response) -> str:
         if resp.status_code >= 400:
@@ -155,6 +236,8 @@ class OpenAiRecommendationAdapter:
         *,
         request: RecommendationRequest,
         messages: list[dict[str, str]],
+        mode: str = "single",
+        log_metadata: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         context = dict(request.context or {})
         return {
@@ -163,16 +246,19 @@ class OpenAiRecommendationAdapter:
             "request_id": context.get("request_id") or context.get("requested_item_id"),
             "provider": self._settings.LLM_PROVIDER,
             "endpoint": f"{self._settings.LLM_BASE_URL.rstrip('/')}/chat/completions",
-            "model": self._settings.LLM_MODEL,
+            "model": self._model,
+            "tier": self._tier,
             "vehicle_json": request.vehicle or {},
             "context_json": context,
             "request_payload_json": {
-                "model": self._settings.LLM_MODEL,
+                "model": self._model,
                 "temperature": self._settings.LLM_TEMPERATURE,
                 "response_format": {"type": "json_object"},
             },
             "metadata_json": {
                 "parts_count": len(request.parts or []),
+                "mode": mode,
+                **(log_metadata or {}),
             },
             "messages": messages,
         }
@@ -181,10 +267,17 @@ class OpenAiRecommendationAdapter:
         self,
         request: RecommendationRequest,
         messages: list[dict[str, str]],
+        mode: str = "single",
+        log_metadata: dict[str, Any] | None = None,
     ) -> str | None:
         try:
             return self._log_store.create_log(
-                self._build_payload_preview(request=request, messages=messages)
+                self._build_payload_preview(
+                    request=request,
+                    messages=messages,
+                    mode=mode,
+                    log_metadata=log_metadata,
+                )
             )
         except Exception as exc:
             logger.warning("[RECOMMENDER_DEBUG] failed to create llm log: %s", exc)
@@ -239,20 +332,27 @@ class OpenAiRecommendationAdapter:
         except Exception as exc:
             logger.warning("[RECOMMENDER_DEBUG] failed to mark llm log failure: %s", exc)
 
-    def _parse_response(
-        self,
-        raw: str,
-        request: RecommendationRequest,
-    ) -> RecommendationResponse:
+    @staticmethod
+    def _load_json_object(raw: str) -> Any:
         raw = raw.strip()
         json_text = raw if raw.startswith("{") else _extract_json(raw)
 
         try:
             obj: Any = json.loads(json_text)
         except json.JSONDecodeError as exc:
-            raise LlmError(
+            raise LlmParseError(
                 f"JSON inválido retornado pelo modelo: {exc}"
             ) from exc
+        if not isinstance(obj, dict):
+            raise LlmParseError("Resposta do modelo não é um objeto JSON.")
+        return obj
+
+    def _parse_response(
+        self,
+        raw: str,
+        request: RecommendationRequest,
+    ) -> RecommendationResponse:
+        obj = self._load_json_object(raw)
 
         # Ensure the response carries an id (echo requester_id if missing)
         if "id" not in obj or not obj["id"]:
@@ -261,4 +361,54 @@ class OpenAiRecommendationAdapter:
         try:
             return RecommendationResponse.model_validate(obj)
         except Exception as exc:
-            raise LlmError(f"Resposta não bate no schema: {exc}") from exc
+            raise LlmParseError(f"Resposta não bate no schema: {exc}") from exc
+
+    def _parse_batch_response(
+        self,
+        raw: str,
+        request: RecommendationRequest,
+    ) -> RecommendationResponse:
+        obj = self._load_json_object(raw)
+        raw_items = obj.get("items")
+        if not isinstance(raw_items, list) or not raw_items:
+            raise LlmParseError("Resposta em lote sem a lista 'items'.")
+
+        requested_ids = {part.item_id for part in request.parts or [] if part.item_id}
+        items: list[dict[str, Any]] = []
+        for raw_item in raw_items:
+            if not isinstance(raw_item, dict):
+                raise LlmParseError("Item da resposta em lote não é um objeto JSON.")
+            item_id = str(raw_item.get("item_id") or "").strip()
+            if item_id not in requested_ids:
+                continue
+            candidates = raw_item.get("candidates")
+            if candidates is None:
+                candidates = raw_item.get("accepted_candidates") or []
+            items.append(
+                {
+                    "item_id": item_id,
+                    "needs_more_info": bool(raw_item.get("needs_more_info", False)),
+                    "required_missing_fields": raw_item.get("required_missing_fields") or [],
+                    "accepted_candidates": candidates,
+                }
+            )
+        if not items:
+            raise LlmParseError("Nenhum item da resposta em lote corresponde ao pedido.")
+
+        try:
+            response = RecommendationResponse.model_validate(
+                {
+                    "id": obj.get("id") or request.requester_id or "unknown",
+                    "items": items,
+                    "evidences": obj.get("evidences"),
+                    "raw": obj.get("raw") or {},
+                }
+            )
+        except Exception as exc:
+            raise LlmParseError(f"Resposta em lote não bate no schema: {exc}") from exc
+
+        response.candidates = [
+            candidate for item in response.items for candidate in item.accepted_candidates
+        ]
+        response.needs_more_info = any(item.needs_more_info for item in response.items)
+        return response
@@ -92,6 +92,56 @@ Exemplo de resposta para "pastilha de freio dianteira Vectra 2.2 2000":
 }
 """
 
+# ── Batch instruction block (one call for every item of a thread) ────
+
+BATCH_DEVELOPER_INSTRUCTIONS = """\
+Tarefa: o pedido do mecânico contém VÁRIOS itens. Analise todos de uma vez e
+retorne, para CADA item, peças com part_number único seguindo as mesmas regras
+abaixo. Cada item é identificado por um item_id que DEVE ser ecoado sem alteração.
+
+Regras:
+1. Responda com exatamente uma entrada em "items" para cada item_id recebido.
+2. Para cada item, retorne de 3 a 5 candidatos de MARCAS DIFERENTES (OEM + aftermarket),
+   com part_number real, brand, average_price_brl, score (0..1) e metadata
+   (description, compatibility_notes, origin, fitment_keys, warning_flags, required_questions).
+3. Quando o contexto trouxer "prefiltered_candidates" para um item, apenas ordene e explique
+   esses candidatos — não invente novos códigos para esse item.
+4. Se faltar informação para um item, marque "needs_more_info": true e liste os campos em
+   "required_missing_fields".
+5. Retorne APENAS JSON válido.
+
+Schema de saída:
+{
+  "id": "<echo do requester_id>",
+  "items": [
+    {
+      "item_id": "<item_id recebido>",
+      "needs_more_info": false,
+      "required_missing_fields": [],
+      "candidates": [
+        {
+          "id": "<identificador interno>",
+          "part_number": "<código único da peça>",
+          "brand": "<marca/fabricante>",
+          "average_price_brl": <float preço médio em R$>,
+          "score": <float 0..1>,
+          "metadata": {
+            "description": "...",
+            "compatibility_notes": "...",
+            "origin": "OEM" | "aftermarket",
+            "fitment_keys": ["..."],
+            "warning_flags": ["..."],
+            "required_questions": ["..."]
+          }
+        }
+      ]
+    }
+  ],
+  "evidences": [],
+  "raw": {}
+}
+"""
+
 
 def _format_parts(parts: List[PartRequest] | None) -> str:
     if not parts:
@@ -100,7 +150,8 @@ def _format_parts(parts: List[PartRequest] | None) -> str:
     for p in parts:
         desc = p.description or "sem descrição"
         pn = p.part_number or "sem código"
-        lines.append(f"- {desc} (código: {pn}, qtd: {p.quantity})")
+        prefix = f"[item_id: {p.item_id}] " if p.item_id else ""
+        lines.append(f"- {prefix}{desc} (código: {pn}, qtd: {p.quantity})")
     return "\n".join(lines)
 
 
@@ -111,16 +162,14 @@ def _format_vehicle(vehicle: dict | None) -> str:
     return ", ".join(parts) if parts else "Veículo não informado."
 
 
-def build_messages(request: RecommendationRequest) -> list[dict[str, str]]:
-    """Build the chat-completion messages list from a RecommendationRequest."""
-
+def _build_user_content(request: RecommendationRequest) -> str:
     vehicle_block = _format_vehicle(request.vehicle)
     parts_block = _format_parts(request.parts)
     context_block = ""
     if request.context:
         context_block = f"\nContexto adicional: {request.context}"
 
-    user_content = (
+    return (
         f"Solicitante: {request.requester_id or 'anônimo'}\n"
         f"Veículo: {vehicle_block}\n"
         f"Peças solicitadas:\n{parts_block}"
@@ -128,8 +177,22 @@ def build_messages(request: RecommendationRequest) -> list[dict[str, str]]:
         "Responda APENAS com JSON válido."
     )
 
+
+def build_messages(request: RecommendationRequest) -> list[dict[str, str]]:
+    """Build the chat-completion messages list from a RecommendationRequest."""
+
     return [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "developer", "content": DEVELOPER_INSTRUCTIONS},
-        {"role": "user", "content": user_content},
+        {"role": "user", "content": _build_user_content(request)},
+    ]
+
+
+def build_batch_messages(request: RecommendationRequest) -> list[dict[str, str]]:
+    """Build a single chat-completion request covering every part of the request."""
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "developer", "content": BATCH_DEVELOPER_INSTRUCTIONS},
+        {"role": "user", "content": _build_user_content(request)},
     ]
@@ -0,0 +1,309 @@
+"""Hedged requests and a circuit breaker for the LLM and embeddings providers.
+
+``ResilientProvider.call(send)`` wraps one logical provider call:
+
+  * Circuit breaker — after ``failure_threshold`` consecutive failed calls
+    the circuit opens and calls raise :class:`ProviderUnavailableError`
+    without touching the network for ``reset_seconds``. Then one probe call
+    is let through (half-open); its outcome closes or re-opens the circuit.
+  * Hedging — when the first attempt has not answered after the recent p95
+    latency (clamped to ``[min_delay, max_delay]``), a second attempt is sent,
+    to the fallback endpoint when there is one, and the first successful
+    response wins; the other attempt is cancelled. A first attempt that fails
+    early starts the second one immediately only when it can go to a distinct
+    fallback: re-sending to a primary that is failing or rate-limiting would
+    just double its load before the breaker trips.
+  * Retry-After — an endpoint that answers 429 with ``Retry-After`` gets no
+    attempts until that time has passed; the fallback takes its calls, and
+    with no endpoint left the call raises :class:`ProviderUnavailableError`
+    without a network call.
+
+Transport errors, 429 and 5xx responses are failed attempts. When every
+attempt fails with a status, the last response is returned so the adapter
+reports it as before. Several ``ResilientProvider`` (e.g. one per model tier)
+may share one ``CircuitBreaker``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+
+import httpx
+
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Below this many successful samples the hedge waits ``max_delay``.
+_MIN_LATENCY_SAMPLES = 20
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised without a network call while the provider's circuit is open."""
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderEndpoint:
+    base_url: str
+    api_key: str
+
+
+class _RetryableResponse(Exception):
+    def __init__(self, response: httpx.Response) -> None:
+        super().__init__(f"provider answered {response.status_code}")
+        self.response = response
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = max(1, int(failure_threshold))
+        self._reset_seconds = float(reset_seconds)
+        self._clock = clock
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self._reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def acquire(self) -> None:
+        """Let a call through or raise :class:`ProviderUnavailableError`."""
+        with self._lock:
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self._reset_seconds:
+                    self.rejected += 1
+                    raise ProviderUnavailableError(f"{self.name} provider unavailable (circuit open)")
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise ProviderUnavailableError(f"{self.name} provider unavailable (probe in flight)")
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("[PROVIDER] %s circuit closed", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        "[PROVIDER] %s circuit opened after %s failures", self.name, self._failures
+                    )
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Forget an acquired call that ended without an outcome (cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> dict[str, str | int]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+            }
+
+
+class ResilientProvider:
+    def __init__(
+        self,
+        *,
+        primary: ProviderEndpoint,
+        breaker: CircuitBreaker,
+        fallback: ProviderEndpoint | None = None,
+        hedging: bool = True,
+        min_delay: float = 0.5,
+        max_delay: float = 10.0,
+        window: int = 200,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._primary = primary
+        self._fallback = fallback
+        self._breaker = breaker
+        self._hedging = hedging
+        self._min_delay = float(min_delay)
+        self._max_delay = float(max_delay)
+        self._clock = clock
+        self._latencies: deque[float] = deque(maxlen=window)
+        # base_url -> clock() value before which the endpoint asked not to be called (429).
+        self._retry_after: dict[str, float] = {}
+        self.hedged = 0
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    def hedge_delay(self) -> float:
+        if len(self._latencies) < _MIN_LATENCY_SAMPLES:
+            return self._max_delay
+        ordered = sorted(self._latencies)
+        p95 = ordered[max(math.ceil(0.95 * len(ordered)), 1) - 1]
+        return min(max(p95, self._min_delay), self._max_delay)
+
+    async def call(
+        self,
+        send: Callable[[ProviderEndpoint], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        endpoints = [
+            endpoint
+            for endpoint in (self._primary, self._fallback)
+            if endpoint is not None and not self._rate_limited(endpoint)
+        ]
+        if not endpoints:
+            raise ProviderUnavailableError(f"{self._breaker.name} provider unavailable (rate limited)")
+        self._breaker.acquire()
+        try:
+            response = await self._hedged(send, endpoints)
+        except asyncio.CancelledError:
+            self._breaker.release()
+            raise
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        if response.status_code in _RETRYABLE_STATUSES:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+
+    # ── private ───────────────────────────────────────────────────────
+
+    async def _hedged(
+        self,
+        send: Callable[[ProviderEndpoint], Awaitable[httpx.Response]],
+        endpoints: list[ProviderEndpoint],
+    ) -> httpx.Response:
+        first = endpoints[0]
+        hedge: ProviderEndpoint | None = None
+        if self._hedging:
+            hedge = endpoints[1] if len(endpoints) > 1 else first
+        pending = {asyncio.create_task(self._attempt(send, first))}
+        last_error: Exception | None = None
+        try:
+            while pending:
+                timeout = self.hedge_delay() if hedge is not None else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    try:
+                        return task.result()
+                    except Exception as exc:
+                        last_error = exc
+                if hedge is None:
+                    continue
+                if done and hedge == first:
+                    # Failed fast with no distinct fallback: leave the retry to the caller and breaker.
+                    hedge = None
+                    continue
+                if self._rate_limited(hedge):
+                    hedge = None
+                    continue
+                self.hedged += 1
+                logger.info(
+                    "[PROVIDER] %s hedging to %s (%s)",
+                    self._breaker.name,
+                    hedge.base_url,
+                    "first attempt failed" if done else f"no answer after {timeout:.2f}s",
+                )
+                pending.add(asyncio.create_task(self._attempt(send, hedge)))
+                hedge = None
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if isinstance(last_error, _RetryableResponse):
+            return last_error.response
+        assert last_error is not None
+        raise last_error
+
+    async def _attempt(
+        self,
+        send: Callable[[ProviderEndpoint], Awaitable[httpx.Response]],
+        endpoint: ProviderEndpoint,
+    ) -> httpx.Response:
+        start = self._clock()
+        response = await send(endpoint)
+        if response.status_code == 429:
+            delay = _retry_after_seconds(response.headers.get("retry-after"))
+            if delay:
+                self._retry_after[endpoint.base_url] = self._clock() + delay
+                logger.warning(
+                    "[PROVIDER] %s %s rate limited, retrying after %.1fs",
+                    self._breaker.name,
+                    endpoint.base_url,
+                    delay,
+                )
+        if response.status_code in _RETRYABLE_STATUSES:
+            raise _RetryableResponse(response)
+        self._latencies.append(self._clock() - start)
+        return response
+
+    def _rate_limited(self, endpoint: ProviderEndpoint) -> bool:
+        until = self._retry_after.get(endpoint.base_url)
+        if until is None:
+            return False
+        if self._clock() >= until:
+            del self._retry_after[endpoint.base_url]
+            return False
+        return True
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    """Seconds from a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
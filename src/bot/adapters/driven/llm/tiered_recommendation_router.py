@@ -0,0 +1,151 @@
+"""Tiered model routing for recommendation calls.
+
+Every request goes to the fast tier (``LLM_FAST_MODEL``, short timeout)
+first. The strong tier (``LLM_MODEL``) is only called when the fast answer
+cannot be trusted:
+
+  * ``parse_error`` / ``provider_error`` — the fast call raised (unparseable
+    output, HTTP error, timeout);
+  * ``required_questions`` — a candidate still carries disambiguation
+    questions;
+  * ``low_score`` — no candidate reaches ``min_score``.
+
+An open circuit (``LlmUnavailableError``) is not escalated: both tiers share
+the provider's breaker.
+
+In batch mode only the items that need it go to the strong tier, in one
+call, and are merged back. Each attempt is its own ``llm_call_logs`` row
+tagged with its ``tier``; escalated rows also carry ``escalated_from`` and
+``escalation_reason`` in ``metadata_json``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+
+from src.bot.adapters.driven.llm.llm_recommendation_adapter import (
+    LlmError,
+    LlmParseError,
+    LlmUnavailableError,
+    OpenAiRecommendationAdapter,
+)
+from src.bot.application.dtos.recommendation.candidate import Candidate
+from src.bot.application.dtos.recommendation.recommendation_request import (
+    RecommendationRequest,
+)
+from src.bot.application.dtos.recommendation.recommendation_response import (
+    RecommendationResponse,
+)
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_FAST_FAILURES = (LlmError, httpx.HTTPError)
+
+
+class TieredRecommendationRouter:
+    """Implements :class:`LlmBatchRecommendationPort` over a fast and a strong adapter."""
+
+    def __init__(
+        self,
+        *,
+        fast: OpenAiRecommendationAdapter,
+        strong: OpenAiRecommendationAdapter,
+        min_score: float = 0.6,
+    ) -> None:
+        self._fast = fast
+        self._strong = strong
+        self._min_score = min_score
+
+    async def generate(self, request: RecommendationRequest) -> RecommendationResponse:
+        try:
+            response = await self._fast.generate(request)
+        except LlmUnavailableError:
+            raise
+        except _FAST_FAILURES as exc:
+            return await self._strong.generate(request, log_metadata=self._escalation(_failure_reason(exc)))
+
+        reason = self._escalation_reason(response.candidates, response.needs_more_info)
+        if reason is None:
+            return response
+        try:
+            return await self._strong.generate(request, log_metadata=self._escalation(reason))
+        except _FAST_FAILURES as exc:
+            logger.warning(
+                "[RECOMMENDER_DEBUG] strong tier failed (%s), keeping fast answer requester=%s: %s",
+                reason,
+                request.requester_id,
+                exc,
+            )
+            return response
+
+    async def generate_batch(self, request: RecommendationRequest) -> RecommendationResponse:
+        try:
+            response = await self._fast.generate_batch(request)
+        except LlmUnavailableError:
+            raise
+        except _FAST_FAILURES as exc:
+            return await self._strong.generate_batch(
+                request, log_metadata=self._escalation(_failure_reason(exc))
+            )
+
+        reasons: dict[str, str] = {}
+        for item in response.items:
+            reason = self._escalation_reason(item.accepted_candidates, item.needs_more_info)
+            if reason is not None and item.item_id:
+                reasons[item.item_id] = reason
+        if not reasons:
+            return response
+
+        subset = request.model_copy(
+            update={"parts": [part for part in request.parts or [] if part.item_id in reasons]}
+        )
+        try:
+            escalated = await self._strong.generate_batch(
+                subset,
+                log_metadata={
+                    **self._escalation(",".join(sorted(set(reasons.values())))),
+                    "escalated_item_ids": sorted(reasons),
+                },
+            )
+        except _FAST_FAILURES as exc:
+            logger.warning(
+                "[RECOMMENDER_DEBUG] strong tier batch failed, keeping fast answers items=%s: %s",
+                sorted(reasons),
+                exc,
+            )
+            return response
+
+        # Items the strong tier left out keep their fast answer.
+        stronger = {item.item_id: item for item in escalated.items}
+        response.items = [stronger.get(item.item_id, item) for item in response.items]
+        response.candidates = [
+            candidate for item in response.items for candidate in item.accepted_candidates
+        ]
+        response.needs_more_info = any(item.needs_more_info for item in response.items)
+        return response
+
+    # ── private helpers ──────────────────────────────────────────────
+
+    def _escalation_reason(self, candidates: list[Candidate], needs_more_info: bool) -> str | None:
+        if any(candidate.metadata.get("required_questions") for candidate in candidates):
+            return "required_questions"
+        if not candidates:
+            # Asking the mechanic for missing fields is not something a stronger model fixes.
+            return None if needs_more_info else "low_score"
+        best = max(candidate.score or 0.0 for candidate in candidates)
+        return "low_score" if best < self._min_score else None
+
+    def _escalation(self, reason: str) -> dict[str, Any]:
+        logger.info(
+            "[RECOMMENDER_DEBUG] escalating to strong tier model=%s reason=%s",
+            self._strong.model,
+            reason,
+        )
+        return {"escalated_from": self._fast.model, "escalation_reason": reason}
+
+
+def _failure_reason(exc: Exception) -> str:
+    return "parse_error" if isinstance(exc, LlmParseError) else "provider_error"
@@ -6,6 +6,10 @@ Run with:
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -48,13 +52,54 @@ from src.bot.adapters.driver.fastapi.routers.vehicles import (
 from src.bot.adapters.driver.fastapi.routers.admin_catalogs import (
     router as admin_catalogs_router,
 )
+from src.bot.adapters.driven.db.thread_events import PostgresThreadEventListener
+from src.bot.adapters.driver.fastapi.dependencies.use_cases import (
+    get_thread_event_hub,
+    refresh_vehicle_catalog_index,
+)
 from src.bot.infrastructure.config.settings import (
     LOCAL_CORS_ORIGIN_REGEX,
     get_cors_origins,
+    settings,
 )
 from src.bot.infrastructure.errors.http_exceptions import (
     register_exception_handlers,
 )
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+async def _refresh_vehicle_catalog_periodically(interval_seconds: int) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(refresh_vehicle_catalog_index)
+        except Exception as exc:
+            # Keep serving with the last good index; the seed works without a DB.
+            logger.warning("Vehicle catalog index refresh failed: %s", exc)
+        await asyncio.sleep(interval_seconds)
+
+
+@asynccontextmanager
+async def _lifespan(application: FastAPI) -> AsyncIterator[None]:
+    background: list[asyncio.Task[None]] = []
+    if settings.VEHICLE_CATALOG_REFRESH_SECONDS > 0:
+        background.append(
+            asyncio.create_task(
+                _refresh_vehicle_catalog_periodically(settings.VEHICLE_CATALOG_REFRESH_SECONDS)
+            )
+        )
+    if settings.THREAD_EVENTS_LISTEN:
+        listener = PostgresThreadEventListener(get_thread_event_hub(), settings.DATABASE_URL)
+        background.append(asyncio.create_task(listener.run()))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        for task in background:
+            with suppress(asyncio.CancelledError):
+                await task
 
 
 def create_app() -> FastAPI:
@@ -62,6 +107,7 @@ def create_app() -> FastAPI:
         title="Mecanice Browser Quotation Backend",
         version="0.1.0",
         description="API do fluxo interno de cotação entre mecânicos e autopeças.",
+        lifespan=_lifespan,
     )
 
     # ── CORS ────────────────────────────────────────────────────────
@@ -72,6 +118,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Offer-Version", "X-Next-Before"],
     )
 
     # ── exception handlers ────────────────────────────────────────────
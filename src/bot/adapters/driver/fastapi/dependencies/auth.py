@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from threading import Lock
 
 import jwt
 from fastapi import Header, HTTPException, status
@@ -29,7 +33,85 @@ def _http_401() -> HTTPException:
     )
 
 
+class VerifiedTokenCache:
+    """LRU of already verified tokens, keyed by SHA-256 digest and valid until the token's ``exp``.
+
+    Only successful decodes are stored, so invalid tokens always go through
+    full verification. Raw tokens are never kept in memory.
+    """
+
+    def __init__(self, *, max_entries: int, max_seconds: float) -> None:
+        self._max_entries = int(max_entries)
+        self._max_seconds = float(max_seconds)
+        self._lock = Lock()
+        self._entries: OrderedDict[bytes, tuple[BrowserIdentity, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> BrowserIdentity | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, identity: BrowserIdentity, exp: float | None) -> None:
+        if self._max_entries <= 0:
+            return
+        expires_at = time.time() + self._max_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (identity, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+VERIFIED_TOKEN_CACHE = VerifiedTokenCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    max_seconds=settings.AUTH_TOKEN_CACHE_MAX_SECONDS,
+)
+
+
 def _decode_browser_token(token: str) -> BrowserIdentity:
+    cached = VERIFIED_TOKEN_CACHE.get(token)
+    if cached is not None:
+        return cached
+    identity, exp = _verify_browser_token(token)
+    VERIFIED_TOKEN_CACHE.put(token, identity, exp)
+    return identity
+
+
+def _verify_browser_token(token: str) -> tuple[BrowserIdentity, float | None]:
     try:
         payload = jwt.decode(
             token,
@@ -64,8 +146,10 @@ def _decode_browser_token(token: str) -> BrowserIdentity:
     if isinstance(exp, (int, float)):
         if datetime.fromtimestamp(exp, tz=timezone.utc) < datetime.now(timezone.utc):
             raise _http_401()
+    else:
+        exp = None
 
-    return BrowserIdentity(
+    identity = BrowserIdentity(
         user_id=int(user_id),
         role=str(role),
         shop_id=int(shop_id) if shop_id is not None else None,
@@ -74,6 +158,7 @@ def _decode_browser_token(token: str) -> BrowserIdentity:
         name=payload.get("name"),
         email=payload.get("email"),
     )
+    return identity, exp
 
 
 def require_authenticated(
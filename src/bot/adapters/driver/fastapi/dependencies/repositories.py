@@ -29,7 +29,13 @@ from src.bot.adapters.driven.db.repositories.workshop_repo_sa import WorkshopRep
 from src.bot.adapters.driven.db.repositories.manufacturer_repo_sa import ManufacturerRepoSqlAlchemy
 from src.bot.adapters.driven.db.repositories.vehicle_repo_sa import VehicleRepoSqlAlchemy
 from src.bot.adapters.driven.db.repositories.catalog_repo_sa import CatalogRepoSqlAlchemy
-from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import RagChunkRepoSqlAlchemy
+from src.bot.adapters.driven.db.repositories.catalog_fitment_repo_sa import CatalogFitmentRepoSqlAlchemy
+from src.bot.adapters.driven.db.repositories.part_history_repo_sa import PartHistoryRepoSqlAlchemy
+from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import (
+    HnswSearchTuning,
+    RagChunkRepoSqlAlchemy,
+)
+from src.bot.infrastructure.config.settings import settings
 
 
 def get_mechanic_repo(
@@ -110,7 +116,29 @@ def get_catalog_repo(
     return CatalogRepoSqlAlchemy(session)
 
 
+def get_catalog_fitment_repo(
+    session: Session = Depends(get_session),
+) -> CatalogFitmentRepoSqlAlchemy:
+    return CatalogFitmentRepoSqlAlchemy(session)
+
+
+def get_part_history_repo(
+    session: Session = Depends(get_session),
+) -> PartHistoryRepoSqlAlchemy:
+    return PartHistoryRepoSqlAlchemy(session)
+
+
 def get_rag_chunk_repo(
     session: Session = Depends(get_session),
 ) -> RagChunkRepoSqlAlchemy:
-    return RagChunkRepoSqlAlchemy(session)
+    return RagChunkRepoSqlAlchemy(
+        session,
+        search_mode=settings.RAG_VECTOR_SEARCH_MODE,
+        rerank_factor=settings.RAG_RERANK_FACTOR,
+        tuning=HnswSearchTuning(
+            ef_search=settings.RAG_HNSW_EF_SEARCH,
+            ef_search_max=settings.RAG_HNSW_EF_SEARCH_MAX,
+            iterative_scan=settings.RAG_HNSW_ITERATIVE_SCAN,
+            max_scan_tuples=settings.RAG_HNSW_MAX_SCAN_TUPLES,
+        ),
+    )
@@ -9,9 +9,34 @@ from __future__ import annotations
 
 from functools import lru_cache
 
+from fastapi import Depends
+
+from src.bot.adapters.driven.db.repositories.catalog_fitment_repo_sa import (
+    CatalogFitmentRepoSqlAlchemy,
+)
+from src.bot.adapters.driven.db.repositories.part_history_repo_sa import (
+    PartHistoryRepoSqlAlchemy,
+)
+from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import (
+    RagChunkRepoSqlAlchemy,
+)
+from src.bot.adapters.driven.db.repositories.vehicle_catalog_source_sa import (
+    VehicleCatalogSourceSqlAlchemy,
+)
+from src.bot.adapters.driven.db.session import SessionLocal
+from src.bot.adapters.driven.db.thread_events import ThreadEventHub
+from src.bot.adapters.driven.llm.embeddings_adapter import EmbeddingsAdapter
 from src.bot.adapters.driven.llm.llm_recommendation_adapter import (
     OpenAiRecommendationAdapter,
 )
+from src.bot.adapters.driven.llm.provider_resilience import (
+    CircuitBreaker,
+    ProviderEndpoint,
+    ResilientProvider,
+)
+from src.bot.adapters.driven.llm.tiered_recommendation_router import (
+    TieredRecommendationRouter,
+)
 from src.bot.adapters.driven.webhooks.http_webhook_dispatcher import (
     HttpWebhookDispatcher,
 )
@@ -21,6 +46,11 @@ from src.bot.adapters.driven.whatsapp.observable_whatsapp_client import (
 from src.bot.adapters.driven.vehicle.brasilapi_plate_lookup import (
     BrasilApiVehiclePlateLookup,
 )
+from src.bot.adapters.driver.fastapi.dependencies.repositories import (
+    get_catalog_fitment_repo,
+    get_part_history_repo,
+    get_rag_chunk_repo,
+)
 from src.bot.application.useCases.fanout_quote_requests import (
     FanoutQuoteRequestsUseCase,
 )
@@ -30,17 +60,113 @@ from src.bot.application.useCases.submit_vendor_offer_and_notify_mechanic import
 from src.bot.application.services.idempotency_registry import (
     InMemoryIdempotencyRegistry,
 )
+from src.bot.application.services.password_hasher import PasswordHasher
+from src.bot.application.services.part_candidate_generator import PartCandidateGenerator
 from src.bot.application.services.parts_suggestion_provider import (
+    FitmentFirstSuggestionProvider,
     LlmPartsSuggestionProvider,
     PartsSuggestionProvider,
+    RetrievalFirstSuggestionProvider,
+)
+from src.bot.application.services.recommendation_service import (
+    VEHICLE_CATALOG_INDEX,
+    FilteredRecommendationService,
 )
 from src.bot.application.services.vehicle_plate_resolver import VehiclePlateResolver
 from src.bot.infrastructure.config.settings import settings
 
 
 @lru_cache(maxsize=1)
-def _llm_adapter() -> OpenAiRecommendationAdapter:
-    return OpenAiRecommendationAdapter(settings)
+def _llm_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        "llm",
+        failure_threshold=settings.PROVIDER_BREAKER_FAILURES,
+        reset_seconds=settings.PROVIDER_BREAKER_RESET_SECONDS,
+    )
+
+
+@lru_cache(maxsize=1)
+def _embeddings_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        "embeddings",
+        failure_threshold=settings.PROVIDER_BREAKER_FAILURES,
+        reset_seconds=settings.PROVIDER_BREAKER_RESET_SECONDS,
+    )
+
+
+def _resilient_provider(
+    breaker: CircuitBreaker,
+    *,
+    base_url: str,
+    api_key: str,
+    fallback_base_url: str,
+    fallback_api_key: str,
+    max_delay: float,
+) -> ResilientProvider:
+    fallback = (
+        ProviderEndpoint(fallback_base_url, fallback_api_key or api_key) if fallback_base_url else None
+    )
+    return ResilientProvider(
+        primary=ProviderEndpoint(base_url, api_key),
+        fallback=fallback,
+        breaker=breaker,
+        hedging=settings.PROVIDER_HEDGING_ENABLED,
+        min_delay=settings.PROVIDER_HEDGE_MIN_DELAY_SECONDS,
+        max_delay=min(settings.PROVIDER_HEDGE_MAX_DELAY_SECONDS, max_delay),
+    )
+
+
+def _llm_resilience(timeout_seconds: float) -> ResilientProvider:
+    # One per tier so each hedges on its own latency; the breaker is shared.
+    return _resilient_provider(
+        _llm_breaker(),
+        base_url=settings.LLM_BASE_URL,
+        api_key=settings.LLM_API_KEY,
+        fallback_base_url=settings.LLM_FALLBACK_BASE_URL,
+        fallback_api_key=settings.LLM_FALLBACK_API_KEY,
+        max_delay=timeout_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def _llm_adapter() -> OpenAiRecommendationAdapter | TieredRecommendationRouter:
+    strong = OpenAiRecommendationAdapter(
+        settings,
+        tier="strong" if settings.LLM_FAST_MODEL else None,
+        resilience=_llm_resilience(settings.LLM_TIMEOUT_SECONDS),
+    )
+    if not settings.LLM_FAST_MODEL:
+        return strong
+    return TieredRecommendationRouter(
+        fast=OpenAiRecommendationAdapter(
+            settings,
+            model=settings.LLM_FAST_MODEL,
+            timeout_seconds=settings.LLM_FAST_TIMEOUT_SECONDS,
+            tier="fast",
+            resilience=_llm_resilience(settings.LLM_FAST_TIMEOUT_SECONDS),
+        ),
+        strong=strong,
+        min_score=settings.LLM_ESCALATION_MIN_SCORE,
+    )
+
+
+@lru_cache(maxsize=1)
+def _embeddings_adapter() -> EmbeddingsAdapter:
+    return EmbeddingsAdapter(
+        settings,
+        resilience=_resilient_provider(
+            _embeddings_breaker(),
+            base_url=settings.EMBEDDINGS_BASE_URL,
+            api_key=settings.EMBEDDINGS_API_KEY,
+            fallback_base_url=settings.EMBEDDINGS_FALLBACK_BASE_URL,
+            fallback_api_key=settings.EMBEDDINGS_FALLBACK_API_KEY,
+            max_delay=settings.PROVIDER_HEDGE_MAX_DELAY_SECONDS,
+        ),
+    )
+
+
+def provider_breakers() -> dict[str, CircuitBreaker]:
+    return {"llm": _llm_breaker(), "embeddings": _embeddings_breaker()}
 
 
 @lru_cache(maxsize=1)
@@ -66,6 +192,11 @@ def _vehicle_plate_resolver() -> VehiclePlateResolver:
     return VehiclePlateResolver(_vehicle_plate_lookup())
 
 
+@lru_cache(maxsize=1)
+def _thread_event_hub() -> ThreadEventHub:
+    return ThreadEventHub()
+
+
 @lru_cache(maxsize=1)
 def _vendor_offer_idempotency_registry() -> InMemoryIdempotencyRegistry:
     return InMemoryIdempotencyRegistry()
@@ -82,8 +213,24 @@ def get_submit_vendor_offer_use_case() -> SubmitVendorOfferAndNotifyMechanicUseC
     )
 
 
-def get_parts_suggestion_provider() -> PartsSuggestionProvider:
-    return LlmPartsSuggestionProvider(adapter=_llm_adapter())
+def get_parts_suggestion_provider(
+    fitment_repo: CatalogFitmentRepoSqlAlchemy = Depends(get_catalog_fitment_repo),
+    chunk_repo: RagChunkRepoSqlAlchemy = Depends(get_rag_chunk_repo),
+    history_repo: PartHistoryRepoSqlAlchemy = Depends(get_part_history_repo),
+) -> PartsSuggestionProvider:
+    retrieval_first = RetrievalFirstSuggestionProvider(
+        fallback=LlmPartsSuggestionProvider(adapter=_llm_adapter()),
+        generator=PartCandidateGenerator(
+            chunk_repo=chunk_repo,
+            embeddings=_embeddings_adapter(),
+            history=history_repo,
+            chunk_limit=settings.PARTS_RETRIEVAL_CHUNKS,
+            history_limit=settings.PARTS_HISTORY_LIMIT,
+            hit_min_similarity=settings.PARTS_CATALOG_HIT_MIN_SIMILARITY,
+        ),
+        ranker=FilteredRecommendationService(llm=_llm_adapter()),
+    )
+    return FitmentFirstSuggestionProvider(fallback=retrieval_first, fitments=fitment_repo)
 
 
 def get_webhook_dispatcher() -> HttpWebhookDispatcher:
@@ -92,3 +239,33 @@ def get_webhook_dispatcher() -> HttpWebhookDispatcher:
 
 def get_vehicle_plate_resolver() -> VehiclePlateResolver:
     return _vehicle_plate_resolver()
+
+
+def get_thread_event_hub() -> ThreadEventHub:
+    return _thread_event_hub()
+
+
+@lru_cache(maxsize=1)
+def _password_hasher() -> PasswordHasher:
+    return PasswordHasher(
+        rounds=settings.BCRYPT_ROUNDS,
+        workers=settings.PASSWORD_HASH_WORKERS,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+        limits={
+            "email": settings.PASSWORD_LOGIN_MAX_CONCURRENT_PER_EMAIL,
+            "ip": settings.PASSWORD_LOGIN_MAX_CONCURRENT_PER_IP,
+        },
+    )
+
+
+def get_password_hasher() -> PasswordHasher:
+    return _password_hasher()
+
+
+def refresh_vehicle_catalog_index() -> int:
+    """Pull vehicles/manufacturers changed since the last run into the recommender index."""
+    session = SessionLocal()
+    try:
+        return VEHICLE_CATALOG_INDEX.refresh(VehicleCatalogSourceSqlAlchemy(session))
+    finally:
+        session.close()
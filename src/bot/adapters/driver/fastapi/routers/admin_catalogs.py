@@ -3,6 +3,7 @@
 Routes (all require admin auth):
   POST   /admin/catalogs          — upload a PDF catalog (async ingestion)
                                     accepts: brand (optional), manufacturer_id, description
+                                    identical content returns the existing catalog (200)
   GET    /admin/catalogs          — list catalog documents
                                     filters: brand, manufacturer_id, status, include_inactive
   GET    /admin/catalogs/{id}     — get one catalog document
@@ -10,33 +11,44 @@ Routes (all require admin auth):
                                     ?hard=true for physical deletion
   POST   /admin/catalogs/query    — RAG query against ingested catalogs
                                     filters: brand, manufacturer_id, catalog_id
+                                    repeated questions are answered from cache (cached=true)
+  POST   /admin/catalogs/query/stream — same query, answer streamed via SSE
+                                    events: sources, token, done, error
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import threading
 import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
     File,
     Form,
     HTTPException,
+    Request,
     Response,
     UploadFile,
 )
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from starlette.types import Message
 
+from src.bot.adapters.driven.db.repositories.catalog_fitment_repo_sa import CatalogFitmentRepoSqlAlchemy
 from src.bot.adapters.driven.db.repositories.catalog_repo_sa import CatalogRepoSqlAlchemy
 from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import RagChunkRepoSqlAlchemy
 from src.bot.adapters.driven.db.session import SessionLocal
 from src.bot.adapters.driven.llm.embeddings_adapter import EmbeddingsAdapter
 from src.bot.adapters.driver.fastapi.dependencies.auth import require_admin
 from src.bot.adapters.driver.fastapi.dependencies.repositories import (
+    get_catalog_fitment_repo,
     get_catalog_repo,
     get_rag_chunk_repo,
 )
@@ -47,15 +59,53 @@ from src.bot.adapters.driver.fastapi.schemas.catalogs import (
     RagQuerySource,
 )
 from src.bot.application.services.pdf_ingestion_service import PdfIngestionService
+from src.bot.application.services.rag_answer_cache import RAG_ANSWER_CACHE
 from src.bot.application.services.rag_query_service import RagQueryService
 from src.bot.infrastructure.config.settings import settings
 from src.bot.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/admin/catalogs", tags=["admin-catalogs"])
-
 _ALLOWED_MIME = {"application/pdf", "application/octet-stream"}
+# Multipart boundaries, part headers and the small form fields around the PDF.
+_FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class _BodyLimitRoute(APIRoute):
+    """Caps the request body while it is received.
+
+    Form parameters make Starlette read and spool the whole multipart body
+    before the handler runs, so the upload limit has to sit on ``receive``:
+    the request is answered 413 as soon as the byte count passes it, with or
+    without a Content-Length (chunked uploads). A declared length over the
+    limit is rejected before anything is read.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+
+        async def capped_handler(request: Request) -> Response:
+            limit = settings.CATALOG_UPLOAD_MAX_BYTES + _FORM_OVERHEAD_BYTES
+            declared = request.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > limit:
+                raise _too_large()
+            received = 0
+
+            async def receive() -> Message:
+                nonlocal received
+                message = await request.receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > limit:
+                        raise _too_large()
+                return message
+
+            return await handler(Request(request.scope, receive))
+
+        return capped_handler
+
+
+router = APIRouter(prefix="/admin/catalogs", tags=["admin-catalogs"], route_class=_BodyLimitRoute)
 
 
 def _upload_dir() -> Path:
@@ -64,6 +114,37 @@ def _upload_dir() -> Path:
     return path
 
 
+class _UploadTooLarge(Exception):
+    pass
+
+
+async def _stream_to_disk(file: UploadFile, dest: Path, *, max_bytes: int, chunk_bytes: int) -> tuple[int, str]:
+    """Copy ``file`` to ``dest`` chunk by chunk; returns (size, sha256 hex).
+
+    Raises :class:`_UploadTooLarge` as soon as ``max_bytes`` is exceeded and
+    removes the partial file.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with dest.open("wb") as out:
+            while chunk := await file.read(chunk_bytes):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _UploadTooLarge()
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def _too_large() -> HTTPException:
+    limit_mb = settings.CATALOG_UPLOAD_MAX_BYTES // (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"Arquivo excede o limite de {limit_mb} MB.")
+
+
 # ── Background ingestion ──────────────────────────────────────────────
 
 def _ingest_background(catalog_id: int, pdf_path: str) -> None:
@@ -86,6 +167,7 @@ async def _ingest_background_async(catalog_id: int, pdf_path: str) -> None:
             catalog_repo=CatalogRepoSqlAlchemy(session),
             chunk_repo=RagChunkRepoSqlAlchemy(session),
             embeddings=EmbeddingsAdapter(settings),
+            fitment_repo=CatalogFitmentRepoSqlAlchemy(session),
         )
         await service.ingest(catalog_id, pdf_path)
     except Exception as exc:
@@ -104,7 +186,8 @@ async def _ingest_background_async(catalog_id: int, pdf_path: str) -> None:
     dependencies=[Depends(require_admin)],
 )
 async def upload_catalog(
-    background_tasks: BackgroundTasks,
+    request: Request,
+    response: Response,
     file: Annotated[UploadFile, File(description="PDF catalog file")],
     manufacturer_id: Annotated[int | None, Form()] = None,
     description: Annotated[str | None, Form()] = None,
@@ -115,19 +198,40 @@ async def upload_catalog(
             not (file.filename or "").lower().endswith(".pdf")):
         raise HTTPException(status_code=400, detail="Somente arquivos PDF são aceitos.")
 
-    content = await file.read()
+    # The body was capped while it was received (see _BodyLimitRoute); the
+    # exact limit on the PDF itself is checked while copying it to disk.
+
     stored_filename = f"{uuid.uuid4().hex}.pdf"
     stored_path = _upload_dir() / stored_filename
-    stored_path.write_bytes(content)
+    try:
+        size, content_sha256 = await _stream_to_disk(
+            file,
+            stored_path,
+            max_bytes=settings.CATALOG_UPLOAD_MAX_BYTES,
+            chunk_bytes=settings.CATALOG_UPLOAD_CHUNK_BYTES,
+        )
+    except _UploadTooLarge:
+        raise _too_large() from None
+
+    existing = catalog_repo.find_active_by_sha256(content_sha256)
+    if existing is not None:
+        stored_path.unlink(missing_ok=True)
+        logger.info(
+            "Catalog upload '%s' matches catalog %d (%s); skipping ingestion",
+            file.filename, existing["id"], existing["status"],
+        )
+        response.status_code = 200
+        return CatalogDocumentResponse(**existing)
 
     catalog = catalog_repo.create(
         {
             "manufacturer_id": manufacturer_id,
             "original_filename": file.filename or stored_filename,
             "stored_filename": stored_filename,
-            "file_size_bytes": len(content),
+            "file_size_bytes": size,
             "description": description,
             "brand": brand,
+            "content_sha256": content_sha256,
         }
     )
 
@@ -185,11 +289,16 @@ async def list_catalogs(
 async def query_catalogs(
     body: RagQueryRequest,
     chunk_repo: RagChunkRepoSqlAlchemy = Depends(get_rag_chunk_repo),
+    fitment_repo: CatalogFitmentRepoSqlAlchemy = Depends(get_catalog_fitment_repo),
+    catalog_repo: CatalogRepoSqlAlchemy = Depends(get_catalog_repo),
 ) -> RagQueryResponse:
     service = RagQueryService(
         chunk_repo=chunk_repo,
         embeddings=EmbeddingsAdapter(settings),
         settings=settings,
+        fitment_repo=fitment_repo,
+        answer_cache=RAG_ANSWER_CACHE,
+        catalog_repo=catalog_repo,
     )
     result = await service.query(
         body.query,
@@ -202,6 +311,65 @@ async def query_catalogs(
         answer=result["answer"],
         sources=[RagQuerySource(**s) for s in result["sources"]],
         total_sources=result.get("total_sources", len(result["sources"])),
+        answer_source=result.get("answer_source", "llm"),
+        cached=result.get("cached", False),
+    )
+
+
+def _sse_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post(
+    "/query/stream",
+    summary="RAG query against ingested catalogs, answer streamed via SSE",
+    dependencies=[Depends(require_admin)],
+    response_class=StreamingResponse,
+)
+async def query_catalogs_stream(
+    body: RagQueryRequest,
+    request: Request,
+    chunk_repo: RagChunkRepoSqlAlchemy = Depends(get_rag_chunk_repo),
+    fitment_repo: CatalogFitmentRepoSqlAlchemy = Depends(get_catalog_fitment_repo),
+    catalog_repo: CatalogRepoSqlAlchemy = Depends(get_catalog_repo),
+) -> StreamingResponse:
+    service = RagQueryService(
+        chunk_repo=chunk_repo,
+        embeddings=EmbeddingsAdapter(settings),
+        settings=settings,
+        fitment_repo=fitment_repo,
+        answer_cache=RAG_ANSWER_CACHE,
+        catalog_repo=catalog_repo,
+    )
+    events = service.query_stream(
+        body.query,
+        manufacturer_id=body.manufacturer_id,
+        catalog_id=body.catalog_id,
+        brand=body.brand,
+        top_k=body.top_k,
+    )
+    # Retrieval runs here, while the request-scoped DB session is still open;
+    # only the LLM answer is streamed after the response starts.
+    first = await anext(events)
+
+    async def _body() -> AsyncIterator[str]:
+        try:
+            yield _sse_event(first["event"], first["data"])
+            async for event in events:
+                if await request.is_disconnected():
+                    logger.info("RAG stream client disconnected; cancelling LLM stream")
+                    break
+                yield _sse_event(event["event"], event["data"])
+        except Exception as exc:
+            logger.exception("RAG stream failed: %s", exc)
+            yield _sse_event("error", {"detail": "Falha ao gerar a resposta."})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        _body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 import jwt
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from src.bot.adapters.driver.fastapi.dependencies.auth import (
     BrowserIdentity,
@@ -13,6 +13,7 @@ from src.bot.adapters.driver.fastapi.dependencies.auth import (
 from src.bot.adapters.driver.fastapi.dependencies.repositories import (
     get_browser_auth_repo,
 )
+from src.bot.adapters.driver.fastapi.dependencies.use_cases import get_password_hasher
 from src.bot.adapters.driver.fastapi.schemas.auth import (
     AuthCredentialCreateSchema,
     AuthLoginResponseSchema,
@@ -23,6 +24,8 @@ from src.bot.adapters.driver.fastapi.schemas.auth import (
 from src.bot.adapters.driven.db.repositories.browser_auth_repo_sa import (
     BrowserAuthRepoSqlAlchemy,
 )
+from src.bot.application.services.password_hasher import PasswordHasher
+from src.bot.domain.errors import UnauthorizedError
 from src.bot.infrastructure.config.settings import settings
 
 router = APIRouter(tags=["auth"])
@@ -47,9 +50,19 @@ def _encode_token(principal: dict) -> str:
 @router.post("/auth/login", response_model=AuthLoginResponseSchema, summary="Login para usuários do app web")
 async def login(
     body: AuthLoginSchema,
+    request: Request,
     repo: BrowserAuthRepoSqlAlchemy = Depends(get_browser_auth_repo),
+    hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    principal = repo.authenticate(body.email, body.password)
+    credential = repo.find_login(body.email)
+    if credential is None or not await hasher.verify_and_upgrade(
+        body.password,
+        credential["password_hash"],
+        keys={"email": body.email.strip().lower(), "ip": request.client.host if request.client else ""},
+        on_rehash=lambda password_hash: repo.update_password_hash(credential, password_hash),
+    ):
+        raise UnauthorizedError("E-mail ou senha inválidos.")
+    principal = repo.complete_login(credential)
     token = _encode_token(principal)
     return AuthLoginResponseSchema(
         token=token,
@@ -79,5 +92,7 @@ async def me(identity: BrowserIdentity = Depends(require_authenticated)):
 async def create_credential(
     body: AuthCredentialCreateSchema,
     repo: BrowserAuthRepoSqlAlchemy = Depends(get_browser_auth_repo),
+    hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    return repo.create_credential(body.model_dump())
+    password_hash = await hasher.hash(body.password)
+    return repo.create_credential(body.model_dump(exclude={"password"}), password_hash=password_hash)
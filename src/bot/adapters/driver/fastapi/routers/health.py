@@ -2,7 +2,15 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from src.bot.adapters.driver.fastapi.dependencies.auth import (
+    VERIFIED_TOKEN_CACHE,
+    BrowserIdentity,
+    require_admin,
+)
+from src.bot.adapters.driver.fastapi.dependencies.use_cases import provider_breakers
+from src.bot.application.services.rag_answer_cache import RAG_ANSWER_CACHE
 
 router = APIRouter(tags=["health"])
 
@@ -10,3 +18,18 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@router.get("/health/auth-cache", summary="Métricas do cache de tokens verificados")
+async def auth_cache_stats(_: BrowserIdentity = Depends(require_admin)):
+    return VERIFIED_TOKEN_CACHE.stats()
+
+
+@router.get("/health/rag-cache", summary="Métricas do cache de respostas RAG")
+async def rag_cache_stats(_: BrowserIdentity = Depends(require_admin)):
+    return RAG_ANSWER_CACHE.stats()
+
+
+@router.get("/health/providers", summary="Estado dos circuit breakers de LLM e embeddings")
+async def provider_stats(_: BrowserIdentity = Depends(require_admin)):
+    return {name: breaker.stats() for name, breaker in provider_breakers().items()}
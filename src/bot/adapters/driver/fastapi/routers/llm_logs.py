@@ -29,6 +29,7 @@ async def list_llm_logs(
     model: str | None = None,
     requester_id: str | None = None,
     thread_id: str | None = None,
+    tier: str | None = None,
     repo: LlmCallLogRepoSqlAlchemy = Depends(get_llm_call_log_repo),
 ):
     return repo.list_logs(
@@ -38,6 +39,7 @@ async def list_llm_logs(
         model=model,
         requester_id=requester_id,
         thread_id=thread_id,
+        tier=tier,
     )
 
 
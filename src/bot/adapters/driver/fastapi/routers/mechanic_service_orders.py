@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
 from src.bot.adapters.driver.fastapi.dependencies.auth import (
     BrowserIdentity,
@@ -26,10 +26,17 @@ router = APIRouter(prefix="/mechanic/service-orders", tags=["mechanic-service-or
     summary="Listar ordens de serviço do mecânico logado",
 )
 async def list_service_orders(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    before: str | None = Query(default=None, description="id da última ordem da página anterior"),
     mechanic: BrowserIdentity = Depends(require_mechanic),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
-    return repo.list_service_orders(mechanic_id=mechanic.mechanic_id)
+    rows, next_before = repo.list_service_orders(mechanic_id=mechanic.mechanic_id, limit=limit, before=before)
+    # The body stays a plain list; the next page's cursor travels in a header, absent on the last page.
+    if next_before is not None:
+        response.headers["X-Next-Before"] = next_before
+    return rows
 
 
 @router.get(
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from src.bot.adapters.driver.fastapi.dependencies.auth import (
     BrowserIdentity,
@@ -10,10 +10,12 @@ from src.bot.adapters.driver.fastapi.dependencies.auth import (
 from src.bot.adapters.driver.fastapi.dependencies.repositories import (
     get_browser_thread_repo,
 )
+from src.bot.adapters.driver.fastapi.http_cache import make_etag, not_modified, set_etag
 from src.bot.adapters.driver.fastapi.schemas.threads import (
     OfferFinalizeSchema,
     OfferItemCreateSchema,
-    OfferItemResponseSchema,
+    OfferItemMutationResponseSchema,
+    OfferItemsBatchSchema,
     OfferSubmitResponseSchema,
     OfferSubmitSchema,
     OfferItemUpdateSchema,
@@ -29,20 +31,30 @@ router = APIRouter(prefix="/offers", tags=["offers"])
 @router.get("/{offer_id}", response_model=OfferResponseSchema, summary="Detalhar oferta")
 async def get_offer(
     offer_id: int,
+    request: Request,
+    response: Response,
     actor: BrowserIdentity = Depends(require_authenticated),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
+    version = repo.get_offer_version(offer_id=offer_id, actor=actor)
+    etag = make_etag("offer", offer_id, version, actor.role, actor.user_id)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    set_etag(response, etag)
     return repo.get_offer(offer_id=offer_id, actor=actor)
 
 
 @router.post(
     "/{offer_id}/items",
-    response_model=OfferItemResponseSchema,
+    response_model=OfferItemMutationResponseSchema,
     summary="Adicionar item à oferta",
 )
 async def add_offer_item(
     offer_id: int,
     body: OfferItemCreateSchema,
+    expected_version: int | None = Query(default=None, ge=0),
     seller: BrowserIdentity = Depends(require_seller),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
@@ -50,18 +62,39 @@ async def add_offer_item(
         offer_id=offer_id,
         seller_id=seller.vendor_id,
         payload=body.model_dump(),
+        expected_version=expected_version,
+    )
+
+
+@router.put(
+    "/{offer_id}/items:batch",
+    response_model=OfferResponseSchema,
+    summary="Aplicar alterações em lote nos itens da oferta",
+)
+async def batch_offer_items(
+    offer_id: int,
+    body: OfferItemsBatchSchema,
+    seller: BrowserIdentity = Depends(require_seller),
+    repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
+):
+    return repo.apply_offer_item_changes(
+        offer_id=offer_id,
+        seller_id=seller.vendor_id,
+        operations=[operation.model_dump(exclude_unset=True) for operation in body.operations],
+        expected_version=body.expected_version,
     )
 
 
 @router.put(
     "/{offer_id}/items/{item_id}",
-    response_model=OfferItemResponseSchema,
+    response_model=OfferItemMutationResponseSchema,
     summary="Atualizar item da oferta",
 )
 async def update_offer_item(
     offer_id: int,
     item_id: int,
     body: OfferItemUpdateSchema,
+    expected_version: int | None = Query(default=None, ge=0),
     seller: BrowserIdentity = Depends(require_seller),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
@@ -70,6 +103,7 @@ async def update_offer_item(
         item_id=item_id,
         seller_id=seller.vendor_id,
         payload=body.model_dump(exclude_unset=True),
+        expected_version=expected_version,
     )
 
 
@@ -81,15 +115,17 @@ async def update_offer_item(
 async def delete_offer_item(
     offer_id: int,
     item_id: int,
+    expected_version: int | None = Query(default=None, ge=0),
     seller: BrowserIdentity = Depends(require_seller),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ) -> Response:
-    repo.delete_offer_item(
+    version = repo.delete_offer_item(
         offer_id=offer_id,
         item_id=item_id,
         seller_id=seller.vendor_id,
+        expected_version=expected_version,
     )
-    return Response(status_code=204)
+    return Response(status_code=204, headers={"X-Offer-Version": str(version)})
 
 
 @router.post(
@@ -5,12 +5,13 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 import jwt
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from src.bot.adapters.driver.fastapi.dependencies.auth import require_admin
 from src.bot.adapters.driver.fastapi.dependencies.repositories import (
     get_seller_credential_repo,
 )
+from src.bot.adapters.driver.fastapi.dependencies.use_cases import get_password_hasher
 from src.bot.adapters.driver.fastapi.schemas.seller_auth import (
     SellerCredentialCreateSchema,
     SellerCredentialResponseSchema,
@@ -20,6 +21,8 @@ from src.bot.adapters.driver.fastapi.schemas.seller_auth import (
 from src.bot.adapters.driven.db.repositories.seller_credential_repo_sa import (
     SellerCredentialRepoSqlAlchemy,
 )
+from src.bot.application.services.password_hasher import PasswordHasher
+from src.bot.domain.errors import UnauthorizedError
 from src.bot.infrastructure.config.settings import settings
 
 router = APIRouter(prefix="/seller", tags=["seller-auth"])
@@ -32,9 +35,18 @@ router = APIRouter(prefix="/seller", tags=["seller-auth"])
 )
 async def seller_login(
     body: SellerLoginSchema,
+    request: Request,
     repo: SellerCredentialRepoSqlAlchemy = Depends(get_seller_credential_repo),
+    hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    result = repo.authenticate(body.email, body.password)
+    result = repo.find_login(body.email)
+    if result is None or not await hasher.verify_and_upgrade(
+        body.password,
+        result["password_hash"],
+        keys={"email": body.email.strip().lower(), "ip": request.client.host if request.client else ""},
+        on_rehash=lambda password_hash: repo.update_password_hash(int(result["id"]), password_hash),
+    ):
+        raise UnauthorizedError("E-mail ou senha inválidos.")
 
     now = datetime.now(timezone.utc)
     payload = {
@@ -63,5 +75,7 @@ async def seller_login(
 async def create_credential(
     body: SellerCredentialCreateSchema,
     repo: SellerCredentialRepoSqlAlchemy = Depends(get_seller_credential_repo),
+    hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    return repo.create_credential(body.model_dump())
+    password_hash = await hasher.hash(body.password)
+    return repo.create_credential(body.model_dump(exclude={"password"}), password_hash=password_hash)
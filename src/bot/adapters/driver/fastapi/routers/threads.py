@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import asyncio
+
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from src.bot.adapters.driver.fastapi.dependencies.auth import (
     BrowserIdentity,
@@ -13,12 +15,15 @@ from src.bot.adapters.driver.fastapi.dependencies.repositories import (
 )
 from src.bot.adapters.driver.fastapi.dependencies.use_cases import (
     get_parts_suggestion_provider,
+    get_thread_event_hub,
 )
+from src.bot.adapters.driver.fastapi.http_cache import make_etag, not_modified, set_etag
 from src.bot.adapters.driver.fastapi.schemas.threads import (
     OfferResponseSchema,
     PartRequestResponseSchema,
     SuggestedPartResponseSchema,
     ThreadComparisonResponseSchema,
+    ThreadChangesResponseSchema,
     ThreadCreateSchema,
     ThreadDetailResponseSchema,
     ThreadMessageCreateSchema,
@@ -28,7 +33,9 @@ from src.bot.adapters.driver.fastapi.schemas.threads import (
 from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
     BrowserThreadRepoSqlAlchemy,
 )
+from src.bot.adapters.driven.db.thread_events import ThreadEventHub
 from src.bot.application.services.parts_suggestion_provider import PartsSuggestionProvider
+from src.bot.infrastructure.config.settings import settings
 
 router = APIRouter(prefix="/threads", tags=["threads"])
 
@@ -62,8 +69,9 @@ async def create_thread(
         try:
             all_suggestions: list[dict] = []
             vehicle_payload = _thread_vehicle_payload(body)
-            for requested_item in result["requested_items"]:
-                suggestions = await suggestion_provider.suggest(
+            requested_items = result["requested_items"]
+            suggestions_by_item = await suggestion_provider.suggest_batch(
+                [
                     {
                         "thread_id": result["thread"]["id"],
                         "request_id": result["request"]["id"],
@@ -73,7 +81,10 @@ async def create_thread(
                         "requested_items_count": requested_item["quantity"],
                         "vehicle": vehicle_payload,
                     }
-                )
+                    for requested_item in requested_items
+                ]
+            )
+            for requested_item, suggestions in zip(requested_items, suggestions_by_item):
                 for suggestion in suggestions:
                     all_suggestions.append(
                         {
@@ -110,9 +121,19 @@ async def list_threads(
 @router.get("/{thread_id}", response_model=ThreadDetailResponseSchema, summary="Detalhar thread")
 async def get_thread(
     thread_id: int,
+    request: Request,
+    response: Response,
     actor: BrowserIdentity = Depends(require_authenticated),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
+    # Payloads differ per viewer (sellers only see their own offer), so the viewer is part of the tag.
+    version = repo.get_thread_version(thread_id=thread_id, actor=actor)
+    etag = make_etag("thread", thread_id, version, actor.role, actor.user_id)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    set_etag(response, etag)
     return repo.get_thread_detail(thread_id=thread_id, actor=actor)
 
 
@@ -123,10 +144,74 @@ async def get_thread(
 )
 async def list_messages(
     thread_id: int,
+    request: Request,
+    response: Response,
+    after_id: int | None = Query(default=None, ge=0),
+    before_id: int | None = Query(default=None, gt=0),
+    limit: int = Query(default=100, ge=1, le=200),
     actor: BrowserIdentity = Depends(require_authenticated),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
-    return repo.list_messages(thread_id=thread_id, actor=actor)
+    # Only the thread row is read here; message rows are skipped entirely on a 304.
+    # ``last_message_at`` changes whenever a message is added.
+    thread = repo.get_visible_thread(thread_id=thread_id, actor=actor)
+    etag = make_etag("messages", thread_id, thread["last_message_at"], after_id, before_id, limit)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    set_etag(response, etag)
+    return repo.list_messages(
+        thread_id=thread_id,
+        actor=actor,
+        limit=limit,
+        after_id=after_id,
+        before_id=before_id,
+        thread=thread,
+    )
+
+
+@router.get(
+    "/{thread_id}/changes",
+    response_model=ThreadChangesResponseSchema,
+    summary="Long-poll de novas mensagens e mudanças de oferta da thread",
+)
+async def wait_for_changes(
+    thread_id: int,
+    after_message_id: int = Query(default=0, ge=0),
+    after_version: int | None = Query(default=None, ge=0),
+    timeout: int = Query(default=25, ge=0, le=settings.THREAD_CHANGES_MAX_WAIT_SECONDS),
+    actor: BrowserIdentity = Depends(require_authenticated),
+    repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
+    hub: ThreadEventHub = Depends(get_thread_event_hub),
+):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    event = hub.subscribe(thread_id)
+    try:
+        while True:
+            changes = repo.list_changes(
+                thread_id=thread_id,
+                actor=actor,
+                after_message_id=after_message_id,
+                after_version=after_version,
+            )
+            messages = changes["messages"]
+            # Without ``after_version`` only new messages end the wait, as before.
+            version_moved = after_version is not None and changes["version"] > after_version
+            remaining = deadline - loop.time()
+            if messages or version_moved or remaining <= 0:
+                return {
+                    "thread_id": thread_id,
+                    "messages": messages,
+                    "last_message_id": max((int(message["id"]) for message in messages), default=after_message_id),
+                    "version": changes["version"],
+                    "offers": changes["offers"],
+                    "timed_out": not messages and not version_moved,
+                }
+            await hub.wait(event, remaining)
+    finally:
+        hub.unsubscribe(thread_id, event)
 
 
 @router.post(
@@ -200,9 +285,18 @@ async def create_offer(
 )
 async def list_offers(
     thread_id: int,
+    request: Request,
+    response: Response,
     actor: BrowserIdentity = Depends(require_authenticated),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
+    version = repo.get_thread_version(thread_id=thread_id, actor=actor)
+    etag = make_etag("offers", thread_id, version, actor.role, actor.user_id)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    set_etag(response, etag)
     return repo.list_offers(thread_id=thread_id, actor=actor)
 
 
@@ -213,7 +307,16 @@ async def list_offers(
 )
 async def get_comparison(
     thread_id: int,
+    request: Request,
+    response: Response,
     mechanic: BrowserIdentity = Depends(require_mechanic),
     repo: BrowserThreadRepoSqlAlchemy = Depends(get_browser_thread_repo),
 ):
+    version = repo.get_thread_version(thread_id=thread_id, actor=mechanic)
+    etag = make_etag("comparison", thread_id, version, mechanic.role, mechanic.user_id)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    set_etag(response, etag)
     return repo.get_comparison(thread_id=thread_id, mechanic_id=mechanic.mechanic_id)
@@ -19,6 +19,7 @@ class CatalogDocumentResponse(BaseModel):
     chunk_count: int | None
     error_message: str | None
     is_active: bool
+    content_sha256: str | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -46,3 +47,8 @@ class RagQueryResponse(BaseModel):
     answer: str
     sources: list[RagQuerySource]
     total_sources: int = Field(description="Total sources considered")
+    answer_source: str = Field(
+        default="llm",
+        description="'fitments' when answered from the parsed application tables, else 'llm'",
+    )
+    cached: bool = Field(default=False, description="True when the answer was served from the answer cache")
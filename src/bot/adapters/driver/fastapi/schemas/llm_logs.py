@@ -26,6 +26,7 @@ class LlmLogSummarySchema(BaseModel):
     provider: str
     endpoint: str
     model: str
+    tier: str | None = None
     status: str
     http_status: int | None = None
     duration_ms: int | None = None
@@ -152,6 +152,26 @@ class OfferItemUpdateSchema(BaseModel):
         return self
 
 
+class OfferItemOperationSchema(OfferItemUpdateSchema):
+    op: Literal["create", "update", "delete"]
+    item_id: int | None = Field(default=None, gt=0)
+    source_type: OfferItemSourceType | None = None
+    suggested_part_id: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def check_operation(self) -> "OfferItemOperationSchema":
+        if self.op == "create" and self.source_type is None:
+            raise ValueError("source_type is required for create operations")
+        if self.op in {"update", "delete"} and self.item_id is None:
+            raise ValueError(f"item_id is required for {self.op} operations")
+        return self
+
+
+class OfferItemsBatchSchema(BaseModel):
+    expected_version: int = Field(ge=0)
+    operations: list[OfferItemOperationSchema] = Field(min_length=1, max_length=200)
+
+
 class OfferFinalizeSchema(BaseModel):
     selected_option_ids: list[int] | None = None
 
@@ -229,6 +249,15 @@ class ThreadMessageResponseSchema(BaseModel):
     created_at: datetime
 
 
+class ThreadChangesResponseSchema(BaseModel):
+    thread_id: int
+    messages: list[ThreadMessageResponseSchema]
+    last_message_id: int
+    version: int
+    offers: list[OfferResponseSchema] = Field(default_factory=list)
+    timed_out: bool
+
+
 class SuggestedPartResponseSchema(BaseModel):
     id: int
     thread_id: int
@@ -263,6 +292,10 @@ class OfferItemResponseSchema(BaseModel):
     updated_at: datetime | None = None
 
 
+class OfferItemMutationResponseSchema(OfferItemResponseSchema):
+    offer_version: int
+
+
 class OfferGroupResponseSchema(BaseModel):
     requested_item_id: int
     requested_item_description: str
@@ -298,6 +331,7 @@ class OfferResponseSchema(BaseModel):
     seller_shop_name: str
     seller_store: SellerStoreSchema
     seller_user: SellerUserSchema
+    version: int = 0
     groups: list[OfferGroupResponseSchema] = Field(default_factory=list)
     items: list[OfferItemResponseSchema] = Field(default_factory=list)
 
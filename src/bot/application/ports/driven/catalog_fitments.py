@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+
+class CatalogFitmentLookupPort(Protocol):
+    """Exact-vehicle reads of the ``catalog_fitments`` table."""
+
+    def find_fitments(
+        self,
+        *,
+        model: str,
+        year: int | None = None,
+        part_types: list[str] | None = None,
+        brand: str | None = None,
+        catalog_id: int | None = None,
+        manufacturer_id: int | None = None,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Rows from active catalogs whose model is ``model`` or starts with it.
+
+        Rows: id, catalog_id, original_filename, brand, model, engine, fuel,
+        year_start, year_end, part_type, part_code, variant, reference, gap, page.
+        """
+        ...
@@ -16,3 +16,11 @@ class LlmRecommendationPort(Protocol):
     ) -> RecommendationResponse:
         """Generate a recommendation response from an LLM or model service."""
         ...
+
+
+class LlmBatchRecommendationPort(LlmRecommendationPort, Protocol):
+    async def generate_batch(
+        self, request: RecommendationRequest
+    ) -> RecommendationResponse:
+        """Rank every part of the request in one call, keyed by ``item_id``."""
+        ...
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+
+class PartHistoryLookupPort(Protocol):
+    """Parts previously offered or suggested for a vehicle model."""
+
+    def find_history_candidates(
+        self,
+        *,
+        queries: list[dict[str, Any]],
+        limit: int = 10,
+    ) -> list[list[dict[str, Any]]]:
+        """One result list per query, in order, looked up in a single round trip.
+
+        Each query has ``model``, ``keywords`` and an optional ``year``; a query
+        without model or keywords gets an empty list. Rows are one per part
+        number seen on threads for ``model`` whose item matches ``keywords``:
+        part_number, brand, title, note, offered_count, chosen_count,
+        suggested_count, year_matches, average_price_brl. Most chosen first,
+        at most ``limit`` per query.
+        """
+        ...
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Protocol
+
+
+class VehicleCatalogSourcePort(Protocol):
+    """Incremental reads of the ``manufacturers`` / ``vehicles`` reference tables.
+
+    Both methods return rows with ``updated_at >= since`` (all rows when
+    ``since`` is None), soft-deleted rows included so callers can drop them.
+    """
+
+    def list_manufacturers_changed_since(self, since: datetime | None) -> list[dict[str, Any]]:
+        """Rows: id, name, soft_delete, updated_at."""
+        ...
+
+    def list_vehicles_changed_since(self, since: datetime | None) -> list[dict[str, Any]]:
+        """Rows: id, manufacturer_id, model, model_year_start, model_year_end, soft_delete, updated_at."""
+        ...
@@ -0,0 +1,195 @@
+"""Exact-vehicle answers from the ``catalog_fitments`` table.
+
+A query qualifies when it names a catalog model (via the recommender's
+vehicle index); the part type (vela/cabo/bobina), year and engine
+displacement narrow it further. Anything else stays on the vector search +
+LLM path.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.bot.application.services.catalog_fitment_parser import (
+    IGNITION_CABLE,
+    IGNITION_COIL,
+    SPARK_PLUG,
+)
+from src.bot.application.services.keyword_matcher import normalize_text
+from src.bot.application.services.recommendation_service import VEHICLE_CATALOG_INDEX
+
+PART_TYPE_LABELS = {
+    SPARK_PLUG: "Vela de ignição",
+    IGNITION_CABLE: "Cabo de ignição",
+    IGNITION_COIL: "Bobina de ignição",
+}
+
+_CABLE_RE = re.compile(r"\bcabos?\b")
+_COIL_RE = re.compile(r"\bbobinas?\b")
+_SPARK_PLUG_RE = re.compile(r"\bvelas?\b|\bspark plugs?\b")
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_DISPLACEMENT_RE = re.compile(r"\b\d[.,]\d\b")
+
+
+@dataclass(frozen=True, slots=True)
+class FitmentQuery:
+    model: str
+    year: int | None = None
+    engine: str | None = None
+    part_types: list[str] = field(default_factory=list)
+
+
+def resolve_fitment_query(text: str, vehicle: dict[str, Any] | None = None) -> FitmentQuery | None:
+    """Model/year/engine/part types named in ``text`` (and ``vehicle``); None without a model."""
+    vehicle = vehicle or {}
+    normalized = normalize_text(str(text or ""))
+    vehicle_model = normalize_text(str(vehicle.get("model") or ""))
+
+    model = None
+    for source in (vehicle_model, normalized):
+        models = VEHICLE_CATALOG_INDEX.models_in(source) if source else []
+        if models:
+            model = models[0]
+            break
+    model = model or vehicle_model or None
+    if not model:
+        return None
+
+    year_text = str(vehicle.get("year") or "").strip()
+    years = [int(year) for year in _YEAR_RE.findall(normalized)]
+    year = int(year_text) if year_text.isdigit() else (years[-1] if years else None)
+
+    engine_source = " ".join(filter(None, [normalize_text(str(vehicle.get("engine") or "")), vehicle_model, normalized]))
+    displacement = _DISPLACEMENT_RE.search(engine_source)
+
+    return FitmentQuery(
+        model=model,
+        year=year,
+        engine=displacement.group(0).replace(",", ".") if displacement else None,
+        part_types=detect_part_types(normalized),
+    )
+
+
+def detect_part_types(normalized_text: str) -> list[str]:
+    """Ignition part types named in the text; "cabo de vela" is a cable, not a plug."""
+    part_types = []
+    if _CABLE_RE.search(normalized_text):
+        part_types.append(IGNITION_CABLE)
+    if _COIL_RE.search(normalized_text):
+        part_types.append(IGNITION_COIL)
+    without_cables = re.sub(r"\bcabos? de velas?\b", " ", normalized_text)
+    if _SPARK_PLUG_RE.search(without_cables):
+        part_types.append(SPARK_PLUG)
+    return part_types
+
+
+def narrow_by_engine(rows: list[dict[str, Any]], engine: str | None) -> list[dict[str, Any]]:
+    """Rows whose model/engine mention ``engine`` ("1.0"), or all rows when none do."""
+    if not engine:
+        return rows
+    matching = [
+        row
+        for row in rows
+        if engine in normalize_text(f"{row.get('model') or ''} {row.get('engine') or ''}").replace(",", ".")
+    ]
+    return matching or rows
+
+
+def format_years(row: dict[str, Any]) -> str:
+    start, end = row.get("year_start"), row.get("year_end")
+    if start and end:
+        return str(start) if start == end else f"{start}–{end}"
+    if start:
+        return f"{start} em diante"
+    if end:
+        return f"até {end}"
+    return "—"
+
+
+def format_fitment_answer(rows: list[dict[str, Any]]) -> str:
+    """Markdown table in the same shape the LLM is asked to produce."""
+    lines = [
+        "Resultado da tabela de aplicação dos catálogos:",
+        "",
+        "| Veículo | Motor | Combustível | Anos | Peça | Marca | Código | Gap (mm) |",
+        "|---------|-------|-------------|------|------|-------|--------|----------|",
+    ]
+    for row in rows:
+        part = PART_TYPE_LABELS.get(row["part_type"], row["part_type"])
+        if row.get("variant"):
+            part = f"{part} ({'Iridium' if row['variant'] == 'iridium' else 'Convencional'})"
+        lines.append(
+            "| "
+            + " | ".join(
+                [
+                    row["model"],
+                    row.get("engine") or "—",
+                    (row.get("fuel") or "—").capitalize(),
+                    format_years(row),
+                    part,
+                    row["brand"],
+                    row["part_code"],
+                    row.get("gap") or "—",
+                ]
+            )
+            + " |"
+        )
+    return "\n".join(lines)
+
+
+def fitment_sources(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """One source per catalog page, in the ``RagQuerySource`` shape."""
+    grouped: dict[tuple[Any, Any], list[dict[str, Any]]] = {}
+    for row in rows:
+        grouped.setdefault((row["catalog_id"], row.get("page")), []).append(row)
+    return [
+        {
+            "catalog_id": catalog_id,
+            "brand": page_rows[0]["brand"],
+            "filename": page_rows[0].get("original_filename"),
+            "page": page,
+            "chunk_text": "; ".join(_row_text(row) for row in page_rows)[:500],
+            "similarity": 1.0,
+        }
+        for (catalog_id, page), page_rows in grouped.items()
+    ]
+
+
+def fitment_suggestions(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Rows as parts suggestions, one per brand/part code."""
+    suggestions: list[dict[str, Any]] = []
+    seen: set[tuple[str, str]] = set()
+    for row in rows:
+        key = (row["brand"], row["part_code"])
+        if key in seen:
+            continue
+        seen.add(key)
+        suggestions.append(
+            {
+                "title": f"{PART_TYPE_LABELS.get(row['part_type'], row['part_type'])} {row['brand']} {row['part_code']}",
+                "brand": row["brand"],
+                "part_number": row["part_code"],
+                "confidence": 1.0,
+                "note": _row_text(row),
+                "metadata_json": {
+                    "source": "catalog_fitments",
+                    "fitment_id": row["id"],
+                    "catalog_id": row["catalog_id"],
+                    "page": row.get("page"),
+                    "part_type": row["part_type"],
+                    "variant": row.get("variant"),
+                    "gap": row.get("gap"),
+                },
+            }
+        )
+    return suggestions
+
+
+def _row_text(row: dict[str, Any]) -> str:
+    vehicle = " ".join(filter(None, [row["model"], row.get("engine"), row.get("fuel")]))
+    text = f"{vehicle} ({format_years(row)}): {row['brand']} {row['part_code']}"
+    if row.get("gap"):
+        text += f", gap {row['gap']} mm"
+    return text
@@ -0,0 +1,223 @@
+"""Deterministic extraction of application tables from Bosch/NGK catalogs.
+
+Both catalogs print one row per vehicle/engine with a fixed column order
+(the same layouts described to the LLM in ``rag_query_service``):
+
+  Bosch: Modelo | Motorização | Combustível | Código da vela | Gap |
+         Nº Referência | Código Simplificado | Cabo | Bobina
+  NGK:   Modelo | Motorização | Combustível | Código Convencional |
+         Código Iridium | Gap | Anos | Cabo de ignição
+
+Rows come either from PyMuPDF table detection or from text lines whose
+cells are separated by ``|``, tabs or runs of spaces. A row only becomes a
+fitment when its fuel and gap cells look right, so headers, footnotes and
+anything the layout does not explain are left to the vector search + LLM.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from src.bot.application.services.keyword_matcher import normalize_text
+
+SPARK_PLUG = "spark_plug"
+IGNITION_CABLE = "ignition_cable"
+IGNITION_COIL = "ignition_coil"
+
+_CELL_SPLIT_RE = re.compile(r"\s*\|\s*|\t+|\s{2,}")
+_FUEL_RE = re.compile(r"\b(gasolina|flex|alcool|etanol|gnv)\b")
+_GAP_RE = re.compile(r"^\d[.,]\d{1,2}(?:\s*[-–/]\s*\d[.,]\d{1,2})?$")
+_FULL_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_SHORT_YEAR_RE = re.compile(r"(?<![\d.,])\d{2}(?![\d.,])")
+_OPEN_END_RE = re.compile(r"(?:→|->|>|em diante|diante|\+)\s*$")
+_UNTIL_RE = re.compile(r"^\s*(?:ate|<)")
+_EMPTY_CELL = {"", "-", "–", "—", "n/a", "*"}
+
+
+def supported_brand(brand: str | None) -> str | None:
+    """Canonical layout name ("Bosch"/"NGK") for ``brand``, or None."""
+    key = normalize_text(str(brand or ""))
+    if key == "bosch":
+        return "Bosch"
+    if key == "ngk":
+        return "NGK"
+    return None
+
+
+def rows_from_text(page_text: str) -> list[list[str]]:
+    """Split text lines into cells; lines without at least two cells are skipped."""
+    rows: list[list[str]] = []
+    for line in page_text.splitlines():
+        # A leading "|" is kept: it marks an empty model cell, not a border.
+        cells = [cell.strip() for cell in _CELL_SPLIT_RE.split(line.strip().rstrip("|").rstrip())]
+        if len(cells) >= 2:
+            rows.append(cells)
+    return rows
+
+
+def parse_fitment_rows(
+    rows: Iterable[Sequence[str | None]],
+    *,
+    brand: str | None,
+    page: int | None = None,
+) -> list[dict[str, Any]]:
+    """Fitments found in ``rows`` for the catalog ``brand`` (empty for unknown layouts).
+
+    A blank model cell repeats the previous row's model, as in catalogs that
+    print the model once above its engine variants.
+    """
+    layout = supported_brand(brand)
+    if layout is None:
+        return []
+    parse_row = _parse_bosch_row if layout == "Bosch" else _parse_ngk_row
+
+    fitments: list[dict[str, Any]] = []
+    seen: set[tuple] = set()
+    last_model: str | None = None
+    for raw in rows:
+        cells = [_clean(cell) for cell in raw]
+        if cells and not cells[0] and last_model:
+            cells[0] = last_model
+        parsed = parse_row(cells)
+        if not parsed:
+            continue
+        last_model = cells[0]
+        for fitment in parsed:
+            fitment["brand"] = layout
+            fitment["page"] = page
+            key = (
+                fitment["model_key"],
+                fitment["engine"],
+                fitment["fuel"],
+                fitment["year_start"],
+                fitment["year_end"],
+                fitment["part_type"],
+                fitment["part_code"],
+            )
+            if key not in seen:
+                seen.add(key)
+                fitments.append(fitment)
+    return fitments
+
+
+def parse_years(value: str | None) -> tuple[int | None, int | None]:
+    """``(start, end)`` from "2010-2016", "10→16", "2012 →", "até 2009" and similar."""
+    text = normalize_text(value or "")
+    if not text:
+        return None, None
+    years = [int(year) for year in _FULL_YEAR_RE.findall(text)]
+    if not years:
+        years = [_expand_short_year(int(year)) for year in _SHORT_YEAR_RE.findall(text)]
+    if not years:
+        return None, None
+    if len(years) >= 2:
+        return min(years[0], years[1]), max(years[0], years[1])
+    if _UNTIL_RE.search(text):
+        return None, years[0]
+    if _OPEN_END_RE.search(text) or text.endswith("-"):
+        return years[0], None
+    return years[0], years[0]
+
+
+# ── layouts ───────────────────────────────────────────────────────────
+
+
+def _parse_bosch_row(cells: list[str]) -> list[dict[str, Any]]:
+    if len(cells) < 5:
+        return []
+    model, engine, fuel, plug_code, gap = cells[:5]
+    reference, simplified, cable, coil = (cells[5:9] + ["", "", "", ""])[:4]
+    base = _base_fitment(model, engine, fuel, gap)
+    if base is None or not plug_code:
+        return []
+    year_start, year_end = parse_years(_years_in(model) or _years_in(engine))
+    base.update(year_start=year_start, year_end=year_end)
+
+    fitments = [
+        _fitment(base, SPARK_PLUG, plug_code, variant=None, reference=reference or simplified or None)
+    ]
+    if cable:
+        fitments.append(_fitment(base, IGNITION_CABLE, cable))
+    if coil:
+        fitments.append(_fitment(base, IGNITION_COIL, coil))
+    return fitments
+
+
+def _parse_ngk_row(cells: list[str]) -> list[dict[str, Any]]:
+    if len(cells) < 6:
+        return []
+    model, engine, fuel, conventional, iridium, gap = cells[:6]
+    years, cable = (cells[6:8] + ["", ""])[:2]
+    base = _base_fitment(model, engine, fuel, gap)
+    if base is None or not (conventional or iridium):
+        return []
+    year_start, year_end = parse_years(years or _years_in(model))
+    base.update(year_start=year_start, year_end=year_end)
+
+    fitments: list[dict[str, Any]] = []
+    if conventional:
+        fitments.append(_fitment(base, SPARK_PLUG, conventional, variant="conventional"))
+    if iridium:
+        fitments.append(_fitment(base, SPARK_PLUG, iridium, variant="iridium"))
+    if cable:
+        fitments.append(_fitment(base, IGNITION_CABLE, cable))
+    return fitments
+
+
+# ── helpers ───────────────────────────────────────────────────────────
+
+
+def _clean(cell: str | None) -> str:
+    value = re.sub(r"\s+", " ", str(cell or "")).strip()
+    return "" if value.lower() in _EMPTY_CELL else value
+
+
+def _base_fitment(model: str, engine: str, fuel: str, gap: str) -> dict[str, Any] | None:
+    fuel_match = _FUEL_RE.search(normalize_text(fuel))
+    if not model or fuel_match is None or not _GAP_RE.match(gap):
+        return None
+    display_model = _strip_years(model)
+    model_key = normalize_text(display_model)
+    if not model_key:
+        return None
+    return {
+        "model": display_model,
+        "model_key": model_key,
+        "engine": engine or None,
+        "fuel": fuel_match.group(1),
+        "gap": gap.replace(",", "."),
+    }
+
+
+def _fitment(
+    base: dict[str, Any],
+    part_type: str,
+    part_code: str,
+    *,
+    variant: str | None = None,
+    reference: str | None = None,
+) -> dict[str, Any]:
+    return {
+        **base,
+        "gap": base["gap"] if part_type == SPARK_PLUG else None,
+        "part_type": part_type,
+        "part_code": part_code,
+        "variant": variant,
+        "reference": reference,
+    }
+
+
+def _years_in(text: str) -> str:
+    match = re.search(r"(?:\b(?:19|20)\d{2}\b.*)$", text)
+    return match.group(0) if match else ""
+
+
+def _strip_years(text: str) -> str:
+    years = _years_in(text)
+    return text[: len(text) - len(years)].strip(" -–/") if years else text
+
+
+def _expand_short_year(year: int) -> int:
+    return 2000 + year if year <= 50 else 1900 + year
@@ -0,0 +1,136 @@
+"""Compiled whole-word keyword matching for normalized (lowercase, unaccented) text.
+
+All keywords are compiled into a single regex built from a character trie,
+so a lookup is one left-to-right scan whose per-position cost depends on the
+length of the keywords, not on how many there are. This lets the recommender
+match thousands of models and brands loaded from the catalog tables.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from functools import lru_cache
+
+# Plural forms ("velas", "alternadores") count as a hit for the singular keyword.
+_PLURAL_SUFFIX = r"(?:e?s)?"
+
+# Joins texts for a single scan. It is neither a word nor a whitespace character,
+# so \b still fires at each text edge and \s never runs across it.
+_SEGMENT_SEPARATOR = "\x00"
+
+
+# Combining marks left behind by NFKD ("ç" -> "c" + U+0327), dropped in one translate() call.
+_STRIP_COMBINING = {cp: None for cp in range(0x10000) if unicodedata.combining(chr(cp))}
+
+
+@lru_cache(maxsize=8192)
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents; memoized because the same labels recur constantly."""
+    text = text.strip().lower()
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFKD", text).translate(_STRIP_COMBINING)
+
+
+def normalize_many(texts: Sequence[str]) -> list[str]:
+    """:func:`normalize_text` for a batch, done as one pass over the joined texts."""
+    joined = _SEGMENT_SEPARATOR.join(texts).lower()
+    if not joined.isascii():
+        joined = unicodedata.normalize("NFKD", joined).translate(_STRIP_COMBINING)
+    return [text.strip() for text in joined.split(_SEGMENT_SEPARATOR)] if texts else []
+
+
+def iter_segment_matches(pattern: re.Pattern[str], texts: Sequence[str]) -> Iterator[tuple[int, re.Match[str]]]:
+    """Run ``pattern`` once over all ``texts``, yielding ``(text_index, match)``.
+
+    Patterns must not match the NUL separator (none of ours can).
+    """
+    starts: list[int] = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(_SEGMENT_SEPARATOR)
+    for match in pattern.finditer(_SEGMENT_SEPARATOR.join(texts)):
+        yield bisect_right(starts, match.start()) - 1, match
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    trie: dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict[str, dict]) -> str:
+    terminal = "" in node
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        # Regex alternation is ordered, so the optional group still prefers the longer keyword.
+        return f"(?:{body})?"
+    return body
+
+
+class KeywordMatcher:
+    """Map whole-word keyword hits in a text to labels.
+
+    ``keywords`` maps each (already normalized) keyword to its label. Labels
+    keep the order in which they first appear in ``keywords``; that order is the
+    priority used by :meth:`best`.
+    """
+
+    def __init__(self, keywords: Mapping[str, str]) -> None:
+        self._labels = {keyword: label for keyword, label in keywords.items() if keyword}
+        self._priority: dict[str, int] = {}
+        for label in self._labels.values():
+            self._priority.setdefault(label, len(self._priority))
+        self._pattern = (
+            re.compile(rf"\b({_trie_pattern(self._labels)}){_PLURAL_SUFFIX}\b")
+            if self._labels
+            else None
+        )
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[str, Iterable[str]]) -> "KeywordMatcher":
+        """Build from ``{label: (keyword, ...)}``, the shape of ``CATEGORY_KEYWORDS``."""
+        keywords: dict[str, str] = {}
+        for label, group in groups.items():
+            for keyword in group:
+                keywords.setdefault(keyword, label)
+        return cls(keywords)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def keywords(self, text: str) -> list[str]:
+        """Return the matched keywords in text order (longest match at each position)."""
+        if self._pattern is None or not text:
+            return []
+        return [match.group(1) for match in self._pattern.finditer(text)]
+
+    def labels(self, text: str) -> list[str]:
+        """Return the distinct labels found in ``text``, in text order."""
+        return list(dict.fromkeys(self._labels[keyword] for keyword in self.keywords(text)))
+
+    def labels_many(self, texts: Sequence[str]) -> list[list[str]]:
+        """:meth:`labels` for every text, computed in one scan over all of them."""
+        found: list[dict[str, None]] = [{} for _ in texts]
+        if self._pattern is not None:
+            for index, match in iter_segment_matches(self._pattern, texts):
+                found[index][self._labels[match.group(1)]] = None
+        return [list(labels) for labels in found]
+
+    def best(self, text: str) -> str | None:
+        """Return the found label with the highest priority, or None."""
+        return self.best_of(self.labels(text))
+
+    def best_of(self, labels: Iterable[str]) -> str | None:
+        return min(labels, key=self._priority.__getitem__, default=None)
@@ -0,0 +1,268 @@
+"""Retrieval-first candidate shortlists for parts suggestions.
+
+For each requested item with a known type and vehicle model, candidates come
+from two places before any LLM call:
+
+  1. Catalog chunks (``RagChunkRepoSqlAlchemy``): lines of the retrieved
+     chunks that name the vehicle model (and its year, when printed) and
+     carry part codes, scored by the chunk similarity.
+  2. Past threads (``PartHistoryLookupPort``): part numbers sellers offered
+     or chose, and earlier suggestions, for the same model and item type;
+     one query covers every item of the batch.
+
+A lone catalog code above ``hit_min_similarity`` is a ``catalog_hit`` that
+needs no ranking; other shortlists go to the LLM only to be ordered and
+explained.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from src.bot.application.ports.driven.part_history import PartHistoryLookupPort
+from src.bot.application.services.catalog_fitment_lookup import resolve_fitment_query
+from src.bot.application.services.catalog_fitment_parser import parse_years
+from src.bot.application.services.keyword_matcher import normalize_text
+from src.bot.application.services.recommendation_service import (
+    CATEGORY_KEYWORDS,
+    CATEGORY_LABELS,
+    CATEGORY_MATCHER,
+    infer_item_type,
+)
+from src.bot.infrastructure.logging import get_logger
+
+if TYPE_CHECKING:
+    from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import (
+        RagChunkRepoSqlAlchemy,
+    )
+    from src.bot.adapters.driven.llm.embeddings_adapter import EmbeddingsAdapter
+
+logger = get_logger(__name__)
+
+# Upper-case tokens of 4+ characters mixing letters and digits: "BKR6E",
+# "SYL-1382", "F000KE0P37". Engine labels like "16V" are too short to match.
+_PART_CODE_RE = re.compile(r"(?<![\w+-])(?=[A-Z0-9+-]*\d)(?=[A-Z0-9+-]*[A-Z])[A-Z0-9][A-Z0-9+-]{3,}(?![\w-])")
+_FULL_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_CATALOG_CANDIDATES_PER_ITEM = 5
+
+
+@dataclass(slots=True)
+class CandidateShortlist:
+    item_type: str
+    candidates: list[dict[str, Any]] = field(default_factory=list)
+    catalog_hit: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _ItemContext:
+    item_type: str
+    model: str | None
+    year: int | None
+    search_text: str
+
+
+class PartCandidateGenerator:
+    def __init__(
+        self,
+        *,
+        chunk_repo: "RagChunkRepoSqlAlchemy",
+        embeddings: "EmbeddingsAdapter",
+        history: PartHistoryLookupPort,
+        chunk_limit: int = 8,
+        history_limit: int = 10,
+        hit_min_similarity: float = 0.85,
+    ) -> None:
+        self._chunk_repo = chunk_repo
+        self._embeddings = embeddings
+        self._history = history
+        self._chunk_limit = chunk_limit
+        self._history_limit = history_limit
+        self._hit_min_similarity = hit_min_similarity
+
+    async def shortlist_batch(self, payloads: list[dict[str, Any]]) -> list[CandidateShortlist]:
+        """One shortlist per payload, in order; items without type or model get an empty one."""
+        contexts = [self._item_context(payload) for payload in payloads]
+        searchable = [index for index, context in enumerate(contexts) if context.item_type != "unknown" and context.model]
+
+        embeddings: dict[int, list[float]] = {}
+        if searchable:
+            try:
+                vectors = await self._embeddings.embed_texts([contexts[index].search_text for index in searchable])
+                embeddings = dict(zip(searchable, vectors))
+            except Exception as exc:
+                logger.warning("[RECOMMENDER_DEBUG] candidate embedding failed, using history only: %s", exc)
+
+        history_rows: list[list[dict[str, Any]]] = []
+        if searchable:
+            history_rows = self._history.find_history_candidates(
+                queries=[
+                    {
+                        "model": contexts[index].model,
+                        "keywords": list(CATEGORY_KEYWORDS.get(contexts[index].item_type, ())),
+                        "year": contexts[index].year,
+                    }
+                    for index in searchable
+                ],
+                limit=self._history_limit,
+            )
+
+        shortlists = [CandidateShortlist(item_type=context.item_type) for context in contexts]
+        for index, rows in zip(searchable, history_rows):
+            context = contexts[index]
+            catalog = (
+                self._catalog_candidates(context, embeddings[index]) if index in embeddings else []
+            )
+            history = _history_candidates(context, rows)
+            shortlist = shortlists[index]
+            shortlist.candidates = _dedupe(catalog + history)
+            codes = {_code_key(candidate["part_number"]) for candidate in catalog}
+            if len(codes) == 1 and catalog[0]["score"] >= self._hit_min_similarity:
+                shortlist.catalog_hit = catalog[0]
+            logger.info(
+                "[RECOMMENDER_DEBUG] candidates item=%s type=%s catalog=%s history=%s hit=%s",
+                payloads[index].get("requested_item_id"),
+                context.item_type,
+                len(catalog),
+                len(history),
+                shortlist.catalog_hit is not None,
+            )
+        return shortlists
+
+    # ── private ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _item_context(payload: dict[str, Any]) -> _ItemContext:
+        description = str(payload.get("original_description") or "")
+        vehicle = payload.get("vehicle") or {}
+        item_type = infer_item_type(description)
+        query = resolve_fitment_query(description, vehicle)
+        search_text = " ".join(
+            str(value)
+            for value in (
+                description,
+                vehicle.get("brand"),
+                vehicle.get("model"),
+                vehicle.get("engine"),
+                vehicle.get("year"),
+            )
+            if value
+        )
+        return _ItemContext(
+            item_type=item_type,
+            model=query.model if query else None,
+            year=query.year if query else None,
+            search_text=search_text,
+        )
+
+    def _catalog_candidates(self, context: _ItemContext, embedding: list[float]) -> list[dict[str, Any]]:
+        chunks = self._chunk_repo.search_similar(embedding, top_k=self._chunk_limit)
+        model_re = re.compile(rf"\b{re.escape(context.model or '')}\b")
+        candidates: list[dict[str, Any]] = []
+        for chunk in chunks:
+            chunk_text = chunk.get("chunk_text") or ""
+            if context.item_type not in CATEGORY_MATCHER.labels(normalize_text(chunk_text)):
+                continue
+            metadata = chunk.get("metadata") or {}
+            similarity = float(chunk.get("similarity") or 0.0)
+            for line in chunk_text.splitlines():
+                if not model_re.search(normalize_text(line)) or not _line_covers_year(line, context.year):
+                    continue
+                for code in _PART_CODE_RE.findall(line):
+                    candidates.append(
+                        _candidate(
+                            candidate_id=f"catalog:{chunk.get('id')}:{code}",
+                            part_number=code,
+                            brand=chunk.get("brand"),
+                            item_type=context.item_type,
+                            score=similarity,
+                            note=" ".join(line.split())[:200],
+                            metadata={
+                                "source": "catalog_chunks",
+                                "chunk_id": chunk.get("id"),
+                                "catalog_id": metadata.get("catalog_id"),
+                                "page": metadata.get("page"),
+                                "similarity": similarity,
+                            },
+                        )
+                    )
+        candidates.sort(key=lambda candidate: candidate["score"], reverse=True)
+        return _dedupe(candidates)[:_CATALOG_CANDIDATES_PER_ITEM]
+
+
+def _candidate(
+    *,
+    candidate_id: str,
+    part_number: str,
+    brand: str | None,
+    item_type: str,
+    score: float,
+    note: str | None,
+    metadata: dict[str, Any],
+    average_price_brl: float | None = None,
+    title: str | None = None,
+) -> dict[str, Any]:
+    """A raw candidate in the shape ``FilteredRecommendationService`` filters."""
+    label = CATEGORY_LABELS.get(item_type, item_type)
+    title = title or " ".join(filter(None, [label.capitalize(), brand, part_number]))
+    return {
+        "id": candidate_id,
+        "part_number": part_number,
+        "brand": brand,
+        "title": title,
+        "category": label,
+        "score": score,
+        "average_price_brl": average_price_brl,
+        "compatibility_notes": note,
+        "metadata": {**metadata, "title": title, "note": note},
+    }
+
+
+def _history_candidates(context: _ItemContext, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    candidates: list[dict[str, Any]] = []
+    for row in rows:
+        offered, chosen = int(row.get("offered_count") or 0), int(row.get("chosen_count") or 0)
+        candidates.append(
+            _candidate(
+                candidate_id=f"history:{row['part_number']}",
+                part_number=row["part_number"],
+                brand=row.get("brand"),
+                item_type=context.item_type,
+                # Past offers count more than past suggestions; capped below catalog hits.
+                score=round(0.5 + min(0.3, 0.1 * chosen + 0.05 * offered), 2),
+                note=row.get("note") or row.get("title"),
+                average_price_brl=row.get("average_price_brl"),
+                metadata={
+                    "source": "part_history",
+                    "offered_count": offered,
+                    "chosen_count": chosen,
+                    "suggested_count": int(row.get("suggested_count") or 0),
+                },
+                title=row.get("title"),
+            )
+        )
+    return candidates
+
+
+def _line_covers_year(line: str, year: int | None) -> bool:
+    # Only four-digit years count: "16V" is an engine, not 2016.
+    if year is None or not _FULL_YEAR_RE.search(line):
+        return True
+    start, end = parse_years(line)
+    return (start is None or start <= year) and (end is None or end >= year)
+
+
+def _code_key(part_number: str) -> str:
+    return re.sub(r"[^A-Z0-9]", "", part_number.upper())
+
+
+def _dedupe(candidates: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    seen: set[str] = set()
+    unique: list[dict[str, Any]] = []
+    for candidate in candidates:
+        key = _code_key(candidate["part_number"])
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(candidate)
+    return unique
@@ -2,25 +2,53 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from src.bot.adapters.driven.llm.llm_recommendation_adapter import (
     LlmError,
-    OpenAiRecommendationAdapter,
+    LlmParseError,
+    LlmUnavailableError,
 )
+from src.bot.application.dtos.recommendation.candidate import Candidate
 from src.bot.application.dtos.recommendation.part_request import PartRequest
 from src.bot.application.dtos.recommendation.recommendation_request import (
     RecommendationRequest,
 )
+from src.bot.application.ports.driven.catalog_fitments import CatalogFitmentLookupPort
+from src.bot.application.ports.driven.llm_recommendation_port import (
+    LlmBatchRecommendationPort,
+    LlmRecommendationPort,
+)
+from src.bot.application.services.catalog_fitment_lookup import (
+    fitment_suggestions,
+    narrow_by_engine,
+    resolve_fitment_query,
+)
+from src.bot.application.services.part_candidate_generator import (
+    CandidateShortlist,
+    PartCandidateGenerator,
+)
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class PartsSuggestionProvider:
     async def suggest(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    async def suggest_batch(self, payloads: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """Return suggestions for each payload, in the same order.
+
+        The default runs :meth:`suggest` concurrently; providers that can
+        answer several items in one round trip override this.
+        """
+        return list(await asyncio.gather(*(self.suggest(payload) for payload in payloads)))
+
 
 class LlmPartsSuggestionProvider(PartsSuggestionProvider):
-    def __init__(self, adapter: OpenAiRecommendationAdapter) -> None:
+    def __init__(self, adapter: LlmBatchRecommendationPort) -> None:
         self._adapter = adapter
 
     async def suggest(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
@@ -40,29 +68,267 @@ class LlmPartsSuggestionProvider(PartsSuggestionProvider):
             },
         )
 
-        response = await self._adapter.generate(request)
-
-        suggestions: list[dict[str, Any]] = []
-        for candidate in response.candidates or []:
-            metadata = candidate.metadata or {}
-            suggestions.append(
-                {
-                    "title": metadata.get("title")
-                    or candidate.part_number
-                    or payload.get("part_number")
-                    or "Suggested part",
-                    "brand": candidate.brand,
-                    "part_number": candidate.part_number,
-                    "confidence": candidate.score,
-                    "note": metadata.get("note"),
-                    "metadata_json": {
-                        "average_price_brl": candidate.average_price_brl,
-                        "candidate_id": candidate.id,
-                        **metadata,
-                    },
-                }
+        try:
+            response = await self._adapter.generate(request)
+        except LlmUnavailableError as exc:
+            logger.warning("[RECOMMENDER_DEBUG] no suggestions thread=%s: %s", payload["thread_id"], exc)
+            return []
+        return _to_suggestions(response.candidates or [], payload)
+
+    async def suggest_batch(self, payloads: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        if len(payloads) <= 1:
+            return await super().suggest_batch(payloads)
+
+        request = RecommendationRequest(
+            requester_id=str(payloads[0]["request_id"]),
+            vehicle=payloads[0].get("vehicle") or None,
+            parts=[
+                PartRequest(
+                    item_id=str(payload["requested_item_id"]),
+                    part_number=payload.get("part_number"),
+                    description=payload.get("original_description"),
+                    quantity=payload.get("requested_items_count") or 1,
+                )
+                for payload in payloads
+            ],
+            context={
+                "thread_id": str(payloads[0]["thread_id"]),
+                "request_id": str(payloads[0]["request_id"]),
+                "original_description": [payload.get("original_description") or "" for payload in payloads],
+            },
+        )
+
+        candidates_by_item: dict[str, list[Candidate]] = {}
+        try:
+            response = await self._adapter.generate_batch(request)
+            for item in response.items or []:
+                candidates_by_item.setdefault(str(item.item_id), list(item.accepted_candidates or []))
+        except LlmParseError as exc:
+            logger.warning(
+                "[RECOMMENDER_DEBUG] batch suggestion parse failed thread=%s: %s",
+                payloads[0]["thread_id"],
+                exc,
             )
+        except LlmUnavailableError as exc:
+            # Fail fast: per-item retries would only hit the open circuit again.
+            logger.warning(
+                "[RECOMMENDER_DEBUG] no suggestions thread=%s: %s", payloads[0]["thread_id"], exc
+            )
+            return [[] for _ in payloads]
+
+        results: list[list[dict[str, Any]] | None] = []
+        fallback: list[int] = []
+        for index, payload in enumerate(payloads):
+            candidates = candidates_by_item.get(str(payload["requested_item_id"]))
+            if candidates is None:
+                results.append(None)
+                fallback.append(index)
+            else:
+                results.append(_to_suggestions(candidates, payload))
+
+        if fallback:
+            fallback_results = await asyncio.gather(*(self.suggest(payloads[index]) for index in fallback))
+            for index, suggestions in zip(fallback, fallback_results):
+                results[index] = suggestions
+        return [suggestions or [] for suggestions in results]
+
+
+class FitmentFirstSuggestionProvider(PartsSuggestionProvider):
+    """Answers exact-vehicle ignition items from ``catalog_fitments``.
+
+    An item qualifies when it names a part type (vela/cabo/bobina) and the
+    vehicle model and year are known; only the items the table cannot answer
+    are sent to ``fallback`` (in one batch).
+    """
+
+    def __init__(self, fallback: PartsSuggestionProvider, fitments: CatalogFitmentLookupPort) -> None:
+        self._fallback = fallback
+        self._fitments = fitments
+
+    async def suggest(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        return (await self.suggest_batch([payload]))[0]
+
+    async def suggest_batch(self, payloads: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        results = [self._from_fitments(payload) for payload in payloads]
+        pending = [index for index, suggestions in enumerate(results) if suggestions is None]
+        if pending:
+            fallback_results = await self._fallback.suggest_batch([payloads[index] for index in pending])
+            for index, suggestions in zip(pending, fallback_results):
+                results[index] = suggestions
+        return [suggestions or [] for suggestions in results]
+
+    def _from_fitments(self, payload: dict[str, Any]) -> list[dict[str, Any]] | None:
+        query = resolve_fitment_query(payload.get("original_description") or "", payload.get("vehicle"))
+        if query is None or query.year is None or not query.part_types:
+            return None
+        rows = self._fitments.find_fitments(model=query.model, year=query.year, part_types=query.part_types)
+        suggestions = fitment_suggestions(narrow_by_engine(rows, query.engine))
+        if not suggestions:
+            return None
+        logger.info(
+            "[RECOMMENDER_DEBUG] fitment table answered thread=%s item=%s rows=%s",
+            payload.get("thread_id"),
+            payload.get("requested_item_id"),
+            len(rows),
+        )
         return suggestions
 
 
-__all__ = ["LlmError", "PartsSuggestionProvider", "LlmPartsSuggestionProvider"]
+class RetrievalFirstSuggestionProvider(PartsSuggestionProvider):
+    """Builds a shortlist from catalog chunks and past threads before the LLM.
+
+    A single high-confidence catalog code is returned as is; other
+    shortlists go through ``ranker`` (a ``FilteredRecommendationService``),
+    which filters them by category/vehicle and asks the LLM only to order and
+    explain what is left. Items without a usable shortlist go to ``fallback``
+    (in one batch).
+    """
+
+    _UNRANKED_LIMIT = 5
+
+    def __init__(
+        self,
+        fallback: PartsSuggestionProvider,
+        generator: PartCandidateGenerator,
+        ranker: LlmRecommendationPort,
+    ) -> None:
+        self._fallback = fallback
+        self._generator = generator
+        self._ranker = ranker
+
+    async def suggest(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        return (await self.suggest_batch([payload]))[0]
+
+    async def suggest_batch(self, payloads: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        shortlists = await self._generator.shortlist_batch(payloads)
+        results: list[list[dict[str, Any]] | None] = [None] * len(payloads)
+        to_rank: list[int] = []
+        for index, shortlist in enumerate(shortlists):
+            if shortlist.catalog_hit is not None:
+                results[index] = [_raw_candidate_suggestion(shortlist.catalog_hit)]
+            elif shortlist.candidates:
+                to_rank.append(index)
+
+        if to_rank:
+            ranked = await self._rank(
+                [payloads[index] for index in to_rank],
+                [shortlists[index] for index in to_rank],
+            )
+            for index, suggestions in zip(to_rank, ranked):
+                results[index] = suggestions or None
+
+        pending = [index for index, suggestions in enumerate(results) if suggestions is None]
+        logger.info(
+            "[RECOMMENDER_DEBUG] retrieval-first thread=%s catalog_hits=%s ranked=%s llm_fallback=%s",
+            payloads[0].get("thread_id") if payloads else None,
+            sum(1 for shortlist in shortlists if shortlist.catalog_hit is not None),
+            len(to_rank),
+            len(pending),
+        )
+        if pending:
+            fallback_results = await self._fallback.suggest_batch([payloads[index] for index in pending])
+            for index, suggestions in zip(pending, fallback_results):
+                results[index] = suggestions
+        return [suggestions or [] for suggestions in results]
+
+    async def _rank(
+        self,
+        payloads: list[dict[str, Any]],
+        shortlists: list[CandidateShortlist],
+    ) -> list[list[dict[str, Any]]]:
+        item_ids = [str(payload["requested_item_id"]) for payload in payloads]
+        request = RecommendationRequest(
+            requester_id=str(payloads[0]["request_id"]),
+            vehicle=payloads[0].get("vehicle") or None,
+            parts=[
+                PartRequest(
+                    item_id=item_id,
+                    part_number=payload.get("part_number"),
+                    description=payload.get("original_description"),
+                    quantity=payload.get("requested_items_count") or 1,
+                )
+                for item_id, payload in zip(item_ids, payloads)
+            ],
+            context={
+                "thread_id": str(payloads[0]["thread_id"]),
+                "original_description": [payload.get("original_description") or "" for payload in payloads],
+                "raw_candidates_by_item": {
+                    item_id: shortlist.candidates for item_id, shortlist in zip(item_ids, shortlists)
+                },
+            },
+        )
+        try:
+            response = await self._ranker.generate(request)
+        except LlmError as exc:
+            logger.warning(
+                "[RECOMMENDER_DEBUG] shortlist ranking failed thread=%s, keeping retrieval order: %s",
+                payloads[0]["thread_id"],
+                exc,
+            )
+            return [
+                [_raw_candidate_suggestion(candidate) for candidate in shortlist.candidates[: self._UNRANKED_LIMIT]]
+                for shortlist in shortlists
+            ]
+
+        # Descriptions like "vela e cabo" are split into "<id>-1", "<id>-2".
+        candidates_by_item: dict[str, list[Candidate]] = {item_id: [] for item_id in item_ids}
+        for item in response.items or []:
+            base_id = next(
+                (item_id for item_id in item_ids if item.item_id == item_id or item.item_id.startswith(f"{item_id}-")),
+                None,
+            )
+            if base_id is not None:
+                candidates_by_item[base_id].extend(item.accepted_candidates or [])
+        return [
+            _to_suggestions(candidates_by_item[item_id], payload)
+            for item_id, payload in zip(item_ids, payloads)
+        ]
+
+
+def _to_suggestions(candidates: list[Candidate], payload: dict[str, Any]) -> list[dict[str, Any]]:
+    suggestions: list[dict[str, Any]] = []
+    for candidate in candidates:
+        metadata = candidate.metadata or {}
+        suggestions.append(
+            {
+                "title": metadata.get("title")
+                or candidate.part_number
+                or payload.get("part_number")
+                or "Suggested part",
+                "brand": candidate.brand,
+                "part_number": candidate.part_number,
+                "confidence": candidate.score,
+                "note": metadata.get("note"),
+                "metadata_json": {
+                    "average_price_brl": candidate.average_price_brl,
+                    "candidate_id": candidate.id,
+                    **metadata,
+                },
+            }
+        )
+    return suggestions
+
+
+def _raw_candidate_suggestion(candidate: dict[str, Any]) -> dict[str, Any]:
+    metadata = candidate.get("metadata") or {}
+    return {
+        "title": candidate["title"],
+        "brand": candidate.get("brand"),
+        "part_number": candidate["part_number"],
+        "confidence": candidate.get("score"),
+        "note": candidate.get("compatibility_notes"),
+        "metadata_json": {
+            "average_price_brl": candidate.get("average_price_brl"),
+            "candidate_id": candidate.get("id"),
+            **{key: value for key, value in metadata.items() if key not in ("title", "note")},
+        },
+    }
+
+
+__all__ = [
+    "LlmError",
+    "PartsSuggestionProvider",
+    "LlmPartsSuggestionProvider",
+    "FitmentFirstSuggestionProvider",
+    "RetrievalFirstSuggestionProvider",
+]
@@ -0,0 +1,120 @@
+"""bcrypt hashing on a dedicated, bounded worker pool.
+
+bcrypt is deliberately slow (~100-300 ms per call) and would stall the event
+loop if called from ``async def`` routes. Jobs run on their own small thread
+pool (bcrypt releases the GIL), so a login burst queues there instead of
+delaying every other request. Admission is bounded globally and per caller
+key (e-mail, client IP); callers over the limit get ``TooManyRequestsError``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import TypeVar
+
+import bcrypt
+
+from src.bot.domain.errors import TooManyRequestsError
+from src.bot.infrastructure.config.settings import settings
+
+T = TypeVar("T")
+
+_BUSY_MESSAGE = "Muitas tentativas de login simultâneas. Tente novamente em instantes."
+
+
+def hash_password(plain: str, rounds: int | None = None) -> str:
+    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)).decode()
+
+
+def check_password(plain: str, hashed: str) -> bool:
+    return bcrypt.checkpw(plain.encode(), hashed.encode())
+
+
+def bcrypt_cost(hashed: str) -> int | None:
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[1].startswith("2"):
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        *,
+        rounds: int,
+        workers: int,
+        max_pending: int,
+        limits: dict[str, int] | None = None,
+    ) -> None:
+        self.rounds = int(rounds)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="bcrypt")
+        self._max_pending = max(1, int(max_pending))
+        self._limits = dict(limits or {})
+        self._lock = Lock()
+        self._pending = 0
+        self._in_flight: dict[tuple[str, str], int] = {}
+
+    def needs_rehash(self, hashed: str) -> bool:
+        cost = bcrypt_cost(hashed)
+        return cost is not None and cost != self.rounds
+
+    async def hash(self, plain: str, *, keys: dict[str, str] | None = None) -> str:
+        return await self._run(hash_password, plain, self.rounds, keys=keys)
+
+    async def verify(self, plain: str, hashed: str, *, keys: dict[str, str] | None = None) -> bool:
+        return await self._run(check_password, plain, hashed, keys=keys)
+
+    async def verify_and_upgrade(
+        self,
+        plain: str,
+        hashed: str,
+        *,
+        keys: dict[str, str] | None = None,
+        on_rehash: Callable[[str], None] | None = None,
+    ) -> bool:
+        """Verify ``plain``; on success re-hash at the configured cost when ``hashed`` uses another one."""
+        if not await self.verify(plain, hashed, keys=keys):
+            return False
+        if on_rehash is not None and self.needs_rehash(hashed):
+            on_rehash(await self.hash(plain, keys=keys))
+        return True
+
+    async def _run(self, fn: Callable[..., T], *args: object, keys: dict[str, str] | None) -> T:
+        slots = self._acquire(keys or {})
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._release(slots)
+
+    def _acquire(self, keys: dict[str, str]) -> list[tuple[str, str]]:
+        slots = [(kind, value) for kind, value in keys.items() if value and kind in self._limits]
+        with self._lock:
+            if self._pending >= self._max_pending:
+                raise TooManyRequestsError(_BUSY_MESSAGE)
+            for slot in slots:
+                if self._in_flight.get(slot, 0) >= self._limits[slot[0]]:
+                    raise TooManyRequestsError(_BUSY_MESSAGE)
+            self._pending += 1
+            for slot in slots:
+                self._in_flight[slot] = self._in_flight.get(slot, 0) + 1
+        return slots
+
+    def _release(self, slots: Iterable[tuple[str, str]]) -> None:
+        with self._lock:
+            self._pending -= 1
+            for slot in slots:
+                remaining = self._in_flight.get(slot, 0) - 1
+                if remaining > 0:
+                    self._in_flight[slot] = remaining
+                else:
+                    self._in_flight.pop(slot, None)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
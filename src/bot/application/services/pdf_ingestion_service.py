@@ -8,7 +8,8 @@ Pipeline per catalog:
   5. Split each page into overlapping character-level chunks
   6. Embed chunks in batches via EmbeddingsAdapter
   7. Persist chunks to rag_chunks
-  8. Mark catalog as 'ready' (or 'error' on failure)
+  8. Bosch/NGK catalogs: replace the parsed application rows in catalog_fitments
+  9. Mark catalog as 'ready' (or 'error' on failure)
 """
 
 from __future__ import annotations
@@ -19,9 +20,17 @@ from typing import TYPE_CHECKING
 import fitz  # PyMuPDF
 
 from src.bot.application.services.brand_detector import extract_brand
+from src.bot.application.services.catalog_fitment_parser import (
+    parse_fitment_rows,
+    rows_from_text,
+    supported_brand,
+)
 from src.bot.infrastructure.logging import get_logger
 
 if TYPE_CHECKING:
+    from src.bot.adapters.driven.db.repositories.catalog_fitment_repo_sa import (
+        CatalogFitmentRepoSqlAlchemy,
+    )
     from src.bot.adapters.driven.db.repositories.catalog_repo_sa import (
         CatalogRepoSqlAlchemy,
     )
@@ -58,16 +67,27 @@ def _chunk_text(raw: str) -> list[str]:
     return chunks
 
 
+def _page_table_rows(page: fitz.Page) -> list[list[str | None]]:
+    """Rows of the tables PyMuPDF detects on ``page`` (empty when detection fails)."""
+    try:
+        return [row for table in page.find_tables().tables for row in table.extract()]
+    except Exception as exc:  # table detection is best-effort; text rows still apply
+        logger.warning("Table detection failed on page %s: %s", page.number + 1, exc)
+        return []
+
+
 class PdfIngestionService:
     def __init__(
         self,
         catalog_repo: "CatalogRepoSqlAlchemy",
         chunk_repo: "RagChunkRepoSqlAlchemy",
         embeddings: "EmbeddingsAdapter",
+        fitment_repo: "CatalogFitmentRepoSqlAlchemy | None" = None,
     ) -> None:
         self._catalog_repo = catalog_repo
         self._chunk_repo = chunk_repo
         self._embeddings = embeddings
+        self._fitment_repo = fitment_repo
 
     async def ingest(self, catalog_id: int, pdf_path: str) -> None:
         """Full ingestion pipeline for one PDF.  Raises on unrecoverable errors."""
@@ -89,12 +109,23 @@ class PdfIngestionService:
                 brand_source = "provided" if catalog.get("brand") else "not found"
                 logger.info("Catalog %d: brand = %s (%s)", catalog_id, catalog.get("brand"), brand_source)
 
+            parse_fitments = self._fitment_repo is not None and supported_brand(catalog.get("brand")) is not None
+            fitments: list[dict] = []
+
             with fitz.open(pdf_path) as doc:
                 page_count = len(doc)
                 for page_num, page in enumerate(doc, start=1):
                     page_text = page.get_text()
                     if not page_text or not page_text.strip():
                         continue
+                    if parse_fitments:
+                        fitments.extend(
+                            parse_fitment_rows(
+                                _page_table_rows(page) + rows_from_text(page_text),
+                                brand=catalog.get("brand"),
+                                page=page_num,
+                            )
+                        )
                     for chunk_idx, chunk in enumerate(_chunk_text(page_text)):
                         chunks_data.append(
                             {
@@ -148,6 +179,8 @@ class PdfIngestionService:
                 chunks_data[i]["embedding"] = emb
 
             self._chunk_repo.insert_chunks(chunks_data)
+            if parse_fitments:
+                self._fitment_repo.replace_for_catalog(catalog_id, fitments)
 
             self._catalog_repo.update_status(
                 catalog_id,
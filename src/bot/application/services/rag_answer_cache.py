@@ -0,0 +1,119 @@
+"""Per-process LRU/TTL cache of RAG answers.
+
+Sellers ask the same questions ("vela Palio Fire 1.0") over and over; each
+miss costs an embedding, a vector search and a full LLM completion. Keys
+combine the normalized question, the filters and the catalog set version
+(see ``CatalogRepoSqlAlchemy.catalog_set_version``), so any catalog status
+or ``is_active`` change — in this process or another — makes old entries
+unreachable; they then age out through the TTL and the LRU bound.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+from typing import Any
+
+from src.bot.application.services.keyword_matcher import normalize_text
+from src.bot.infrastructure.config.settings import settings
+
+AnswerKey = tuple[str, int | None, int | None, str | None, int, str]
+
+_TRAILING_PUNCTUATION_RE = re.compile(r"[\s?!.]+$")
+
+
+def normalize_question(query: str) -> str:
+    """Lowercase, accent-free, single-spaced question without trailing punctuation."""
+    return _TRAILING_PUNCTUATION_RE.sub("", " ".join(normalize_text(str(query or "")).split()))
+
+
+def answer_key(
+    query: str,
+    *,
+    manufacturer_id: int | None,
+    catalog_id: int | None,
+    brand: str | None,
+    top_k: int,
+    catalog_version: str,
+) -> AnswerKey:
+    return (
+        normalize_question(query),
+        manufacturer_id,
+        catalog_id,
+        normalize_text(brand) if brand else None,
+        int(top_k),
+        catalog_version,
+    )
+
+
+class RagAnswerCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = float(ttl_seconds)
+        self._max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._lock = Lock()
+        # key -> (result, expires_at), least recently used first
+        self._entries: OrderedDict[AnswerKey, tuple[dict[str, Any], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def get(self, key: AnswerKey) -> dict[str, Any] | None:
+        """Cached result (a fresh dict), or None when unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[0])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: AnswerKey, result: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (dict(result), self._clock() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+RAG_ANSWER_CACHE = RagAnswerCache(
+    ttl_seconds=settings.RAG_ANSWER_CACHE_TTL_SECONDS,
+    max_entries=settings.RAG_ANSWER_CACHE_MAX_ENTRIES,
+)
@@ -5,22 +5,53 @@ Steps:
   2. Search rag_chunks for top-K most similar chunks
   3. Build a context-enriched prompt
   4. Call the chat LLM and return answer + sources
+
+``query_stream`` runs the same pipeline but yields the sources as soon as
+retrieval finishes and then the answer token by token (provider stream mode).
+
+When a fitment repository is wired in, questions that name a catalog model
+("vela do Palio 1.0 2015") are first answered from ``catalog_fitments``;
+the embedding and LLM calls only run when that lookup finds nothing.
+
+With an answer cache and a catalog repository wired in, finished answers
+are kept per normalized question, filters and catalog set version, and
+both methods report ``cached`` so callers can tell a replay from a fresh
+answer.
 """
 
 from __future__ import annotations
 
+import json
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING, Any
 
 import httpx
 
+from src.bot.application.services.catalog_fitment_lookup import (
+    fitment_sources,
+    format_fitment_answer,
+    narrow_by_engine,
+    resolve_fitment_query,
+)
+from src.bot.application.services.rag_answer_cache import (
+    AnswerKey,
+    RagAnswerCache,
+    answer_key,
+)
 from src.bot.infrastructure.config.settings import Settings
 from src.bot.infrastructure.logging import get_logger
 
 if TYPE_CHECKING:
+    from src.bot.adapters.driven.db.repositories.catalog_repo_sa import (
+        CatalogRepoSqlAlchemy,
+    )
     from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import (
         RagChunkRepoSqlAlchemy,
     )
     from src.bot.adapters.driven.llm.embeddings_adapter import EmbeddingsAdapter
+    from src.bot.application.ports.driven.catalog_fitments import (
+        CatalogFitmentLookupPort,
+    )
 
 logger = get_logger(__name__)
 
@@ -53,16 +84,28 @@ _SYSTEM_PROMPT = (
 )
 
 
+_NO_CONTEXT_ANSWER = (
+    "Não encontrei informações relevantes nos catálogos disponíveis "
+    "para responder sua pergunta."
+)
+
+
 class RagQueryService:
     def __init__(
         self,
         chunk_repo: "RagChunkRepoSqlAlchemy",
         embeddings: "EmbeddingsAdapter",
         settings: Settings,
+        fitment_repo: "CatalogFitmentLookupPort | None" = None,
+        answer_cache: RagAnswerCache | None = None,
+        catalog_repo: "CatalogRepoSqlAlchemy | None" = None,
     ) -> None:
         self._chunk_repo = chunk_repo
         self._embeddings = embeddings
         self._settings = settings
+        self._fitment_repo = fitment_repo
+        self._answer_cache = answer_cache
+        self._catalog_repo = catalog_repo
 
     async def query(
         self,
@@ -73,6 +116,200 @@ class RagQueryService:
         brand: str | None = None,
         top_k: int = 6,
     ) -> dict[str, Any]:
+        key = self._cache_key(
+            query, manufacturer_id=manufacturer_id, catalog_id=catalog_id, brand=brand, top_k=top_k
+        )
+        if key is not None:
+            cached = self._answer_cache.get(key)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        result = await self._answer(
+            query, manufacturer_id=manufacturer_id, catalog_id=catalog_id, brand=brand, top_k=top_k
+        )
+        if key is not None:
+            self._answer_cache.put(key, result)
+        return {**result, "cached": False}
+
+    async def _answer(
+        self,
+        query: str,
+        *,
+        manufacturer_id: int | None,
+        catalog_id: int | None,
+        brand: str | None,
+        top_k: int,
+    ) -> dict[str, Any]:
+        fitments = self._find_fitments(
+            query, manufacturer_id=manufacturer_id, catalog_id=catalog_id, brand=brand
+        )
+        if fitments:
+            sources = fitment_sources(fitments)
+            return {
+                "answer": format_fitment_answer(fitments),
+                "sources": sources,
+                "total_sources": len(sources),
+                "answer_source": "fitments",
+            }
+
+        chunks = await self._retrieve(
+            query,
+            manufacturer_id=manufacturer_id,
+            catalog_id=catalog_id,
+            brand=brand,
+            top_k=top_k,
+        )
+
+        if not chunks:
+            return {
+                "answer": _NO_CONTEXT_ANSWER,
+                "sources": [],
+            }
+
+        answer = await self._call_llm(self._build_messages(query, chunks))
+        sources = self._build_sources(chunks)
+
+        return {
+            "answer": answer,
+            "sources": sources,
+            "total_sources": len(sources),
+            "answer_source": "llm",
+        }
+
+    async def query_stream(
+        self,
+        query: str,
+        *,
+        manufacturer_id: int | None = None,
+        catalog_id: int | None = None,
+        brand: str | None = None,
+        top_k: int = 6,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield ``sources``, then one ``token`` event per answer delta, then ``done``.
+
+        Closing the generator (eg. when the HTTP client disconnects) closes the
+        upstream provider stream as well. A cached answer is replayed as a
+        single token; only answers streamed to the end are cached.
+        """
+        key = self._cache_key(
+            query, manufacturer_id=manufacturer_id, catalog_id=catalog_id, brand=brand, top_k=top_k
+        )
+        cached = self._answer_cache.get(key) if key is not None else None
+        if cached is not None:
+            yield {
+                "event": "sources",
+                "data": {"sources": cached["sources"], "total_sources": len(cached["sources"]), "cached": True},
+            }
+            yield {"event": "token", "data": {"delta": cached["answer"]}}
+            yield {"event": "done", "data": {}}
+            return
+
+        fitments = self._find_fitments(
+            query, manufacturer_id=manufacturer_id, catalog_id=catalog_id, brand=brand
+        )
+        if fitments:
+            sources = fitment_sources(fitments)
+            answer = format_fitment_answer(fitments)
+            yield {
+                "event": "sources",
+                "data": {"sources": sources, "total_sources": len(sources), "cached": False},
+            }
+            yield {"event": "token", "data": {"delta": answer}}
+            self._store(key, answer, sources, "fitments")
+            yield {"event": "done", "data": {}}
+            return
+
+        chunks = await self._retrieve(
+            query,
+            manufacturer_id=manufacturer_id,
+            catalog_id=catalog_id,
+            brand=brand,
+            top_k=top_k,
+        )
+        sources = self._build_sources(chunks)
+        yield {
+            "event": "sources",
+            "data": {"sources": sources, "total_sources": len(sources), "cached": False},
+        }
+
+        if not chunks:
+            yield {"event": "token", "data": {"delta": _NO_CONTEXT_ANSWER}}
+            self._store(key, _NO_CONTEXT_ANSWER, [], None)
+            yield {"event": "done", "data": {}}
+            return
+
+        deltas: list[str] = []
+        async for delta in self._stream_llm(self._build_messages(query, chunks)):
+            deltas.append(delta)
+            yield {"event": "token", "data": {"delta": delta}}
+        self._store(key, "".join(deltas), sources, "llm")
+        yield {"event": "done", "data": {}}
+
+    # ── private ───────────────────────────────────────────────────────
+
+    def _cache_key(
+        self,
+        query: str,
+        *,
+        manufacturer_id: int | None,
+        catalog_id: int | None,
+        brand: str | None,
+        top_k: int,
+    ) -> AnswerKey | None:
+        if self._answer_cache is None or self._catalog_repo is None or not self._answer_cache.enabled:
+            return None
+        return answer_key(
+            query,
+            manufacturer_id=manufacturer_id,
+            catalog_id=catalog_id,
+            brand=brand,
+            top_k=top_k,
+            catalog_version=self._catalog_repo.catalog_set_version(),
+        )
+
+    def _store(self, key: AnswerKey | None, answer: str, sources: list[dict[str, Any]], answer_source: str | None) -> None:
+        """Cache a streamed answer in the same shape :meth:`query` returns."""
+        if key is None:
+            return
+        result: dict[str, Any] = {"answer": answer, "sources": sources}
+        if answer_source is not None:
+            result.update(total_sources=len(sources), answer_source=answer_source)
+        self._answer_cache.put(key, result)
+
+    def _find_fitments(
+        self,
+        query: str,
+        *,
+        manufacturer_id: int | None,
+        catalog_id: int | None,
+        brand: str | None,
+    ) -> list[dict[str, Any]]:
+        if self._fitment_repo is None:
+            return []
+        fitment_query = resolve_fitment_query(query)
+        # The table only covers the part types the parser knows; anything else
+        # (oil filters, brake pads...) goes to retrieval instead.
+        if fitment_query is None or not fitment_query.part_types:
+            return []
+        rows = self._fitment_repo.find_fitments(
+            model=fitment_query.model,
+            year=fitment_query.year,
+            part_types=fitment_query.part_types,
+            brand=brand,
+            catalog_id=catalog_id,
+            manufacturer_id=manufacturer_id,
+        )
+        return narrow_by_engine(rows, fitment_query.engine)
+
+    async def _retrieve(
+        self,
+        query: str,
+        *,
+        manufacturer_id: int | None,
+        catalog_id: int | None,
+        brand: str | None,
+        top_k: int,
+    ) -> list[dict[str, Any]]:
         # 1. Embed the query
         query_embedding = await self._embeddings.embed_text(query)
 
@@ -84,17 +321,10 @@ class RagQueryService:
             catalog_id=catalog_id,
             brand=brand,
         )
-        chunks = self._diversify_sources(raw_chunks, top_k)
-
-        if not chunks:
-            return {
-                "answer": (
-                    "Não encontrei informações relevantes nos catálogos disponíveis "
-                    "para responder sua pergunta."
-                ),
-                "sources": [],
-            }
+        return self._diversify_sources(raw_chunks, top_k)
 
+    @staticmethod
+    def _build_messages(query: str, chunks: list[dict[str, Any]]) -> list[dict[str, str]]:
         # 3. Build context string with catalog metadata
         context_parts: list[str] = []
         for i, chunk in enumerate(chunks, start=1):
@@ -110,8 +340,8 @@ class RagQueryService:
             )
         context_text = "\n\n---\n\n".join(context_parts)
 
-        # 4. Call LLM
-        messages = [
+        # 4. Messages for the chat LLM
+        return [
             {"role": "system", "content": _SYSTEM_PROMPT},
             {
                 "role": "user",
@@ -120,8 +350,9 @@ class RagQueryService:
                 ),
             },
         ]
-        answer = await self._call_llm(messages)
 
+    @staticmethod
+    def _build_sources(chunks: list[dict[str, Any]]) -> list[dict[str, Any]]:
         # 5. Build source list with brand information
         sources: list[dict[str, Any]] = []
         for chunk in chunks:
@@ -136,14 +367,7 @@ class RagQueryService:
                     "similarity": float(chunk.get("similarity") or 0),
                 }
             )
-
-        return {
-            "answer": answer,
-            "sources": sources,
-            "total_sources": len(sources),
-        }
-
-    # ── private ───────────────────────────────────────────────────────
+        return sources
 
     @staticmethod
     def _diversify_sources(
@@ -182,20 +406,28 @@ class RagQueryService:
 
         return result
 
-    async def _call_llm(self, messages: list[dict[str, str]]) -> str:
+    def _chat_request(
+        self, messages: list[dict[str, str]], *, stream: bool = False
+    ) -> tuple[str, dict[str, str], dict[str, Any]]:
         s = self._settings
         url = f"{s.LLM_BASE_URL.rstrip('/')}/chat/completions"
         headers = {
             "Authorization": f"Bearer {s.LLM_API_KEY}",
             "Content-Type": "application/json",
         }
-        payload = {
+        payload: dict[str, Any] = {
             "model": s.LLM_MODEL,
             "messages": messages,
             "temperature": 0.1,
         }
+        if stream:
+            payload["stream"] = True
+        return url, headers, payload
+
+    async def _call_llm(self, messages: list[dict[str, str]]) -> str:
+        url, headers, payload = self._chat_request(messages)
 
-        async with httpx.AsyncClient(timeout=s.LLM_TIMEOUT_SECONDS) as client:
+        async with httpx.AsyncClient(timeout=self._settings.LLM_TIMEOUT_SECONDS) as client:
             resp = await client.post(url, headers=headers, json=payload)
 
         if resp.status_code >= 400:
@@ -204,3 +436,27 @@ class RagQueryService:
             )
 
         return resp.json()["choices"][0]["message"]["content"]
+
+    async def _stream_llm(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        url, headers, payload = self._chat_request(messages, stream=True)
+
+        async with httpx.AsyncClient(timeout=self._settings.LLM_TIMEOUT_SECONDS) as client:
+            async with client.stream("POST", url, headers=headers, json=payload) as resp:
+                if resp.status_code >= 400:
+                    body = (await resp.aread()).decode(errors="replace")
+                    raise RuntimeError(f"LLM error {resp.status_code}: {body[:300]}")
+
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = json.loads(data)["choices"][0].get("delta") or {}
+                    except (ValueError, KeyError, IndexError):
+                        logger.warning("Ignoring malformed LLM stream line: %s", data[:200])
+                        continue
+                    content = delta.get("content")
+                    if content:
+                        yield content
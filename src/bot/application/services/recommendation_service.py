@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
-import unicodedata
 from dataclasses import dataclass, field
 from typing import Any
 
+from src.bot.adapters.driven.llm.llm_recommendation_adapter import LlmParseError
 from src.bot.application.dtos.recommendation.candidate import Candidate
 from src.bot.application.dtos.recommendation.part_request import PartRequest
 from src.bot.application.dtos.recommendation.recommendation_item_result import (
@@ -22,6 +23,13 @@ from src.bot.application.dtos.recommendation.recommendation_response import (
 from src.bot.application.ports.driven.llm_recommendation_port import (
     LlmRecommendationPort,
 )
+from src.bot.application.services.keyword_matcher import (
+    KeywordMatcher,
+    iter_segment_matches,
+    normalize_many,
+    normalize_text,
+)
+from src.bot.application.services.vehicle_catalog_index import VehicleCatalogIndex
 from src.bot.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
@@ -78,16 +86,26 @@ MODEL_TO_BRAND = {
     "onix": "chevrolet",
 }
 
-COMPATIBILITY_MODEL_HINTS = tuple(MODEL_TO_BRAND.keys())
 SENSITIVE_TYPES = {"alternator"}
 
+BRAND_ALIASES = {"gm": "chevrolet", "vw": "volkswagen"}
+
+CATEGORY_MATCHER = KeywordMatcher.from_groups(CATEGORY_KEYWORDS)
+
+# Seeded with the constants above; refreshed from the vehicles catalog at runtime.
+VEHICLE_CATALOG_INDEX = VehicleCatalogIndex(
+    seed_models=MODEL_TO_BRAND,
+    seed_brands=KNOWN_BRANDS,
+    brand_aliases=BRAND_ALIASES,
+)
+
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+# Years and year ranges in one pass: group 2 is set only for a range.
+_YEAR_OR_RANGE_RE = re.compile(r"\b((?:19|20)\d{2})(?:\s*[-/]\s*((?:19|20)\d{2})\b)?\b")
+
 
 def _normalize_text(value: Any) -> str:
-    text = str(value or "").strip().lower()
-    if not text:
-        return ""
-    decomposed = unicodedata.normalize("NFKD", text)
-    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return normalize_text(str(value or ""))
 
 
 def _compact_dict(payload: dict[str, Any]) -> dict[str, Any]:
@@ -116,28 +134,14 @@ def _normalize_vehicle(vehicle: dict[str, Any] | None) -> dict[str, Any]:
 
 
 def _extract_years(text: str) -> list[int]:
-    return [int(match.group(0)) for match in re.finditer(r"\b(19|20)\d{2}\b", text)]
-
-
-def _extract_year_ranges(text: str) -> list[tuple[int, int]]:
-    ranges: list[tuple[int, int]] = []
-    for match in re.finditer(r"\b(19|20)\d{2}\s*[-/]\s*(19|20)\d{2}\b", text):
-        values = re.findall(r"(?:19|20)\d{2}", match.group(0))
-        if len(values) == 2:
-            start, end = int(values[0]), int(values[1])
-            ranges.append((min(start, end), max(start, end)))
-    return ranges
+    return [int(match.group(0)) for match in _YEAR_RE.finditer(text)]
 
 
 def infer_item_type(text: str | None) -> str:
     normalized = _normalize_text(text)
     if not normalized:
         return "unknown"
-    for item_type, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in normalized:
-                return item_type
-    return "unknown"
+    return CATEGORY_MATCHER.best(normalized) or "unknown"
 
 
 def normalize_item_label(text: str) -> str:
@@ -162,18 +166,24 @@ def _maybe_extract_vehicle_from_text(
         elif not current_year:
             vehicle["year"] = detected_year
 
+    year_value = int(vehicle["year"]) if str(vehicle.get("year") or "").isdigit() else None
+
     if not vehicle.get("model"):
-        for model, brand in MODEL_TO_BRAND.items():
-            if model in normalized_text:
-                vehicle["model"] = model.title()
-                vehicle.setdefault("brand", brand.upper() if brand == "gm" else brand.title())
-                break
+        models = VEHICLE_CATALOG_INDEX.models_in(normalized_text)
+        if models:
+            entry = VEHICLE_CATALOG_INDEX.resolve_model(models[0], year=year_value, brand=vehicle.get("brand"))
+            if entry is not None:
+                vehicle["model"] = entry.model.title()
+                vehicle.setdefault("brand", VEHICLE_CATALOG_INDEX.brand_display(entry.brand))
 
     if not vehicle.get("brand"):
-        for brand in KNOWN_BRANDS:
-            if brand in normalized_text:
-                vehicle["brand"] = brand.upper() if brand in {"gm", "vw"} else brand.title()
-                break
+        brands = VEHICLE_CATALOG_INDEX.brands_in(normalized_text)
+        if brands:
+            vehicle["brand"] = VEHICLE_CATALOG_INDEX.brand_display(brands[0])
+
+    if vehicle.get("model") and year_value is not None:
+        if VEHICLE_CATALOG_INDEX.covers_year(vehicle["model"], year_value, brand=vehicle.get("brand")) is False:
+            conflicts.append(f"year={year_value} outside_catalog_range model={vehicle['model']}")
 
     return vehicle, conflicts
 
@@ -249,6 +259,44 @@ class StructuredItem:
     raw_candidates: list[dict[str, Any]] = field(default_factory=list)
 
 
+@dataclass(slots=True)
+class CandidateColumns:
+    """Per-candidate features for a batch, one list entry per candidate."""
+
+    texts: list[str]
+    item_types: list[str]
+    brands: list[list[str]]
+    models: list[list[str]]
+    years: list[list[int]]
+    year_ranges: list[list[tuple[int, int]]]
+
+    @classmethod
+    def scan(cls, candidate_texts: list[str]) -> "CandidateColumns":
+        """Normalize all texts and extract every feature with one regex pass per feature."""
+        texts = normalize_many(candidate_texts)
+        years: list[list[int]] = [[] for _ in texts]
+        year_ranges: list[list[tuple[int, int]]] = [[] for _ in texts]
+        for index, match in iter_segment_matches(_YEAR_OR_RANGE_RE, texts):
+            start = int(match.group(1))
+            years[index].append(start)
+            if match.group(2):
+                end = int(match.group(2))
+                years[index].append(end)
+                year_ranges[index].append((min(start, end), max(start, end)))
+
+        return cls(
+            texts=texts,
+            item_types=[
+                CATEGORY_MATCHER.best_of(labels) or "unknown"
+                for labels in CATEGORY_MATCHER.labels_many(texts)
+            ],
+            brands=VEHICLE_CATALOG_INDEX.brand_matcher.labels_many(texts),
+            models=VEHICLE_CATALOG_INDEX.model_matcher.labels_many(texts),
+            years=years,
+            year_ranges=year_ranges,
+        )
+
+
 class FilteredRecommendationService(LlmRecommendationPort):
     def __init__(self, llm: LlmRecommendationPort | None = None) -> None:
         self._llm = llm
@@ -281,19 +329,29 @@ class FilteredRecommendationService(LlmRecommendationPort):
         flattened_rejections: list[Candidate] = []
         global_missing_fields: list[str] = []
 
-        for item in items:
-            accepted_candidates, rejected_candidates = self._filter_candidates(item)
+        filtered_items = [(item, *self._filter_candidates(item)) for item in items]
+        llm_indexes = [
+            index
+            for index, (item, accepted_candidates, _) in enumerate(filtered_items)
+            if accepted_candidates and not item.missing_fields and self._llm is not None
+        ]
+        llm_results = dict(
+            zip(
+                llm_indexes,
+                await self._rank_items_with_llm(
+                    request=request,
+                    pending=[filtered_items[index] for index in llm_indexes],
+                ),
+            )
+        )
+
+        for index, (item, accepted_candidates, rejected_candidates) in enumerate(filtered_items):
             summary = self._summarize_item(item, accepted_candidates, rejected_candidates)
             needs_more_info = bool(item.missing_fields)
             final_candidates = accepted_candidates
 
-            if accepted_candidates and not needs_more_info and self._llm is not None:
-                final_candidates, llm_needs_more_info, llm_missing_fields = await self._rank_with_llm(
-                    request=request,
-                    item=item,
-                    accepted_candidates=accepted_candidates,
-                    rejected_candidates=rejected_candidates,
-                )
+            if index in llm_results:
+                final_candidates, llm_needs_more_info, llm_missing_fields = llm_results[index]
                 needs_more_info = needs_more_info or llm_needs_more_info
                 for field_name in llm_missing_fields:
                     if field_name not in item.missing_fields:
@@ -514,17 +572,16 @@ class FilteredRecommendationService(LlmRecommendationPort):
             ),
         )
 
+        candidates = [
+            self._normalize_candidate(raw_candidate, index)
+            for index, raw_candidate in enumerate(item.raw_candidates, start=1)
+        ]
         if item.missing_fields:
-            for index, raw_candidate in enumerate(item.raw_candidates, start=1):
-                candidate = self._normalize_candidate(raw_candidate, index)
-                candidate.compatibility_status = "rejected"
-                candidate.reason = "insufficient_vehicle_data"
-                rejected.append(candidate)
-            return accepted, rejected
+            rejection_reasons: list[str | None] = ["insufficient_vehicle_data"] * len(candidates)
+        else:
+            rejection_reasons = self._candidate_rejection_reasons(item=item, candidates=candidates)
 
-        for index, raw_candidate in enumerate(item.raw_candidates, start=1):
-            candidate = self._normalize_candidate(raw_candidate, index)
-            rejection_reason = self._candidate_rejection_reason(item=item, candidate=candidate)
+        for candidate, rejection_reason in zip(candidates, rejection_reasons):
             if rejection_reason is None:
                 candidate.compatibility_status = "compatible"
                 candidate.reason = "filtered_candidate"
@@ -537,9 +594,10 @@ class FilteredRecommendationService(LlmRecommendationPort):
         accepted.sort(key=lambda candidate: float(candidate.score or 0.0), reverse=True)
         return accepted, rejected
 
-    def _candidate_rejection_reason(self, *, item: StructuredItem, candidate: Candidate) -> str | None:
+    @staticmethod
+    def _candidate_text(candidate: Candidate) -> str:
         metadata = candidate.metadata or {}
-        candidate_text = " ".join(
+        return " ".join(
             filter(
                 None,
                 [
@@ -551,46 +609,67 @@ class FilteredRecommendationService(LlmRecommendationPort):
                 ],
             )
         )
-        candidate_type = infer_item_type(candidate_text)
 
+    def _candidate_rejection_reasons(
+        self,
+        *,
+        item: StructuredItem,
+        candidates: list[Candidate],
+    ) -> list[str | None]:
+        """Rejection reason (or None) for each candidate, evaluated column-wise."""
         if item.requested_item_type == "unknown":
-            return "insufficient_metadata"
-        if candidate_type == "unknown":
-            return "insufficient_metadata"
-        if candidate_type != item.requested_item_type:
-            return "wrong_category"
-        if self._has_vehicle_incompatibility(item.vehicle, candidate_text):
-            return "incompatible_vehicle"
-        return None
-
-    def _has_vehicle_incompatibility(self, vehicle: dict[str, Any], candidate_text: str) -> bool:
-        normalized_candidate = _normalize_text(candidate_text)
-        request_brand = _normalize_text(vehicle.get("brand"))
+            return ["insufficient_metadata"] * len(candidates)
+
+        columns = CandidateColumns.scan([self._candidate_text(candidate) for candidate in candidates])
+        incompatible = self._vehicle_incompatibility_mask(item.vehicle, columns)
+        return [
+            "insufficient_metadata"
+            if candidate_type == "unknown"
+            else "wrong_category"
+            if candidate_type != item.requested_item_type
+            else "incompatible_vehicle"
+            if is_incompatible
+            else None
+            for candidate_type, is_incompatible in zip(columns.item_types, incompatible)
+        ]
+
+    def _vehicle_incompatibility_mask(self, vehicle: dict[str, Any], columns: CandidateColumns) -> list[bool]:
+        count = len(columns.texts)
+        request_brand = VEHICLE_CATALOG_INDEX.canonical_brand(vehicle.get("brand"))
         request_model = _normalize_text(vehicle.get("model"))
-        request_year = str(vehicle.get("year") or "").strip()
-
-        if request_brand:
-            mentioned_brands = [brand for brand in KNOWN_BRANDS if brand in normalized_candidate]
-            if mentioned_brands and request_brand not in mentioned_brands:
-                return True
-
-        if request_model and request_model not in normalized_candidate:
-            mentioned_models = [model for model in COMPATIBILITY_MODEL_HINTS if model in normalized_candidate]
-            if mentioned_models and request_model not in mentioned_models:
-                return True
-
-        if request_year:
-            year_ranges = _extract_year_ranges(normalized_candidate)
-            if year_ranges:
-                request_year_value = int(request_year)
-                if not any(start <= request_year_value <= end for start, end in year_ranges):
-                    return True
-            else:
-                mentioned_years = _extract_years(normalized_candidate)
-                if mentioned_years and int(request_year) not in mentioned_years:
-                    return True
-
-        return False
+        request_year_text = str(vehicle.get("year") or "").strip()
+        request_year = int(request_year_text) if request_year_text.isdigit() else None
+
+        if not request_brand and request_model:
+            model_brands = VEHICLE_CATALOG_INDEX.brands_for_model(request_model)
+            if len(model_brands) == 1:
+                request_brand = model_brands[0]
+
+        brand_mismatch = (
+            [bool(brands) and request_brand not in brands for brands in columns.brands]
+            if request_brand
+            else [False] * count
+        )
+        model_mismatch = (
+            [
+                request_model not in text and bool(models) and request_model not in models
+                for text, models in zip(columns.texts, columns.models)
+            ]
+            if request_model
+            else [False] * count
+        )
+        if request_year is None:
+            year_mismatch = [False] * count
+        else:
+            # An explicit range wins over loose years.
+            year_mismatch = [
+                not any(start <= request_year <= end for start, end in ranges)
+                if ranges
+                else bool(years) and request_year not in years
+                for ranges, years in zip(columns.year_ranges, columns.years)
+            ]
+
+        return [any(flags) for flags in zip(brand_mismatch, model_mismatch, year_mismatch)]
 
     async def _rank_with_llm(
         self,
@@ -625,12 +704,130 @@ class FilteredRecommendationService(LlmRecommendationPort):
         )
 
         llm_response = await self._llm.generate(llm_request)
+        ordered_candidates = self._merge_llm_candidates(accepted_candidates, llm_response.candidates or [])
+
+        return (
+            ordered_candidates,
+            bool(llm_response.needs_more_info),
+            list(llm_response.required_missing_fields or []),
+        )
+
+    async def _rank_items_with_llm(
+        self,
+        *,
+        request: RecommendationRequest,
+        pending: list[tuple[StructuredItem, list[Candidate], list[Candidate]]],
+    ) -> list[tuple[list[Candidate], bool, list[str]]]:
+        """Rank every pending item, in a single batched call when the LLM supports it.
+
+        Items the batch could not answer (unparseable output or a missing
+        ``item_id``) fall back to concurrent per-item calls.
+        """
+        if not pending or self._llm is None:
+            return []
+
+        results: dict[int, tuple[list[Candidate], bool, list[str]]] = {}
+        item_ids = [item.item_id for item, _, _ in pending]
+        can_batch = (
+            len(pending) > 1
+            and callable(getattr(self._llm, "generate_batch", None))
+            and len(set(item_ids)) == len(item_ids)
+        )
+        if can_batch:
+            try:
+                results = await self._rank_batch_with_llm(request=request, pending=pending)
+            except LlmParseError as exc:
+                logger.warning(
+                    "%s llm_batch_parse_failed items=%s error=%s",
+                    DEBUG_PREFIX,
+                    _safe_json(item_ids),
+                    exc,
+                )
+
+        fallback_indexes = [index for index in range(len(pending)) if index not in results]
+        if fallback_indexes:
+            if can_batch:
+                logger.info(
+                    "%s llm_batch_fallback items=%s",
+                    DEBUG_PREFIX,
+                    _safe_json([item_ids[index] for index in fallback_indexes]),
+                )
+            fallback_results = await asyncio.gather(
+                *(
+                    self._rank_with_llm(
+                        request=request,
+                        item=pending[index][0],
+                        accepted_candidates=pending[index][1],
+                        rejected_candidates=pending[index][2],
+                    )
+                    for index in fallback_indexes
+                )
+            )
+            results.update(zip(fallback_indexes, fallback_results))
+
+        return [results[index] for index in range(len(pending))]
+
+    async def _rank_batch_with_llm(
+        self,
+        *,
+        request: RecommendationRequest,
+        pending: list[tuple[StructuredItem, list[Candidate], list[Candidate]]],
+    ) -> dict[int, tuple[list[Candidate], bool, list[str]]]:
+        index_by_item_id = {item.item_id: index for index, (item, _, _) in enumerate(pending)}
+        llm_request = RecommendationRequest(
+            requester_id=request.requester_id,
+            vehicle=_normalize_vehicle(request.vehicle),
+            parts=[
+                PartRequest(
+                    item_id=item.item_id,
+                    part_number=item.part_number,
+                    description=item.description,
+                    quantity=item.quantity,
+                    notes=item.notes,
+                )
+                for item, _, _ in pending
+            ],
+            context={
+                "original_description": (request.context or {}).get("original_description")
+                or [item.description for item, _, _ in pending],
+                "batch_items": [
+                    {
+                        "item_id": item.item_id,
+                        "requested_item_type": item.requested_item_type,
+                        "vehicle": _compact_dict(item.vehicle),
+                        "required_missing_fields": item.missing_fields,
+                        "prefiltered_candidates": [candidate.model_dump() for candidate in accepted],
+                        "rejected_candidates": [candidate.model_dump() for candidate in rejected],
+                    }
+                    for item, accepted, rejected in pending
+                ],
+            },
+        )
+
+        llm_response = await self._llm.generate_batch(llm_request)
+        results: dict[int, tuple[list[Candidate], bool, list[str]]] = {}
+        for item_result in llm_response.items or []:
+            index = index_by_item_id.get(item_result.item_id)
+            if index is None or index in results:
+                continue
+            results[index] = (
+                self._merge_llm_candidates(pending[index][1], item_result.accepted_candidates or []),
+                bool(item_result.needs_more_info),
+                list(item_result.required_missing_fields or []),
+            )
+        return results
+
+    def _merge_llm_candidates(
+        self,
+        accepted_candidates: list[Candidate],
+        llm_candidates: list[Candidate],
+    ) -> list[Candidate]:
         accepted_map: dict[tuple[str | None, str | None], Candidate] = {}
         for candidate in accepted_candidates:
             accepted_map[(candidate.id, candidate.part_number)] = candidate
 
         ordered_candidates: list[Candidate] = []
-        for llm_candidate in llm_response.candidates or []:
+        for llm_candidate in llm_candidates:
             key = (llm_candidate.id, llm_candidate.part_number)
             accepted = accepted_map.get(key)
             if accepted is None:
@@ -658,12 +855,7 @@ class FilteredRecommendationService(LlmRecommendationPort):
             _safe_json([candidate.model_dump() for candidate in accepted_candidates]),
             _safe_json([candidate.model_dump() for candidate in ordered_candidates]),
         )
-
-        return (
-            ordered_candidates,
-            bool(llm_response.needs_more_info),
-            list(llm_response.required_missing_fields or []),
-        )
+        return ordered_candidates
 
     def _summarize_item(
         self,
@@ -0,0 +1,239 @@
+"""In-memory model/brand dictionary backed by the vehicles catalog.
+
+The index starts from a small static seed (so the recommender works without a
+database) and is kept in sync with the ``manufacturers`` and ``vehicles``
+tables by :meth:`VehicleCatalogIndex.refresh`, which only fetches rows whose
+``updated_at`` moved since the previous refresh.
+
+Lookups read an immutable snapshot that is swapped atomically after each
+refresh that changed something, so request threads never take the lock.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any
+
+from src.bot.application.ports.driven.vehicle_catalog import VehicleCatalogSourcePort
+from src.bot.application.services.keyword_matcher import KeywordMatcher, normalize_text
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rows are re-read from slightly before the watermark: ``updated_at`` is the
+# writer's transaction start time, so a slow transaction may commit a row that
+# is older than the newest one we already saw. Upserts are idempotent.
+_WATERMARK_OVERLAP = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, slots=True)
+class VehicleModel:
+    model: str
+    brand: str
+    year_start: int | None = None
+    year_end: int | None = None
+
+    def covers_year(self, year: int) -> bool:
+        if self.year_start is not None and year < self.year_start:
+            return False
+        if self.year_end is not None and year > self.year_end:
+            return False
+        return True
+
+
+@dataclass(frozen=True, slots=True)
+class _Snapshot:
+    brand_matcher: KeywordMatcher
+    model_matcher: KeywordMatcher
+    brand_names: dict[str, str]
+    models: dict[str, tuple[VehicleModel, ...]]
+
+
+class VehicleCatalogIndex:
+    """Brand/model lookup with year ranges.
+
+    Brands are canonical normalized manufacturer names ("volkswagen");
+    ``brand_aliases`` maps short forms ("vw") onto them. Models are normalized
+    model names ("gol", "grand siena").
+    """
+
+    def __init__(
+        self,
+        *,
+        seed_models: Mapping[str, str] | None = None,
+        seed_brands: Iterable[str] = (),
+        brand_aliases: Mapping[str, str] | None = None,
+    ) -> None:
+        self._aliases = {normalize_text(k): normalize_text(v) for k, v in (brand_aliases or {}).items()}
+        self._seed_brands = {self.canonical_brand(brand) for brand in seed_brands if brand}
+        self._seed_models = {
+            normalize_text(model): self.canonical_brand(brand) for model, brand in (seed_models or {}).items()
+        }
+
+        self._lock = Lock()
+        self._manufacturers: dict[int, tuple[str, str]] = {}
+        self._vehicles: dict[int, tuple[int, str, int | None, int | None]] = {}
+        self._manufacturers_watermark: datetime | None = None
+        self._vehicles_watermark: datetime | None = None
+        self._refreshed_at: float | None = None
+        self._snapshot = self._build_snapshot()
+
+    # ── lookups ───────────────────────────────────────────────────────
+
+    def canonical_brand(self, value: Any) -> str:
+        brand = normalize_text(str(value or ""))
+        return self._aliases.get(brand, brand)
+
+    def brand_display(self, brand: str) -> str:
+        canonical = self.canonical_brand(brand)
+        return self._snapshot.brand_names.get(canonical) or canonical.title()
+
+    @property
+    def brand_matcher(self) -> KeywordMatcher:
+        return self._snapshot.brand_matcher
+
+    @property
+    def model_matcher(self) -> KeywordMatcher:
+        return self._snapshot.model_matcher
+
+    def brands_in(self, normalized_text: str) -> list[str]:
+        """Canonical brands mentioned in ``normalized_text``, in text order."""
+        return self._snapshot.brand_matcher.labels(normalized_text)
+
+    def models_in(self, normalized_text: str) -> list[str]:
+        """Models mentioned in ``normalized_text``, in text order."""
+        return self._snapshot.model_matcher.labels(normalized_text)
+
+    def model_entries(self, model: str) -> tuple[VehicleModel, ...]:
+        return self._snapshot.models.get(normalize_text(model), ())
+
+    def brands_for_model(self, model: str) -> list[str]:
+        return list(dict.fromkeys(entry.brand for entry in self.model_entries(model)))
+
+    def resolve_model(self, model: str, *, year: int | None = None, brand: str | None = None) -> VehicleModel | None:
+        """Best catalog entry for ``model``, preferring the brand and year given."""
+        entries = list(self.model_entries(model))
+        if brand:
+            canonical = self.canonical_brand(brand)
+            entries = [entry for entry in entries if entry.brand == canonical] or entries
+        if year is not None:
+            entries = [entry for entry in entries if entry.covers_year(year)] or entries
+        return entries[0] if entries else None
+
+    def covers_year(self, model: str, year: int, *, brand: str | None = None) -> bool | None:
+        """Whether the catalog lists ``model`` for ``year``; None when it has no dated rows."""
+        entries = self.model_entries(model)
+        if brand:
+            canonical = self.canonical_brand(brand)
+            entries = tuple(entry for entry in entries if entry.brand == canonical)
+        dated = [entry for entry in entries if entry.year_start is not None]
+        if not dated:
+            return None
+        return any(entry.covers_year(year) for entry in dated)
+
+    # ── refresh ───────────────────────────────────────────────────────
+
+    def refresh(self, source: VehicleCatalogSourcePort) -> int:
+        """Apply catalog rows changed since the last refresh; returns how many rows changed."""
+        with self._lock:
+            manufacturer_rows = source.list_manufacturers_changed_since(self._since(self._manufacturers_watermark))
+            vehicle_rows = source.list_vehicles_changed_since(self._since(self._vehicles_watermark))
+
+            changed = 0
+            for row in manufacturer_rows:
+                changed += self._apply_manufacturer(row)
+                self._manufacturers_watermark = self._max(self._manufacturers_watermark, row.get("updated_at"))
+            for row in vehicle_rows:
+                changed += self._apply_vehicle(row)
+                self._vehicles_watermark = self._max(self._vehicles_watermark, row.get("updated_at"))
+
+            if changed:
+                self._snapshot = self._build_snapshot()
+                logger.info(
+                    "Vehicle catalog index refreshed: %s changed rows, %s manufacturers, %s vehicles",
+                    changed,
+                    len(self._manufacturers),
+                    len(self._vehicles),
+                )
+            self._refreshed_at = time.monotonic()
+            return changed
+
+    def refresh_if_stale(self, source: VehicleCatalogSourcePort, max_age_seconds: float) -> int:
+        refreshed_at = self._refreshed_at
+        if refreshed_at is not None and time.monotonic() - refreshed_at < max_age_seconds:
+            return 0
+        return self.refresh(source)
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _since(watermark: datetime | None) -> datetime | None:
+        return None if watermark is None else watermark - _WATERMARK_OVERLAP
+
+    @staticmethod
+    def _max(current: datetime | None, value: datetime | None) -> datetime | None:
+        if value is None:
+            return current
+        return value if current is None or value > current else current
+
+    def _apply_manufacturer(self, row: Mapping[str, Any]) -> int:
+        manufacturer_id = int(row["id"])
+        if row.get("soft_delete"):
+            return 1 if self._manufacturers.pop(manufacturer_id, None) is not None else 0
+        display = str(row["name"]).strip()
+        entry = (normalize_text(display), display)
+        if self._manufacturers.get(manufacturer_id) == entry:
+            return 0
+        self._manufacturers[manufacturer_id] = entry
+        return 1
+
+    def _apply_vehicle(self, row: Mapping[str, Any]) -> int:
+        vehicle_id = int(row["id"])
+        if row.get("soft_delete"):
+            return 1 if self._vehicles.pop(vehicle_id, None) is not None else 0
+        entry = (
+            int(row["manufacturer_id"]),
+            normalize_text(str(row["model"])),
+            row.get("model_year_start"),
+            row.get("model_year_end"),
+        )
+        if self._vehicles.get(vehicle_id) == entry:
+            return 0
+        self._vehicles[vehicle_id] = entry
+        return 1
+
+    def _build_snapshot(self) -> _Snapshot:
+        brand_names: dict[str, str] = {}
+        brand_keywords = {brand: brand for brand in self._seed_brands}
+        brand_keywords.update({alias: brand for alias, brand in self._aliases.items()})
+        for canonical, display in self._manufacturers.values():
+            brand_names[canonical] = display
+            brand_keywords[canonical] = canonical
+
+        models: dict[str, list[VehicleModel]] = {}
+        for manufacturer_id, model, year_start, year_end in self._vehicles.values():
+            manufacturer = self._manufacturers.get(manufacturer_id)
+            if manufacturer is None or not model:
+                continue
+            models.setdefault(model, []).append(
+                VehicleModel(model=model, brand=manufacturer[0], year_start=year_start, year_end=year_end)
+            )
+        for model, brand in self._seed_models.items():
+            if model not in models:
+                models[model] = [VehicleModel(model=model, brand=brand)]
+
+        # Bare numbers ("500") and one-letter names are too ambiguous to spot in free text.
+        model_keywords = {model: model for model in models if len(model) > 1 and not model.isdigit()}
+        return _Snapshot(
+            brand_matcher=KeywordMatcher(brand_keywords),
+            model_matcher=KeywordMatcher(model_keywords),
+            brand_names=brand_names,
+            models={
+                model: tuple(sorted(entries, key=lambda entry: (entry.year_start or 0, entry.brand)))
+                for model, entries in models.items()
+            },
+        )
@@ -21,6 +21,10 @@ class UnauthorizedError(DomainError):
 	"""Raised when the actor is not authorized to perform an action."""
 
 
+class TooManyRequestsError(DomainError):
+	"""Raised when a caller exceeds a concurrency or rate limit."""
+
+
 # Specific domain exceptions (convenience subclasses)
 class MechanicNotFound(NotFoundError):
 	pass
@@ -13,6 +13,7 @@ from src.bot.domain.errors import (
     NotFoundError,
     ValidationError,
     ConflictError,
+    TooManyRequestsError,
     UnauthorizedError,
 )
 
@@ -37,6 +38,10 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def _unauthorized(_req: Request, exc: UnauthorizedError) -> JSONResponse:
         return JSONResponse(status_code=401, content={"detail": str(exc)})
 
+    @app.exception_handler(TooManyRequestsError)
+    async def _too_many_requests(_req: Request, exc: TooManyRequestsError) -> JSONResponse:
+        return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
     @app.exception_handler(DomainError)
     async def _domain_generic(_req: Request, exc: DomainError) -> JSONResponse:
         return JSONResponse(status_code=500, content={"detail": str(exc)})
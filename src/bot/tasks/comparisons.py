@@ -0,0 +1,48 @@
+"""Rebuild the materialized thread comparisons.
+
+Usage::
+
+    python -m src.bot.tasks.comparisons            # every thread
+    python -m src.bot.tasks.comparisons 12 15      # only these threads
+
+Seller renames through the vendor API are patched into the documents right
+away; shop (``autoparts``) names have no update path in the API, so a shop
+renamed directly in the database shows its old name until this task runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    BrowserThreadRepoSqlAlchemy,
+)
+from src.bot.adapters.driven.db.session import SessionLocal
+from src.bot.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def rebuild_thread_comparisons(thread_ids: list[int] | None = None) -> int:
+    session = SessionLocal()
+    try:
+        count = BrowserThreadRepoSqlAlchemy(session).rebuild_comparisons(thread_ids=thread_ids)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    logger.info("Rebuilt %s thread comparisons", count)
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild materialized thread comparisons.")
+    parser.add_argument("thread_ids", nargs="*", type=int, help="threads to rebuild (default: all)")
+    args = parser.parse_args(argv)
+    count = rebuild_thread_comparisons(args.thread_ids or None)
+    print(f"rebuilt {count} thread comparisons")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""End-to-end load test of the quotation flow against a local Postgres.
+
+Starts the provider stub (``provider_stub``) and the real app in-process,
+points ``LLM_*`` / ``EMBEDDINGS_*`` at the stub and runs ``--concurrency``
+workers, each repeating this scenario until ``--scenarios`` have run:
+
+  1. mechanic creates a thread (``POST /threads``, with suggestions);
+  2. seller polls the inbox ``--inbox-polls`` times (``GET /seller/inbox``);
+  3. seller opens an offer, adds one option per requested item and submits;
+  4. mechanic reads the comparison (``GET /threads/{id}/comparison``).
+
+Per endpoint it reports requests, errors, RPS, p50/p95/p99 latency and the
+SQL statements each request executed (counted on the SQLAlchemy engine and
+returned in an ``X-DB-Queries`` header added only here). The accounts must
+already exist (see migrations 014/019; seeded mechanics use ``secret123``).
+
+Usage::
+
+    python -m src.bot.tasks.load_test --seller-email vendedor@loja.local
+    python -m src.bot.tasks.load_test --seller-email vendedor@loja.local \\
+        --concurrency 16 --scenarios 200 --chat-latency lognormal:0.8,2.5 --json load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.bot.tasks.provider_stub import (
+    LatencyDistribution,
+    StubBehavior,
+    create_stub_app,
+    serve_in_thread,
+)
+
+DB_QUERIES_HEADER = "x-db-queries"
+
+_query_counter: ContextVar[list[int] | None] = ContextVar("load_test_query_counter", default=None)
+
+_SCENARIO_ITEMS = (
+    {"description": "vela de ignição", "quantity": 4},
+    {"description": "pastilha de freio dianteira", "quantity": 1},
+)
+_SCENARIO_VEHICLE = {"brand": "Fiat", "model": "Palio", "year": "2015", "engine": "1.0"}
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+# ── DB query counting ─────────────────────────────────────────────────
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Count every statement ``engine`` runs into the current request's counter."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+class DbQueryCountMiddleware:
+    """ASGI middleware that reports the request's statement count in ``X-DB-Queries``.
+
+    Sync dependencies and handlers run with a copy of the request's context,
+    so they all increment the same counter object.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        counter = [0]
+        token = _query_counter.set(counter)
+
+        async def send_with_count(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((DB_QUERIES_HEADER.encode(), str(counter[0]).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _query_counter.reset(token)
+
+
+# ── stats ─────────────────────────────────────────────────────────────
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    db_queries: list[int] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def record(self, elapsed_ms: float, status: int, db_queries: int | None) -> None:
+        self.latencies_ms.append(elapsed_ms)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+        if db_queries is not None:
+            self.db_queries.append(db_queries)
+
+
+class LoadReport:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def record(self, label: str, elapsed_ms: float, status: int, db_queries: int | None) -> None:
+        self.endpoints.setdefault(label, EndpointStats()).record(elapsed_ms, status, db_queries)
+
+    def summary(self) -> dict[str, Any]:
+        wall = max((self.finished or time.perf_counter()) - self.started, 1e-9)
+        endpoints = {}
+        for label, stats in self.endpoints.items():
+            count = len(stats.latencies_ms)
+            endpoints[label] = {
+                "requests": count,
+                "errors": stats.errors,
+                "statuses": {str(status): total for status, total in sorted(stats.statuses.items())},
+                "rps": round(count / wall, 2),
+                "p50_ms": round(percentile(stats.latencies_ms, 50), 1),
+                "p95_ms": round(percentile(stats.latencies_ms, 95), 1),
+                "p99_ms": round(percentile(stats.latencies_ms, 99), 1),
+                "db_queries_avg": (
+                    round(sum(stats.db_queries) / len(stats.db_queries), 1) if stats.db_queries else None
+                ),
+                "db_queries_max": max(stats.db_queries, default=None),
+            }
+        total = sum(len(stats.latencies_ms) for stats in self.endpoints.values())
+        return {"wall_seconds": round(wall, 2), "requests": total, "rps": round(total / wall, 2), "endpoints": endpoints}
+
+
+def format_report(summary: dict[str, Any]) -> str:
+    header = f"{'endpoint':<36} {'reqs':>6} {'errs':>5} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'db avg':>7} {'db max':>7}"
+    lines = [header, "-" * len(header)]
+    for label, row in summary["endpoints"].items():
+        db_avg = "-" if row["db_queries_avg"] is None else f"{row['db_queries_avg']:.1f}"
+        db_max = "-" if row["db_queries_max"] is None else str(row["db_queries_max"])
+        lines.append(
+            f"{label:<36} {row['requests']:>6} {row['errors']:>5} {row['rps']:>7.2f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {db_avg:>7} {db_max:>7}"
+        )
+    lines.append(f"total: {summary['requests']} requests in {summary['wall_seconds']}s ({summary['rps']} rps)")
+    return "\n".join(lines)
+
+
+# ── scenario ──────────────────────────────────────────────────────────
+
+
+class ScenarioClient:
+    def __init__(self, client: httpx.AsyncClient, report: LoadReport) -> None:
+        self._client = client
+        self._report = report
+
+    async def call(self, label: str, method: str, url: str, token: str | None = None, **kwargs) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        start = time.perf_counter()
+        response = await self._client.request(method, url, headers=headers, **kwargs)
+        queries = response.headers.get(DB_QUERIES_HEADER)
+        self._report.record(
+            label,
+            (time.perf_counter() - start) * 1000,
+            response.status_code,
+            int(queries) if queries is not None else None,
+        )
+        return response
+
+    async def login(self, email: str, password: str) -> str:
+        response = await self.call("POST /auth/login", "POST", "/auth/login", json={"email": email, "password": password})
+        if response.status_code != 200:
+            raise RuntimeError(f"login failed for {email}: HTTP {response.status_code} (is DATABASE_URL seeded?)")
+        return response.json()["token"]
+
+
+async def run_scenario(
+    client: ScenarioClient,
+    *,
+    mechanic_token: str,
+    seller_token: str,
+    inbox_polls: int,
+    generate_suggestions: bool,
+) -> None:
+    created = await client.call(
+        "POST /threads",
+        "POST",
+        "/threads",
+        mechanic_token,
+        json={
+            "requested_items": list(_SCENARIO_ITEMS),
+            "vehicle": _SCENARIO_VEHICLE,
+            "generate_suggestions": generate_suggestions,
+        },
+    )
+    if created.status_code >= 400:
+        return
+    detail = created.json()
+    thread_id = detail["thread"]["id"]
+
+    for _ in range(inbox_polls):
+        await client.call("GET /seller/inbox", "GET", "/seller/inbox", seller_token, params={"page_size": 20})
+
+    offer = await client.call("POST /threads/{id}/offers", "POST", f"/threads/{thread_id}/offers", seller_token)
+    if offer.status_code >= 400:
+        return
+    offer_id = offer.json()["id"]
+    for index, item in enumerate(detail["requested_items"], start=1):
+        await client.call(
+            "POST /offers/{id}/items",
+            "POST",
+            f"/offers/{offer_id}/items",
+            seller_token,
+            json={
+                "requested_item_id": item["id"],
+                "source_type": "manual",
+                "description": item["description"],
+                "brand": "Bosch",
+                "part_number": f"LOAD-{index:04d}",
+                "quantity": item["quantity"],
+                "unit_price": 25.0 * index,
+            },
+        )
+    await client.call("POST /offers/{id}/submit", "POST", f"/offers/{offer_id}/submit", seller_token, json={})
+    await client.call(
+        "GET /threads/{id}/comparison", "GET", f"/threads/{thread_id}/comparison", mechanic_token
+    )
+
+
+async def run_load(
+    base_url: str,
+    *,
+    mechanic_email: str,
+    seller_email: str,
+    password: str,
+    concurrency: int,
+    scenarios: int,
+    inbox_polls: int,
+    generate_suggestions: bool,
+) -> LoadReport:
+    report = LoadReport()
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as http:
+        client = ScenarioClient(http, report)
+        mechanic_token = await client.login(mechanic_email, password)
+        seller_token = await client.login(seller_email, password)
+        report.endpoints.clear()
+        report.started = time.perf_counter()
+
+        remaining = iter(range(scenarios))
+
+        async def worker() -> None:
+            for _ in remaining:
+                await run_scenario(
+                    client,
+                    mechanic_token=mechanic_token,
+                    seller_token=seller_token,
+                    inbox_polls=inbox_polls,
+                    generate_suggestions=generate_suggestions,
+                )
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report.finished = time.perf_counter()
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mechanic-email", default="mecanico+1@mecanice.local")
+    parser.add_argument("--seller-email", required=True)
+    parser.add_argument("--password", default="secret123")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", type=int, default=50)
+    parser.add_argument("--inbox-polls", type=int, default=3)
+    parser.add_argument("--no-suggestions", action="store_true", help="create threads without LLM suggestions")
+    parser.add_argument("--chat-latency", type=LatencyDistribution.parse, default=LatencyDistribution.parse("lognormal:0.8,2.5"))
+    parser.add_argument("--embeddings-latency", type=LatencyDistribution.parse, default=LatencyDistribution.parse("lognormal:0.05,0.2"))
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--ambiguity-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    # Imported late: the app reads settings lazily, so the stub URLs set below win.
+    from src.bot.adapters.driven.db.session import engine
+    from src.bot.adapters.driver.fastapi.app_factory import create_app
+    from src.bot.infrastructure.config.settings import settings
+
+    behavior = StubBehavior(
+        chat_latency=args.chat_latency,
+        embeddings_latency=args.embeddings_latency,
+        error_rate=args.error_rate,
+        ambiguity_rate=args.ambiguity_rate,
+        seed=args.seed,
+    )
+    with serve_in_thread(create_stub_app(behavior)) as stub_url:
+        settings.LLM_BASE_URL = settings.EMBEDDINGS_BASE_URL = stub_url
+        settings.LLM_API_KEY = settings.EMBEDDINGS_API_KEY = "stub"
+        settings.LLM_FALLBACK_BASE_URL = settings.EMBEDDINGS_FALLBACK_BASE_URL = ""
+
+        install_query_counter(engine)
+        app = create_app()
+        app.add_middleware(DbQueryCountMiddleware)
+        with serve_in_thread(app, lifespan="on") as app_url:
+            report = asyncio.run(
+                run_load(
+                    app_url,
+                    mechanic_email=args.mechanic_email,
+                    seller_email=args.seller_email,
+                    password=args.password,
+                    concurrency=args.concurrency,
+                    scenarios=args.scenarios,
+                    inbox_polls=args.inbox_polls,
+                    generate_suggestions=not args.no_suggestions,
+                )
+            )
+
+    summary = report.summary()
+    summary["provider_stub_requests"] = dict(behavior.requests)
+    print(format_report(summary))
+    print(f"provider stub: {behavior.requests['chat']} chat, {behavior.requests['embeddings']} embeddings requests")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
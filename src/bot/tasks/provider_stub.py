@@ -0,0 +1,275 @@
+"""Local OpenAI-compatible stub for the LLM and embeddings providers.
+
+Serves ``POST /chat/completions`` and ``POST /embeddings`` with configurable
+latency distributions and error rate, so hedging, the circuit breaker and
+throughput can be exercised without calling the real provider. Point
+``LLM_BASE_URL`` / ``EMBEDDINGS_BASE_URL`` (or the ``*_FALLBACK_BASE_URL``)
+at it.
+
+Chat answers follow the ``prompt_templates`` output schema: the batch schema
+(one entry per ``[item_id: ...]`` in the user message) when the batch
+instructions were sent, the single schema otherwise. ``--ambiguity-rate``
+answers a share of items with low scores and ``required_questions``, which is
+what makes the tiered router escalate.
+
+Latency specs: ``0.8`` (fixed seconds), ``uniform:0.2,1.5`` or
+``lognormal:0.8,2.5`` (median and p95 seconds).
+
+Usage::
+
+    python -m src.bot.tasks.provider_stub --port 9100
+    python -m src.bot.tasks.provider_stub --port 9100 --chat-latency lognormal:0.8,2.5 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.bot.adapters.driven.llm.prompt_templates import BATCH_DEVELOPER_INSTRUCTIONS
+
+_EMBEDDING_DIMENSIONS = 1536
+_Z_95 = 1.6449
+_ITEM_ID_RE = re.compile(r"\[item_id: ([^\]]+)\]")
+_REQUESTER_RE = re.compile(r"^Solicitante: (.+)$", re.MULTILINE)
+# (part_number, brand, origin, average_price_brl, score)
+_CANNED_CANDIDATES = (
+    ("STUB-0001", "Bosch", "aftermarket", 42.9, 0.92),
+    ("STUB-0002", "NGK", "aftermarket", 38.5, 0.86),
+    ("STUB-0003", "OEM", "OEM", 89.9, 0.8),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyDistribution:
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, values = spec.partition(":")
+        if not values:
+            kind, values = "fixed", spec
+        numbers = [float(value) for value in values.split(",")]
+        if kind == "fixed" and len(numbers) == 1:
+            return cls("fixed", numbers[0])
+        if kind in ("uniform", "lognormal") and len(numbers) == 2 and 0 <= numbers[0] <= numbers[1]:
+            return cls(kind, numbers[0], numbers[1])
+        raise ValueError(f"invalid latency spec: {spec!r}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal" and self.a > 0:
+            sigma = math.log(self.b / self.a) / _Z_95
+            return rng.lognormvariate(math.log(self.a), sigma)
+        return self.a
+
+
+@dataclass
+class StubBehavior:
+    """Mutable at runtime (tests flip it between calls)."""
+
+    chat_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    embeddings_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Sent as ``Retry-After`` (seconds) on error responses when set.
+    retry_after: float | None = None
+    ambiguity_rate: float = 0.0
+    seed: int | None = None
+    requests: dict[str, int] = field(default_factory=lambda: {"chat": 0, "embeddings": 0})
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+
+    async def delay(self, latency: LatencyDistribution) -> None:
+        seconds = latency.sample(self._random)
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def is_ambiguous(self) -> bool:
+        return self.ambiguity_rate > 0 and self._random.random() < self.ambiguity_rate
+
+
+def _candidates(ambiguous: bool) -> list[dict[str, Any]]:
+    questions = ["Dianteiro ou traseiro?", "Com ou sem ABS?"] if ambiguous else []
+    return [
+        {
+            "id": str(index),
+            "part_number": part_number,
+            "brand": brand,
+            "average_price_brl": price,
+            "score": round(score / 2, 2) if ambiguous else score,
+            "metadata": {
+                "description": f"Peça {brand} (stub)",
+                "compatibility_notes": "Resposta simulada pelo provider stub",
+                "origin": origin,
+                "fitment_keys": ["ano", "motor"],
+                "warning_flags": ["varia por versão"] if ambiguous else [],
+                "required_questions": questions,
+            },
+        }
+        for index, (part_number, brand, origin, price, score) in enumerate(_CANNED_CANDIDATES, start=1)
+    ]
+
+
+def _chat_content(body: dict[str, Any], behavior: StubBehavior) -> dict[str, Any]:
+    """An answer in the ``prompt_templates`` output schema for ``body["messages"]``."""
+    messages = body.get("messages") or []
+    by_role = {message.get("role"): str(message.get("content") or "") for message in messages}
+    user = by_role.get("user", "")
+    requester = _REQUESTER_RE.search(user)
+    content: dict[str, Any] = {
+        "id": requester.group(1).strip() if requester else "stub",
+        "evidences": [],
+        "raw": {"model": body.get("model"), "stub": True},
+    }
+    if by_role.get("developer") == BATCH_DEVELOPER_INSTRUCTIONS:
+        content["items"] = [
+            {
+                "item_id": item_id.strip(),
+                "needs_more_info": False,
+                "required_missing_fields": [],
+                "candidates": _candidates(behavior.is_ambiguous()),
+            }
+            for item_id in _ITEM_ID_RE.findall(user)
+        ]
+    else:
+        content["candidates"] = _candidates(behavior.is_ambiguous())
+    return content
+
+
+def _embedding(text: str, dimensions: int) -> list[float]:
+    # Deterministic per text, so repeated queries hit the same chunks.
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    return [rng.uniform(-1.0, 1.0) for _ in range(dimensions)]
+
+
+def create_stub_app(behavior: StubBehavior | None = None, *, dimensions: int = _EMBEDDING_DIMENSIONS) -> FastAPI:
+    app = FastAPI(title="provider-stub")
+    app.state.behavior = behavior or StubBehavior()
+
+    def _error(status: int) -> JSONResponse:
+        stub: StubBehavior = app.state.behavior
+        headers = {"Retry-After": f"{stub.retry_after:g}"} if stub.retry_after is not None else None
+        return JSONResponse(
+            {"error": {"message": "stub failure", "type": "server_error"}},
+            status_code=status,
+            headers=headers,
+        )
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        stub: StubBehavior = app.state.behavior
+        stub.requests["chat"] += 1
+        body = await request.json()
+        await stub.delay(stub.chat_latency)
+        if stub.should_fail():
+            return _error(stub.error_status)
+        content = json.dumps(_chat_content(body, stub), ensure_ascii=False)
+        return {
+            "id": f"chatcmpl-stub-{stub.requests['chat']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            ],
+        }
+
+    @app.post("/embeddings")
+    async def embeddings(request: Request):
+        stub: StubBehavior = app.state.behavior
+        stub.requests["embeddings"] += 1
+        body = await request.json()
+        await stub.delay(stub.embeddings_latency)
+        if stub.should_fail():
+            return _error(stub.error_status)
+        texts = body.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        return {
+            "object": "list",
+            "model": body.get("model"),
+            "data": [
+                {"object": "embedding", "index": index, "embedding": _embedding(str(text), dimensions)}
+                for index, text in enumerate(texts)
+            ],
+        }
+
+    return app
+
+
+@contextmanager
+def serve_in_thread(app: FastAPI, host: str = "127.0.0.1", *, lifespan: str = "off") -> Iterator[str]:
+    """Run ``app`` on a free local port in a background thread; yields its base URL."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan=lifespan))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not server.started:
+            if not thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("provider stub did not start")
+            time.sleep(0.01)
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        sock.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--chat-latency", type=LatencyDistribution.parse, default=LatencyDistribution())
+    parser.add_argument("--embeddings-latency", type=LatencyDistribution.parse, default=LatencyDistribution())
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with errors")
+    parser.add_argument("--ambiguity-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    behavior = StubBehavior(
+        chat_latency=args.chat_latency,
+        embeddings_latency=args.embeddings_latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        ambiguity_rate=args.ambiguity_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_stub_app(behavior), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
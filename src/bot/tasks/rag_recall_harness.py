@@ -0,0 +1,196 @@
+"""Replay a labelled query set against the RAG search and report recall/latency.
+
+Each line of the query file is a JSON object::
+
+    {"query": "vela palio 1.0 2015",
+     "relevant": [{"catalog_id": 3, "page": 12}],   # pages that answer it
+     "relevant_chunk_ids": [812],                   # optional, exact chunks
+     "brand": "NGK", "catalog_id": null, "manufacturer_id": null,
+     "embedding": [...]}                            # optional, see below
+
+Labels by catalog page survive re-ingestion; chunk ids do not. Queries
+without an ``embedding`` are embedded once through the embeddings API;
+``--save-embeddings`` writes them back so later runs are fully offline.
+
+Every combination of ``--modes``, ``--ef-search`` and ``--iterative-scan``
+is replayed; ``auto`` ef_search means the selectivity-based tuning from
+Settings, a number pins ef_search to that value.
+
+Usage::
+
+    python -m src.bot.tasks.rag_recall_harness queries.jsonl
+    python -m src.bot.tasks.rag_recall_harness queries.jsonl --top-k 6 \\
+        --modes full halfvec --ef-search auto 40 200 --iterative-scan off relaxed_order
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import (
+    ITERATIVE_SCAN_MODES,
+    VECTOR_SEARCH_MODES,
+    HnswSearchTuning,
+    RagChunkRepoSqlAlchemy,
+)
+from src.bot.adapters.driven.db.session import SessionLocal
+from src.bot.infrastructure.config.settings import settings
+from src.bot.tasks.rag_search_benchmark import percentile
+
+@dataclass(frozen=True, slots=True)
+class SearchConfig:
+    mode: str
+    ef_search: int | None  # None = selectivity-based ("auto")
+    iterative_scan: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.mode}/ef={self.ef_search or 'auto'}/{self.iterative_scan}"
+
+    def tuning(self) -> HnswSearchTuning:
+        if self.ef_search is None:
+            return HnswSearchTuning(
+                ef_search=settings.RAG_HNSW_EF_SEARCH,
+                ef_search_max=settings.RAG_HNSW_EF_SEARCH_MAX,
+                iterative_scan=self.iterative_scan,
+                max_scan_tuples=settings.RAG_HNSW_MAX_SCAN_TUPLES,
+            )
+        return HnswSearchTuning(
+            ef_search=self.ef_search,
+            ef_search_max=self.ef_search,
+            iterative_scan=self.iterative_scan,
+            max_scan_tuples=settings.RAG_HNSW_MAX_SCAN_TUPLES,
+        )
+
+
+def load_queries(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+async def embed_missing(queries: list[dict[str, Any]]) -> int:
+    """Fill ``embedding`` for queries without one; returns how many were embedded."""
+    from src.bot.adapters.driven.llm.embeddings_adapter import EmbeddingsAdapter
+
+    missing = [query for query in queries if not query.get("embedding")]
+    vectors = await EmbeddingsAdapter(settings).embed_texts([query["query"] for query in missing])
+    for query, vector in zip(missing, vectors):
+        query["embedding"] = vector
+    return len(missing)
+
+
+def label_recall(query: dict[str, Any], rows: list[dict[str, Any]]) -> float:
+    """Share of the query's relevant pages/chunks present in ``rows``; 1.0 when unlabelled."""
+    expected = {("chunk", int(chunk_id)) for chunk_id in query.get("relevant_chunk_ids") or []}
+    expected |= {("page", int(label["catalog_id"]), int(label["page"])) for label in query.get("relevant") or []}
+    if not expected:
+        return 1.0
+    found: set[tuple] = set()
+    for row in rows:
+        found.add(("chunk", int(row["id"])))
+        metadata = row.get("metadata") or {}
+        if metadata.get("catalog_id") is not None and metadata.get("page") is not None:
+            found.add(("page", int(metadata["catalog_id"]), int(metadata["page"])))
+    return len(expected & found) / len(expected)
+
+
+def replay(
+    session: Session,
+    queries: list[dict[str, Any]],
+    configs: list[SearchConfig],
+    *,
+    top_k: int,
+    rerank_factor: int = 4,
+) -> dict[str, dict[str, float]]:
+    """Per config: mean recall@top_k, p50/p95 latency (ms) and mean rows returned per query."""
+    results: dict[str, dict[str, float]] = {}
+    for config in configs:
+        repo = RagChunkRepoSqlAlchemy(
+            session,
+            search_mode=config.mode,
+            rerank_factor=rerank_factor,
+            tuning=config.tuning(),
+        )
+        recalls: list[float] = []
+        latencies: list[float] = []
+        returned: list[int] = []
+        for query in queries:
+            started = time.perf_counter()
+            rows = repo.search_similar(
+                query["embedding"],
+                top_k=top_k,
+                brand=query.get("brand"),
+                catalog_id=query.get("catalog_id"),
+                manufacturer_id=query.get("manufacturer_id"),
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            # The HNSW settings are transaction-local; end it before the next config.
+            session.rollback()
+            recalls.append(label_recall(query, rows))
+            returned.append(len(rows))
+        results[config.label] = {
+            "recall": sum(recalls) / len(recalls) if recalls else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "rows": sum(returned) / len(returned) if returned else 0.0,
+        }
+    return results
+
+
+def _ef_search(value: str) -> int | None:
+    return None if value == "auto" else int(value)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay labelled RAG queries and report recall@k / latency.")
+    parser.add_argument("queries", type=Path, help="JSONL file with labelled queries")
+    parser.add_argument("--top-k", type=int, default=settings.RAG_TOP_K)
+    parser.add_argument("--modes", nargs="+", default=["full"], choices=VECTOR_SEARCH_MODES)
+    parser.add_argument("--ef-search", nargs="+", type=_ef_search, default=[None], help="'auto' or a fixed value")
+    parser.add_argument(
+        "--iterative-scan",
+        nargs="+",
+        default=[settings.RAG_HNSW_ITERATIVE_SCAN],
+        choices=ITERATIVE_SCAN_MODES,
+    )
+    parser.add_argument("--rerank-factor", type=int, default=settings.RAG_RERANK_FACTOR)
+    parser.add_argument("--save-embeddings", action="store_true", help="write fetched embeddings back to the file")
+    args = parser.parse_args(argv)
+
+    queries = load_queries(args.queries)
+    embedded = asyncio.run(embed_missing(queries))
+    if embedded and args.save_embeddings:
+        args.queries.write_text(
+            "".join(json.dumps(query, ensure_ascii=False) + "\n" for query in queries),
+            encoding="utf-8",
+        )
+
+    configs = [
+        SearchConfig(mode=mode, ef_search=ef_search, iterative_scan=iterative_scan)
+        for mode, ef_search, iterative_scan in itertools.product(args.modes, args.ef_search, args.iterative_scan)
+    ]
+    session = SessionLocal()
+    try:
+        results = replay(session, queries, configs, top_k=args.top_k, rerank_factor=args.rerank_factor)
+    finally:
+        session.close()
+
+    print(f"{len(queries)} queries, top_k={args.top_k} ({embedded} embedded this run)")
+    print(f"{'config':<36} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'rows':>6}")
+    for label, stats in results.items():
+        print(
+            f"{label:<36} {stats['recall']:>9.3f} {stats['p50_ms']:>8.1f} "
+            f"{stats['p95_ms']:>8.1f} {stats['rows']:>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Recall/latency of the quantized RAG search modes against full precision.
+
+Query vectors are sampled from the stored chunk embeddings, so no embedding
+API calls are made. For each query the ``full`` mode (the current
+``search_similar``) is the reference result; every other mode reports how
+many of those top-k ids it returned (recall@k) and its latency.
+
+Usage::
+
+    python -m src.bot.tasks.rag_search_benchmark
+    python -m src.bot.tasks.rag_search_benchmark --queries 200 --top-k 10 --rerank-factor 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import (
+    VECTOR_SEARCH_MODES,
+    RagChunkRepoSqlAlchemy,
+)
+from src.bot.adapters.driven.db.session import SessionLocal
+
+
+def recall_at_k(expected_ids: Sequence[Any], found_ids: Sequence[Any], k: int) -> float:
+    """Share of the first ``k`` expected ids present in the first ``k`` found ids."""
+    expected = set(list(expected_ids)[:k])
+    if not expected:
+        return 1.0
+    return len(expected.intersection(list(found_ids)[:k])) / len(expected)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def sample_query_embeddings(session: Session, count: int, *, brand: str | None = None) -> list[list[float]]:
+    rows = session.execute(
+        text("""
+            SELECT CAST(rc.embedding AS text) AS embedding
+            FROM rag_chunks rc
+            WHERE rc.source_type = 'catalog'
+              AND rc.embedding IS NOT NULL
+              AND (CAST(:brand AS text) IS NULL OR rc.brand = :brand)
+            ORDER BY random()
+            LIMIT :count
+        """),
+        {"brand": brand, "count": count},
+    ).mappings().all()
+    return [json.loads(row["embedding"]) for row in rows]
+
+
+def run_benchmark(
+    session: Session,
+    queries: list[list[float]],
+    *,
+    modes: Sequence[str],
+    top_k: int,
+    rerank_factor: int = 4,
+    brand: str | None = None,
+) -> dict[str, dict[str, float]]:
+    """Per mode: mean recall@top_k against ``full`` plus p50/p95 latency in ms."""
+    repo = RagChunkRepoSqlAlchemy(session, rerank_factor=rerank_factor)
+    latencies: dict[str, list[float]] = {mode: [] for mode in ("full", *modes)}
+    recalls: dict[str, list[float]] = {mode: [] for mode in latencies}
+    for embedding in queries:
+        reference: list[Any] = []
+        for mode in latencies:
+            started = time.perf_counter()
+            rows = repo.search_similar(embedding, top_k=top_k, brand=brand, mode=mode)
+            latencies[mode].append((time.perf_counter() - started) * 1000)
+            # set_config(..., true) only lasts for the transaction; end it so modes don't leak settings.
+            session.rollback()
+            ids = [row["id"] for row in rows]
+            if mode == "full":
+                reference = ids
+            recalls[mode].append(recall_at_k(reference, ids, top_k))
+    return {
+        mode: {
+            "recall": sum(recalls[mode]) / len(recalls[mode]) if recalls[mode] else 0.0,
+            "p50_ms": percentile(latencies[mode], 50),
+            "p95_ms": percentile(latencies[mode], 95),
+        }
+        for mode in latencies
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark quantized RAG search modes.")
+    parser.add_argument("--queries", type=int, default=100, help="sampled query vectors")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rerank-factor", type=int, default=4, help="first-pass candidates = top_k * factor")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=[mode for mode in VECTOR_SEARCH_MODES if mode != "full"],
+        choices=[mode for mode in VECTOR_SEARCH_MODES if mode != "full"],
+    )
+    parser.add_argument("--brand", default=None, help="restrict queries and search to one brand")
+    args = parser.parse_args(argv)
+
+    session = SessionLocal()
+    try:
+        queries = sample_query_embeddings(session, args.queries, brand=args.brand)
+        results = run_benchmark(
+            session,
+            queries,
+            modes=args.modes,
+            top_k=args.top_k,
+            rerank_factor=args.rerank_factor,
+            brand=args.brand,
+        )
+    finally:
+        session.close()
+
+    print(f"{len(queries)} queries, top_k={args.top_k}, rerank_factor={args.rerank_factor}")
+    print(f"{'mode':<8} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode, stats in results.items():
+        print(f"{mode:<8} {stats['recall']:>9.3f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from src.bot.adapters.driver.fastapi.dependencies.repositories import get_catalog_repo
+from src.bot.adapters.driver.fastapi.routers import admin_catalogs
+from src.bot.infrastructure.config.settings import settings
+from src.bot.infrastructure.errors.http_exceptions import register_exception_handlers
+
+NOW = datetime(2026, 3, 28, 12, 0, tzinfo=timezone.utc)
+PDF = b"%PDF-1.4\n" + b"x" * 5000
+
+
+class FakeCatalogRepo:
+    def __init__(self) -> None:
+        self.rows: list[dict] = []
+
+    def find_active_by_sha256(self, content_sha256: str):
+        for row in self.rows:
+            if row["content_sha256"] == content_sha256 and row["status"] != "error":
+                return row
+        return None
+
+    def create(self, payload: dict) -> dict:
+        row = {
+            "id": len(self.rows) + 1,
+            "manufacturer_id": payload.get("manufacturer_id"),
+            "original_filename": payload["original_filename"],
+            "stored_filename": payload["stored_filename"],
+            "file_size_bytes": payload.get("file_size_bytes"),
+            "description": payload.get("description"),
+            "brand": payload.get("brand"),
+            "content_sha256": payload.get("content_sha256"),
+            "status": "pending",
+            "page_count": None,
+            "chunk_count": None,
+            "error_message": None,
+            "is_active": True,
+            "created_at": NOW,
+            "updated_at": NOW,
+        }
+        self.rows.append(row)
+        return row
+
+    def deactivate_older_duplicates(self, filename: str, keep_id: int) -> int:
+        return 0
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "CATALOG_UPLOAD_CHUNK_BYTES", 1024)
+    ingested: list[tuple[int, str]] = []
+    monkeypatch.setattr(admin_catalogs, "_ingest_background", lambda *args: ingested.append(args))
+
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(admin_catalogs.router)
+    repo = FakeCatalogRepo()
+    app.dependency_overrides[get_catalog_repo] = lambda: repo
+    return TestClient(app), repo, ingested, tmp_path
+
+
+def _upload(test_client: TestClient, content: bytes, filename: str = "catalogo.pdf"):
+    return test_client.post(
+        "/admin/catalogs",
+        files={"file": (filename, content, "application/pdf")},
+        headers={"X-Admin-Token": settings.ADMIN_TOKEN},
+    )
+
+
+def test_upload_streams_to_disk_and_records_content_hash(client):
+    test_client, repo, ingested, upload_dir = client
+
+    response = _upload(test_client, PDF)
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["file_size_bytes"] == len(PDF)
+    assert body["content_sha256"] == hashlib.sha256(PDF).hexdigest()
+    stored = upload_dir / repo.rows[0]["stored_filename"]
+    assert stored.read_bytes() == PDF
+    assert ingested == [(1, str(stored))]
+
+
+def test_identical_content_returns_existing_catalog_without_ingesting(client):
+    test_client, repo, ingested, upload_dir = client
+    _upload(test_client, PDF)
+    repo.rows[0]["status"] = "ready"
+
+    response = _upload(test_client, PDF, filename="copia.pdf")
+
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+    assert len(repo.rows) == 1
+    assert len(ingested) == 1
+    assert len(list(upload_dir.iterdir())) == 1
+
+
+def test_upload_over_the_limit_is_rejected_and_partial_file_removed(client, monkeypatch):
+    test_client, repo, ingested, upload_dir = client
+    monkeypatch.setattr(settings, "CATALOG_UPLOAD_MAX_BYTES", 4096)
+
+    response = _upload(test_client, PDF)
+
+    assert response.status_code == 413
+    assert repo.rows == []
+    assert ingested == []
+    assert list(upload_dir.iterdir()) == []
+
+
+def test_chunked_upload_without_length_is_cut_off_while_receiving(client, monkeypatch):
+    test_client, repo, ingested, upload_dir = client
+    monkeypatch.setattr(settings, "CATALOG_UPLOAD_MAX_BYTES", 4096)
+    boundary = "catalogboundary"
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="catalogo.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode()
+    chunks = [head] + [b"x" * 16 * 1024] * 64 + [f"\r\n--{boundary}--\r\n".encode()]
+    sent: list[int] = []
+    messages: list[dict] = []
+
+    async def receive():
+        sent.append(len(sent))
+        body = chunks[len(sent) - 1]
+        return {"type": "http.request", "body": body, "more_body": len(sent) < len(chunks)}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/admin/catalogs",
+        "raw_path": b"/admin/catalogs",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={boundary}".encode()),
+            (b"transfer-encoding", b"chunked"),
+            (b"x-admin-token", settings.ADMIN_TOKEN.encode()),
+        ],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(test_client.app(scope, receive, send))
+
+    assert messages[0]["type"] == "http.response.start"
+    assert messages[0]["status"] == 413
+    # 4 KiB + 64 KiB of form overhead: stopped after five 16 KiB chunks, not 64.
+    assert len(sent) == 6
+    assert repo.rows == []
+    assert list(upload_dir.iterdir()) == []
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bcrypt
 import jwt
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -8,36 +9,57 @@ import pytest
 from src.bot.adapters.driver.fastapi.dependencies.repositories import (
     get_browser_auth_repo,
 )
+from src.bot.adapters.driver.fastapi.dependencies.use_cases import get_password_hasher
 from src.bot.adapters.driver.fastapi.routers.auth import router as auth_router
+from src.bot.application.services.password_hasher import PasswordHasher, bcrypt_cost, check_password
 from src.bot.infrastructure.config.settings import settings
 from src.bot.infrastructure.errors.http_exceptions import register_exception_handlers
 
 
 class FakeBrowserAuthRepo:
-    def authenticate(self, email: str, password: str) -> dict:
-        if email == "mec@test.com" and password == "secret123":
-            return {
-                "user_id": 11,
-                "role": "mechanic",
-                "shop_id": 7,
-                "vendor_id": None,
-                "mechanic_id": 11,
-                "name": "Mecânico Teste",
-                "email": email,
-            }
-        if email == "seller@test.com" and password == "secret123":
-            return {
-                "user_id": 21,
-                "role": "seller",
-                "shop_id": 9,
-                "vendor_id": 21,
-                "mechanic_id": None,
-                "email": email,
-                "name": "Vendedor Teste",
-            }
-        raise Exception("unexpected authenticate call")
-
-    def create_credential(self, payload: dict) -> dict:
+    def __init__(self) -> None:
+        # Stored at a lower cost than the hasher uses, so a login triggers a rehash.
+        password_hash = bcrypt.hashpw(b"secret123", bcrypt.gensalt(rounds=4)).decode()
+        self.credentials = {
+            "mec@test.com": {
+                "id": 1,
+                "password_hash": password_hash,
+                "principal": {
+                    "user_id": 11,
+                    "role": "mechanic",
+                    "shop_id": 7,
+                    "vendor_id": None,
+                    "mechanic_id": 11,
+                    "name": "Mecânico Teste",
+                    "email": "mec@test.com",
+                },
+            },
+            "seller@test.com": {
+                "id": 2,
+                "password_hash": password_hash,
+                "principal": {
+                    "user_id": 21,
+                    "role": "seller",
+                    "shop_id": 9,
+                    "vendor_id": 21,
+                    "mechanic_id": None,
+                    "email": "seller@test.com",
+                    "name": "Vendedor Teste",
+                },
+            },
+        }
+
+    def find_login(self, email: str) -> dict | None:
+        return self.credentials.get(email.strip().lower())
+
+    def complete_login(self, login: dict) -> dict:
+        return dict(login["principal"])
+
+    def update_password_hash(self, login: dict, password_hash: str) -> None:
+        login["password_hash"] = password_hash
+
+    def create_credential(self, payload: dict, *, password_hash: str) -> dict:
+        self.created_hash = password_hash
         return {
             "id": 1,
             "role": payload["role"],
@@ -52,11 +74,18 @@ class FakeBrowserAuthRepo:
 
 
 @pytest.fixture
-def client():
+def repo():
+    return FakeBrowserAuthRepo()
+
+
+@pytest.fixture
+def client(repo):
     app = FastAPI()
     register_exception_handlers(app)
     app.include_router(auth_router)
-    app.dependency_overrides[get_browser_auth_repo] = lambda: FakeBrowserAuthRepo()
+    hasher = PasswordHasher(rounds=5, workers=1, max_pending=8, limits={"email": 2, "ip": 8})
+    app.dependency_overrides[get_browser_auth_repo] = lambda: repo
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
     return TestClient(app)
 
 
@@ -76,7 +105,7 @@ def test_auth_login_and_me(client: TestClient):
     assert me_response.json()["name"] == "Mecânico Teste"
 
 
-def test_auth_create_credential_with_admin_token(client: TestClient):
+def test_auth_create_credential_with_admin_token(client: TestClient, repo: FakeBrowserAuthRepo):
     response = client.post(
         "/auth/credentials",
         json={
@@ -89,3 +118,21 @@ def test_auth_create_credential_with_admin_token(client: TestClient):
     )
     assert response.status_code == 200
     assert response.json()["role"] == "mechanic"
+    # Hashed by the router on the hasher's pool; the repo only stores the result.
+    assert bcrypt_cost(repo.created_hash) == 5
+    assert check_password("secret123", repo.created_hash)
+
+
+def test_login_rejects_wrong_password_and_rehashes_on_cost_change(client: TestClient, repo: FakeBrowserAuthRepo):
+    wrong = client.post("/auth/login", json={"email": "mec@test.com", "password": "wrong-pass"})
+    assert wrong.status_code == 401
+    assert bcrypt_cost(repo.credentials["mec@test.com"]["password_hash"]) == 4
+
+    response = client.post("/auth/login", json={"email": "mec@test.com", "password": "secret123"})
+    assert response.status_code == 200
+    upgraded = repo.credentials["mec@test.com"]["password_hash"]
+    assert bcrypt_cost(upgraded) == 5
+    assert bcrypt.checkpw(b"secret123", upgraded.encode())
+
+    unknown = client.post("/auth/login", json={"email": "ghost@test.com", "password": "secret123"})
+    assert unknown.status_code == 401
@@ -19,7 +19,8 @@ from src.bot.adapters.driver.fastapi.routers.mechanic_service_orders import (
 from src.bot.adapters.driver.fastapi.routers.offers import router as offers_router
 from src.bot.adapters.driver.fastapi.routers.seller_inbox import router as seller_inbox_router
 from src.bot.adapters.driver.fastapi.routers.threads import router as threads_router
-from src.bot.domain.errors import NotFoundError, UnauthorizedError, ValidationError
+from src.bot.application.services.parts_suggestion_provider import PartsSuggestionProvider
+from src.bot.domain.errors import ConflictError, NotFoundError, UnauthorizedError, ValidationError
 from src.bot.infrastructure.config.settings import settings
 from src.bot.infrastructure.errors.http_exceptions import register_exception_handlers
 
@@ -36,7 +37,7 @@ def _token(payload: dict) -> str:
     return jwt.encode({**base, **payload}, settings.SELLER_JWT_SECRET, algorithm="HS256")
 
 
-class FakeSuggestionProvider:
+class FakeSuggestionProvider(PartsSuggestionProvider):
     async def suggest(self, payload: dict) -> list[dict]:
         if payload["part_number"] == "FAIL":
             raise ValidationError("llm failed")
@@ -68,6 +69,11 @@ class FakeBrowserThreadRepo:
         self._request_seq = 1
         self._requested_item_seq = 1
         self._message_seq = 1
+        self.message_list_reads = 0
+        self.visible_thread_reads = 0
+        self.offer_list_reads = 0
+        self.batch_calls = 0
+        self._thread_versions: dict[int, int] = {}
         self._suggestion_seq = 1
         self._offer_seq = 1
         self._item_seq = 1
@@ -191,6 +197,7 @@ class FakeBrowserThreadRepo:
                 "finalized_at": None,
                 "seller_name": self._seller_names[seller_id],
                 "seller_shop_name": self._seller_shop_names[seller_id],
+                "version": 0,
             }
             self._offer_items[offer_id] = []
         return {
@@ -230,6 +237,7 @@ class FakeBrowserThreadRepo:
             self._suggestion_seq += 1
             rows.append(row)
         self._suggestions[thread_id] = rows
+        self._bump_version(thread_id)
         return rows
 
     def list_threads(self, *, actor, status=None, limit=20, offset=0):
@@ -285,9 +293,52 @@ class FakeBrowserThreadRepo:
             "offers": self.list_offers(thread_id=thread_id, actor=actor),
         }
 
-    def list_messages(self, *, thread_id: int, actor, limit=100):
-        self.get_thread_detail(thread_id=thread_id, actor=actor)
-        return self._messages[thread_id][:limit]
+    def list_messages(self, *, thread_id: int, actor, limit=100, after_id=None, before_id=None, thread=None):
+        if thread is None:
+            self.get_visible_thread(thread_id=thread_id, actor=actor)
+        self.message_list_reads += 1
+        messages = self._messages[thread_id]
+        if after_id is not None:
+            messages = [message for message in messages if message["id"] > after_id]
+        if before_id is not None:
+            messages = [message for message in messages if message["id"] < before_id]
+            if after_id is None:
+                return messages[-limit:]
+        return messages[:limit]
+
+    def get_thread_version(self, *, thread_id: int, actor):
+        thread = self._threads.get(thread_id)
+        if thread is None:
+            raise NotFoundError("thread not found")
+        if actor.role == "mechanic" and thread["mechanic_id"] != actor.mechanic_id:
+            raise UnauthorizedError("thread not available")
+        if actor.role == "seller" and (thread_id, actor.vendor_id) not in self._offers_by_thread_seller:
+            raise UnauthorizedError("thread not available")
+        offer_versions = 0
+        if actor.role != "mechanic":
+            offer_versions = sum(
+                offer["version"]
+                for offer in self._offers.values()
+                if offer["thread_id"] == thread_id and (actor.role == "admin" or offer["seller_id"] == actor.vendor_id)
+            )
+        return self._thread_versions.get(thread_id, 0) + offer_versions
+
+    def get_visible_thread(self, *, thread_id: int, actor):
+        self.visible_thread_reads += 1
+        thread = self.get_thread_detail(thread_id=thread_id, actor=actor)["thread"]
+        messages = self._messages[thread_id]
+        return {**thread, "last_message_at": messages[-1]["id"] if messages else None}
+
+    def list_changes(self, *, thread_id: int, actor, after_message_id: int, after_version=None, limit=100):
+        version = self.get_thread_version(thread_id=thread_id, actor=actor)
+        offers = []
+        if after_version is not None and version > after_version:
+            offers = self.list_offers(thread_id=thread_id, actor=actor)
+        return {
+            "messages": self.list_messages(thread_id=thread_id, actor=actor, limit=limit, after_id=after_message_id),
+            "version": version,
+            "offers": offers,
+        }
 
     def add_message(self, *, thread_id: int, actor, sender_role: str, sender_user_ref: str, type_: str, body: str, metadata_json=None):
         self.get_thread_detail(thread_id=thread_id, actor=actor)
@@ -303,6 +354,7 @@ class FakeBrowserThreadRepo:
         }
         self._message_seq += 1
         self._messages[thread_id].append(message)
+        self._bump_version(thread_id)
         return message
 
     def get_request(self, *, thread_id: int, actor):
@@ -335,14 +387,17 @@ class FakeBrowserThreadRepo:
                 "finalized_at": None,
                 "seller_name": self._seller_names[seller_id],
                 "seller_shop_name": self._seller_shop_names[seller_id],
+                "version": 0,
             }
             self._offer_items[offer_id] = []
+            self._bump_version(thread_id)
         return self.get_offer(
             offer_id=self._offers_by_thread_seller[key],
             actor=_seller_actor(seller_id=seller_id, shop_id=seller_shop_id),
         )
 
     def list_offers(self, *, thread_id: int, actor):
+        self.offer_list_reads += 1
         offers = []
         for offer in self._offers.values():
             if offer["thread_id"] != thread_id:
@@ -366,13 +421,79 @@ class FakeBrowserThreadRepo:
                 raise UnauthorizedError("offer not available")
         return self._offer_with_items(offer_id)
 
-    def add_offer_item(self, *, offer_id: int, seller_id: int, payload: dict):
+    def get_offer_version(self, *, offer_id: int, actor):
+        offer = self._offers.get(offer_id)
+        if offer is None:
+            raise NotFoundError("offer not found")
+        self.get_offer(offer_id=offer_id, actor=actor)
+        return self._thread_versions.get(offer["thread_id"], 0)
+
+    def _claim_offer(self, *, offer_id: int, seller_id: int, expected_version: int | None) -> dict:
         offer = self._offers[offer_id]
         if offer["seller_id"] != seller_id:
             raise UnauthorizedError("offer not available")
         if offer["status"] not in {"DRAFT", "SUBMITTED_OPTIONS"}:
             raise ValidationError("only draft or submitted option offers can be edited")
+        if expected_version is not None and expected_version != offer["version"]:
+            raise ConflictError("offer was changed by another request")
+        offer["version"] += 1
+        offer["updated_at"] = _dt()
+        offer["total_amount"] = None
+        if offer["status"] != "DRAFT":
+            self._bump_version(offer["thread_id"])
+        return offer
+
+    def add_offer_item(self, *, offer_id: int, seller_id: int, payload: dict, expected_version: int | None = None):
+        offer = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        item = self._create_item(offer, payload)
+        return {**self._serialize_offer_item(item), "offer_version": offer["version"]}
+
+    def update_offer_item(
+        self,
+        *,
+        offer_id: int,
+        item_id: int,
+        seller_id: int,
+        payload: dict,
+        expected_version: int | None = None,
+    ):
+        offer = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        item = self._update_item(offer, item_id, payload)
+        return {**self._serialize_offer_item(item), "offer_version": offer["version"]}
+
+    def delete_offer_item(self, *, offer_id: int, item_id: int, seller_id: int, expected_version: int | None = None):
+        offer = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        self._delete_item(offer, item_id)
+        return offer["version"]
+
+    def apply_offer_item_changes(
+        self,
+        *,
+        offer_id: int,
+        seller_id: int,
+        operations: list[dict],
+        expected_version: int,
+    ):
+        self.batch_calls += 1
+        offer = self._claim_offer(offer_id=offer_id, seller_id=seller_id, expected_version=expected_version)
+        snapshot = [dict(item) for item in self._offer_items[offer_id]]
+        try:
+            for operation in operations:
+                payload = {key: value for key, value in operation.items() if key not in {"op", "item_id"}}
+                if operation["op"] == "create":
+                    self._create_item(offer, payload)
+                elif operation["op"] == "update":
+                    self._update_item(offer, operation["item_id"], payload)
+                else:
+                    self._delete_item(offer, operation["item_id"])
+        except Exception:
+            self._offer_items[offer_id] = snapshot
+            offer["version"] -= 1
+            raise
+        return self._offer_with_items(offer_id)
 
+    def _create_item(self, offer: dict, payload: dict) -> dict:
+        offer_id = offer["id"]
         requested_item_id = payload.get("requested_item_id")
         if requested_item_id is None:
             if len(self._requested_items[offer["thread_id"]]) == 1:
@@ -419,17 +540,10 @@ class FakeBrowserThreadRepo:
         }
         self._item_seq += 1
         self._offer_items[offer_id].append(item)
-        offer["updated_at"] = _dt()
-        offer["total_amount"] = None
-        return self._serialize_offer_item(item)
+        return item
 
-    def update_offer_item(self, *, offer_id: int, item_id: int, seller_id: int, payload: dict):
-        offer = self._offers[offer_id]
-        if offer["seller_id"] != seller_id:
-            raise UnauthorizedError("offer not available")
-        if offer["status"] not in {"DRAFT", "SUBMITTED_OPTIONS"}:
-            raise ValidationError("only draft or submitted option offers can be edited")
-        for item in self._offer_items[offer_id]:
+    def _update_item(self, offer: dict, item_id: int, payload: dict) -> dict:
+        for item in self._offer_items[offer["id"]]:
             if item["id"] == item_id:
                 if "description" in payload:
                     item["title"] = payload["description"]
@@ -450,23 +564,14 @@ class FakeBrowserThreadRepo:
                 if "is_final_choice" in payload:
                     item["is_final_choice"] = payload["is_final_choice"]
                 item["updated_at"] = _dt()
-                offer["updated_at"] = _dt()
-                offer["total_amount"] = None
-                return self._serialize_offer_item(item)
+                return item
         raise NotFoundError("offer item not found")
 
-    def delete_offer_item(self, *, offer_id: int, item_id: int, seller_id: int):
-        offer = self._offers[offer_id]
-        if offer["seller_id"] != seller_id:
-            raise UnauthorizedError("offer not available")
-        if offer["status"] not in {"DRAFT", "SUBMITTED_OPTIONS"}:
-            raise ValidationError("only draft or submitted option offers can be edited")
-        original_len = len(self._offer_items[offer_id])
-        self._offer_items[offer_id] = [item for item in self._offer_items[offer_id] if item["id"] != item_id]
-        if len(self._offer_items[offer_id]) == original_len:
+    def _delete_item(self, offer: dict, item_id: int) -> None:
+        original_len = len(self._offer_items[offer["id"]])
+        self._offer_items[offer["id"]] = [item for item in self._offer_items[offer["id"]] if item["id"] != item_id]
+        if len(self._offer_items[offer["id"]]) == original_len:
             raise NotFoundError("offer item not found")
-        offer["updated_at"] = _dt()
-        offer["total_amount"] = None
 
     def submit_offer(self, *, offer_id: int, seller_id: int, payload: dict | None = None):
         offer = self._offers[offer_id]
@@ -492,6 +597,8 @@ class FakeBrowserThreadRepo:
             offer["submitted_at"] = _dt()
             offer["finalized_at"] = _dt()
             offer["updated_at"] = _dt()
+            offer["version"] += 1
+            self._bump_version(offer["thread_id"])
             self._threads[offer["thread_id"]]["status"] = "closed"
             self._messages[offer["thread_id"]].append(
                 {
@@ -519,6 +626,8 @@ class FakeBrowserThreadRepo:
         offer["total_amount"] = None
         offer["submitted_at"] = _dt()
         offer["updated_at"] = _dt()
+        offer["version"] += 1
+        self._bump_version(offer["thread_id"])
         self._threads[offer["thread_id"]]["status"] = "offer_received"
         summary = self._build_offer_summary(offer_id, finalized=False)
         self._messages[offer["thread_id"]].append(
@@ -569,6 +678,8 @@ class FakeBrowserThreadRepo:
         offer["submitted_at"] = offer["submitted_at"] or _dt()
         offer["finalized_at"] = _dt()
         offer["updated_at"] = _dt()
+        offer["version"] += 1
+        self._bump_version(offer["thread_id"])
         self._threads[offer["thread_id"]]["status"] = "offer_received"
         summary = self._build_offer_summary(offer_id, finalized=True)
         self._messages[offer["thread_id"]].append(
@@ -620,7 +731,7 @@ class FakeBrowserThreadRepo:
             ],
         }
 
-    def list_service_orders(self, *, mechanic_id: int):
+    def list_service_orders(self, *, mechanic_id: int, limit: int = 50, before: str | None = None):
         rows = []
         for offer in self._offers.values():
             thread = self._threads[offer["thread_id"]]
@@ -633,7 +744,14 @@ class FakeBrowserThreadRepo:
                 continue
             rows.append(self._service_order_summary(offer["id"]))
         rows.sort(key=lambda row: (row["submitted_at"], row["offer_id"]), reverse=True)
-        return rows
+        if before is not None:
+            self._parse_service_order_id(before)
+            ids = [row["id"] for row in rows]
+            if before not in ids:
+                raise NotFoundError("service order not found")
+            rows = rows[ids.index(before) + 1 :]
+        next_before = rows[limit - 1]["id"] if len(rows) > limit else None
+        return rows[:limit], next_before
 
     def get_service_order(self, *, service_order_id: str, mechanic_id: int):
         offer_id = self._parse_service_order_id(service_order_id)
@@ -658,6 +776,10 @@ class FakeBrowserThreadRepo:
 
     def update_thread_status_for_seller(self, *, thread_id: int, seller_id: int, shop_id: int, new_status: str):
         self._threads[thread_id]["status"] = new_status
+        self._bump_version(thread_id)
+
+    def _bump_version(self, thread_id: int) -> None:
+        self._thread_versions[thread_id] = self._thread_versions.get(thread_id, 0) + 1
 
     @staticmethod
     def _build_requested_items_text(items: list[dict]) -> str:
@@ -907,7 +1029,9 @@ def client():
     repo = FakeBrowserThreadRepo()
     app.dependency_overrides[get_browser_thread_repo] = lambda: repo
     app.dependency_overrides[get_parts_suggestion_provider] = lambda: FakeSuggestionProvider()
-    return TestClient(app)
+    test_client = TestClient(app)
+    test_client.repo = repo
+    return test_client
 
 
 MECHANIC_HEADERS = {
@@ -1312,6 +1436,21 @@ def test_mechanic_can_list_and_detail_service_orders(client: TestClient):
     assert rows[0]["status"] == "proposal_sent"
     assert rows[0]["vehicle_summary"] == "VW Golf 2019 1.4 TSI"
 
+    first_page = client.get("/mechanic/service-orders?limit=1", headers=MECHANIC_HEADERS)
+    assert [row["offer_id"] for row in first_page.json()] == [second_offer_id]
+    assert first_page.headers["X-Next-Before"] == f"so_{second_offer_id}"
+    next_page = client.get(
+        f"/mechanic/service-orders?limit=1&before={first_page.headers['X-Next-Before']}",
+        headers=MECHANIC_HEADERS,
+    )
+    assert [row["offer_id"] for row in next_page.json()] == [first_offer_id]
+    assert "X-Next-Before" not in next_page.headers
+
+    unknown_cursor = client.get("/mechanic/service-orders?before=so_9999", headers=MECHANIC_HEADERS)
+    assert unknown_cursor.status_code == 404
+    bad_cursor = client.get("/mechanic/service-orders?before=abc", headers=MECHANIC_HEADERS)
+    assert bad_cursor.status_code == 422
+
     detail_response = client.get(f"/mechanic/service-orders/so_{first_offer_id}", headers=MECHANIC_HEADERS)
     assert detail_response.status_code == 200
     detail = detail_response.json()
@@ -1396,3 +1535,286 @@ def test_seller_inbox_reads_workshop_and_current_offer_from_browser_threads(clie
     assert detail["workshop"]["name"] == "Oficina Azul"
     assert detail["workshop"]["phone"] == "+5511999999999"
     assert detail["current_offer"]["summary_text"] == "Resposta enviada com 1 opção para Alternador."
+
+
+def test_thread_changes_feed_returns_only_messages_after_cursor(client: TestClient):
+    created = client.post(
+        "/threads",
+        headers=MECHANIC_HEADERS,
+        json={"requested_items": [{"description": "Pastilha de freio", "quantity": 1}]},
+    ).json()
+    thread_id = created["thread"]["id"]
+
+    initial = client.get(f"/threads/{thread_id}/changes?timeout=0", headers=MECHANIC_HEADERS)
+    assert initial.status_code == 200
+    cursor = initial.json()["last_message_id"]
+
+    idle = client.get(
+        f"/threads/{thread_id}/changes?after_message_id={cursor}&timeout=0",
+        headers=MECHANIC_HEADERS,
+    )
+    assert idle.json() == {
+        "thread_id": thread_id,
+        "messages": [],
+        "last_message_id": cursor,
+        "version": initial.json()["version"],
+        "offers": [],
+        "timed_out": True,
+    }
+
+    client.post(
+        f"/threads/{thread_id}/messages",
+        headers=MECHANIC_HEADERS,
+        json={"type": "text", "body": "Alguma novidade?"},
+    )
+    changed = client.get(
+        f"/threads/{thread_id}/changes?after_message_id={cursor}&timeout=0",
+        headers=MECHANIC_HEADERS,
+    ).json()
+    assert [message["body"] for message in changed["messages"]] == ["Alguma novidade?"]
+    assert changed["last_message_id"] > cursor
+    assert changed["timed_out"] is False
+
+    forbidden = client.get(f"/threads/{thread_id}/changes?timeout=0", headers=OTHER_MECHANIC_HEADERS)
+    assert forbidden.status_code == 401
+
+    too_long = client.get(f"/threads/{thread_id}/changes?timeout=3600", headers=MECHANIC_HEADERS)
+    assert too_long.status_code == 422
+
+
+def test_thread_changes_feed_reports_item_edits_on_submitted_offers(client: TestClient):
+    created = client.post(
+        "/threads",
+        headers=MECHANIC_HEADERS,
+        json={"requested_items": [{"description": "Alternador", "quantity": 1}]},
+    ).json()
+    thread_id = created["thread"]["id"]
+    offer = client.post(f"/threads/{thread_id}/offers", headers=SELLER_HEADERS).json()
+    item = client.post(
+        f"/offers/{offer['id']}/items",
+        headers=SELLER_HEADERS,
+        json={
+            "requested_item_id": created["requested_items"][0]["id"],
+            "source_type": "manual",
+            "description": "Alternador Bosch",
+            "quantity": 1,
+            "unit_price": 900.0,
+        },
+    ).json()
+    client.post(f"/offers/{offer['id']}/submit", headers=SELLER_HEADERS)
+
+    seen = client.get(f"/threads/{thread_id}/changes?timeout=0", headers=MECHANIC_HEADERS).json()
+    idle = client.get(
+        f"/threads/{thread_id}/changes?after_message_id={seen['last_message_id']}"
+        f"&after_version={seen['version']}&timeout=0",
+        headers=MECHANIC_HEADERS,
+    ).json()
+    assert idle["timed_out"] is True
+    assert idle["offers"] == []
+
+    client.put(
+        f"/offers/{offer['id']}/items/{item['id']}",
+        headers=SELLER_HEADERS,
+        json={"unit_price": 850.0},
+    )
+    changed = client.get(
+        f"/threads/{thread_id}/changes?after_message_id={seen['last_message_id']}"
+        f"&after_version={seen['version']}&timeout=0",
+        headers=MECHANIC_HEADERS,
+    ).json()
+    assert changed["messages"] == []
+    assert changed["timed_out"] is False
+    assert changed["version"] > seen["version"]
+    assert [entry["id"] for entry in changed["offers"]] == [offer["id"]]
+    assert changed["offers"][0]["items"][0]["unit_price"] == 850
+
+
+def test_list_messages_supports_cursors_and_conditional_get(client: TestClient):
+    created = client.post(
+        "/threads",
+        headers=MECHANIC_HEADERS,
+        json={"requested_items": [{"description": "Pastilha de freio", "quantity": 1}]},
+    ).json()
+    thread_id = created["thread"]["id"]
+    for body in ("primeira", "segunda", "terceira"):
+        client.post(
+            f"/threads/{thread_id}/messages",
+            headers=MECHANIC_HEADERS,
+            json={"type": "text", "body": body},
+        )
+
+    client.repo.visible_thread_reads = 0
+    full = client.get(f"/threads/{thread_id}/messages", headers=MECHANIC_HEADERS)
+    assert full.status_code == 200
+    etag = full.headers["etag"]
+    ids = [message["id"] for message in full.json()]
+
+    assert client.repo.visible_thread_reads == 1
+
+    after = client.get(f"/threads/{thread_id}/messages?after_id={ids[-3]}", headers=MECHANIC_HEADERS)
+    assert [message["body"] for message in after.json()] == ["segunda", "terceira"]
+    before = client.get(f"/threads/{thread_id}/messages?before_id={ids[-1]}&limit=2", headers=MECHANIC_HEADERS)
+    assert [message["body"] for message in before.json()] == ["primeira", "segunda"]
+
+    reads_before = client.repo.message_list_reads
+    unchanged = client.get(
+        f"/threads/{thread_id}/messages",
+        headers={**MECHANIC_HEADERS, "If-None-Match": etag},
+    )
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == etag
+    assert client.repo.message_list_reads == reads_before
+
+    client.post(
+        f"/threads/{thread_id}/messages",
+        headers=MECHANIC_HEADERS,
+        json={"type": "text", "body": "quarta"},
+    )
+    changed = client.get(
+        f"/threads/{thread_id}/messages",
+        headers={**MECHANIC_HEADERS, "If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[-1]["body"] == "quarta"
+
+
+def test_thread_offer_and_comparison_reads_answer_304_until_the_thread_changes(client: TestClient):
+    created = client.post(
+        "/threads",
+        headers=MECHANIC_HEADERS,
+        json={"requested_items": [{"description": "Vela de ignição", "quantity": 4}]},
+    ).json()
+    thread_id = created["thread"]["id"]
+    offer = client.post(f"/threads/{thread_id}/offers", headers=SELLER_HEADERS).json()
+    client.post(
+        f"/offers/{offer['id']}/items",
+        headers=SELLER_HEADERS,
+        json={"source_type": "manual", "description": "Vela NGK", "quantity": 4, "unit_price": 30.0},
+    )
+    client.post(f"/offers/{offer['id']}/submit", headers=SELLER_HEADERS)
+
+    urls = [
+        f"/threads/{thread_id}",
+        f"/threads/{thread_id}/offers",
+        f"/threads/{thread_id}/comparison",
+        f"/offers/{offer['id']}",
+    ]
+    etags = {}
+    for url in urls:
+        response = client.get(url, headers=MECHANIC_HEADERS)
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "private, no-cache"
+        etags[url] = response.headers["etag"]
+    assert len(set(etags.values())) == len(urls)
+
+    reads_before = client.repo.offer_list_reads
+    for url in urls:
+        unchanged = client.get(url, headers={**MECHANIC_HEADERS, "If-None-Match": etags[url]})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+    assert client.repo.offer_list_reads == reads_before
+
+    seller_view = client.get(
+        f"/threads/{thread_id}/offers",
+        headers={**SELLER_HEADERS, "If-None-Match": etags[f"/threads/{thread_id}/offers"]},
+    )
+    assert seller_view.status_code == 200
+
+    client.post(
+        f"/offers/{offer['id']}/items",
+        headers=SELLER_HEADERS,
+        json={"source_type": "manual", "description": "Vela Bosch", "quantity": 4, "unit_price": 28.0},
+    )
+    for url in urls:
+        changed = client.get(url, headers={**MECHANIC_HEADERS, "If-None-Match": etags[url]})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etags[url]
+
+
+def test_draft_item_edits_refresh_the_seller_view_but_not_the_mechanic_one(client: TestClient):
+    created = client.post(
+        "/threads",
+        headers=MECHANIC_HEADERS,
+        json={"requested_items": [{"description": "Vela de ignição", "quantity": 4}]},
+    ).json()
+    thread_id = created["thread"]["id"]
+    offer = client.post(f"/threads/{thread_id}/offers", headers=SELLER_HEADERS).json()
+    url = f"/threads/{thread_id}/offers"
+    mechanic_etag = client.get(url, headers=MECHANIC_HEADERS).headers["etag"]
+    seller_etag = client.get(url, headers=SELLER_HEADERS).headers["etag"]
+
+    client.post(
+        f"/offers/{offer['id']}/items",
+        headers=SELLER_HEADERS,
+        json={"source_type": "manual", "description": "Vela NGK", "quantity": 4, "unit_price": 30.0},
+    )
+
+    assert client.get(url, headers={**MECHANIC_HEADERS, "If-None-Match": mechanic_etag}).status_code == 304
+    seller_view = client.get(url, headers={**SELLER_HEADERS, "If-None-Match": seller_etag})
+    assert seller_view.status_code == 200
+    assert [item["title"] for item in seller_view.json()[0]["items"]] == ["Vela NGK"]
+
+
+def test_offer_item_edits_use_expected_version_and_batch_applies_in_one_call(client: TestClient):
+    create_response = client.post(
+        "/threads",
+        headers=MECHANIC_HEADERS,
+        json={
+            "requested_items": [
+                {"description": "Pastilha de freio", "quantity": 1},
+                {"description": "Disco de freio", "quantity": 2},
+            ],
+        },
+    )
+    thread_id = create_response.json()["thread"]["id"]
+    pads_id, discs_id = [item["id"] for item in create_response.json()["requested_items"]]
+
+    offer = client.post(f"/threads/{thread_id}/offers", headers=SELLER_HEADERS).json()
+    offer_id = offer["id"]
+    assert offer["version"] == 0
+
+    added = client.post(
+        f"/offers/{offer_id}/items?expected_version=0",
+        headers=SELLER_HEADERS,
+        json={"requested_item_id": pads_id, "source_type": "manual", "description": "Pastilha TRW", "unit_price": 90.0},
+    )
+    assert added.status_code == 200
+    assert added.json()["offer_version"] == 1
+
+    stale = client.put(
+        f"/offers/{offer_id}/items/{added.json()['id']}?expected_version=0",
+        headers=SELLER_HEADERS,
+        json={"unit_price": 95.0},
+    )
+    assert stale.status_code == 409
+
+    batch = client.put(
+        f"/offers/{offer_id}/items:batch",
+        headers=SELLER_HEADERS,
+        json={
+            "expected_version": 1,
+            "operations": [
+                {"op": "update", "item_id": added.json()["id"], "unit_price": 95.0},
+                {"op": "create", "requested_item_id": discs_id, "source_type": "manual", "description": "Disco Fremax", "quantity": 2, "unit_price": 180.0},
+                {"op": "create", "requested_item_id": discs_id, "source_type": "manual", "description": "Disco Hipper", "quantity": 2, "unit_price": 150.0},
+            ],
+        },
+    )
+    assert batch.status_code == 200
+    body = batch.json()
+    assert body["version"] == 2
+    assert [len(group["options"]) for group in body["groups"]] == [1, 2]
+    assert body["groups"][0]["options"][0]["unit_price"] == 95.0
+
+    hipper_id = body["groups"][1]["options"][1]["id"]
+    deleted = client.delete(f"/offers/{offer_id}/items/{hipper_id}?expected_version=2", headers=SELLER_HEADERS)
+    assert deleted.status_code == 204
+    assert deleted.headers["X-Offer-Version"] == "3"
+
+    missing_item_id = client.put(
+        f"/offers/{offer_id}/items:batch",
+        headers=SELLER_HEADERS,
+        json={"operations": [{"op": "delete"}]},
+    )
+    assert missing_item_id.status_code == 422
@@ -119,6 +119,7 @@ def test_list_llm_logs_returns_summary_and_passes_filters(client):
         "model": "gpt-4o-mini",
         "requester_id": None,
         "thread_id": "10",
+        "tier": None,
     }
 
 
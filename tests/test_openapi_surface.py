@@ -19,3 +19,4 @@ def test_openapi_excludes_whatsapp_and_test_routes():
     assert "/offers/{offer_id}/finalize" in paths
     assert "/mechanic/service-orders" in paths
     assert "/mechanic/service-orders/{service_order_id}" in paths
+    assert "/admin/catalogs/query/stream" in paths
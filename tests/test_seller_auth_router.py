@@ -12,8 +12,10 @@ from src.bot.adapters.driver.fastapi.dependencies.auth import require_admin
 from src.bot.adapters.driver.fastapi.dependencies.repositories import (
     get_seller_credential_repo,
 )
+from src.bot.adapters.driver.fastapi.dependencies.use_cases import get_password_hasher
 from src.bot.adapters.driver.fastapi.routers.seller_auth import router as seller_auth_router
-from src.bot.domain.errors import ConflictError, UnauthorizedError, ValidationError
+from src.bot.application.services.password_hasher import PasswordHasher
+from src.bot.domain.errors import ConflictError, ValidationError
 from src.bot.infrastructure.errors.http_exceptions import register_exception_handlers
 
 
@@ -22,7 +24,7 @@ def allow_admin_override():
 
 
 def _hash(pw: str) -> str:
-    return bcrypt.hashpw(pw.encode(), bcrypt.gensalt()).decode()
+    return bcrypt.hashpw(pw.encode(), bcrypt.gensalt(rounds=4)).decode()
 
 
 class FakeSellerCredentialRepo:
@@ -40,7 +42,7 @@ class FakeSellerCredentialRepo:
     def _now(self) -> str:
         return "2026-06-01T00:00:00+00:00"
 
-    def create_credential(self, payload: dict) -> dict:
+    def create_credential(self, payload: dict, *, password_hash: str) -> dict:
         seller_id = int(payload["seller_id"])
         autopart_id = int(payload["autopart_id"])
 
@@ -62,7 +64,7 @@ class FakeSellerCredentialRepo:
             "seller_id": seller_id,
             "autopart_id": autopart_id,
             "email": payload["email"].strip().lower(),
-            "password_hash": _hash(payload["password"]),
+            "password_hash": password_hash,
             "active": True,
             "created_at": self._now(),
             "updated_at": self._now(),
@@ -70,20 +72,15 @@ class FakeSellerCredentialRepo:
         self._creds[cid] = row
         return {k: v for k, v in row.items() if k != "password_hash"}
 
-    def authenticate(self, email: str, password: str) -> dict:
+    def find_login(self, email: str) -> dict | None:
         email_lower = email.strip().lower()
         for c in self._creds.values():
             if c["email"] == email_lower and c["active"]:
-                if bcrypt.checkpw(password.encode(), c["password_hash"].encode()):
-                    vendor = self._vendors[c["seller_id"]]
-                    return {
-                        "seller_id": c["seller_id"],
-                        "autopart_id": c["autopart_id"],
-                        "email": c["email"],
-                        "seller_name": vendor["name"],
-                    }
-                raise UnauthorizedError("E-mail ou senha inválidos.")
-        raise UnauthorizedError("E-mail ou senha inválidos.")
+                return {**c, "seller_name": self._vendors[c["seller_id"]]["name"]}
+        return None
+
+    def update_password_hash(self, credential_id: int, password_hash: str) -> None:
+        self._creds[credential_id]["password_hash"] = password_hash
 
 
 @pytest.fixture
@@ -99,6 +96,8 @@ def client(fake_repo):
 
     app.dependency_overrides[require_admin] = allow_admin_override
     app.dependency_overrides[get_seller_credential_repo] = lambda: fake_repo
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=8, limits={"email": 2, "ip": 8})
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
 
     return TestClient(app)
 
@@ -171,8 +170,8 @@ def test_login_success(client, fake_repo):
             "seller_id": 1,
             "autopart_id": 10,
             "email": "login@autoparts.com",
-            "password": "senha123",
-        }
+        },
+        password_hash=_hash("senha123"),
     )
 
     r = client.post(
@@ -198,8 +197,8 @@ def test_login_wrong_password(client, fake_repo):
             "seller_id": 2,
             "autopart_id": 10,
             "email": "maria@autoparts.com",
-            "password": "senha123",
-        }
+        },
+        password_hash=_hash("senha123"),
     )
 
     r = client.post(
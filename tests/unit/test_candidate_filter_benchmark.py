@@ -0,0 +1,169 @@
+"""Micro-benchmark for batch candidate filtering.
+
+``_baseline_rejection_reason`` is the per-candidate filter the batch path
+replaced, kept here as the reference for equivalence and speed.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+
+import pytest
+
+from src.bot.application.services.keyword_matcher import normalize_text
+from src.bot.application.services.recommendation_service import (
+    VEHICLE_CATALOG_INDEX,
+    FilteredRecommendationService,
+    StructuredItem,
+    _extract_years,
+    infer_item_type,
+)
+
+_YEAR_RANGE_RE = re.compile(r"\b((?:19|20)\d{2})\s*[-/]\s*((?:19|20)\d{2})\b")
+
+
+def _baseline_vehicle_incompatibility(vehicle: dict, candidate_text: str) -> bool:
+    normalized_candidate = normalize_text(candidate_text)
+    request_brand = VEHICLE_CATALOG_INDEX.canonical_brand(vehicle.get("brand"))
+    request_model = normalize_text(str(vehicle.get("model") or ""))
+    request_year = str(vehicle.get("year") or "").strip()
+
+    if not request_brand and request_model:
+        model_brands = VEHICLE_CATALOG_INDEX.brands_for_model(request_model)
+        if len(model_brands) == 1:
+            request_brand = model_brands[0]
+
+    if request_brand:
+        mentioned_brands = VEHICLE_CATALOG_INDEX.brands_in(normalized_candidate)
+        if mentioned_brands and request_brand not in mentioned_brands:
+            return True
+
+    if request_model and request_model not in normalized_candidate:
+        mentioned_models = VEHICLE_CATALOG_INDEX.models_in(normalized_candidate)
+        if mentioned_models and request_model not in mentioned_models:
+            return True
+
+    if request_year:
+        year_ranges = [
+            (min(int(match.group(1)), int(match.group(2))), max(int(match.group(1)), int(match.group(2))))
+            for match in _YEAR_RANGE_RE.finditer(normalized_candidate)
+        ]
+        if year_ranges:
+            if not any(start <= int(request_year) <= end for start, end in year_ranges):
+                return True
+        else:
+            mentioned_years = _extract_years(normalized_candidate)
+            if mentioned_years and int(request_year) not in mentioned_years:
+                return True
+    return False
+
+
+def _baseline_rejection_reason(item: StructuredItem, candidate) -> str | None:
+    candidate_text = FilteredRecommendationService._candidate_text(candidate)
+    candidate_type = infer_item_type(candidate_text)
+    if item.requested_item_type == "unknown" or candidate_type == "unknown":
+        return "insufficient_metadata"
+    if candidate_type != item.requested_item_type:
+        return "wrong_category"
+    if _baseline_vehicle_incompatibility(item.vehicle, candidate_text):
+        return "incompatible_vehicle"
+    return None
+
+
+_CANDIDATE_TEMPLATES = [
+    {"title": "Vela de ignição BKR6E", "brand": "NGK", "note": "Palio 1.0 2010-2016"},
+    {"title": "Vela de ignição iridium", "brand": "Bosch", "note": "Gol G5 2008/2012"},
+    {"title": "Filtro de óleo PSL55", "brand": "Tecfil", "note": "Palio 2014"},
+    {"title": "Vela de ignição", "brand": "Denso", "note": "Fiat Uno 2015"},
+    {"title": "Vela de ignição", "brand": "Champion", "note": "Chevrolet Onix 2019"},
+    {"title": "Peça sem categoria", "brand": "Genérica", "note": None},
+    {"title": "Velas de ignição jogo", "brand": "NGK", "note": "Palio Weekend 2003-2009"},
+]
+
+
+def _candidates(count: int) -> list[dict]:
+    return [
+        {"id": str(index), "part_number": f"PN-{index}", "score": (index % 10) / 10, **_CANDIDATE_TEMPLATES[index % 7]}
+        for index in range(count)
+    ]
+
+
+def _item(raw_candidates: list[dict], vehicle: dict | None = None, item_type: str = "spark_plug") -> StructuredItem:
+    return StructuredItem(
+        item_id="item-1",
+        description="vela de ignicao",
+        quantity=4,
+        part_number=None,
+        notes=None,
+        requested_item_type=item_type,
+        vehicle={"brand": "Fiat", "model": "Palio", "year": "2015"} if vehicle is None else vehicle,
+        raw_candidates=raw_candidates,
+    )
+
+
+@pytest.mark.parametrize(
+    ("vehicle", "item_type"),
+    [
+        (None, "spark_plug"),
+        ({"model": "Palio", "year": "2005"}, "spark_plug"),
+        ({"brand": "VW", "model": "Gol", "year": "2010"}, "spark_plug"),
+        ({"model": "Onix"}, "spark_plug"),
+        ({}, "oil_filter"),
+        (None, "unknown"),
+    ],
+)
+def test_batch_filter_matches_the_per_candidate_baseline(vehicle, item_type):
+    service = FilteredRecommendationService()
+    item = _item(_candidates(70), vehicle, item_type)
+    candidates = [service._normalize_candidate(raw, index) for index, raw in enumerate(item.raw_candidates, 1)]
+
+    batch = service._candidate_rejection_reasons(item=item, candidates=candidates)
+
+    assert batch == [_baseline_rejection_reason(item, candidate) for candidate in candidates]
+
+
+def test_batch_filter_pinned_reasons():
+    service = FilteredRecommendationService()
+    item = _item(_candidates(7))
+    candidates = [service._normalize_candidate(raw, index) for index, raw in enumerate(item.raw_candidates, 1)]
+
+    assert service._candidate_rejection_reasons(item=item, candidates=candidates) == [
+        None,
+        "incompatible_vehicle",
+        "wrong_category",
+        "incompatible_vehicle",
+        "incompatible_vehicle",
+        "insufficient_metadata",
+        "incompatible_vehicle",
+    ]
+
+
+def _best_rate(count: int, run) -> float:
+    best = float("inf")
+    for _ in range(3):
+        normalize_text.cache_clear()
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return count / best
+
+
+def test_filter_candidates_throughput():
+    service = FilteredRecommendationService()
+    item = _item(_candidates(2000))
+    candidates = [service._normalize_candidate(raw, index) for index, raw in enumerate(item.raw_candidates, 1)]
+
+    batch_rate = _best_rate(
+        len(candidates),
+        lambda: service._candidate_rejection_reasons(item=item, candidates=candidates),
+    )
+    baseline_rate = _best_rate(
+        len(candidates),
+        lambda: [_baseline_rejection_reason(item, candidate) for candidate in candidates],
+    )
+    rates = f"batch={batch_rate:,.0f}/s baseline={baseline_rate:,.0f}/s"
+    # Loose floors so the test only catches pathological regressions on slow CI boxes;
+    # on one core the batch path runs at about 1.0-1.5x the baseline, so allow for noise.
+    assert batch_rate > 2000, rates
+    assert batch_rate > 0.7 * baseline_rate, rates
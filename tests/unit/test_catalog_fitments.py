@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.bot.application.services.catalog_fitment_lookup import (
+    detect_part_types,
+    resolve_fitment_query,
+)
+from src.bot.application.services.catalog_fitment_parser import (
+    parse_fitment_rows,
+    parse_years,
+    rows_from_text,
+)
+from src.bot.application.services.parts_suggestion_provider import (
+    FitmentFirstSuggestionProvider,
+    PartsSuggestionProvider,
+)
+from src.bot.application.services.rag_query_service import RagQueryService
+
+BOSCH_PAGE = """
+CATÁLOGO DE APLICAÇÃO BOSCH
+Modelo | Motorização | Combustível | Código da vela | Gap | Nº Referência | Código Simplificado | Cabo | Bobina
+Palio 1.0 2010-2016 | Fire 8V | Flex | FR 6 D+ | 0,8 | 0 242 240 593 | F000KE0P37 | STF 123 | F 000 ZS0 210
+ | Fire 16V | Gasolina | FR 7 DC+ | 0,9 | 0 242 235 666 | | |
+Observação: consulte o manual do veículo.
+"""
+
+NGK_ROWS = [
+    ["Modelo", "Motorização", "Combustível", "Código Convencional", "Código Iridium", "Gap", "Anos", "Cabo de ignição"],
+    ["Gol", "1.0 8V", "Flex", "BKR6E", "BKR6EIX", "0.8", "08→13", "SCG-71"],
+    ["Gol", "1.6 8V", "Flex", "BKR5E", None, "0.9", "2009 em diante", None],
+]
+
+
+def test_bosch_text_rows_become_fitments_and_carry_the_model_forward():
+    fitments = parse_fitment_rows(rows_from_text(BOSCH_PAGE), brand="BOSCH", page=12)
+
+    plugs = [f for f in fitments if f["part_type"] == "spark_plug"]
+    assert [(f["model"], f["engine"], f["part_code"], f["gap"]) for f in plugs] == [
+        ("Palio 1.0", "Fire 8V", "FR 6 D+", "0.8"),
+        ("Palio 1.0", "Fire 16V", "FR 7 DC+", "0.9"),
+    ]
+    assert plugs[0]["year_start"] == 2010 and plugs[0]["year_end"] == 2016
+    assert plugs[0]["reference"] == "0 242 240 593"
+    assert plugs[0]["model_key"] == "palio 1.0"
+    assert {f["part_type"] for f in fitments} == {"spark_plug", "ignition_cable", "ignition_coil"}
+    assert all(f["brand"] == "Bosch" and f["page"] == 12 for f in fitments)
+
+
+def test_ngk_rows_parse_variants_years_and_cables():
+    fitments = parse_fitment_rows(NGK_ROWS, brand="ngk")
+
+    assert [(f["engine"], f["part_type"], f["variant"], f["part_code"]) for f in fitments] == [
+        ("1.0 8V", "spark_plug", "conventional", "BKR6E"),
+        ("1.0 8V", "spark_plug", "iridium", "BKR6EIX"),
+        ("1.0 8V", "ignition_cable", None, "SCG-71"),
+        ("1.6 8V", "spark_plug", "conventional", "BKR5E"),
+    ]
+    assert (fitments[0]["year_start"], fitments[0]["year_end"]) == (2008, 2013)
+    assert (fitments[-1]["year_start"], fitments[-1]["year_end"]) == (2009, None)
+    assert fitments[2]["gap"] is None
+
+
+def test_unknown_layouts_and_malformed_rows_are_ignored():
+    assert parse_fitment_rows(NGK_ROWS, brand="DENSO") == []
+    assert parse_fitment_rows([["Gol", "1.0", "Flex", "BKR6E", "", "grande"]], brand="NGK") == []
+    assert parse_years("até 2009") == (None, 2009)
+    assert parse_years("2012 →") == (2012, None)
+
+
+def test_query_resolution_reads_model_year_engine_and_part_types():
+    query = resolve_fitment_query("Qual a vela e o cabo de vela do Palio 1.0 2015?")
+
+    assert query.model == "palio"
+    assert query.year == 2015
+    assert query.engine == "1.0"
+    assert query.part_types == ["ignition_cable", "spark_plug"]
+    assert detect_part_types("jogo de cabos de vela") == ["ignition_cable"]
+    assert resolve_fitment_query("vela de ignição iridium") is None
+
+
+class FakeFitmentRepo:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.calls: list[dict] = []
+
+    def find_fitments(self, **filters):
+        self.calls.append(filters)
+        return self.rows
+
+
+def _row(engine: str, code: str) -> dict:
+    return {
+        "id": 7,
+        "catalog_id": 3,
+        "original_filename": "bosch.pdf",
+        "brand": "Bosch",
+        "model": "Palio",
+        "engine": engine,
+        "fuel": "flex",
+        "year_start": 2010,
+        "year_end": 2016,
+        "part_type": "spark_plug",
+        "part_code": code,
+        "variant": None,
+        "reference": None,
+        "gap": "0.8",
+        "page": 12,
+    }
+
+
+class ExplodingEmbeddings:
+    async def embed_text(self, text: str) -> list[float]:
+        raise AssertionError("vector search must not run for an exact fitment hit")
+
+
+def test_rag_answers_exact_vehicle_from_fitments_without_embedding_or_llm():
+    repo = FakeFitmentRepo([_row("1.0 Fire 8V", "FR 6 D+"), _row("1.4 Fire 8V", "FR 7 DC+")])
+    service = RagQueryService(chunk_repo=None, embeddings=ExplodingEmbeddings(), settings=None, fitment_repo=repo)
+
+    result = asyncio.run(service.query("vela palio 1.0 2015", brand="BOSCH"))
+
+    assert result["answer_source"] == "fitments"
+    assert "FR 6 D+" in result["answer"] and "FR 7 DC+" not in result["answer"]
+    assert result["sources"] == [
+        {
+            "catalog_id": 3,
+            "brand": "Bosch",
+            "filename": "bosch.pdf",
+            "page": 12,
+            "chunk_text": "Palio 1.0 Fire 8V flex (2010–2016): Bosch FR 6 D+, gap 0.8 mm",
+            "similarity": 1.0,
+        }
+    ]
+    assert repo.calls[0]["model"] == "palio"
+    assert repo.calls[0]["year"] == 2015
+    assert repo.calls[0]["brand"] == "BOSCH"
+
+
+
+def test_rag_skips_fitments_when_no_part_type_is_named():
+    repo = FakeFitmentRepo([_row("1.0 Fire 8V", "FR 6 D+")])
+    service = RagQueryService(chunk_repo=None, embeddings=ExplodingEmbeddings(), settings=None, fitment_repo=repo)
+
+    rows = service._find_fitments("filtro de oleo do palio 1.0", manufacturer_id=None, catalog_id=None, brand=None)
+
+    assert rows == []
+    assert repo.calls == []
+
+
+class RecordingProvider(PartsSuggestionProvider):
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+
+    async def suggest_batch(self, payloads):
+        self.batches.append(payloads)
+        return [[{"title": "LLM", "part_number": None}] for _ in payloads]
+
+
+def test_suggestions_use_fitments_for_exact_vehicles_and_llm_for_the_rest():
+    fallback = RecordingProvider()
+    provider = FitmentFirstSuggestionProvider(fallback, FakeFitmentRepo([_row("1.0 Fire 8V", "FR 6 D+")]))
+    vehicle = {"brand": "Fiat", "model": "Palio", "year": "2015"}
+
+    results = asyncio.run(
+        provider.suggest_batch(
+            [
+                {"thread_id": 1, "requested_item_id": 1, "original_description": "vela de ignição", "vehicle": vehicle},
+                {"thread_id": 1, "requested_item_id": 2, "original_description": "pastilha de freio", "vehicle": vehicle},
+            ]
+        )
+    )
+
+    assert results[0][0]["part_number"] == "FR 6 D+"
+    assert results[0][0]["metadata_json"]["source"] == "catalog_fitments"
+    assert results[1] == [{"title": "LLM", "part_number": None}]
+    assert [payload["requested_item_id"] for payload in fallback.batches[0]] == [2]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from src.bot.application.services.keyword_matcher import KeywordMatcher
+from src.bot.application.services.recommendation_service import (
+    _maybe_extract_vehicle_from_text,
+    infer_item_type,
+)
+
+
+def test_matcher_prefers_longest_keyword_and_group_priority():
+    matcher = KeywordMatcher.from_groups(
+        {
+            "oil_filter": ("filtro de oleo",),
+            "oil": ("oleo",),
+        }
+    )
+
+    assert matcher.keywords("troca de oleo e filtro de oleo") == ["oleo", "filtro de oleo"]
+    assert matcher.labels("troca de oleo e filtro de oleo") == ["oil", "oil_filter"]
+    assert matcher.best("troca de oleo e filtro de oleo") == "oil_filter"
+    assert matcher.best("sem categoria") is None
+
+
+def test_matcher_matches_whole_words_and_plurals_only():
+    matcher = KeywordMatcher({"gol": "gol", "alternador": "alternador"})
+
+    assert matcher.labels("vw golf 2015") == []
+    assert matcher.labels("dois alternadores para gol") == ["alternador", "gol"]
+
+
+def test_empty_matcher_never_matches():
+    assert KeywordMatcher({}).labels("qualquer texto") == []
+
+
+def test_infer_item_type_and_vehicle_extraction_use_whole_words():
+    assert infer_item_type("Velas de ignição NGK") == "spark_plug"
+    assert infer_item_type("Filtro de óleo Tecfil") == "oil_filter"
+
+    vehicle, _ = _maybe_extract_vehicle_from_text("bateria para golf 2018 vw", {})
+    assert "model" not in vehicle
+    assert vehicle["brand"] == "Volkswagen"
+    assert vehicle["year"] == "2018"
@@ -100,3 +100,96 @@ def test_openai_adapter_persists_llm_log(monkeypatch):
     assert log_store.success_payload["http_status"] == 200
     assert log_store.success_payload["response_candidate_count"] == 1
     assert log_store.failure_payload is None
+
+
+class FakeBatchResponse(FakeResponse):
+    def __init__(self) -> None:
+        super().__init__()
+        self.text = "batch"
+
+    def json(self):
+        return {
+            "choices": [
+                {
+                    "message": {
+                        "content": (
+                            '{"id":"req-1","items":['
+                            '{"item_id":"11","candidates":[{"id":"1","part_number":"BKR6E-11","brand":"NGK","score":0.9}]},'
+                            '{"item_id":"12","candidates":[{"id":"2","part_number":"F000","brand":"Bosch","score":0.7}]},'
+                            '{"item_id":"99","candidates":[]}'
+                            "]}"
+                        )
+                    }
+                }
+            ]
+        }
+
+
+class FakeBatchAsyncClient(FakeAsyncClient):
+    async def post(self, url, headers=None, json=None):
+        return FakeBatchResponse()
+
+
+def test_openai_adapter_generate_batch_maps_candidates_per_item(monkeypatch):
+    monkeypatch.setattr(
+        "src.bot.adapters.driven.llm.llm_recommendation_adapter.httpx.AsyncClient",
+        FakeBatchAsyncClient,
+    )
+    settings = SimpleNamespace(
+        LLM_API_KEY="test-key",
+        LLM_BASE_URL="https://api.openai.com/v1",
+        LLM_MODEL="gpt-4o-mini",
+        LLM_TEMPERATURE=0.2,
+        LLM_TIMEOUT_SECONDS=30,
+        LLM_PROVIDER="openai",
+    )
+    log_store = FakeLogStore()
+    adapter = OpenAiRecommendationAdapter(settings, log_store=log_store)
+    request = RecommendationRequest(
+        requester_id="req-1",
+        vehicle={"brand": "Fiat", "model": "Palio", "year": "2015"},
+        parts=[
+            PartRequest(item_id="11", description="vela", quantity=4),
+            PartRequest(item_id="12", description="bobina", quantity=1),
+        ],
+        context={"thread_id": "10"},
+    )
+
+    response = asyncio.run(adapter.generate_batch(request))
+
+    assert [item.item_id for item in response.items] == ["11", "12"]
+    assert response.items[1].accepted_candidates[0].part_number == "F000"
+    assert log_store.created_payload["metadata_json"]["mode"] == "batch"
+    assert log_store.success_payload["response_candidate_count"] == 2
+
+
+def test_openai_adapter_tier_overrides_model_and_tags_the_log(monkeypatch):
+    monkeypatch.setattr(
+        "src.bot.adapters.driven.llm.llm_recommendation_adapter.httpx.AsyncClient",
+        FakeAsyncClient,
+    )
+    settings = SimpleNamespace(
+        LLM_API_KEY="test-key",
+        LLM_BASE_URL="https://api.openai.com/v1",
+        LLM_MODEL="gpt-4.1-mini",
+        LLM_TEMPERATURE=0.2,
+        LLM_TIMEOUT_SECONDS=30,
+        LLM_PROVIDER="openai",
+    )
+    log_store = FakeLogStore()
+    adapter = OpenAiRecommendationAdapter(
+        settings, log_store=log_store, model="gpt-4.1-nano", timeout_seconds=5, tier="fast"
+    )
+    request = RecommendationRequest(
+        requester_id="req-1",
+        vehicle={"brand": "Fiat", "model": "Palio", "year": "2015"},
+        parts=[PartRequest(description="vela", quantity=1)],
+        context={"thread_id": "10"},
+    )
+
+    asyncio.run(adapter.generate(request, log_metadata={"escalation_reason": "low_score"}))
+
+    assert log_store.created_payload["model"] == "gpt-4.1-nano"
+    assert log_store.created_payload["tier"] == "fast"
+    assert log_store.created_payload["request_payload_json"]["model"] == "gpt-4.1-nano"
+    assert log_store.created_payload["metadata_json"]["escalation_reason"] == "low_score"
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.bot.adapters.driven.llm.llm_recommendation_adapter import (
+    OpenAiRecommendationAdapter,
+)
+from src.bot.adapters.driven.llm.tiered_recommendation_router import (
+    TieredRecommendationRouter,
+)
+from src.bot.application.dtos.recommendation.part_request import PartRequest
+from src.bot.application.dtos.recommendation.recommendation_request import (
+    RecommendationRequest,
+)
+from src.bot.tasks.load_test import (
+    DbQueryCountMiddleware,
+    LoadReport,
+    format_report,
+    install_query_counter,
+)
+from src.bot.tasks.provider_stub import (
+    LatencyDistribution,
+    StubBehavior,
+    create_stub_app,
+    serve_in_thread,
+)
+
+
+class NullLogStore:
+    def create_log(self, payload: dict) -> None:
+        return None
+
+
+def _adapter(url: str, model: str, tier: str) -> OpenAiRecommendationAdapter:
+    settings = SimpleNamespace(
+        LLM_API_KEY="stub",
+        LLM_BASE_URL=url,
+        LLM_MODEL=model,
+        LLM_TEMPERATURE=0.2,
+        LLM_TIMEOUT_SECONDS=30,
+        LLM_PROVIDER="openai",
+    )
+    return OpenAiRecommendationAdapter(settings, log_store=NullLogStore(), tier=tier)
+
+
+def test_stub_answers_match_the_single_and_batch_prompt_schemas():
+    behavior = StubBehavior(ambiguity_rate=1.0)
+    request = RecommendationRequest(
+        requester_id="req-7",
+        vehicle={"brand": "Fiat", "model": "Palio", "year": "2015"},
+        parts=[
+            PartRequest(item_id="11", description="vela", quantity=4),
+            PartRequest(item_id="12", description="pastilha", quantity=1),
+        ],
+        context={"thread_id": "10"},
+    )
+    with serve_in_thread(create_stub_app(behavior)) as url:
+        batch = asyncio.run(_adapter(url, "fast-model", "fast").generate_batch(request))
+        single = asyncio.run(_adapter(url, "fast-model", "fast").generate(request))
+
+        # Ambiguous answers carry required_questions, so the router escalates.
+        router = TieredRecommendationRouter(
+            fast=_adapter(url, "fast-model", "fast"), strong=_adapter(url, "strong-model", "strong")
+        )
+        calls_before = behavior.requests["chat"]
+        asyncio.run(router.generate(request))
+
+    assert batch.id == "req-7"
+    assert [item.item_id for item in batch.items] == ["11", "12"]
+    assert len(batch.items[0].accepted_candidates) == 3
+    assert batch.items[0].accepted_candidates[0].metadata["required_questions"]
+    assert len(single.candidates) == 3 and single.candidates[0].average_price_brl == 42.9
+    assert behavior.requests["chat"] == calls_before + 2
+
+
+def test_latency_specs_parse_and_lognormal_hits_its_median():
+    assert LatencyDistribution.parse("0.8") == LatencyDistribution("fixed", 0.8)
+    assert LatencyDistribution.parse("uniform:0.2,1.5").kind == "uniform"
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("lognormal:2,1")
+
+    rng = random.Random(1)
+    samples = sorted(LatencyDistribution.parse("lognormal:0.8,2.5").sample(rng) for _ in range(4000))
+    assert 0.7 < samples[2000] < 0.9
+    assert 2.2 < samples[3800] < 2.8
+
+
+def test_middleware_reports_statements_per_request_and_report_aggregates_them():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    install_query_counter(engine)
+
+    def get_conn():
+        with engine.connect() as conn:
+            yield conn
+
+    app = FastAPI()
+    app.add_middleware(DbQueryCountMiddleware)
+
+    @app.get("/sync")
+    def sync_endpoint(conn=Depends(get_conn)):
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_endpoint(conn=Depends(get_conn)):
+        conn.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    report = LoadReport()
+    with TestClient(app) as client:
+        for path in ("/sync", "/async", "/sync"):
+            response = client.get(path)
+            report.record(f"GET {path}", 10.0, response.status_code, int(response.headers["x-db-queries"]))
+        report.record("GET /missing", 5.0, client.get("/missing").status_code, None)
+
+    summary = report.summary()
+    assert summary["endpoints"]["GET /sync"]["requests"] == 2
+    assert summary["endpoints"]["GET /sync"]["db_queries_avg"] == 2.0
+    assert summary["endpoints"]["GET /async"]["db_queries_max"] == 1
+    assert summary["endpoints"]["GET /missing"]["errors"] == 1
+    assert "GET /sync" in format_report(summary)
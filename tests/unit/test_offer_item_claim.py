@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    BrowserThreadRepoSqlAlchemy,
+)
+from src.bot.domain.errors import ConflictError, ValidationError
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class OfferSession:
+    """Plays ``seller_offers`` for the version claim and records every statement."""
+
+    def __init__(self, *, status: str = "DRAFT", version: int = 4) -> None:
+        self.status = status
+        self.version = version
+        self.statements: list[str] = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "UPDATE seller_offers" in sql:
+            expected = params["expected_version"]
+            if self.status not in {"DRAFT", "SUBMITTED_OPTIONS"} or (expected is not None and expected != self.version):
+                return _Result([])
+            self.version += 1
+            return _Result([{"id": 40, "thread_id": 5, "status": self.status, "version": self.version}])
+        if "DELETE FROM seller_offer_items" in sql:
+            return _Result([(item_id,) for item_id in params["item_ids"]])
+        if "FROM seller_offers" in sql:
+            return _Result([{"id": 40, "thread_id": 5, "seller_id": 21, "status": self.status, "version": self.version}])
+        return _Result([])
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_draft_item_delete_claims_version_in_one_statement_and_skips_the_comparison():
+    session = OfferSession()
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    assert repo.delete_offer_item(offer_id=40, item_id=7, seller_id=21, expected_version=4) == 5
+    assert session.statements[0].lstrip().startswith("UPDATE seller_offers")
+    assert not any("FROM seller_offers" in sql for sql in session.statements)
+    assert not any("thread_comparisons" in sql for sql in session.statements)
+    assert session.commits == 1
+
+
+def test_stale_expected_version_is_a_conflict():
+    session = OfferSession(version=6)
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    with pytest.raises(ConflictError):
+        repo.delete_offer_item(offer_id=40, item_id=7, seller_id=21, expected_version=4)
+    assert session.commits == 0
+
+
+def test_finalized_offer_is_still_reported_as_not_editable():
+    session = OfferSession(status="FINALIZED_QUOTE")
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    with pytest.raises(ValidationError):
+        repo.delete_offer_item(offer_id=40, item_id=7, seller_id=21)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    BrowserThreadRepoSqlAlchemy,
+)
+from src.bot.domain.errors import NotFoundError, ValidationError
+
+NOW = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+def _stored(item_id: int, **overrides) -> dict:
+    return {
+        "id": item_id,
+        "offer_id": 40,
+        "requested_item_id": 1,
+        "source_type": "manual",
+        "suggested_part_id": None,
+        "title": f"Item {item_id}",
+        "brand": None,
+        "part_number": None,
+        "quantity": 1,
+        "unit_price": 10,
+        "compatibility_note": None,
+        "metadata_json": {},
+        "is_final_choice": False,
+        "created_at": NOW,
+        "updated_at": NOW,
+        **overrides,
+    }
+
+
+class BatchSession:
+    """Serves the batch reads from fixtures and records every statement."""
+
+    suggestions = {15: {"id": 15, "requested_item_id": 2, "title": "Disco Fremax", "brand": "Fremax", "part_number": "BD-1"}}
+    stored = {70: _stored(70), 71: _stored(71), 72: _stored(72)}
+
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict]] = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        params = params or {}
+        self.statements.append((sql, params))
+        head = sql.split()[0]
+        if head == "UPDATE" and "seller_offers" in sql:
+            return _Result([{"id": 40, "thread_id": 5, "status": "DRAFT", "version": 4}])
+        if "FROM requested_items ri" in sql:
+            return _Result([(1,), (2,)])
+        if "FROM suggested_parts" in sql:
+            return _Result([self.suggestions[i] for i in params["ids"] if i in self.suggestions])
+        if head == "SELECT" and "FROM seller_offer_items" in sql:
+            return _Result([self.stored[i] for i in params["item_ids"] if i in self.stored])
+        if head == "DELETE":
+            return _Result([(i,) for i in params["item_ids"] if i in self.stored])
+        if head in {"UPDATE", "INSERT"} and "seller_offer_items" in sql:
+            rows = json.loads(params["rows"])
+            return _Result([_stored(row.get("id", 100 + index), **{k: v for k, v in row.items() if k != "id"}) for index, row in enumerate(rows)])
+        return _Result([])
+
+    def commit(self):
+        self.commits += 1
+
+
+def _repo(session: BatchSession, monkeypatch) -> BrowserThreadRepoSqlAlchemy:
+    repo = BrowserThreadRepoSqlAlchemy(session)
+    monkeypatch.setattr(repo, "get_offer", lambda *, offer_id, actor: {"id": offer_id})
+    return repo
+
+
+def _creates(count: int) -> list[dict]:
+    return [
+        {"op": "create", "requested_item_id": 1, "source_type": "manual", "description": f"Pastilha {index}", "unit_price": 50 + index}
+        for index in range(count)
+    ]
+
+
+@pytest.mark.parametrize("lines", [1, 30])
+def test_batch_statement_count_does_not_grow_with_line_count(monkeypatch, lines):
+    session = BatchSession()
+    repo = _repo(session, monkeypatch)
+
+    repo.apply_offer_item_changes(
+        offer_id=40,
+        seller_id=21,
+        expected_version=3,
+        operations=[
+            *_creates(lines),
+            {"op": "create", "source_type": "suggested", "suggested_part_id": 15, "requested_item_id": 2, "unit_price": 180},
+            {"op": "update", "item_id": 70, "unit_price": 12},
+            {"op": "update", "item_id": 71, "quantity": 2},
+            {"op": "delete", "item_id": 72},
+        ],
+    )
+
+    # claim, requested items, suggestions, updated rows, delete, update, insert (a draft leaves the thread alone)
+    assert len(session.statements) == 7
+    assert session.commits == 1
+    insert = next(params for sql, params in session.statements if sql.split()[0] == "INSERT")
+    inserted = json.loads(insert["rows"])
+    assert len(inserted) == lines + 1
+    assert inserted[-1]["title"] == "Disco Fremax"
+    update = next(params for sql, params in session.statements if "UPDATE seller_offer_items" in sql)
+    assert [(row["id"], row["unit_price"], row["quantity"]) for row in json.loads(update["rows"])] == [(70, 12, 1), (71, 10, 2)]
+
+
+def test_batch_rejects_the_whole_set_before_writing(monkeypatch):
+    session = BatchSession()
+    repo = _repo(session, monkeypatch)
+
+    with pytest.raises(ValidationError):
+        repo.apply_offer_item_changes(
+            offer_id=40,
+            seller_id=21,
+            expected_version=3,
+            operations=[*_creates(5), {"op": "create", "source_type": "suggested", "suggested_part_id": 99, "requested_item_id": 2}],
+        )
+    assert not any(sql.split()[0] in {"INSERT", "DELETE"} for sql, _ in session.statements)
+    assert session.commits == 0
+
+    with pytest.raises(ValidationError):
+        repo.apply_offer_item_changes(
+            offer_id=40,
+            seller_id=21,
+            expected_version=3,
+            operations=[{"op": "update", "item_id": 70, "quantity": 2}, {"op": "delete", "item_id": 70}],
+        )
+
+    with pytest.raises(NotFoundError):
+        repo.apply_offer_item_changes(
+            offer_id=40, seller_id=21, expected_version=3, operations=[{"op": "update", "item_id": 404, "quantity": 2}]
+        )
+
+
+def test_item_edits_move_the_thread_version_only_for_offers_the_mechanic_sees(monkeypatch):
+    session = BatchSession()
+    repo = _repo(session, monkeypatch)
+    synced: list[int] = []
+    monkeypatch.setattr(repo, "_sync_comparison_offer", lambda *, thread_id, offer_id: synced.append(offer_id))
+
+    repo._offer_items_changed({"id": 40, "thread_id": 5, "status": "DRAFT", "version": 4})
+    assert session.statements == []
+
+    repo._offer_items_changed({"id": 40, "thread_id": 5, "status": "SUBMITTED_OPTIONS", "version": 5})
+    [(sql, params)] = session.statements
+    assert "UPDATE quote_threads SET version = version + 1" in " ".join(sql.split())
+    assert params["thread_id"] == 5
+    assert synced == [40]
+
+
+def test_batch_updates_apply_source_type_and_suggested_part(monkeypatch):
+    session = BatchSession()
+    repo = _repo(session, monkeypatch)
+    session.stored = {**BatchSession.stored, 73: _stored(73, requested_item_id=2)}
+
+    repo.apply_offer_item_changes(
+        offer_id=40,
+        seller_id=21,
+        expected_version=3,
+        operations=[
+            {"op": "update", "item_id": 73, "source_type": "suggested", "suggested_part_id": 15},
+            {"op": "update", "item_id": 70, "source_type": "manual", "unit_price": 12},
+        ],
+    )
+
+    update = next(params for sql, params in session.statements if "UPDATE seller_offer_items" in sql)
+    rows = {row["id"]: row for row in json.loads(update["rows"])}
+    # The new suggestion fills the fields the operation did not set.
+    assert (rows[73]["source_type"], rows[73]["suggested_part_id"], rows[73]["title"]) == ("suggested", 15, "Disco Fremax")
+    assert rows[73]["part_number"] == "BD-1"
+    assert (rows[70]["source_type"], rows[70]["suggested_part_id"], rows[70]["title"]) == ("manual", None, "Item 70")
+
+
+def test_switching_a_suggested_item_to_manual_drops_the_suggestion():
+    merge = BrowserThreadRepoSqlAlchemy._merge_offer_item_payload
+    current = _stored(70, source_type="suggested", suggested_part_id=15, title="Disco Fremax")
+
+    merged = merge(current, {"source_type": "manual"})
+
+    assert (merged["source_type"], merged["suggested_part_id"], merged["description"]) == ("manual", None, "Disco Fremax")
+    assert merge(current, {"unit_price": 20})["suggested_part_id"] == 15
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    BrowserThreadRepoSqlAlchemy,
+)
+from src.bot.domain.errors import ConflictError, ValidationError
+
+NOW = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class ScriptedSession:
+    """Answers the submission reads from fixtures and records every statement."""
+
+    def __init__(
+        self,
+        *,
+        offer_status: str = "DRAFT",
+        transition_applies: bool = True,
+        status_after_read: str | None = None,
+    ) -> None:
+        self.offer_status = offer_status
+        self.transition_applies = transition_applies
+        # What a concurrent request left behind when the guarded UPDATE misses.
+        self.status_after_read = status_after_read or offer_status
+        self.statements: list[tuple[str, dict]] = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        params = params or {}
+        self.statements.append((sql, params))
+        if "JOIN requested_items ri" in sql:
+            if self.offer_status not in {"DRAFT", "SUBMITTED_OPTIONS"}:
+                return _Result([])
+            return _Result(
+                [
+                    {"id": 1, "description": "Pastilha de freio", "quantity": 1, "offer_version": 3},
+                    {"id": 2, "description": "Disco de freio", "quantity": 2, "offer_version": 3},
+                ]
+            )
+        if "FROM seller_offers" in sql and "WITH offer AS" not in sql:
+            return _Result([{"id": 40, "thread_id": 5, "seller_id": 21, "status": self.status_after_read, "version": 4}])
+        if "FROM seller_offer_items" in sql:
+            return _Result([_item(100, 1, "45.50"), _item(101, 1, "52.00"), _item(102, 2, "120.00")])
+        if "WITH offer AS" in sql:
+            if not self.transition_applies:
+                return _Result([])
+            return _Result(
+                [
+                    {
+                        "id": 40,
+                        "thread_id": 5,
+                        "seller_id": 21,
+                        "seller_shop_id": 9,
+                        "status": params["status"],
+                        "notes": None,
+                        "total_amount": params["total_amount"],
+                        "created_at": NOW,
+                        "updated_at": NOW,
+                        "submitted_at": NOW,
+                        "finalized_at": NOW if params["total_amount"] is not None else None,
+                        "version": params["version"] + 1,
+                        "seller_name": "Carlos Silva",
+                        "seller_shop_name": "Autopeças Azul",
+                    }
+                ]
+            )
+        return _Result([])
+
+    def commit(self):
+        self.commits += 1
+
+
+def _item(item_id: int, requested_item_id: int, unit_price: str) -> dict:
+    return {
+        "id": item_id,
+        "offer_id": 40,
+        "requested_item_id": requested_item_id,
+        "source_type": "manual",
+        "suggested_part_id": None,
+        "title": f"Opção {item_id}",
+        "brand": "Bosch",
+        "part_number": None,
+        "quantity": 1,
+        "unit_price": Decimal(unit_price),
+        "compatibility_note": None,
+        "metadata_json": {},
+        "is_final_choice": False,
+        "created_at": NOW,
+        "updated_at": None,
+    }
+
+
+def _writes(session: ScriptedSession) -> list[str]:
+    return [sql for sql, _ in session.statements if sql.split()[0] in {"WITH", "UPDATE", "INSERT"}]
+
+
+def test_submit_offer_writes_offer_notice_and_thread_in_one_statement():
+    session = ScriptedSession()
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    result = repo.submit_offer(offer_id=40, seller_id=21)
+
+    transition = [params for sql, params in session.statements if "WITH offer AS" in sql]
+    assert len(transition) == 1
+    assert transition[0]["status"] == "SUBMITTED_OPTIONS"
+    assert transition[0]["thread_status"] == "offer_received"
+    assert transition[0]["body"] == "Resposta enviada com 2 opções para Pastilha de freio e 1 opção para Disco de freio."
+    assert json.loads(transition[0]["metadata_json"]) == {"offer_id": 40, "seller_id": 21, "status": "SUBMITTED_OPTIONS"}
+    assert transition[0]["version"] == 3
+
+    # Requested items (with the offer version) and offer items, the guarded transition, the comparison swap.
+    assert len(session.statements) == 4
+    assert not any("FOR UPDATE" in sql for sql, _ in session.statements)
+    assert len(_writes(session)) == 2
+    assert _writes(session)[1].lstrip().startswith("UPDATE thread_comparisons")
+    assert session.commits == 1
+
+    assert result["offer_id"] == 40
+    assert result["thread_status"] == "offer_received"
+    assert result["service_order_id"] is None
+    assert result["seller_store"] == {"id": 9, "name": "Autopeças Azul"}
+    assert [len(group["options"]) for group in result["groups"]] == [2, 1]
+    assert result["total_amount"] is None
+
+
+def test_final_proposal_selects_items_and_totals_inside_the_transition():
+    session = ScriptedSession(offer_status="SUBMITTED_OPTIONS")
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    result = repo.submit_offer(
+        offer_id=40,
+        seller_id=21,
+        payload={"close_quote": True, "selected_option_ids": [101, 102]},
+    )
+
+    params = next(params for sql, params in session.statements if "WITH offer AS" in sql)
+    assert params["selected_ids"] == [101, 102]
+    assert params["total_amount"] == 172.0
+    assert params["thread_status"] == "closed"
+    assert json.loads(params["metadata_json"])["service_order_id"] == "so_40"
+
+    assert result["thread_status"] == "closed"
+    assert result["service_order_id"] == "so_40"
+    assert result["final_total"] == 172.0
+    assert [item["id"] for item in result["items"] if item["is_final_choice"]] == [101, 102]
+    assert result["summary_text"] == "Orçamento enviado com 1 item selecionado para Pastilha de freio e 1 item selecionado para Disco de freio."
+
+
+def test_finalize_rejects_two_choices_for_the_same_requested_item_before_writing():
+    session = ScriptedSession()
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    with pytest.raises(ValidationError):
+        repo.finalize_offer(offer_id=40, seller_id=21, payload={"selected_option_ids": [100, 101]})
+    assert _writes(session) == []
+
+
+def test_submission_of_an_offer_that_is_no_longer_editable_is_rejected_before_writing():
+    session = ScriptedSession(offer_status="FINALIZED_QUOTE")
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    with pytest.raises(ValidationError):
+        repo.submit_offer(offer_id=40, seller_id=21)
+    assert _writes(session) == []
+
+
+def test_transition_guard_rejects_an_offer_that_left_the_editable_states():
+    session = ScriptedSession(transition_applies=False, status_after_read="FINALIZED_QUOTE")
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    with pytest.raises(ValidationError):
+        repo.submit_offer(offer_id=40, seller_id=21)
+    assert session.commits == 0
+
+
+def test_transition_guard_turns_an_item_edit_after_the_read_into_a_conflict():
+    session = ScriptedSession(transition_applies=False)
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    with pytest.raises(ConflictError):
+        repo.submit_offer(offer_id=40, seller_id=21)
+    assert session.commits == 0
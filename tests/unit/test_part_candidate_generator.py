@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.bot.application.dtos.recommendation.candidate import Candidate
+from src.bot.application.dtos.recommendation.recommendation_request import (
+    RecommendationRequest,
+)
+from src.bot.application.dtos.recommendation.recommendation_response import (
+    RecommendationResponse,
+)
+from src.bot.application.services.part_candidate_generator import PartCandidateGenerator
+from src.bot.application.services.parts_suggestion_provider import (
+    PartsSuggestionProvider,
+    RetrievalFirstSuggestionProvider,
+)
+from src.bot.application.services.recommendation_service import FilteredRecommendationService
+
+NGK_CHUNK = (
+    "Velas de ignição NGK — Modelo | Motorização | Combustível | Convencional | Iridium | Gap\n"
+    "Palio 1.0 2010-2016 | Fire 8V | Flex | BKR6E | BKR6EIX | 0.8\n"
+    "Gol 1.0 2008-2013 | 8V | Flex | BKR5E | - | 0.9"
+)
+
+
+class FakeChunkRepo:
+    def __init__(self, similarity: float, text: str = NGK_CHUNK) -> None:
+        self.similarity = similarity
+        self.text = text
+        self.searches = 0
+
+    def search_similar(self, embedding, **filters):
+        self.searches += 1
+        return [
+            {
+                "id": 41,
+                "chunk_text": self.text,
+                "brand": "NGK",
+                "similarity": self.similarity,
+                "metadata": {"catalog_id": 3, "page": 12},
+            }
+        ]
+
+
+class FakeEmbeddings:
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    async def embed_texts(self, texts):
+        self.texts.extend(texts)
+        return [[0.1] for _ in texts]
+
+
+class FakeHistory:
+    def __init__(self, rows=None) -> None:
+        self.rows = rows or []
+        self.calls: list[dict] = []
+
+    def find_history_candidates(self, *, queries, limit=10):
+        self.calls.append({"queries": queries, "limit": limit})
+        return [self.rows for _ in queries]
+
+
+class ReversingLlm:
+    """Ranks by reversing the shortlist and tries to slip in an invented code."""
+
+    def __init__(self) -> None:
+        self.requests: list[RecommendationRequest] = []
+
+    async def generate(self, request: RecommendationRequest) -> RecommendationResponse:
+        self.requests.append(request)
+        shortlist = [Candidate.model_validate(c) for c in request.context["prefiltered_candidates"]]
+        invented = Candidate(id="x", part_number="INVENTED-1", score=0.99)
+        return RecommendationResponse(id=request.requester_id, candidates=[invented, *reversed(shortlist)])
+
+
+class RecordingFallback(PartsSuggestionProvider):
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+
+    async def suggest_batch(self, payloads):
+        self.batches.append(payloads)
+        return [[{"title": "LLM", "part_number": None}] for _ in payloads]
+
+
+def _payload(item_id: int, description: str) -> dict:
+    return {
+        "thread_id": 9,
+        "request_id": 4,
+        "requested_item_id": item_id,
+        "original_description": description,
+        "vehicle": {"brand": "Fiat", "model": "Palio", "year": "2015"},
+    }
+
+
+def _provider(chunks: FakeChunkRepo, history: FakeHistory, llm: ReversingLlm, fallback: RecordingFallback):
+    generator = PartCandidateGenerator(
+        chunk_repo=chunks,
+        embeddings=FakeEmbeddings(),
+        history=history,
+        hit_min_similarity=0.85,
+    )
+    return RetrievalFirstSuggestionProvider(
+        fallback=fallback,
+        generator=generator,
+        ranker=FilteredRecommendationService(llm=llm),
+    )
+
+
+def test_single_confident_catalog_code_skips_the_llm():
+    chunk = NGK_CHUNK.replace(" | BKR6EIX", " | -")
+    llm, fallback = ReversingLlm(), RecordingFallback()
+    provider = _provider(FakeChunkRepo(0.91, chunk), FakeHistory(), llm, fallback)
+
+    [suggestions] = asyncio.run(provider.suggest_batch([_payload(1, "vela de ignição")]))
+
+    assert [s["part_number"] for s in suggestions] == ["BKR6E"]
+    assert suggestions[0]["metadata_json"]["source"] == "catalog_chunks"
+    assert suggestions[0]["metadata_json"]["page"] == 12
+    assert llm.requests == [] and fallback.batches == []
+
+
+def test_llm_only_ranks_the_shortlist_and_untyped_items_fall_back():
+    history = FakeHistory(
+        [
+            {
+                "part_number": "BKR5EZ",
+                "brand": "NGK",
+                "title": "Vela de ignição NGK BKR5EZ",
+                "note": "Palio Fire",
+                "offered_count": 3,
+                "chosen_count": 1,
+                "suggested_count": 0,
+                "average_price_brl": 21.5,
+            }
+        ]
+    )
+    llm, fallback = ReversingLlm(), RecordingFallback()
+    provider = _provider(FakeChunkRepo(0.7), history, llm, fallback)
+
+    results = asyncio.run(
+        provider.suggest_batch([_payload(1, "vela de ignição"), _payload(2, "pastilha de freio")])
+    )
+
+    # The LLM's order is kept without its invented code; Gol's BKR5E is on
+    # another model's line and never enters the shortlist.
+    assert [s["part_number"] for s in results[0]] == ["BKR6EIX", "BKR6E", "BKR5EZ"]
+    assert results[0][2]["metadata_json"]["source"] == "part_history"
+    assert results[1] == [{"title": "LLM", "part_number": None}]
+    assert [p["requested_item_id"] for p in fallback.batches[0]] == [2]
+    assert len(llm.requests) == 1
+    [call] = history.calls
+    [query] = call["queries"]
+    assert query["model"] == "palio" and query["year"] == 2015
+    assert "vela" in query["keywords"]
+
+
+def test_history_is_looked_up_once_per_batch():
+    history = FakeHistory()
+    chunks = FakeChunkRepo(0.7)
+    generator = PartCandidateGenerator(chunk_repo=chunks, embeddings=FakeEmbeddings(), history=history)
+
+    shortlists = asyncio.run(
+        generator.shortlist_batch(
+            [_payload(1, "vela de ignição"), _payload(2, "cabo de vela"), _payload(3, "vela de ignição")]
+        )
+    )
+
+    assert len(shortlists) == 3
+    [call] = history.calls
+    assert len(call["queries"]) == 3
+    assert chunks.searches == 3
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    MECHANIC_VISIBLE_OFFER_STATUSES,
+)
+from src.bot.adapters.driven.db.repositories.part_history_repo_sa import PartHistoryRepoSqlAlchemy
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class RecordingSession:
+    def __init__(self, rows=None) -> None:
+        self.rows = rows or []
+        self.statements: list[tuple[str, dict]] = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params or {}))
+        return _Result(self.rows)
+
+
+def _row(idx: int, part_number: str, *, chosen: int = 0) -> dict:
+    return {
+        "idx": idx,
+        "part_number": part_number,
+        "brand": "NGK",
+        "title": None,
+        "note": None,
+        "offered_count": 1,
+        "chosen_count": chosen,
+        "suggested_count": 0,
+        "year_matches": 0,
+        "average_price_brl": 20.0,
+    }
+
+
+def test_offer_history_counts_every_mechanic_visible_status():
+    session = RecordingSession([_row(0, "BKR6E", chosen=1)])
+
+    [rows] = PartHistoryRepoSqlAlchemy(session).find_history_candidates(
+        queries=[{"model": "palio", "keywords": ["vela"], "year": 2015}]
+    )
+
+    [(sql, params)] = session.statements
+    # A final choice on a "proposal_sent" offer is as much evidence as one on
+    # a finalized quote, so the filter follows the thread view's status set.
+    assert "proposal_sent" in params["statuses"]
+    assert params["statuses"] == sorted(MECHANIC_VISIBLE_OFFER_STATUSES)
+    assert "so.status = ANY(CAST(:statuses AS text[]))" in sql
+    assert "SUBMITTED_OPTIONS" not in sql
+    assert rows[0]["chosen_count"] == 1 and "idx" not in rows[0]
+
+
+def test_batch_is_one_statement_and_rows_go_back_to_their_query():
+    session = RecordingSession([_row(0, "BKR6E"), _row(2, "N0123"), _row(2, "N0456")])
+
+    results = PartHistoryRepoSqlAlchemy(session).find_history_candidates(
+        queries=[
+            {"model": "palio", "keywords": ["vela"], "year": 2015},
+            {"model": "", "keywords": ["pastilha"], "year": None},
+            {"model": "gol", "keywords": ["pastilha", "freio"], "year": None},
+        ],
+        limit=5,
+    )
+
+    assert len(session.statements) == 1
+    queries = json.loads(session.statements[0][1]["queries"])
+    assert [query["idx"] for query in queries] == [0, 2]
+    assert queries[0]["patterns"] == ["%vela%"] and queries[0]["year"] == "2015"
+    assert queries[1]["model_prefix"] == "gol %"
+    assert [[row["part_number"] for row in rows] for rows in results] == [["BKR6E"], [], ["N0123", "N0456"]]
+
+
+def test_batch_without_searchable_queries_skips_the_database():
+    session = RecordingSession()
+
+    results = PartHistoryRepoSqlAlchemy(session).find_history_candidates(
+        queries=[{"model": "palio", "keywords": [], "year": None}]
+    )
+
+    assert results == [[]] and session.statements == []
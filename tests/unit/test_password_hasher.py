@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+from src.bot.application.services import password_hasher as module
+from src.bot.application.services.password_hasher import PasswordHasher, bcrypt_cost
+from src.bot.domain.errors import TooManyRequestsError
+
+
+def test_bcrypt_cost_and_needs_rehash():
+    hasher = PasswordHasher(rounds=5, workers=1, max_pending=4)
+    stored = bcrypt.hashpw(b"secret123", bcrypt.gensalt(rounds=4)).decode()
+
+    assert bcrypt_cost(stored) == 4
+    assert bcrypt_cost("not-a-bcrypt-hash") is None
+    assert hasher.needs_rehash(stored) is True
+    assert hasher.needs_rehash(asyncio.run(hasher.hash("secret123"))) is False
+
+
+def test_per_key_cap_rejects_concurrent_logins_without_blocking_the_loop(monkeypatch):
+    release = threading.Event()
+
+    def slow_check(plain: str, hashed: str) -> bool:
+        release.wait(timeout=5)
+        return True
+
+    monkeypatch.setattr(module, "check_password", slow_check)
+    hasher = PasswordHasher(rounds=4, workers=2, max_pending=8, limits={"email": 1, "ip": 8})
+
+    async def _run():
+        first = asyncio.create_task(hasher.verify("a", "h", keys={"email": "mec@test.com", "ip": "10.0.0.1"}))
+        await asyncio.sleep(0.01)
+        assert hasher.pending == 1
+
+        # Same e-mail is over its cap; another e-mail from the same IP still gets in.
+        with pytest.raises(TooManyRequestsError):
+            await hasher.verify("a", "h", keys={"email": "mec@test.com", "ip": "10.0.0.1"})
+        second = asyncio.create_task(hasher.verify("a", "h", keys={"email": "other@test.com", "ip": "10.0.0.1"}))
+
+        # The event loop keeps serving other work while bcrypt jobs run.
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0.001)
+            ticks += 1
+        assert ticks == 5
+
+        release.set()
+        assert await first is True
+        assert await second is True
+        assert hasher.pending == 0
+
+    asyncio.run(_run())
+
+
+def test_global_pending_bound(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(module, "check_password", lambda plain, hashed: release.wait(timeout=5))
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=2)
+
+    async def _run():
+        jobs = [asyncio.create_task(hasher.verify("a", "h")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(TooManyRequestsError):
+            await hasher.verify("a", "h")
+        release.set()
+        assert await asyncio.gather(*jobs) == [True, True]
+
+    asyncio.run(_run())
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.bot.adapters.driven.llm.embeddings_adapter import (
+    EmbeddingsAdapter,
+    EmbeddingsError,
+    EmbeddingsUnavailableError,
+)
+from src.bot.adapters.driven.llm.llm_recommendation_adapter import (
+    LlmError,
+    LlmUnavailableError,
+    OpenAiRecommendationAdapter,
+)
+from src.bot.adapters.driven.llm.provider_resilience import (
+    CircuitBreaker,
+    ProviderEndpoint,
+    ResilientProvider,
+)
+from src.bot.application.dtos.recommendation.part_request import PartRequest
+from src.bot.application.dtos.recommendation.recommendation_request import (
+    RecommendationRequest,
+)
+from src.bot.application.services.parts_suggestion_provider import (
+    LlmPartsSuggestionProvider,
+)
+from src.bot.tasks.provider_stub import (
+    LatencyDistribution,
+    StubBehavior,
+    create_stub_app,
+    serve_in_thread,
+)
+
+
+class NullLogStore:
+    def create_log(self, payload: dict) -> None:
+        return None
+
+
+def _settings(base_url: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        LLM_API_KEY="test-key",
+        LLM_BASE_URL=base_url,
+        LLM_MODEL="gpt-4.1-mini",
+        LLM_TEMPERATURE=0.2,
+        LLM_TIMEOUT_SECONDS=30,
+        LLM_PROVIDER="openai",
+        EMBEDDINGS_API_KEY="test-key",
+        EMBEDDINGS_BASE_URL=base_url,
+        EMBEDDINGS_MODEL="text-embedding-3-small",
+    )
+
+
+def _request() -> RecommendationRequest:
+    return RecommendationRequest(
+        requester_id="req-1",
+        vehicle={"brand": "Fiat", "model": "Palio", "year": "2015"},
+        parts=[PartRequest(description="vela", quantity=4)],
+        context={"thread_id": "10"},
+    )
+
+
+def _payload(item_id: int) -> dict:
+    return {
+        "thread_id": 10,
+        "request_id": 4,
+        "requested_item_id": item_id,
+        "original_description": "vela de ignição",
+        "vehicle": {"brand": "Fiat", "model": "Palio", "year": "2015"},
+    }
+
+
+def test_slow_primary_is_hedged_to_the_fallback_and_the_first_success_wins():
+    slow, healthy = StubBehavior(chat_latency=LatencyDistribution.parse("1.0")), StubBehavior()
+    with serve_in_thread(create_stub_app(slow)) as primary_url, serve_in_thread(
+        create_stub_app(healthy)
+    ) as fallback_url:
+        provider = ResilientProvider(
+            primary=ProviderEndpoint(primary_url, "test-key"),
+            fallback=ProviderEndpoint(fallback_url, "test-key"),
+            breaker=CircuitBreaker("llm"),
+            min_delay=0.05,
+            max_delay=0.5,
+        )
+        adapter = OpenAiRecommendationAdapter(
+            _settings(primary_url), log_store=NullLogStore(), resilience=provider
+        )
+
+        start = time.perf_counter()
+        response = asyncio.run(adapter.generate(_request()))
+        elapsed = time.perf_counter() - start
+
+        # Once enough fast answers are seen, the hedge waits about their p95.
+        slow.chat_latency = LatencyDistribution()
+        for _ in range(20):
+            asyncio.run(adapter.generate(_request()))
+        hedge_delay = provider.hedge_delay()
+
+    assert response.candidates[0].part_number == "STUB-0001"
+    assert elapsed < 0.9
+    assert provider.hedged == 1
+    assert healthy.requests["chat"] == 1
+    # Local stub answers take milliseconds; the clamp (0.5s) would mean no samples were used.
+    assert 0.05 <= hedge_delay < 0.5
+
+
+def test_breaker_opens_on_failures_fails_fast_to_no_suggestions_and_recovers():
+    failing = StubBehavior(error_rate=1.0)
+    now = [0.0]
+    with serve_in_thread(create_stub_app(failing)) as url:
+        breaker = CircuitBreaker("llm", failure_threshold=2, reset_seconds=30, clock=lambda: now[0])
+        provider = ResilientProvider(primary=ProviderEndpoint(url, "test-key"), breaker=breaker)
+        adapter = OpenAiRecommendationAdapter(_settings(url), log_store=NullLogStore(), resilience=provider)
+        suggestions = LlmPartsSuggestionProvider(adapter)
+
+        for _ in range(2):
+            with pytest.raises(LlmError, match="503"):
+                asyncio.run(adapter.generate(_request()))
+        # Without a distinct fallback a fast 503 is not re-sent to the same endpoint.
+        assert failing.requests["chat"] == 2
+        assert breaker.state == "open"
+
+        assert asyncio.run(suggestions.suggest_batch([_payload(1), _payload(2)])) == [[], []]
+        assert failing.requests["chat"] == 2
+        assert breaker.stats()["rejected"] == 1
+
+        failing.error_rate = 0.0
+        now[0] = 31.0
+        assert breaker.state == "half_open"
+        [recovered] = asyncio.run(suggestions.suggest_batch([_payload(1)]))
+
+    assert recovered[0]["part_number"] == "STUB-0001"
+    assert breaker.state == "closed"
+
+
+def test_rate_limited_primary_goes_to_the_fallback_until_retry_after_passes():
+    limited = StubBehavior(error_rate=1.0, error_status=429, retry_after=30)
+    healthy = StubBehavior()
+    with serve_in_thread(create_stub_app(limited)) as primary_url, serve_in_thread(
+        create_stub_app(healthy)
+    ) as fallback_url:
+        provider = ResilientProvider(
+            primary=ProviderEndpoint(primary_url, "test-key"),
+            fallback=ProviderEndpoint(fallback_url, "test-key"),
+            breaker=CircuitBreaker("llm"),
+        )
+        adapter = OpenAiRecommendationAdapter(_settings(primary_url), log_store=NullLogStore(), resilience=provider)
+        first = asyncio.run(adapter.generate(_request()))
+        second = asyncio.run(adapter.generate(_request()))
+
+        alone = ResilientProvider(primary=ProviderEndpoint(primary_url, "test-key"), breaker=CircuitBreaker("solo"))
+        solo = OpenAiRecommendationAdapter(_settings(primary_url), log_store=NullLogStore(), resilience=alone)
+        with pytest.raises(LlmError, match="429"):
+            asyncio.run(solo.generate(_request()))
+        with pytest.raises(LlmUnavailableError):
+            asyncio.run(solo.generate(_request()))
+
+    assert first.candidates and second.candidates
+    # The 429 was hedged to the fallback at once; the next call skipped the primary.
+    assert provider.hedged == 1
+    assert healthy.requests["chat"] == 2
+    assert limited.requests["chat"] == 2
+
+
+def test_embeddings_adapter_fails_fast_while_its_circuit_is_open():
+    failing = StubBehavior(error_rate=1.0, error_status=500)
+    with serve_in_thread(create_stub_app(failing, dimensions=8)) as url:
+        breaker = CircuitBreaker("embeddings", failure_threshold=1, reset_seconds=30)
+        adapter = EmbeddingsAdapter(
+            _settings(url),
+            resilience=ResilientProvider(primary=ProviderEndpoint(url, "test-key"), breaker=breaker, hedging=False),
+        )
+        with pytest.raises(EmbeddingsError, match="500"):
+            asyncio.run(adapter.embed_texts(["vela palio"]))
+        with pytest.raises(EmbeddingsUnavailableError):
+            asyncio.run(adapter.embed_texts(["vela palio"]))
+
+        healthy = EmbeddingsAdapter(_settings(url))
+        failing.error_rate = 0.0
+        vectors = asyncio.run(healthy.embed_texts(["vela palio", "vela palio"]))
+
+    assert failing.requests["embeddings"] == 2
+    assert len(vectors[0]) == 8 and vectors[0] == vectors[1]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.bot.application.services.rag_answer_cache import RagAnswerCache, answer_key
+from src.bot.application.services.rag_query_service import RagQueryService
+
+
+class FakeChunkRepo:
+    def search_similar(self, embedding, **filters):
+        return [
+            {
+                "id": 1,
+                "chunk_text": "Palio Fire 1.0 | Flex | FR 6 D+ | 0,8",
+                "brand": "Bosch",
+                "similarity": 0.9,
+                "metadata": {"catalog_id": 3, "page": 12, "original_filename": "bosch.pdf"},
+            }
+        ]
+
+
+class CountingEmbeddings:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def embed_text(self, text: str) -> list[float]:
+        self.calls += 1
+        return [0.1]
+
+
+class FakeCatalogRepo:
+    def __init__(self) -> None:
+        self.version = "2:2026-01-01T00:00:00"
+
+    def catalog_set_version(self) -> str:
+        return self.version
+
+
+def _service(cache: RagAnswerCache, catalogs: FakeCatalogRepo, embeddings: CountingEmbeddings) -> RagQueryService:
+    service = RagQueryService(
+        chunk_repo=FakeChunkRepo(),
+        embeddings=embeddings,
+        settings=None,
+        answer_cache=cache,
+        catalog_repo=catalogs,
+    )
+
+    async def fake_llm(messages):
+        return "Bosch FR 6 D+"
+
+    async def fake_stream(messages):
+        for delta in ("Bosch ", "FR 6 D+"):
+            yield delta
+
+    service._call_llm = fake_llm
+    service._stream_llm = fake_stream
+    return service
+
+
+def test_repeated_question_is_served_from_cache_until_the_catalog_set_changes():
+    cache = RagAnswerCache(ttl_seconds=60, max_entries=10)
+    catalogs = FakeCatalogRepo()
+    embeddings = CountingEmbeddings()
+    service = _service(cache, catalogs, embeddings)
+
+    first = asyncio.run(service.query("Vela Palio Fire 1.0?", brand="Bosch"))
+    second = asyncio.run(service.query("  vela palio   fire 1.0 ", brand="BOSCH"))
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["answer"] == first["answer"] == "Bosch FR 6 D+"
+    assert second["sources"] == first["sources"]
+    assert embeddings.calls == 1
+
+    catalogs.version = "2:2026-01-02T00:00:00"  # a catalog was deactivated
+    third = asyncio.run(service.query("vela palio fire 1.0", brand="Bosch"))
+    assert third["cached"] is False
+    assert embeddings.calls == 2
+
+
+def test_stream_caches_completed_answers_and_replays_them_as_one_token():
+    cache = RagAnswerCache(ttl_seconds=60, max_entries=10)
+    embeddings = CountingEmbeddings()
+    service = _service(cache, FakeCatalogRepo(), embeddings)
+
+    async def collect():
+        return [event async for event in service.query_stream("vela palio fire 1.0")]
+
+    streamed = asyncio.run(collect())
+    replayed = asyncio.run(collect())
+
+    assert streamed[0]["data"]["cached"] is False
+    assert [e["data"]["delta"] for e in streamed if e["event"] == "token"] == ["Bosch ", "FR 6 D+"]
+    assert replayed[0]["data"]["cached"] is True
+    assert [e["data"]["delta"] for e in replayed if e["event"] == "token"] == ["Bosch FR 6 D+"]
+    assert replayed[-1]["event"] == "done"
+    assert embeddings.calls == 1
+    assert asyncio.run(service.query("vela palio fire 1.0"))["answer_source"] == "llm"
+
+
+def test_entries_expire_and_least_recently_used_are_evicted():
+    now = [0.0]
+    cache = RagAnswerCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    keys = [
+        answer_key(q, manufacturer_id=None, catalog_id=None, brand=None, top_k=6, catalog_version="v1")
+        for q in ("a", "b", "c")
+    ]
+    cache.put(keys[0], {"answer": "A"})
+    cache.put(keys[1], {"answer": "B"})
+    assert cache.get(keys[0]) == {"answer": "A"}
+    cache.put(keys[2], {"answer": "C"})
+
+    assert cache.get(keys[1]) is None  # evicted: "a" was used more recently
+    now[0] = 11.0
+    assert cache.get(keys[0]) is None
+    assert cache.stats()["hits"] == 1 and len(cache) == 1
+    assert RagAnswerCache(ttl_seconds=0, max_entries=5).enabled is False
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import pytest
+
+from src.bot.adapters.driven.db.repositories.rag_chunk_repo_sa import (
+    HnswSearchTuning,
+    RagChunkRepoSqlAlchemy,
+)
+from src.bot.tasks.rag_recall_harness import SearchConfig, label_recall, replay
+from src.bot.tasks.rag_search_benchmark import percentile, recall_at_k, run_benchmark
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one(self):
+        return self._rows[0]
+
+    def scalar(self):
+        return self._rows[0] if self._rows else None
+
+
+class RecordingSession:
+    def __init__(
+        self,
+        rows_by_mode: dict[str, list[int]] | None = None,
+        *,
+        matching: int = 100,
+        pgvector: str = "0.8.0",
+    ) -> None:
+        self.statements: list[tuple[str, dict]] = []
+        self.rows_by_mode = rows_by_mode or {}
+        self.matching = matching
+        self.pgvector = pgvector
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params or {}))
+        if "pg_extension" in sql:
+            return _Result([self.pgvector])
+        if "set_config" in sql:
+            return _Result([])
+        if "SUM(chunk_count)" in sql:
+            return _Result([{"matching": self.matching, "total": 1000}])
+        mode = "binary" if "<~>" in sql else "halfvec" if "halfvec" in sql else "full"
+        return _Result([{"id": chunk_id} for chunk_id in self.rows_by_mode.get(mode, [])])
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture(autouse=True)
+def pgvector_with_iterative_scan(monkeypatch):
+    monkeypatch.setattr(RagChunkRepoSqlAlchemy, "_iterative_scan_supported", True)
+
+
+def _settings(params: dict) -> dict:
+    values = list(params.values())
+    return dict(zip(values[::2], values[1::2]))
+
+
+DEFAULT_SETTINGS = {
+    "hnsw.ef_search": "40",
+    "hnsw.iterative_scan": "off",
+    "hnsw.max_scan_tuples": "20000",
+}
+
+
+def test_full_mode_keeps_the_single_pass_query():
+    session = RecordingSession()
+    RagChunkRepoSqlAlchemy(session).search_similar([0.1, 0.2], top_k=6)
+
+    (_, tuning_params), (sql, params) = session.statements
+    assert _settings(tuning_params) == DEFAULT_SETTINGS
+    assert "candidates" not in sql
+    assert "ORDER BY rc.embedding <=>" in sql
+    assert params["top_k"] == 6
+
+
+def test_filtered_search_widens_ef_search_by_selectivity_and_enables_iterative_scan():
+    session = RecordingSession(matching=50)
+    RagChunkRepoSqlAlchemy(session).search_similar([0.1], top_k=18, brand="NGK")
+
+    (selectivity_sql, selectivity_params), (_, tuning_params), (sql, params) = session.statements
+    assert "brand = :brand" in selectivity_sql and selectivity_params == {"brand": "NGK"}
+    # 5% of the chunks match, so 18 rows need an ef_search of 360.
+    assert _settings(tuning_params) == {
+        "hnsw.ef_search": "360",
+        "hnsw.iterative_scan": "relaxed_order",
+        "hnsw.max_scan_tuples": "20000",
+    }
+    assert params["brand"] == "NGK"
+
+
+def test_iterative_scan_is_skipped_below_pgvector_0_8_and_the_version_read_once(monkeypatch):
+    monkeypatch.setattr(RagChunkRepoSqlAlchemy, "_iterative_scan_supported", None)
+    session = RecordingSession(matching=50, pgvector="0.7.4")
+
+    RagChunkRepoSqlAlchemy(session).search_similar([0.1], top_k=18, brand="NGK")
+    RagChunkRepoSqlAlchemy(session).search_similar([0.1], top_k=18, brand="NGK")
+
+    assert sum("pg_extension" in sql for sql, _ in session.statements) == 1
+    tuning = [params for sql, params in session.statements if "set_config" in sql]
+    assert tuning == [{"name_0": "hnsw.ef_search", "value_0": "360"}] * 2
+
+
+def test_a_later_unfiltered_search_resets_what_a_filtered_one_set_in_the_transaction():
+    session = RecordingSession(matching=50)
+    repo = RagChunkRepoSqlAlchemy(session)
+
+    repo.search_similar([0.1], top_k=18, brand="NGK")
+    repo.search_similar([0.1], top_k=6)
+
+    filtered, unfiltered = [_settings(params) for sql, params in session.statements if "set_config" in sql]
+    assert filtered["hnsw.iterative_scan"] == "relaxed_order"
+    assert unfiltered == DEFAULT_SETTINGS
+
+
+def test_ef_search_is_capped_and_iterative_scan_can_be_disabled():
+    tuning = HnswSearchTuning(ef_search_max=200, iterative_scan="off")
+
+    assert tuning.settings_for(18, 0.01) == {**DEFAULT_SETTINGS, "hnsw.ef_search": "200"}
+    assert tuning.settings_for(6, 1.0) == DEFAULT_SETTINGS
+    with pytest.raises(ValueError):
+        HnswSearchTuning(iterative_scan="sometimes")
+
+
+@pytest.mark.parametrize(
+    ("mode", "first_pass"),
+    [
+        ("halfvec", "CAST(rc.embedding AS halfvec(1536)) <=>"),
+        ("binary", "CAST(binary_quantize(rc.embedding) AS bit(1536)) <~>"),
+    ],
+)
+def test_quantized_modes_search_the_index_then_rerank_exactly(mode, first_pass):
+    session = RecordingSession()
+    RagChunkRepoSqlAlchemy(session, search_mode=mode, rerank_factor=4).search_similar([0.1], top_k=18)
+
+    (ef_sql, ef_params), (sql, params) = session.statements
+    assert "set_config" in ef_sql
+    assert _settings(ef_params) == {**DEFAULT_SETTINGS, "hnsw.ef_search": "72"}
+    assert f"ORDER BY {first_pass}" in sql
+    assert "FROM candidates c" in sql
+    assert sql.rstrip().endswith("LIMIT :top_k")
+    assert params["candidates"] == 72 and params["top_k"] == 18
+
+
+def test_small_candidate_sets_keep_the_default_ef_search_and_unknown_modes_fail():
+    session = RecordingSession()
+    RagChunkRepoSqlAlchemy(session, search_mode="halfvec", rerank_factor=4).search_similar([0.1], top_k=6)
+    (_, tuning_params), _ = session.statements
+    assert _settings(tuning_params) == DEFAULT_SETTINGS
+
+    with pytest.raises(ValueError):
+        RagChunkRepoSqlAlchemy(session, search_mode="pq")
+
+
+def test_benchmark_reports_recall_against_full_precision():
+    session = RecordingSession({"full": [1, 2, 3, 4], "halfvec": [1, 2, 3, 4], "binary": [1, 9, 3, 8]})
+
+    results = run_benchmark(session, [[0.1], [0.2]], modes=["halfvec", "binary"], top_k=4)
+
+    assert results["full"]["recall"] == 1.0
+    assert results["halfvec"]["recall"] == 1.0
+    assert results["binary"]["recall"] == 0.5
+    assert session.rollbacks == 6
+    assert recall_at_k([1, 2], [2, 5], 2) == 0.5
+    assert percentile([5.0, 1.0, 3.0, 4.0, 2.0], 95) == 5.0
+
+
+def test_recall_harness_scores_labels_per_config_and_pins_ef_search():
+    session = RecordingSession({"full": [1, 2]})
+    queries = [
+        {"query": "vela palio", "embedding": [0.1], "relevant_chunk_ids": [2, 9]},
+        {"query": "sem rótulo", "embedding": [0.2]},
+    ]
+    configs = [SearchConfig(mode="full", ef_search=300, iterative_scan="off")]
+
+    results = replay(session, queries, configs, top_k=6)
+
+    assert results["full/ef=300/off"]["recall"] == 0.75
+    assert results["full/ef=300/off"]["rows"] == 2
+    assert session.rollbacks == 2
+    assert {**DEFAULT_SETTINGS, "hnsw.ef_search": "300"} in [
+        _settings(params) for sql, params in session.statements if "set_config" in sql
+    ]
+    assert label_recall(
+        {"relevant": [{"catalog_id": 3, "page": 12}]},
+        [{"id": 5, "metadata": {"catalog_id": 3, "page": 12}}],
+    ) == 1.0
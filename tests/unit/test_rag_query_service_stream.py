@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from src.bot.application.services.rag_query_service import RagQueryService
+
+
+class FakeEmbeddings:
+    async def embed_text(self, text: str) -> list[float]:
+        return [0.1, 0.2, 0.3]
+
+
+class FakeChunkRepo:
+    def __init__(self, chunks: list[dict]) -> None:
+        self.chunks = chunks
+
+    def search_similar(self, embedding, *, top_k, manufacturer_id=None, catalog_id=None, brand=None):
+        return self.chunks
+
+
+class FakeStreamResponse:
+    status_code = 200
+
+    def __init__(self, lines: list[str]) -> None:
+        self._lines = lines
+
+    async def aiter_lines(self):
+        for line in self._lines:
+            yield line
+
+
+class FakeStreamContext:
+    def __init__(self, client: "FakeStreamingClient") -> None:
+        self._client = client
+
+    async def __aenter__(self):
+        return FakeStreamResponse(self._client.lines)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        FakeStreamingClient.closed = True
+        return False
+
+
+class FakeStreamingClient:
+    lines: list[str] = []
+    last_payload: dict | None = None
+    closed = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.lines = FakeStreamingClient.lines
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def stream(self, method, url, headers=None, json=None):
+        FakeStreamingClient.last_payload = json
+        return FakeStreamContext(self)
+
+
+def _settings():
+    return SimpleNamespace(
+        LLM_API_KEY="test-key",
+        LLM_BASE_URL="https://api.openai.com/v1",
+        LLM_MODEL="gpt-4o-mini",
+        LLM_TIMEOUT_SECONDS=30,
+    )
+
+
+def _delta(content: str) -> str:
+    return "data: " + json.dumps({"choices": [{"delta": {"content": content}}]})
+
+
+def _chunk() -> dict:
+    return {
+        "chunk_text": "Vela de ignição BKR6E - Gol 1.0 2010",
+        "brand": "NGK",
+        "similarity": 0.9,
+        "metadata": {"catalog_id": 1, "original_filename": "ngk.pdf", "page": 12},
+    }
+
+
+def _collect(service: RagQueryService) -> list[dict]:
+    async def _run():
+        return [event async for event in service.query_stream("vela gol 2010")]
+
+    return asyncio.run(_run())
+
+
+def test_query_stream_sends_sources_then_tokens(monkeypatch):
+    monkeypatch.setattr(
+        "src.bot.application.services.rag_query_service.httpx.AsyncClient",
+        FakeStreamingClient,
+    )
+    FakeStreamingClient.lines = [
+        _delta("A vela é "),
+        "",
+        ": keep-alive",
+        _delta("BKR6E."),
+        "data: [DONE]",
+    ]
+    service = RagQueryService(FakeChunkRepo([_chunk()]), FakeEmbeddings(), _settings())
+
+    events = _collect(service)
+
+    assert [event["event"] for event in events] == ["sources", "token", "token", "done"]
+    assert events[0]["data"]["total_sources"] == 1
+    assert events[0]["data"]["sources"][0]["page"] == 12
+    assert "".join(event["data"]["delta"] for event in events[1:3]) == "A vela é BKR6E."
+    assert FakeStreamingClient.last_payload["stream"] is True
+
+
+def test_query_stream_closing_early_closes_provider_stream(monkeypatch):
+    monkeypatch.setattr(
+        "src.bot.application.services.rag_query_service.httpx.AsyncClient",
+        FakeStreamingClient,
+    )
+    FakeStreamingClient.lines = [_delta("um "), _delta("dois "), _delta("três")]
+    FakeStreamingClient.closed = False
+    service = RagQueryService(FakeChunkRepo([_chunk()]), FakeEmbeddings(), _settings())
+
+    async def _run():
+        events = service.query_stream("vela gol 2010")
+        await anext(events)  # sources
+        await anext(events)  # first token
+        await events.aclose()
+
+    asyncio.run(_run())
+
+    assert FakeStreamingClient.closed is True
+
+
+def test_query_stream_without_context_skips_llm():
+    service = RagQueryService(FakeChunkRepo([]), FakeEmbeddings(), _settings())
+
+    events = _collect(service)
+
+    assert [event["event"] for event in events] == ["sources", "token", "done"]
+    assert events[0]["data"] == {"sources": [], "total_sources": 0, "cached": False}
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 
+from src.bot.adapters.driven.llm.llm_recommendation_adapter import LlmParseError
 from src.bot.application.dtos.recommendation.candidate import Candidate
 from src.bot.application.dtos.recommendation.part_request import PartRequest
 from src.bot.application.dtos.recommendation.recommendation_request import (
@@ -38,6 +39,48 @@ class FakeLlm:
         )
 
 
+class FakeBatchLlm(FakeLlm):
+    def __init__(self, *, fail_batch: bool = False) -> None:
+        super().__init__()
+        self.batch_calls = 0
+        self._fail_batch = fail_batch
+
+    async def generate_batch(self, request: RecommendationRequest) -> RecommendationResponse:
+        self.batch_calls += 1
+        if self._fail_batch:
+            raise LlmParseError("invalid batch payload")
+        items = [
+            {
+                "item_id": batch_item["item_id"],
+                "accepted_candidates": list(reversed(batch_item["prefiltered_candidates"])),
+            }
+            for batch_item in (request.context or {}).get("batch_items") or []
+        ]
+        return RecommendationResponse.model_validate({"id": request.requester_id, "items": items})
+
+
+def _multi_item_request() -> RecommendationRequest:
+    return RecommendationRequest(
+        requester_id="req-batch",
+        vehicle={"brand": "Fiat", "model": "Palio", "year": "2015", "engine": "1.0"},
+        parts=[
+            PartRequest(item_id="item-1", description="vela de ignição", quantity=4),
+            PartRequest(item_id="item-2", description="filtro de ar", quantity=1),
+        ],
+        context={
+            "raw_candidates_by_item": {
+                "item-1": [
+                    {"id": "v1", "part_number": "BKR6E", "score": 0.9, "metadata": {"description": "Vela de ignição"}},
+                    {"id": "v2", "part_number": "FR6D", "score": 0.8, "metadata": {"description": "Vela de ignição"}},
+                ],
+                "item-2": [
+                    {"id": "f1", "part_number": "ARL123", "score": 0.7, "metadata": {"description": "Filtro de ar"}},
+                ],
+            }
+        },
+    )
+
+
 def _run(coro):
     return asyncio.run(coro)
 
@@ -223,3 +266,29 @@ def test_recommendation_service_rejects_year_model_incompatibility():
     item = response.items[0]
     assert item.accepted_candidates == []
     assert item.rejected_candidates[0].reason == "incompatible_vehicle"
+
+
+def test_recommendation_service_ranks_multiple_items_in_one_batch_call():
+    llm = FakeBatchLlm()
+    service = FilteredRecommendationService(llm=llm)
+
+    response = _run(service.generate(_multi_item_request()))
+
+    assert llm.batch_calls == 1
+    assert llm.calls == 0
+    candidates_by_item = {
+        item.item_id: [candidate.part_number for candidate in item.accepted_candidates]
+        for item in response.items
+    }
+    assert candidates_by_item == {"item-1": ["FR6D", "BKR6E"], "item-2": ["ARL123"]}
+
+
+def test_recommendation_service_falls_back_to_per_item_calls_when_batch_fails_to_parse():
+    llm = FakeBatchLlm(fail_batch=True)
+    service = FilteredRecommendationService(llm=llm)
+
+    response = _run(service.generate(_multi_item_request()))
+
+    assert llm.batch_calls == 1
+    assert llm.calls == 2
+    assert [len(item.accepted_candidates) for item in response.items] == [2, 1]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    BrowserThreadRepoSqlAlchemy,
+)
+from src.bot.adapters.driven.db.seller_visibility import SellerVisibilityCache
+from src.bot.domain.errors import UnauthorizedError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_expires_evicts_and_invalidates_by_workshop():
+    clock = FakeClock()
+    cache = SellerVisibilityCache(ttl_seconds=30, max_entries=2, clock=clock)
+
+    cache.put(thread_id=1, seller_id=21, shop_id=9, workshop_id=7, visible=True)
+    cache.put(thread_id=2, seller_id=21, shop_id=9, workshop_id=8, visible=False)
+    assert cache.get(thread_id=1, seller_id=21, shop_id=9) is True
+    assert cache.get(thread_id=2, seller_id=21, shop_id=9) is False
+
+    cache.put(thread_id=3, seller_id=21, shop_id=9, workshop_id=7, visible=True)
+    assert cache.get(thread_id=1, seller_id=21, shop_id=9) is None  # least recently used
+    assert len(cache) == 2
+
+    cache.invalidate_workshop(7)
+    assert cache.get(thread_id=3, seller_id=21, shop_id=9) is None
+    assert cache.get(thread_id=2, seller_id=21, shop_id=9) is False
+
+    clock.now = 31
+    assert cache.get(thread_id=2, seller_id=21, shop_id=9) is None
+
+
+def test_zero_ttl_disables_cache():
+    cache = SellerVisibilityCache(ttl_seconds=0, max_entries=10)
+    cache.put(thread_id=1, seller_id=21, shop_id=9, workshop_id=7, visible=True)
+    assert cache.get(thread_id=1, seller_id=21, shop_id=9) is None
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def mappings(self):
+        return self
+
+    def one_or_none(self):
+        return self._row
+
+
+class RecordingSession:
+    """Answers the thread read with one row and records every statement."""
+
+    def __init__(self, *, visible: bool) -> None:
+        self.visible = visible
+        self.statements: list[str] = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        row = {
+            "id": params["thread_id"],
+            "mechanic_id": 11,
+            "workshop_id": 7,
+            "status": "open",
+            "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "updated_at": None,
+            "last_message_at": None,
+            "version": 3,
+            "vehicle_plate": None,
+            "vehicle_brand": None,
+            "vehicle_model": None,
+            "vehicle_year": None,
+            "vehicle_engine": None,
+            "vehicle_version": None,
+            "vehicle_notes": None,
+            "seller_visible": self.visible if "vendor_assignments" in sql else None,
+        }
+        return _Result(row)
+
+
+def _seller():
+    class Actor:
+        role = "seller"
+        vendor_id = 21
+        shop_id = 9
+        user_id = 21
+
+    return Actor()
+
+
+def test_seller_thread_reads_check_visibility_in_one_query_then_hit_cache():
+    session = RecordingSession(visible=True)
+    cache = SellerVisibilityCache(ttl_seconds=30, max_entries=100)
+    repo = BrowserThreadRepoSqlAlchemy(session, visibility_cache=cache)
+
+    assert repo.get_thread_version(thread_id=5, actor=_seller()) == 3
+    assert len(session.statements) == 1
+    assert "vendor_assignments" in session.statements[0]
+
+    assert repo.get_thread_version(thread_id=5, actor=_seller()) == 3
+    assert len(session.statements) == 2
+    assert "vendor_assignments" not in session.statements[1]
+
+
+def test_denied_seller_is_cached_until_the_workshop_assignment_changes():
+    session = RecordingSession(visible=False)
+    cache = SellerVisibilityCache(ttl_seconds=30, max_entries=100)
+    repo = BrowserThreadRepoSqlAlchemy(session, visibility_cache=cache)
+
+    with pytest.raises(UnauthorizedError):
+        repo.get_thread_version(thread_id=5, actor=_seller())
+    with pytest.raises(UnauthorizedError):
+        repo.get_thread_version(thread_id=5, actor=_seller())
+    assert "vendor_assignments" not in session.statements[-1]
+
+    session.visible = True
+    cache.invalidate_workshop(7)
+    assert repo.get_thread_version(thread_id=5, actor=_seller()) == 3
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    BrowserThreadRepoSqlAlchemy,
+)
+from src.bot.domain.errors import NotFoundError, ValidationError
+
+NOW = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+def _row(offer_id: int, **overrides) -> dict:
+    return {
+        "offer_id": offer_id,
+        "thread_id": 5,
+        "status": "proposal_sent",
+        "thread_status": "closed",
+        "total_amount": None,
+        "created_at": NOW,
+        "submitted_at": NOW,
+        "title": "Pastilha de freio",
+        "workshop_name": "Oficina Central",
+        "vehicle_brand": "Fiat",
+        "vehicle_model": "Argo",
+        "vehicle_year": "2021",
+        "vehicle_engine": None,
+        "vehicle_version": None,
+        "auto_parts_name": "Autopeças Azul",
+        "seller_name": "Carlos Silva",
+        "final_count": 0,
+        "final_total": Decimal("0"),
+        "all_count": 3,
+        "all_total": Decimal("380.50"),
+        **overrides,
+    }
+
+
+class ListingSession:
+    def __init__(self, rows: list[dict], *, cursor_exists: bool = True) -> None:
+        self.rows = rows
+        self.cursor_exists = cursor_exists
+        self.statements: list[tuple[str, dict]] = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        if "LATERAL" not in str(statement):
+            return _Result([(1,)] if self.cursor_exists else [])
+        return _Result(self.rows)
+
+
+def test_page_is_one_aggregated_query_with_keyset_cursor():
+    session = ListingSession(
+        [
+            _row(12, final_count=2, final_total=Decimal("250.00")),
+            _row(11),
+            _row(10, total_amount=Decimal("199.9"), final_count=1, final_total=Decimal("180")),
+        ]
+    )
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    rows, next_before = repo.list_service_orders(mechanic_id=11, limit=2, before="so_13")
+
+    assert len(session.statements) == 1
+    sql, params = session.statements[0]
+    assert "LIMIT :limit" in sql and "LATERAL" in sql
+    # One row past the page tells that another page follows.
+    assert params["limit"] == 3 and params["before_offer_id"] == 13
+    assert "prev_thread.mechanic_id = :mechanic_id" in sql
+    assert [(row["id"], row["item_count"], row["total_amount"]) for row in rows] == [
+        ("so_12", 2, 250.0),
+        ("so_11", 3, 380.5),
+    ]
+    assert next_before == "so_11"
+
+    last_page, next_before = repo.list_service_orders(mechanic_id=11, limit=3, before="so_13")
+    assert [row["id"] for row in last_page] == ["so_12", "so_11", "so_10"]
+    assert next_before is None
+
+
+def test_first_page_has_no_cursor_and_bad_cursor_is_rejected():
+    session = ListingSession([])
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    assert repo.list_service_orders(mechanic_id=11) == ([], None)
+    sql, params = session.statements[0]
+    assert "before_offer_id" not in params and ":before_offer_id" not in sql
+
+    with pytest.raises(ValidationError):
+        repo.list_service_orders(mechanic_id=11, before="so_abc")
+
+
+def test_empty_page_tells_an_unknown_or_foreign_cursor_from_the_end_of_the_list():
+    session = ListingSession([])
+    repo = BrowserThreadRepoSqlAlchemy(session)
+    assert repo.list_service_orders(mechanic_id=11, before="so_10") == ([], None)
+    assert session.statements[-1][1] == {"offer_id": 10, "mechanic_id": 11}
+
+    with pytest.raises(NotFoundError):
+        BrowserThreadRepoSqlAlchemy(ListingSession([], cursor_exists=False)).list_service_orders(
+            mechanic_id=11, before="so_10"
+        )
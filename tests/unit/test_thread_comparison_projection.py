@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from src.bot.adapters.driven.db.repositories.browser_thread_repo_sa import (
+    BrowserThreadRepoSqlAlchemy,
+    _comparison_json_default,
+)
+from src.bot.adapters.driver.fastapi.schemas.threads import OfferComparisonSchema
+
+SUBMITTED_AT = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+CREATED_AT = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _entry(offer_id: int, status: str = "SUBMITTED_OPTIONS", created_at: datetime = CREATED_AT) -> dict:
+    return {
+        "offer_id": offer_id,
+        "seller_id": 21,
+        "seller_name": "Carlos Silva",
+        "seller_shop_id": 9,
+        "seller_shop_name": "Autopeças Azul",
+        "status": status,
+        "created_at": created_at,
+        "summary_text": None,
+        "final_total": None,
+        "total_amount": None,
+        "submitted_at": SUBMITTED_AT,
+        "finalized_at": None,
+        "groups": [],
+        "items": [],
+        "notes": None,
+    }
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict]] = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((" ".join(str(statement).split()), params or {}))
+
+
+def _offer(offer_id: int, status: str = "SUBMITTED_OPTIONS") -> dict:
+    entry = _entry(offer_id, status=status)
+    return {"id": entry.pop("offer_id"), **entry}
+
+
+def test_sync_swaps_one_offer_in_a_single_update_without_locking_first():
+    session = RecordingSession()
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    repo._sync_comparison_offer(thread_id=1, offer_id=5, offer=_offer(5, status="FINALIZED_QUOTE"))
+
+    assert len(session.statements) == 1
+    sql, params = session.statements[0]
+    assert sql.startswith("UPDATE thread_comparisons tc SET document = jsonb_set(")
+    assert "FOR UPDATE" not in sql
+    assert params["offer_id"] == 5
+    entry = json.loads(params["entry"])
+    assert (entry["offer_id"], entry["status"]) == (5, "FINALIZED_QUOTE")
+    assert entry["created_at"] == CREATED_AT.isoformat()
+
+
+def test_sync_of_a_hidden_offer_only_drops_it_from_the_document():
+    session = RecordingSession()
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    repo._sync_comparison_offer(thread_id=1, offer_id=9, offer=_offer(9, status="DRAFT"))
+
+    [(sql, params)] = session.statements
+    assert params["entry"] is None
+    # Without an entry the UPDATE only matches documents that still list the offer.
+    assert "tc.document->'offers' @> jsonb_build_array" in sql
+
+
+def test_comparison_document_lists_offers_by_creation_time():
+    later = CREATED_AT.replace(hour=10)
+    # Entries read back from jsonb carry ISO strings; fresh ones carry datetimes.
+    stored = json.loads(json.dumps(_entry(2, created_at=later), default=_comparison_json_default))
+    thread = {"id": 1, "vehicle_model": "Palio"}
+    request = {"requested_items": []}
+
+    document = BrowserThreadRepoSqlAlchemy(RecordingSession())._comparison_document(
+        thread, request, offers=[stored, _entry(5), _entry(3)]
+    )
+
+    assert [offer["offer_id"] for offer in document["offers"]] == [3, 5, 2]
+
+
+def test_stored_document_round_trips_into_response_schema():
+    entry = {**_entry(3, status="FINALIZED_QUOTE"), "final_total": Decimal("120.50")}
+    stored = json.loads(json.dumps(entry, default=_comparison_json_default))
+
+    parsed = OfferComparisonSchema.model_validate(stored)
+    assert parsed.submitted_at == SUBMITTED_AT
+    assert parsed.final_total == 120.5
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class ComparisonSession:
+    """Answers the statements of a comparison rebuild and records each one."""
+
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict]] = []
+        self.saved: dict | None = None
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        params = params or {}
+        self.statements.append((sql, params))
+        if sql.startswith("INSERT INTO thread_comparisons"):
+            self.saved = json.loads(params["document"])
+            return _Rows([])
+        if "FROM quote_threads t WHERE t.id" in sql:
+            return _Rows([{"id": 1, "mechanic_id": 11, "workshop_id": 7, "vehicle_model": "Palio", "seller_visible": None}])
+        if "FROM part_requests pr" in sql:
+            return _Rows([{"id": 5, "thread_id": 1, "original_description": "Pastilha"}])
+        if "FROM requested_items" in sql:
+            return _Rows([{"id": 8, "description": "Pastilha", "quantity": 1, "part_number": None}])
+        if "FROM seller_offers so" in sql:
+            # The fake trusts the SQL filter: only the submitted offer comes back.
+            return _Rows(
+                [
+                    {
+                        "id": 3,
+                        "thread_id": 1,
+                        "seller_id": 21,
+                        "seller_shop_id": 9,
+                        "status": "SUBMITTED_OPTIONS",
+                        "notes": None,
+                        "total_amount": None,
+                        "created_at": CREATED_AT,
+                        "submitted_at": SUBMITTED_AT,
+                        "finalized_at": None,
+                        "seller_name": "Carlos Silva",
+                        "seller_shop_name": "Autopeças Azul",
+                    }
+                ]
+            )
+        if "FROM seller_offer_items" in sql:
+            return _Rows([])
+        raise AssertionError(f"unexpected statement: {sql}")
+
+
+def test_rebuild_loads_only_mechanic_visible_offers_and_reads_the_request_once():
+    session = ComparisonSession()
+    repo = BrowserThreadRepoSqlAlchemy(session)
+
+    document = repo._rebuild_comparison(thread_id=1)
+
+    offer_selects = [params for sql, params in session.statements if "FROM seller_offers so" in sql]
+    assert offer_selects == [
+        {"thread_id": 1, "statuses": ["FINALIZED_QUOTE", "SUBMITTED_OPTIONS", "proposal_sent"]}
+    ]
+    # thread, request, requested items, visible offers, items of the one offer, save
+    assert len(session.statements) == 6
+    assert [offer["offer_id"] for offer in document["offers"]] == [3]
+    assert session.saved["offers"][0]["groups"][0]["requested_item_id"] == 8
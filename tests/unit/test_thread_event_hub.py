@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.bot.adapters.driven.db.thread_events import ThreadEventHub
+
+
+def test_publish_wakes_only_waiters_of_that_thread():
+    async def _run():
+        hub = ThreadEventHub()
+        hub.listening = True
+        first = hub.subscribe(1)
+        other = hub.subscribe(2)
+
+        waiter = asyncio.create_task(hub.wait(first, timeout=5))
+        await asyncio.sleep(0)
+        hub.publish(1)
+
+        assert await waiter is True
+        assert await hub.wait(other, timeout=0.01) is False
+
+        hub.unsubscribe(1, first)
+        hub.unsubscribe(2, other)
+        assert hub.waiter_count == 0
+
+    asyncio.run(_run())
+
+
+def test_notification_before_wait_is_not_lost():
+    async def _run():
+        hub = ThreadEventHub()
+        hub.listening = True
+        event = hub.subscribe(7)
+        hub.publish(7)
+        assert await hub.wait(event, timeout=0.01) is True
+
+    asyncio.run(_run())
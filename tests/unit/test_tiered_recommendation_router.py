@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.bot.adapters.driven.llm.llm_recommendation_adapter import LlmParseError
+from src.bot.adapters.driven.llm.tiered_recommendation_router import (
+    TieredRecommendationRouter,
+)
+from src.bot.application.dtos.recommendation.candidate import Candidate
+from src.bot.application.dtos.recommendation.part_request import PartRequest
+from src.bot.application.dtos.recommendation.recommendation_item_result import (
+    RecommendationItemResult,
+)
+from src.bot.application.dtos.recommendation.recommendation_request import (
+    RecommendationRequest,
+)
+from src.bot.application.dtos.recommendation.recommendation_response import (
+    RecommendationResponse,
+)
+
+
+class ScriptedAdapter:
+    """Answers each call with the next scripted response (or raises it)."""
+
+    def __init__(self, model: str, responses: list) -> None:
+        self.model = model
+        self._responses = list(responses)
+        self.calls: list[tuple[RecommendationRequest, dict | None]] = []
+
+    async def _next(self, request, log_metadata):
+        self.calls.append((request, log_metadata))
+        response = self._responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def generate(self, request, *, log_metadata=None):
+        return await self._next(request, log_metadata)
+
+    async def generate_batch(self, request, *, log_metadata=None):
+        return await self._next(request, log_metadata)
+
+
+def _response(*scores: float, questions: list[str] | None = None) -> RecommendationResponse:
+    return RecommendationResponse(
+        id="req-1",
+        candidates=[
+            Candidate(id=str(i), part_number=f"P{i}", score=score, metadata={"required_questions": questions or []})
+            for i, score in enumerate(scores)
+        ],
+    )
+
+
+def _item(item_id: str, *scores: float) -> RecommendationItemResult:
+    return RecommendationItemResult(
+        item_id=item_id,
+        accepted_candidates=[Candidate(id=item_id, part_number=f"{item_id}-{s}", score=s) for s in scores],
+    )
+
+
+def _request(*item_ids: str) -> RecommendationRequest:
+    return RecommendationRequest(
+        requester_id="req-1",
+        vehicle={"brand": "Fiat", "model": "Palio", "year": "2015"},
+        parts=[PartRequest(item_id=item_id, description="vela", quantity=1) for item_id in item_ids or ("1",)],
+        context={"thread_id": "10"},
+    )
+
+
+def test_confident_fast_answers_stay_on_the_fast_tier_and_doubts_escalate():
+    fast = ScriptedAdapter(
+        "fast-model",
+        [
+            _response(0.92, 0.4),
+            _response(0.3),
+            _response(0.95, questions=["Com ou sem ABS?"]),
+            LlmParseError("no json"),
+        ],
+    )
+    strong = ScriptedAdapter("strong-model", [_response(0.9), _response(0.9), _response(0.9)])
+    router = TieredRecommendationRouter(fast=fast, strong=strong, min_score=0.6)
+
+    first = asyncio.run(router.generate(_request()))
+    assert [c.part_number for c in first.candidates] == ["P0", "P1"]
+    assert strong.calls == []
+
+    for expected_reason in ("low_score", "required_questions", "parse_error"):
+        answer = asyncio.run(router.generate(_request()))
+        assert answer.candidates[0].score == 0.9
+        assert strong.calls[-1][1] == {"escalated_from": "fast-model", "escalation_reason": expected_reason}
+    assert len(fast.calls) == 4 and len(strong.calls) == 3
+
+
+def test_batch_escalates_only_doubtful_items_and_keeps_fast_answer_on_strong_failure():
+    fast_batch = RecommendationResponse(id="req-1", items=[_item("11", 0.9), _item("12", 0.2), _item("13")])
+    strong_batch = RecommendationResponse(id="req-1", items=[_item("12", 0.85)])
+    fast = ScriptedAdapter("fast-model", [fast_batch, _response(0.1)])
+    strong = ScriptedAdapter("strong-model", [strong_batch, LlmParseError("boom")])
+    router = TieredRecommendationRouter(fast=fast, strong=strong)
+
+    response = asyncio.run(router.generate_batch(_request("11", "12", "13")))
+
+    escalated_request, metadata = strong.calls[0]
+    assert [part.item_id for part in escalated_request.parts] == ["12", "13"]
+    assert metadata["escalated_item_ids"] == ["12", "13"]
+    assert metadata["escalation_reason"] == "low_score"
+    assert [c.part_number for c in response.candidates] == ["11-0.9", "12-0.85"]
+    assert [item.item_id for item in response.items] == ["11", "12", "13"]
+
+    kept = asyncio.run(router.generate(_request()))
+    assert kept.candidates[0].score == 0.1
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from src.bot.application.services.recommendation_service import (
+    CandidateColumns,
+    FilteredRecommendationService,
+)
+from src.bot.application.services.vehicle_catalog_index import VehicleCatalogIndex
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeCatalogSource:
+    def __init__(self) -> None:
+        self.manufacturers: list[dict] = []
+        self.vehicles: list[dict] = []
+        self.calls: list[tuple[str, datetime | None]] = []
+
+    def list_manufacturers_changed_since(self, since):
+        self.calls.append(("manufacturers", since))
+        return [row for row in self.manufacturers if since is None or row["updated_at"] >= since]
+
+    def list_vehicles_changed_since(self, since):
+        self.calls.append(("vehicles", since))
+        return [row for row in self.vehicles if since is None or row["updated_at"] >= since]
+
+
+def _manufacturer(id_, name, updated_at=T0, soft_delete=False):
+    return {"id": id_, "name": name, "soft_delete": soft_delete, "updated_at": updated_at}
+
+
+def _vehicle(id_, manufacturer_id, model, start, end, updated_at=T0, soft_delete=False):
+    return {
+        "id": id_,
+        "manufacturer_id": manufacturer_id,
+        "model": model,
+        "model_year_start": start,
+        "model_year_end": end,
+        "soft_delete": soft_delete,
+        "updated_at": updated_at,
+    }
+
+
+def _seeded_source() -> FakeCatalogSource:
+    source = FakeCatalogSource()
+    source.manufacturers = [_manufacturer(1, "Volkswagen"), _manufacturer(2, "Fiat"), _manufacturer(3, "Citroën")]
+    source.vehicles = [
+        _vehicle(10, 1, "Gol", 2008, 2022),
+        _vehicle(11, 2, "Grand Siena", 2012, 2020),
+        _vehicle(12, 2, "Siena", 2008, 2016),
+        _vehicle(13, 3, "C3", 2003, None),
+        _vehicle(14, 2, "500", 2012, 2017),
+    ]
+    return source
+
+
+def test_index_loads_catalog_models_brands_and_year_ranges():
+    index = VehicleCatalogIndex(seed_models={"uno": "fiat"}, brand_aliases={"vw": "volkswagen"})
+    assert index.refresh(_seeded_source()) == 8
+
+    assert index.models_in("pastilha grand siena 2014 e c3") == ["grand siena", "c3"]
+    assert index.models_in("oleo 500 ml") == []
+    assert index.brands_in("kit vw e citroen") == ["volkswagen", "citroen"]
+    assert index.brand_display("vw") == "Volkswagen"
+    assert index.brands_for_model("uno") == ["fiat"]
+    assert index.covers_year("gol", 2015) is True
+    assert index.covers_year("gol", 2024) is False
+    assert index.covers_year("c3", 2030) is True
+    assert index.covers_year("uno", 2015) is None
+
+
+def test_refresh_is_incremental_and_applies_soft_deletes():
+    source = _seeded_source()
+    index = VehicleCatalogIndex()
+    index.refresh(source)
+    source.calls.clear()
+
+    assert index.refresh(source) == 0
+    assert source.calls[0][1] is not None and source.calls[0][1] <= T0
+
+    later = T0 + timedelta(hours=1)
+    source.vehicles.append(_vehicle(10, 1, "Gol", 2008, 2022, updated_at=later, soft_delete=True))
+    source.vehicles.append(_vehicle(20, 1, "Nivus", 2020, None, updated_at=later))
+
+    assert index.refresh(source) == 2
+    assert index.models_in("gol nivus") == ["nivus"]
+
+
+def test_filter_uses_catalog_models_for_compatibility(monkeypatch):
+    index = VehicleCatalogIndex(brand_aliases={"vw": "volkswagen"})
+    index.refresh(_seeded_source())
+    monkeypatch.setattr(
+        "src.bot.application.services.recommendation_service.VEHICLE_CATALOG_INDEX",
+        index,
+    )
+    service = FilteredRecommendationService()
+
+    columns = CandidateColumns.scan(["Vela para Fiat Siena", "Vela para VW Gol"])
+    assert service._vehicle_incompatibility_mask({"model": "Gol", "year": "2015"}, columns) == [True, False]
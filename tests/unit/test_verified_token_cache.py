@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from src.bot.adapters.driver.fastapi.dependencies import auth
+from src.bot.adapters.driver.fastapi.dependencies.auth import (
+    BrowserIdentity,
+    VerifiedTokenCache,
+    require_authenticated,
+)
+from src.bot.infrastructure.config.settings import settings
+
+
+def _token(**claims) -> str:
+    payload = {"user_id": 11, "role": "mechanic", "mechanic_id": 11, "shop_id": 7, **claims}
+    return jwt.encode(payload, settings.SELLER_JWT_SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    cache = VerifiedTokenCache(max_entries=2, max_seconds=300)
+    monkeypatch.setattr(auth, "VERIFIED_TOKEN_CACHE", cache)
+    return cache
+
+
+def test_repeated_token_is_verified_once(monkeypatch, token_cache):
+    decodes = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode", lambda *args, **kwargs: decodes.append(1) or real_decode(*args, **kwargs))
+    header = f"Bearer {_token(exp=int(time.time()) + 600)}"
+
+    first = require_authenticated(header)
+    for _ in range(5):
+        assert require_authenticated(header) == first
+
+    assert len(decodes) == 1
+    assert token_cache.stats() == {"size": 1, "max_entries": 2, "hits": 5, "misses": 1, "hit_rate": 0.8333}
+
+
+def test_cached_identity_is_dropped_at_token_exp(token_cache):
+    identity = BrowserIdentity(user_id=11, role="mechanic", mechanic_id=11)
+    token_cache.put("expiring", identity, exp=time.time() - 1)
+    token_cache.put("fresh", identity, exp=time.time() + 60)
+
+    assert token_cache.get("expiring") is None
+    assert token_cache.get("fresh") == identity
+    assert token_cache.stats()["size"] == 1
+
+
+def test_invalid_tokens_are_never_cached(token_cache):
+    bad = "Bearer " + jwt.encode({"user_id": 11, "role": "mechanic"}, "wrong-secret", algorithm="HS256")
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            require_authenticated(bad)
+    assert token_cache.stats()["size"] == 0
+
+
+def test_lru_is_bounded(token_cache):
+    for user_id in (1, 2, 3):
+        require_authenticated(f"Bearer {_token(user_id=user_id)}")
+    assert token_cache.stats()["size"] == 2